@@ -93,6 +93,8 @@ class InstanceConfig(BaseModel):
     cache_shared_labels: Optional[bool] = None
     collect_counters_with_distributions: Optional[bool] = None
     collect_histogram_buckets: Optional[bool] = None
+    concurrent_scrapes: Optional[bool] = None
+    concurrent_scrapes_max_workers: Optional[int] = None
     connect_timeout: Optional[float] = None
     datacenter_metrics: Optional[tuple[str, ...]] = None
     datacenters: Optional[tuple[str, ...]] = None
@@ -119,6 +121,7 @@ class InstanceConfig(BaseModel):
     kerberos_hostname: Optional[str] = None
     kerberos_keytab: Optional[str] = None
     kerberos_principal: Optional[str] = None
+    label_cache_size: Optional[int] = None
     log_requests: Optional[bool] = None
     metric_patterns: Optional[MetricPatterns] = None
     metrics: Optional[tuple[Union[str, MappingProxyType[str, Union[str, Metric]]], ...]] = None
@@ -127,6 +130,7 @@ class InstanceConfig(BaseModel):
     namespace_metrics: Optional[tuple[str, ...]] = None
     namespaces: Optional[tuple[str, ...]] = None
     non_cumulative_histogram_buckets: Optional[bool] = None
+    normalization_cache_size: Optional[int] = None
     ntlm_domain: Optional[str] = None
     openmetrics_endpoint: Optional[str] = None
     password: Optional[str] = None
@@ -156,7 +160,9 @@ class InstanceConfig(BaseModel):
     tls_verify: Optional[bool] = None
     use_latest_spec: Optional[bool] = None
     use_legacy_auth_encoding: Optional[bool] = None
+    use_native_parser: Optional[bool] = None
     use_process_start_time: Optional[bool] = None
+    use_protobuf: Optional[bool] = None
     username: Optional[str] = None
 
     @model_validator(mode='before')
@@ -40,6 +40,14 @@ def instance_collect_histogram_buckets():
     return True
 
 
+def instance_concurrent_scrapes():
+    return False
+
+
+def instance_concurrent_scrapes_max_workers():
+    return 8
+
+
 def instance_disable_generic_tags():
     return False
 
@@ -76,6 +84,10 @@ def instance_kerberos_force_initiate():
     return False
 
 
+def instance_label_cache_size():
+    return 0
+
+
 def instance_log_requests():
     return False
 
@@ -92,6 +104,10 @@ def instance_non_cumulative_histogram_buckets():
     return False
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_persist_connections():
     return False
 
@@ -140,9 +156,17 @@ def instance_use_legacy_auth_encoding():
     return True
 
 
+def instance_use_native_parser():
+    return False
+
+
 def instance_use_openmetrics():
     return False
 
 
 def instance_use_process_start_time():
     return False
+
+
+def instance_use_protobuf():
+    return False
@@ -95,6 +95,8 @@ class InstanceConfig(BaseModel):
     cache_shared_labels: Optional[bool] = None
     collect_counters_with_distributions: Optional[bool] = None
     collect_histogram_buckets: Optional[bool] = None
+    concurrent_scrapes: Optional[bool] = None
+    concurrent_scrapes_max_workers: Optional[int] = None
     connect_timeout: Optional[float] = None
     disable_generic_tags: Optional[bool] = None
     empty_default_hostname: Optional[bool] = None
@@ -119,12 +121,14 @@ class InstanceConfig(BaseModel):
     kerberos_hostname: Optional[str] = None
     kerberos_keytab: Optional[str] = None
     kerberos_principal: Optional[str] = None
+    label_cache_size: Optional[int] = None
     log_requests: Optional[bool] = None
     metric_patterns: Optional[MetricPatterns] = None
     metrics: Optional[tuple[Union[str, MappingProxyType[str, Union[str, Metric]]], ...]] = None
     min_collection_interval: Optional[float] = None
     namespace: Optional[str] = Field(None, pattern='\\w*')
     non_cumulative_histogram_buckets: Optional[bool] = None
+    normalization_cache_size: Optional[int] = None
     ntlm_domain: Optional[str] = None
     openmetrics_endpoint: Optional[str] = None
     password: Optional[str] = None
@@ -151,7 +155,9 @@ class InstanceConfig(BaseModel):
     tls_verify: Optional[bool] = None
     use_latest_spec: Optional[bool] = None
     use_legacy_auth_encoding: Optional[bool] = None
+    use_native_parser: Optional[bool] = None
     use_process_start_time: Optional[bool] = None
+    use_protobuf: Optional[bool] = None
     username: Optional[str] = None
 
     @model_validator(mode='before')
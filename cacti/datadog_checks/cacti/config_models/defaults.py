@@ -26,3 +26,7 @@ def instance_mysql_db():
 
 def instance_mysql_port():
     return 3306
+
+
+def instance_normalization_cache_size():
+    return 0
@@ -44,6 +44,7 @@ class InstanceConfig(BaseModel):
     mysql_password: Optional[str] = None
     mysql_port: Optional[int] = None
     mysql_user: str
+    normalization_cache_size: Optional[int] = None
     rrd_path: str
     rrd_whitelist: Optional[str] = None
     service: Optional[str] = None
@@ -41,6 +41,7 @@ class InstanceConfig(BaseModel):
     empty_default_hostname: Optional[bool] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     service: Optional[str] = None
     tags: Optional[tuple[str, ...]] = None
     use_sudo: Optional[bool] = None
@@ -123,6 +123,8 @@ class InstanceConfig(BaseModel):
     cache_shared_labels: Optional[bool] = None
     collect_counters_with_distributions: Optional[bool] = None
     collect_histogram_buckets: Optional[bool] = None
+    concurrent_scrapes: Optional[bool] = None
+    concurrent_scrapes_max_workers: Optional[int] = None
     connect_timeout: Optional[float] = None
     disable_generic_tags: Optional[bool] = None
     empty_default_hostname: Optional[bool] = None
@@ -149,6 +151,7 @@ class InstanceConfig(BaseModel):
     kerberos_hostname: Optional[str] = None
     kerberos_keytab: Optional[str] = None
     kerberos_principal: Optional[str] = None
+    label_cache_size: Optional[int] = None
     label_joins: Optional[LabelJoins] = None
     label_to_hostname: Optional[str] = None
     labels_mapper: Optional[MappingProxyType[str, Any]] = None
@@ -158,6 +161,7 @@ class InstanceConfig(BaseModel):
     min_collection_interval: Optional[float] = None
     namespace: Optional[str] = Field(None, pattern='\\w*')
     non_cumulative_histogram_buckets: Optional[bool] = None
+    normalization_cache_size: Optional[int] = None
     ntlm_domain: Optional[str] = None
     openmetrics_endpoint: Optional[str] = None
     operator_endpoint: Optional[str] = None
@@ -194,8 +198,10 @@ class InstanceConfig(BaseModel):
     type_overrides: Optional[MappingProxyType[str, Any]] = None
     use_latest_spec: Optional[bool] = None
     use_legacy_auth_encoding: Optional[bool] = None
+    use_native_parser: Optional[bool] = None
     use_openmetrics: Optional[bool] = None
     use_process_start_time: Optional[bool] = None
+    use_protobuf: Optional[bool] = None
     username: Optional[str] = None
 
     @model_validator(mode='before')
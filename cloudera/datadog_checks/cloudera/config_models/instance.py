@@ -64,6 +64,7 @@ class InstanceConfig(BaseModel):
     max_parallel_requests: Optional[int] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     service: Optional[str] = None
     tags: Optional[tuple[str, ...]] = None
 
@@ -72,6 +72,10 @@ def instance_new_leader_checks():
     return False
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_persist_connections():
     return False
 
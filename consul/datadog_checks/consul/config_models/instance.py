@@ -81,6 +81,7 @@ class InstanceConfig(BaseModel):
     min_collection_interval: Optional[float] = None
     network_latency_checks: Optional[bool] = None
     new_leader_checks: Optional[bool] = None
+    normalization_cache_size: Optional[int] = None
     ntlm_domain: Optional[str] = None
     password: Optional[str] = None
     persist_connections: Optional[bool] = None
@@ -19,6 +19,7 @@ from typing import (  # noqa: F401
     Callable,
     Deque,
     Dict,
+    Iterable,
     List,
     Optional,
     Sequence,
@@ -42,7 +43,9 @@ from ..types import (
     ProxySettings,  # noqa: F401
     ServiceCheckStatus,  # noqa: F401
 )
+from ..utils.agent.common import METRIC_NAMESPACE_METRICS
 from ..utils.agent.utils import should_profile_memory
+from ..utils.caching import BoundedCache
 from ..utils.common import ensure_bytes, to_native_string
 from ..utils.diagnose import Diagnosis
 from ..utils.http import RequestsWrapper
@@ -88,6 +91,16 @@ if TYPE_CHECKING:
 
 # Metric types for which it's only useful to submit once per set of tags
 ONE_PER_CONTEXT_METRIC_TYPES = [aggregator.GAUGE, aggregator.RATE, aggregator.MONOTONIC_COUNT]
+# Metric types that may be submitted with `AgentCheck.submit_metric_batch`
+BATCH_METRIC_TYPES = {
+    'gauge': aggregator.GAUGE,
+    'count': aggregator.COUNT,
+    'monotonic_count': aggregator.MONOTONIC_COUNT,
+    'rate': aggregator.RATE,
+    'histogram': aggregator.HISTOGRAM,
+    'historate': aggregator.HISTORATE,
+}
+NATIVE_STRING_TYPES = {str}
 TYPO_SIMILARITY_THRESHOLD = 0.95
 
 
@@ -161,6 +174,16 @@ class AgentCheck(object):
     # See https://github.com/DataDog/integrations-core/pull/2093 for more information.
     DEFAULT_METRIC_LIMIT = 0
 
+    # allows to memoize the normalized form of at most this many distinct sets of tags,
+    # and separately metric names, which most checks submit over and over again.
+    # This can be overridden per instance with the `normalization_cache_size` option, 0 disables it.
+    # Stats are submitted when the `normalization_cache` debug metrics are enabled.
+    DEFAULT_NORMALIZATION_CACHE_SIZE = 0
+
+    # the maximum number of distinct metric names for which to remember the outcome of the
+    # `metric_patterns` filtering, this is only used when patterns are configured
+    METRIC_FILTER_CACHE_SIZE = 10000
+
     # Allow tracing for classic integrations
     def __init_subclass__(cls, *args, **kwargs):
         try:
@@ -235,6 +258,9 @@ class AgentCheck(object):
         if not isinstance(metric_patterns, dict):
             raise ConfigurationError('Setting `metric_patterns` must be a mapping')
 
+        self._exclude_metrics_pattern = None
+        self._include_metrics_pattern = None
+        self._metric_filter_cache = None  # type: Optional[BoundedCache]
         self.exclude_metrics_pattern = self._create_metrics_pattern(metric_patterns, 'exclude')
         self.include_metrics_pattern = self._create_metrics_pattern(metric_patterns, 'include')
 
@@ -295,6 +321,29 @@ class AgentCheck(object):
         # Setup metric limits
         self.metric_limiter = self._get_metric_limiter(self.name, instance=self.instance)
 
+        # Setup memoization of tags and metric names
+        normalization_cache_size = (
+            self.instance.get('normalization_cache_size', self.DEFAULT_NORMALIZATION_CACHE_SIZE)
+            if instance
+            else self.DEFAULT_NORMALIZATION_CACHE_SIZE
+        )
+        if (
+            not isinstance(normalization_cache_size, int)
+            or isinstance(normalization_cache_size, bool)
+            or normalization_cache_size < 0
+        ):
+            raise ConfigurationError('Setting `normalization_cache_size` must be a non-negative integer')
+
+        if normalization_cache_size:
+            self._tag_cache = BoundedCache(normalization_cache_size)  # type: Optional[BoundedCache]
+            self._namespace_cache = BoundedCache(normalization_cache_size)  # type: Optional[BoundedCache]
+        else:
+            self._tag_cache = None
+            self._namespace_cache = None
+
+        # The namespace that `_namespace_cache` entries were formatted with, as it may change after instantiation
+        self._cached_namespace = self.__NAMESPACE__
+
         # Lazily load and validate config
         self._config_model_instance = None  # type: Any
         self._config_model_shared = None  # type: Any
@@ -658,8 +707,42 @@ class AgentCheck(object):
 
         aggregator.submit_event_platform_event(self, self.check_id, to_native_string(raw_event), "dbm-metadata")
 
+    @property
+    def exclude_metrics_pattern(self):
+        return self._exclude_metrics_pattern
+
+    @exclude_metrics_pattern.setter
+    def exclude_metrics_pattern(self, pattern):
+        self._exclude_metrics_pattern = pattern
+        self._reset_metric_filter_cache()
+
+    @property
+    def include_metrics_pattern(self):
+        return self._include_metrics_pattern
+
+    @include_metrics_pattern.setter
+    def include_metrics_pattern(self, pattern):
+        self._include_metrics_pattern = pattern
+        self._reset_metric_filter_cache()
+
+    def _reset_metric_filter_cache(self):
+        # Decisions are only worth remembering if there are patterns to evaluate
+        if self._exclude_metrics_pattern is None and self._include_metrics_pattern is None:
+            self._metric_filter_cache = None
+        else:
+            self._metric_filter_cache = BoundedCache(self.METRIC_FILTER_CACHE_SIZE)
+
     def should_send_metric(self, metric_name):
-        return not self._metric_excluded(metric_name) and self._metric_included(metric_name)
+        metric_filter_cache = self._metric_filter_cache
+        if metric_filter_cache is None:
+            return True
+
+        decision = metric_filter_cache.get(metric_name)
+        if decision is None:
+            decision = not self._metric_excluded(metric_name) and self._metric_included(metric_name)
+            metric_filter_cache.set(metric_name, decision)
+
+        return decision
 
     def _metric_included(self, metric_name):
         if self.include_metrics_pattern is None:
@@ -910,6 +993,94 @@ class AgentCheck(object):
             aggregator.COUNTER, name, value, tags=tags, hostname=hostname, device_name=device_name, raw=raw
         )
 
+    def submit_metric_batch(self, metric_type, records, raw=False, flush_first_value=False):
+        # type: (str, Iterable[Tuple[str, float, Sequence[str], str]], bool, bool) -> None
+        """Submit many samples of the same metric type at once.
+
+        This is equivalent to calling the method of the metric type for every record, except that work shared
+        by the records, like the namespace formatting and the `metric_patterns` filtering of each distinct name,
+        is only done once per batch.
+
+        Parameters:
+
+            metric_type (str):
+                one of `gauge`, `count`, `monotonic_count`, `rate`, `histogram` or `historate`
+            records (iterable[tuple[str, float, list[str], str]]):
+                the `(name, value, tags, hostname)` of every sample
+            raw (bool):
+                whether to ignore any defined namespace prefix
+            flush_first_value (bool):
+                whether to sample the first value, only used for `monotonic_count`
+        """
+        mtype = BATCH_METRIC_TYPES.get(metric_type)
+        if mtype is None:
+            raise ValueError(
+                'Unknown metric type `{}`, must be one of: {}'.format(metric_type, ', '.join(BATCH_METRIC_TYPES))
+            )
+
+        self._submit_metric_batch(mtype, records, raw=raw, flush_first_value=flush_first_value)
+
+    def _submit_metric_batch(self, mtype, records, raw=False, flush_first_value=False):
+        # type: (int, Iterable[Tuple[str, float, Sequence[str], str]], bool, bool) -> None
+        submit_metric = aggregator.submit_metric
+        check_id = self.check_id
+        metric_limiter = self.metric_limiter
+        one_per_context = mtype in ONE_PER_CONTEXT_METRIC_TYPES
+        # Tags only need to be copied rather than normalized when they are all native strings
+        copy_native_tags = not self.disable_generic_tags
+
+        # Mapping of submitted names to their final name, or `None` if the metric must not be sent
+        metric_names = {}  # type: Dict[str, Optional[str]]
+
+        for name, value, tags, hostname in records:
+            if value is None:
+                # ignore metric sample
+                continue
+
+            try:
+                metric_name = metric_names[name]
+            except KeyError:
+                metric_name = self._format_namespace(name, raw)
+                if not self.should_send_metric(metric_name):
+                    metric_name = None
+
+                metric_names[name] = metric_name
+
+            if metric_name is None:
+                continue
+
+            if not tags:
+                tags = []
+            elif copy_native_tags and set(map(type, tags)) <= NATIVE_STRING_TYPES:
+                tags = list(tags)
+            else:
+                tags = self._normalize_tags_type(tags, metric_name=metric_name)
+
+            if hostname is None:
+                hostname = ''
+
+            if metric_limiter:
+                if one_per_context:
+                    if metric_limiter.is_reached():
+                        continue
+                else:
+                    context = self._context_uid(mtype, metric_name, tags, hostname)
+                    if metric_limiter.is_reached(context):
+                        continue
+
+            try:
+                value = float(value)
+            except ValueError:
+                err_msg = 'Metric: {} has non float value: {}. Only float values can be submitted as metrics.'.format(
+                    repr(metric_name), repr(value)
+                )
+                if using_stub_aggregator:
+                    raise ValueError(err_msg)
+                self.warning(err_msg)
+                continue
+
+            submit_metric(self, check_id, mtype, metric_name, value, tags, hostname, flush_first_value)
+
     def service_check(self, name, status, tags=None, hostname=None, message=None, raw=False):
         # type: (str, ServiceCheckStatus, Sequence[str], str, str, bool) -> None
         """Send the status of a service.
@@ -1135,7 +1306,19 @@ class AgentCheck(object):
     def _format_namespace(self, s, raw=False):
         # type: (str, bool) -> str
         if not raw and self.__NAMESPACE__:
-            return '{}.{}'.format(self.__NAMESPACE__, to_native_string(s))
+            if self._namespace_cache is None:
+                return '{}.{}'.format(self.__NAMESPACE__, to_native_string(s))
+
+            if self._cached_namespace != self.__NAMESPACE__:
+                self._namespace_cache.clear()
+                self._cached_namespace = self.__NAMESPACE__
+
+            name = self._namespace_cache.get(s)
+            if name is None:
+                name = '{}.{}'.format(self.__NAMESPACE__, to_native_string(s))
+                self._namespace_cache.set(s, name)
+
+            return name
 
         return to_native_string(s)
 
@@ -1242,6 +1425,22 @@ class AgentCheck(object):
 
                 self.metric_limiter.reset()
 
+            if self._tag_cache is not None:
+                if is_affirmative(self.debug_metrics.get('normalization_cache', False)):
+                    tags = self.get_debug_metric_tags()
+                    for cache_name, cache in (('tags', self._tag_cache), ('names', self._namespace_cache)):
+                        for metric_name, value in cache.get_debug_metrics(
+                            '{}.normalization_cache.{}'.format(METRIC_NAMESPACE_METRICS, cache_name)
+                        ):
+                            self.gauge(metric_name, value, tags=tags, raw=True)
+
+                    # These are not part of the check's own metrics
+                    if self.metric_limiter:
+                        self.metric_limiter.reset()
+
+                self._tag_cache.reset_stats()
+                self._namespace_cache.reset_stats()
+
         return error_report
 
     def event(self, event):
@@ -1303,7 +1502,20 @@ class AgentCheck(object):
         - append `device_name` as `device:` tag
         - normalize tags type
         - doesn't mutate the passed list, returns a new list
+        - memoizes the result when the normalization cache is enabled
         """
+        cache_key = None
+        if self._tag_cache is not None and not device_name:
+            cache_key = tags = tuple(tags)
+            try:
+                cached_tags = self._tag_cache.get(cache_key)
+            except TypeError:
+                # Some tags are not hashable, let the normalization below handle them
+                cache_key = None
+            else:
+                if cached_tags is not None:
+                    return list(cached_tags)
+
         normalized_tags = []
 
         if device_name:
@@ -1327,6 +1539,10 @@ class AgentCheck(object):
                 normalized_tags.append(self.degeneralise_tag(tag))
             else:
                 normalized_tags.append(tag)
+
+        if cache_key is not None:
+            self._tag_cache.set(cache_key, tuple(normalized_tags))
+
         return normalized_tags
 
     def degeneralise_tag(self, tag):
@@ -4,11 +4,13 @@
 # TODO: remove ignore when we stop invoking Mypy with --py2
 # type: ignore
 from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor, wait
 from contextlib import contextmanager
 
 from requests.exceptions import RequestException
 from six import raise_from
 
+from ....config import is_affirmative
 from ....errors import ConfigurationError
 from ....utils.tracing import traced_class
 from ... import AgentCheck
@@ -33,6 +35,7 @@ class OpenMetricsBaseCheckV2(AgentCheck):
     """
 
     DEFAULT_METRIC_LIMIT = 2000
+    DEFAULT_CONCURRENT_SCRAPES_MAX_WORKERS = 8
 
     # Allow tracing for openmetrics integrations
     def __init_subclass__(cls, **kwargs):
@@ -54,6 +57,27 @@ class OpenMetricsBaseCheckV2(AgentCheck):
         # All configured scrapers keyed by the endpoint
         self.scrapers = {}
 
+        # Whether or not to fetch all endpoints in parallel before processing them in order
+        self.concurrent_scrapes = (
+            is_affirmative(self.instance.get('concurrent_scrapes', False)) if self.instance else False
+        )
+
+        # The maximum number of endpoints fetched at the same time when `concurrent_scrapes` is enabled
+        self.concurrent_scrapes_max_workers = (
+            self.instance.get('concurrent_scrapes_max_workers', self.DEFAULT_CONCURRENT_SCRAPES_MAX_WORKERS)
+            if self.instance
+            else self.DEFAULT_CONCURRENT_SCRAPES_MAX_WORKERS
+        )
+        if (
+            not isinstance(self.concurrent_scrapes_max_workers, int)
+            or isinstance(self.concurrent_scrapes_max_workers, bool)
+            or self.concurrent_scrapes_max_workers < 1
+        ):
+            raise ConfigurationError('The setting `concurrent_scrapes_max_workers` must be a positive integer')
+
+        # Created on the first concurrent scrape and reused by the following ones
+        self._prefetch_executor = None
+
         self.check_initializations.append(self.configure_scrapers)
 
     def check(self, _):
@@ -67,15 +91,42 @@ class OpenMetricsBaseCheckV2(AgentCheck):
         """
         self.refresh_scrapers()
 
-        for endpoint, scraper in self.scrapers.items():
-            self.log.debug('Scraping OpenMetrics endpoint: %s', endpoint)
+        if self.concurrent_scrapes and len(self.scrapers) > 1:
+            self.prefetch_scrapers()
+
+        try:
+            for endpoint, scraper in self.scrapers.items():
+                self.log.debug('Scraping OpenMetrics endpoint: %s', endpoint)
+
+                with self.adopt_namespace(scraper.namespace):
+                    try:
+                        scraper.scrape()
+                    except (ConnectionError, RequestException) as e:
+                        self.log.error("There was an error scraping endpoint %s: %s", endpoint, str(e))
+                        raise_from(type(e)("There was an error scraping endpoint {}: {}".format(endpoint, e)), None)
+        finally:
+            for scraper in self.scrapers.values():
+                scraper.discard_prefetched_response()
+
+    def prefetch_scrapers(self):
+        """
+        Fetch every endpoint in parallel so that the total time spent waiting on the network is that of the slowest
+        endpoint rather than the sum of all of them. Scrapers then process their payload serially, which keeps
+        the order of submissions deterministic and namespace handling safe.
+
+        At most `concurrent_scrapes_max_workers` endpoints are fetched at the same time.
+        """
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(
+                max_workers=self.concurrent_scrapes_max_workers, thread_name_prefix='openmetrics-prefetch'
+            )
+
+        wait([self._prefetch_executor.submit(scraper.prefetch) for scraper in self.scrapers.values()])
 
-            with self.adopt_namespace(scraper.namespace):
-                try:
-                    scraper.scrape()
-                except (ConnectionError, RequestException) as e:
-                    self.log.error("There was an error scraping endpoint %s: %s", endpoint, str(e))
-                    raise_from(type(e)("There was an error scraping endpoint {}: {}".format(endpoint, e)), None)
+    def cancel(self):
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False)
+            self._prefetch_executor = None
 
     def configure_scrapers(self):
         """
@@ -0,0 +1,338 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import re
+
+from google.protobuf.internal.decoder import _DecodeVarint32  # pylint: disable=E0611,E0401
+from prometheus_client.metrics_core import Metric
+from prometheus_client.samples import Sample
+from prometheus_client.utils import floatToGoString
+
+from ....utils.functions import no_op, return_false
+from ....utils.prometheus import metrics_pb2
+
+PROTOBUF_MEDIA_TYPE = 'application/vnd.google.protobuf'
+PROTOBUF_ACCEPT_HEADER = (
+    f'{PROTOBUF_MEDIA_TYPE};proto=io.prometheus.client.MetricFamily;encoding=delimited;q=0.7,'
+    'text/plain;version=0.0.4;q=0.3'
+)
+
+ESCAPE_SEQUENCES = {'\\\\': '\\', '\\n': '\n', '\\"': '"'}
+HELP_ESCAPING_PATTERN = re.compile(r'\\[\\n]')
+LABEL_ESCAPING_PATTERN = re.compile(r'\\[\\n"]')
+
+# Label values may contain any escaped character, including quotes and commas
+LABEL_PATTERN = re.compile(r'([^\s=,]+)\s*=\s*"([^"\\]*(?:\\.[^"\\]*)*)"')
+
+PROTOBUF_METRIC_TYPES = {
+    metrics_pb2.COUNTER: 'counter',
+    metrics_pb2.GAUGE: 'gauge',
+    metrics_pb2.SUMMARY: 'summary',
+    metrics_pb2.UNTYPED: 'untyped',
+    metrics_pb2.HISTOGRAM: 'histogram',
+}
+
+INFINITY = float('inf')
+
+ALLOWED_SAMPLE_SUFFIXES = {
+    'counter': ('',),
+    'gauge': ('',),
+    'summary': ('_count', '_sum', ''),
+    'histogram': ('_count', '_sum', '_bucket'),
+}
+
+
+def text_fd_to_metric_families(lines, skip_metric=return_false, on_skip=no_op):
+    """
+    Parse the Prometheus text exposition format, yielding the same metric families as
+    `prometheus_client.parser.text_fd_to_metric_families`.
+
+    Lines are tokenized directly with string operations and labels are extracted in a single regular
+    expression pass. The optional `skip_metric` predicate is called with the final name of every metric
+    family before any of its samples are parsed; if it returns true, its sample lines are only counted
+    and `on_skip` is called with the family name and the number of skipped samples instead of yielding it.
+    """
+    name = ''
+    documentation = ''
+    typ = 'untyped'
+    samples = []
+    allowed_names = ()
+
+    # Whether or not the current family is skipped, which is only decided once the first sample is encountered
+    skip = None
+    skipped_samples = 0
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        if line[0] == '#':
+            parts = line.split(None, 3)
+            if len(parts) < 3:
+                continue
+
+            directive = parts[1]
+            if directive == 'HELP':
+                if parts[2] != name:
+                    if name:
+                        if skip:
+                            on_skip(get_family_name(name, typ), skipped_samples)
+                        else:
+                            yield build_metric(name, documentation, typ, samples)
+
+                    name = parts[2]
+                    typ = 'untyped'
+                    samples = []
+                    allowed_names = (name,)
+                    skip = None
+                    skipped_samples = 0
+
+                documentation = parse_help(parts[3]) if len(parts) == 4 else ''
+            elif directive == 'TYPE':
+                if parts[2] != name:
+                    if name:
+                        if skip:
+                            on_skip(get_family_name(name, typ), skipped_samples)
+                        else:
+                            yield build_metric(name, documentation, typ, samples)
+
+                    name = parts[2]
+                    documentation = ''
+                    samples = []
+                    skip = None
+                    skipped_samples = 0
+
+                typ = parts[3] if len(parts) == 4 else ''
+                allowed_names = tuple(name + suffix for suffix in ALLOWED_SAMPLE_SUFFIXES.get(typ, ('',)))
+
+            continue
+
+        label_start = line.find('{')
+        if label_start == -1:
+            sample_name, _, remainder = line.partition(' ')
+            if not remainder:
+                sample_name, _, remainder = line.partition('\t')
+            labels_string = None
+        else:
+            sample_name = line[:label_start].strip()
+            label_end = line.rindex('}')
+            labels_string = line[label_start + 1 : label_end]
+            remainder = line[label_end + 1 :]
+
+        if sample_name in allowed_names:
+            if skip is None:
+                skip = skip_metric(get_family_name(name, typ))
+
+            if skip:
+                skipped_samples += 1
+            else:
+                samples.append(parse_sample(sample_name, labels_string, remainder))
+
+            continue
+
+        # Any sample that does not belong to the current family is a new untyped singleton
+        if name:
+            if skip:
+                on_skip(get_family_name(name, typ), skipped_samples)
+            else:
+                yield build_metric(name, documentation, typ, samples)
+
+        name = ''
+        documentation = ''
+        typ = 'untyped'
+        samples = []
+        allowed_names = ()
+        skip = None
+        skipped_samples = 0
+
+        if skip_metric(sample_name):
+            on_skip(sample_name, 1)
+        else:
+            yield build_metric(sample_name, '', 'untyped', [parse_sample(sample_name, labels_string, remainder)])
+
+    if name:
+        if skip:
+            on_skip(get_family_name(name, typ), skipped_samples)
+        else:
+            yield build_metric(name, documentation, typ, samples)
+
+
+def get_family_name(name, typ):
+    # Counters are munged into the OpenMetrics representation
+    if typ == 'counter' and name.endswith('_total'):
+        return name[:-6]
+
+    return name
+
+
+def build_metric(name, documentation, typ, samples):
+    if typ == 'counter':
+        if name.endswith('_total'):
+            name = name[:-6]
+        else:
+            samples = [Sample(f'{sample.name}_total', *sample[1:]) for sample in samples]
+
+    metric = Metric(name, documentation, typ)
+    metric.samples = samples
+    return metric
+
+
+def parse_sample(name, labels_string, remainder):
+    values = remainder.split()
+    if not values:
+        raise ValueError(f'Missing value for sample: {name}')
+
+    value = float(values[0])
+    timestamp = float(values[-1]) / 1000 if len(values) > 1 else None
+
+    return Sample(name, parse_labels(labels_string) if labels_string else {}, value, timestamp)
+
+
+def parse_labels(labels_string):
+    if '\\' in labels_string:
+        return {
+            label_name: LABEL_ESCAPING_PATTERN.sub(replace_escape_sequence, label_value)
+            for label_name, label_value in LABEL_PATTERN.findall(labels_string)
+        }
+
+    return dict(LABEL_PATTERN.findall(labels_string))
+
+
+def parse_help(documentation):
+    if '\\' in documentation:
+        return HELP_ESCAPING_PATTERN.sub(replace_escape_sequence, documentation)
+
+    return documentation
+
+
+def replace_escape_sequence(match):
+    return ESCAPE_SEQUENCES[match.group(0)]
+
+
+def protobuf_to_metric_families(chunks, skip_metric=return_false, on_skip=no_op):
+    """
+    Parse the Prometheus protobuf format, i.e. `MetricFamily` messages each prefixed by their varint32 size,
+    from an iterable of byte chunks. Metric families are yielded as soon as they are fully received and
+    have the exact same samples as their representation in the text format would have.
+
+    The `skip_metric` and `on_skip` callbacks behave like they do for `text_fd_to_metric_families`.
+    """
+    buf = bytearray()
+    for chunk in chunks:
+        buf.extend(chunk)
+
+        position = 0
+        with memoryview(buf) as view:
+            while position < len(buf):
+                try:
+                    message_size, message_start = _DecodeVarint32(buf, position)
+                except IndexError:
+                    # The size is split across chunks
+                    break
+
+                message_end = message_start + message_size
+                if message_end > len(buf):
+                    break
+
+                message = metrics_pb2.MetricFamily()
+                message.ParseFromString(view[message_start:message_end])
+                position = message_end
+
+                typ = PROTOBUF_METRIC_TYPES.get(message.type, 'untyped')
+                name = get_family_name(message.name, typ)
+                if skip_metric(name):
+                    on_skip(name, count_protobuf_samples(message, typ))
+                else:
+                    yield build_protobuf_metric(message, name, typ)
+
+        del buf[:position]
+
+    if buf:
+        raise ValueError(f'Incomplete protobuf payload, {len(buf)} trailing bytes')
+
+
+def build_protobuf_metric(message, name, typ):
+    samples = []
+    if typ == 'counter':
+        sample_name = f'{name}_total'
+        for metric in message.metric:
+            samples.append(
+                Sample(sample_name, get_protobuf_labels(metric), metric.counter.value, get_protobuf_timestamp(metric))
+            )
+    elif typ == 'gauge':
+        for metric in message.metric:
+            samples.append(
+                Sample(name, get_protobuf_labels(metric), metric.gauge.value, get_protobuf_timestamp(metric))
+            )
+    elif typ == 'summary':
+        sum_name = f'{name}_sum'
+        count_name = f'{name}_count'
+        for metric in message.metric:
+            labels = get_protobuf_labels(metric)
+            timestamp = get_protobuf_timestamp(metric)
+            summary = metric.summary
+            for quantile in summary.quantile:
+                samples.append(
+                    Sample(name, dict(labels, quantile=floatToGoString(quantile.quantile)), quantile.value, timestamp)
+                )
+
+            samples.append(Sample(sum_name, labels, summary.sample_sum, timestamp))
+            samples.append(Sample(count_name, dict(labels), float(summary.sample_count), timestamp))
+    elif typ == 'histogram':
+        bucket_name = f'{name}_bucket'
+        sum_name = f'{name}_sum'
+        count_name = f'{name}_count'
+        for metric in message.metric:
+            labels = get_protobuf_labels(metric)
+            timestamp = get_protobuf_timestamp(metric)
+            histogram = metric.histogram
+            upper_bound = None
+            for bucket in histogram.bucket:
+                upper_bound = bucket.upper_bound
+                samples.append(
+                    Sample(
+                        bucket_name,
+                        dict(labels, le=floatToGoString(upper_bound)),
+                        float(bucket.cumulative_count),
+                        timestamp,
+                    )
+                )
+
+            # Like the text format, always expose the implicit `+Inf` bucket
+            if upper_bound != INFINITY:
+                samples.append(Sample(bucket_name, dict(labels, le='+Inf'), float(histogram.sample_count), timestamp))
+
+            samples.append(Sample(sum_name, labels, histogram.sample_sum, timestamp))
+            samples.append(Sample(count_name, dict(labels), float(histogram.sample_count), timestamp))
+    else:
+        for metric in message.metric:
+            samples.append(
+                Sample(name, get_protobuf_labels(metric), metric.untyped.value, get_protobuf_timestamp(metric))
+            )
+
+    metric = Metric(name, message.help, typ)
+    metric.samples = samples
+    return metric
+
+
+def count_protobuf_samples(message, typ):
+    if typ == 'summary':
+        return sum(len(metric.summary.quantile) + 2 for metric in message.metric)
+    elif typ == 'histogram':
+        return sum(
+            len(metric.histogram.bucket)
+            + (not metric.histogram.bucket or metric.histogram.bucket[-1].upper_bound != INFINITY)
+            + 2
+            for metric in message.metric
+        )
+    else:
+        return len(message.metric)
+
+
+def get_protobuf_labels(metric):
+    return {label.name: label.value for label in metric.label}
+
+
+def get_protobuf_timestamp(metric):
+    return metric.timestamp_ms / 1000 if metric.HasField('timestamp_ms') else None
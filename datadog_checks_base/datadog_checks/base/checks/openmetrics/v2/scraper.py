@@ -4,6 +4,7 @@
 import fnmatch
 import inspect
 import re
+import time
 from copy import copy, deepcopy
 from itertools import chain
 from math import isinf, isnan
@@ -19,9 +20,14 @@ from ....errors import ConfigurationError
 from ....utils.functions import no_op, return_true
 from ....utils.http import RequestsWrapper
 from .first_scrape_handler import first_scrape_handler
-from .labels import LabelAggregator, get_label_normalizer
+from .labels import LabelAggregator, LabelCache, get_label_normalizer
+from .parser import PROTOBUF_ACCEPT_HEADER, PROTOBUF_MEDIA_TYPE, protobuf_to_metric_families
+from .parser import text_fd_to_metric_families as parse_native
 from .transform import MetricTransformer
 
+# Protobuf payloads are read in chunks of this many bytes, `requests` would otherwise read them one byte at a time
+PROTOBUF_CHUNK_SIZE = 65536
+
 try:
     import datadog_agent
 except ImportError:
@@ -179,6 +185,15 @@ class OpenMetricsScraper:
                         f'Label `{label}` of setting `exclude_metrics_by_labels` must be an array or set to `true`'
                     )
 
+        # The processed form of every label name, or `None` if the label should not become a tag
+        self.label_tag_names = {}
+
+        label_cache_size = config.get('label_cache_size', 0)
+        if not isinstance(label_cache_size, int) or isinstance(label_cache_size, bool) or label_cache_size < 0:
+            raise ConfigurationError('Setting `label_cache_size` must be a non-negative integer')
+
+        self.label_cache = LabelCache(label_cache_size) if label_cache_size else None
+
         custom_tags = config.get('tags', [])  # type: List[str]
         if not isinstance(custom_tags, list):
             raise ConfigurationError('Setting `tags` must be an array')
@@ -221,8 +236,16 @@ class OpenMetricsScraper:
 
         self._content_type = ''
         self._use_latest_spec = is_affirmative(config.get('use_latest_spec', False))
+        self._use_protobuf = is_affirmative(config.get('use_protobuf', False))
         if self._use_latest_spec:
             accept_header = 'application/openmetrics-text;version=1.0.0,application/openmetrics-text;version=0.0.1'
+        elif self._use_protobuf:
+            accept_header = PROTOBUF_ACCEPT_HEADER
+            if self.raw_line_filter is not None:
+                self.log.warning(
+                    'Setting `raw_line_filters` has no effect when the endpoint serves the protobuf format, '
+                    'use `exclude_metrics` instead'
+                )
         else:
             accept_header = 'text/plain'
 
@@ -232,9 +255,21 @@ class OpenMetricsScraper:
 
         self.use_process_start_time = is_affirmative(config.get('use_process_start_time'))
 
+        # The native parser applies metric exclusion before parsing any sample, so we must never
+        # skip the metrics that are required in their entirety by other features
+        self.use_native_parser = is_affirmative(config.get('use_native_parser', False))
+        self.native_parser_exclusion_exemptions = set()
+        if self.label_aggregator.configured:
+            self.native_parser_exclusion_exemptions.update(self.label_aggregator.metric_config)
+        if self.use_process_start_time:
+            self.native_parser_exclusion_exemptions.add('process_start_time_seconds')
+
         # Used for monotonic counts
         self.flush_first_value = False
 
+        # The response, or error, and duration of a request sent ahead of time by `prefetch`
+        self._prefetched = None
+
     def scrape(self):
         """
         Execute a scrape, and for each metric collected, transform the metric.
@@ -250,6 +285,10 @@ class OpenMetricsScraper:
 
         self.flush_first_value = True
 
+        if self.label_cache is not None:
+            self.submit_telemetry_label_cache()
+            self.label_cache.reset_stats()
+
     def consume_metrics(self, runtime_data):
         """
         Yield the processed metrics and filter out excluded metrics.
@@ -276,8 +315,6 @@ class OpenMetricsScraper:
         """
 
         line_streamer = self.stream_connection_lines()
-        if self.raw_line_filter is not None:
-            line_streamer = self.filter_connection_lines(line_streamer)
 
         # Since we determine `self.parse_metric_families` dynamically from the response and that's done as a
         # side effect inside the `line_streamer` generator, we need to consume the first line in order to
@@ -288,6 +325,10 @@ class OpenMetricsScraper:
             # If line_streamer is an empty iterator, next(line_streamer) fails.
             return
 
+        # Protobuf payloads are streamed as raw bytes rather than lines
+        if self.raw_line_filter is not None and not self.is_protobuf_payload:
+            line_streamer = self.filter_connection_lines(line_streamer)
+
         for metric in self.parse_metric_families(line_streamer):
             self.submit_telemetry_number_of_total_metric_samples(metric)
 
@@ -305,10 +346,54 @@ class OpenMetricsScraper:
         # the format will be chosen based on the media type specified in the response's content-header.
         # The selection is based on what Prometheus does:
         # https://github.com/prometheus/prometheus/blob/v2.43.0/model/textparse/interface.go#L83-L90
-        return (
-            parse_openmetrics
-            if self._use_latest_spec or media_type == 'application/openmetrics-text'
-            else parse_prometheus
+        if self._use_latest_spec or media_type == 'application/openmetrics-text':
+            return parse_openmetrics
+        elif media_type == PROTOBUF_MEDIA_TYPE:
+            return self.parse_protobuf_metric_families
+        elif self.use_native_parser:
+            return self.parse_native_metric_families
+        else:
+            return parse_prometheus
+
+    def parse_native_metric_families(self, line_streamer):
+        """
+        Parse the Prometheus text format natively, skipping excluded metrics before any of their samples are parsed.
+        """
+
+        return parse_native(
+            line_streamer,
+            skip_metric=self.is_excluded_metric_family,
+            on_skip=self.submit_telemetry_number_of_skipped_metric_samples,
+        )
+
+    def parse_protobuf_metric_families(self, chunk_streamer):
+        """
+        Parse the Prometheus protobuf format, skipping excluded metrics before any of their samples are built.
+        """
+
+        return protobuf_to_metric_families(
+            chunk_streamer,
+            skip_metric=self.is_excluded_metric_family,
+            on_skip=self.submit_telemetry_number_of_skipped_metric_samples,
+        )
+
+    @property
+    def is_protobuf_payload(self):
+        return not self._use_latest_spec and self._content_type.split(';')[0] == PROTOBUF_MEDIA_TYPE
+
+    def is_excluded_metric_family(self, metric_name):
+        """
+        Whether or not a raw metric family name is excluded by the `exclude_metrics` setting.
+        """
+
+        if self.raw_metric_prefix and metric_name.startswith(self.raw_metric_prefix):
+            metric_name = metric_name[len(self.raw_metric_prefix) :]
+
+        if metric_name in self.native_parser_exclusion_exemptions:
+            return False
+
+        return metric_name in self.exclude_metrics or (
+            self.exclude_metrics_pattern is not None and self.exclude_metrics_pattern.search(metric_name) is not None
         )
 
     def generate_sample_data(self, metric):
@@ -317,6 +402,7 @@ class OpenMetricsScraper:
         """
 
         label_normalizer = get_label_normalizer(metric.type)
+        label_cache = self.label_cache
 
         for sample in metric.samples:
             value = sample.value
@@ -324,50 +410,84 @@ class OpenMetricsScraper:
                 self.log.debug('Ignoring sample for metric `%s` as it has an invalid value: %s', metric.name, value)
                 continue
 
-            tags = []
-            skip_sample = False
             labels = sample.labels
             self.label_aggregator.populate(labels)
             label_normalizer(labels)
 
-            for label_name, label_value in labels.items():
-                sample_excluder = self.exclude_metrics_by_labels.get(label_name)
-                if sample_excluder is not None and sample_excluder(label_value):
-                    skip_sample = True
-                    break
-                elif label_name in self.exclude_labels:
-                    continue
-                elif self.include_labels and label_name not in self.include_labels:
-                    continue
+            if label_cache is None:
+                label_tags, hostname = self.process_labels(labels)
+            else:
+                key = tuple(labels.items())
+                entry = label_cache.get(key)
+                if entry is None:
+                    entry = self.process_labels(labels)
+                    label_cache.set(key, entry)
 
-                label_name = self.rename_labels.get(label_name, label_name)
-                tags.append(f'{label_name}:{label_value}')
+                label_tags, hostname = entry
 
-            if skip_sample:
+            if label_tags is None:
                 continue
 
-            tags.extend(self.tags)
-
-            hostname = ""
-            if self.hostname_label and self.hostname_label in labels:
-                hostname = labels[self.hostname_label]
-                if self.hostname_formatter is not None:
-                    hostname = self.hostname_formatter(hostname)
+            tags = [*label_tags, *self.tags]
 
             self.submit_telemetry_number_of_processed_metric_samples()
             yield sample, tags, hostname
 
+    def process_labels(self, labels):
+        """
+        Return the tags and hostname derived from a sample's labels, with tags set to `None` if the sample is excluded.
+        """
+
+        tags = []
+        label_tag_names = self.label_tag_names
+        for label_name, label_value in labels.items():
+            sample_excluder = self.exclude_metrics_by_labels.get(label_name)
+            if sample_excluder is not None and sample_excluder(label_value):
+                return None, ''
+
+            try:
+                tag_name = label_tag_names[label_name]
+            except KeyError:
+                tag_name = label_tag_names[label_name] = self.get_tag_name(label_name)
+
+            if tag_name is not None:
+                tags.append(f'{tag_name}:{label_value}')
+
+        hostname = ''
+        if self.hostname_label and self.hostname_label in labels:
+            hostname = labels[self.hostname_label]
+            if self.hostname_formatter is not None:
+                hostname = self.hostname_formatter(hostname)
+
+        return tuple(tags), hostname
+
+    def get_tag_name(self, label_name):
+        """
+        Return the tag name of a label after renaming, or `None` if the label is excluded.
+        """
+
+        if label_name in self.exclude_labels:
+            return None
+        elif self.include_labels and label_name not in self.include_labels:
+            return None
+
+        return self.rename_labels.get(label_name, label_name)
+
     def stream_connection_lines(self):
         """
-        Yield the connection line.
+        Yield the connection line, or raw chunks of bytes for the protobuf format.
         """
 
         try:
             with self.get_connection() as connection:
                 # Media type will be used to select parser dynamically
                 self._content_type = connection.headers.get('Content-Type', '')
-                for line in connection.iter_lines(decode_unicode=True):
-                    yield line
+                if self.is_protobuf_payload:
+                    for chunk in connection.iter_content(chunk_size=PROTOBUF_CHUNK_SIZE):
+                        yield chunk
+                else:
+                    for line in connection.iter_lines(decode_unicode=True):
+                        yield line
         except ConnectionError as e:
             if self.ignore_connection_errors:
                 self.log.warning("OpenMetrics endpoint %s is not accessible", self.endpoint)
@@ -391,7 +511,7 @@ class OpenMetricsScraper:
         """
 
         try:
-            response = self.send_request()
+            response = self.get_response()
         except Exception as e:
             self.submit_health_check(ServiceCheck.CRITICAL, message=str(e))
             raise
@@ -413,6 +533,56 @@ class OpenMetricsScraper:
 
                 return response
 
+    def get_response(self):
+        """
+        Return the prefetched response if there is one, otherwise send the request.
+        """
+
+        if self._prefetched is None:
+            start = time.monotonic()
+            try:
+                return self.send_request()
+            finally:
+                self.submit_telemetry_fetch_duration(time.monotonic() - start)
+
+        response, error, duration = self._prefetched
+        self._prefetched = None
+        self.submit_telemetry_fetch_duration(duration)
+
+        if error is not None:
+            raise error
+
+        return response
+
+    def prefetch(self):
+        """
+        Send the request and download the entire payload so that the next scrape does no network I/O.
+
+        This is safe to call from another thread as nothing is submitted, errors are only raised by the next scrape.
+        """
+
+        start = time.monotonic()
+        try:
+            response = self.send_request()
+
+            # Read the payload here rather than while parsing
+            response.content
+        except Exception as e:
+            self._prefetched = (None, e, time.monotonic() - start)
+        else:
+            self._prefetched = (response, None, time.monotonic() - start)
+
+    def discard_prefetched_response(self):
+        """
+        Release the prefetched response, if any, that was not consumed by a scrape.
+        """
+
+        if self._prefetched is not None:
+            response = self._prefetched[0]
+            self._prefetched = None
+            if response is not None:
+                response.close()
+
     def send_request(self, **kwargs):
         """
         Send an HTTP GET request to the `openmetrics_endpoint` value.
@@ -442,12 +612,24 @@ class OpenMetricsScraper:
     def submit_telemetry_number_of_ignored_metric_samples(self, metric):
         self.count('telemetry.metrics.ignored.count', len(metric.samples), tags=self.tags)
 
+    def submit_telemetry_number_of_skipped_metric_samples(self, metric_name, num_samples):
+        self.count('telemetry.metrics.input.count', num_samples, tags=self.tags)
+        self.count('telemetry.metrics.ignored.count', num_samples, tags=self.tags)
+
     def submit_telemetry_number_of_processed_metric_samples(self):
         self.count('telemetry.metrics.processed.count', 1, tags=self.tags)
 
     def submit_telemetry_number_of_ignored_lines(self):
         self.count('telemetry.metrics.blacklist.count', 1, tags=self.tags)
 
+    def submit_telemetry_label_cache(self):
+        self.count('telemetry.label_cache.hits', self.label_cache.hits, tags=self.tags)
+        self.count('telemetry.label_cache.misses', self.label_cache.misses, tags=self.tags)
+        self.gauge('telemetry.label_cache.size', len(self.label_cache), tags=self.tags)
+
+    def submit_telemetry_fetch_duration(self, duration):
+        self.gauge('telemetry.fetch.duration', duration, tags=self.tags)
+
     def submit_telemetry_endpoint_response_size(self, response):
         content_length = response.headers.get('Content-Length')
         if content_length is not None:
@@ -8,11 +8,12 @@ def get_gauge(check, metric_name, modifiers, global_options):
     https://prometheus.io/docs/concepts/metric_types/#gauge
     https://github.com/OpenObservability/OpenMetrics/blob/master/specification/OpenMetrics.md#gauge-1
     """
-    gauge_method = check.gauge
+    submit_metric_batch_method = check.submit_metric_batch
 
     def gauge(metric, sample_data, runtime_data):
-        for sample, tags, hostname in sample_data:
-            gauge_method(metric_name, sample.value, tags=tags, hostname=hostname)
+        submit_metric_batch_method(
+            'gauge', ((metric_name, sample.value, tags, hostname) for sample, tags, hostname in sample_data)
+        )
 
     del check
     del modifiers
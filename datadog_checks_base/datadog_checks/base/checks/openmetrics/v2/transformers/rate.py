@@ -7,11 +7,12 @@ def get_rate(check, metric_name, modifiers, global_options):
     """
     Send with the `AgentCheck.rate` method.
     """
-    rate_method = check.rate
+    submit_metric_batch_method = check.submit_metric_batch
 
     def rate(metric, sample_data, runtime_data):
-        for sample, tags, hostname in sample_data:
-            rate_method(metric_name, sample.value, tags=tags, hostname=hostname)
+        submit_metric_batch_method(
+            'rate', ((metric_name, sample.value, tags, hostname) for sample, tags, hostname in sample_data)
+        )
 
     del check
     del modifiers
@@ -37,13 +37,16 @@ def get_temporal_percent(check, metric_name, modifiers, global_options):
             'the `scale` parameter must be an integer representing parts of a second e.g. 1000 for millisecond'
         )
 
-    rate_method = check.rate
+    submit_metric_batch_method = check.submit_metric_batch
 
     def temporal_percent(metric, sample_data, runtime_data):
-        for sample, tags, hostname in sample_data:
-            rate_method(
-                metric_name, total_time_to_temporal_percent(sample.value, scale=scale), tags=tags, hostname=hostname
-            )
+        submit_metric_batch_method(
+            'rate',
+            (
+                (metric_name, total_time_to_temporal_percent(sample.value, scale=scale), tags, hostname)
+                for sample, tags, hostname in sample_data
+            ),
+        )
 
     del check
     del modifiers
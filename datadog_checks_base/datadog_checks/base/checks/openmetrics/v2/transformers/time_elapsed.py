@@ -8,11 +8,13 @@ def get_time_elapsed(check, metric_name, modifiers, global_options):
     """
     This sends the number of seconds elapsed from a time in the past as a `gauge`.
     """
-    gauge_method = check.gauge
+    submit_metric_batch_method = check.submit_metric_batch
 
     def time_elapsed(metric, sample_data, runtime_data):
-        for sample, tags, hostname in sample_data:
-            gauge_method(metric_name, get_timestamp() - sample.value, tags=tags, hostname=hostname)
+        submit_metric_batch_method(
+            'gauge',
+            ((metric_name, get_timestamp() - sample.value, tags, hostname) for sample, tags, hostname in sample_data),
+        )
 
     del check
     del modifiers
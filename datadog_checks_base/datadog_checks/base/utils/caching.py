@@ -0,0 +1,56 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+
+
+class BoundedCache(object):
+    """
+    A memoization mapping that holds at most `max_size` entries and keeps track of its hit ratio.
+
+    The working sets this is meant for are small and stable so, rather than tracking usage, all entries
+    are dropped at once when the cache is full. This keeps every operation atomic, making it safe to
+    share between threads without locking.
+    """
+
+    def __init__(self, max_size):
+        # type: (int) -> None
+        self.max_size = max_size
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Return the value stored for `key`, or `None` if there is none.
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return value
+
+    def set(self, key, value):
+        if len(self.entries) >= self.max_size:
+            self.entries.clear()
+
+        self.entries[key] = value
+
+    def clear(self):
+        self.entries.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get_debug_metrics(self, prefix):
+        # type: (str) -> tuple
+        return (
+            ('{}.hits'.format(prefix), self.hits),
+            ('{}.misses'.format(prefix), self.misses),
+            ('{}.size'.format(prefix), len(self.entries)),
+        )
+
+    def __len__(self):
+        return len(self.entries)
@@ -2,8 +2,14 @@
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
 import logging
-from itertools import chain
-from typing import Any, Callable, Dict, List, Tuple  # noqa: F401
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain, islice
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Sequence, Tuple  # noqa: F401
+
+from six.moves import queue
 
 from datadog_checks.base import AgentCheck  # noqa: F401
 from datadog_checks.base.utils.db.types import QueriesExecutor, QueriesSubmitter, Transformer  # noqa: F401
@@ -15,6 +21,30 @@ from .transform import COLUMN_TRANSFORMERS, EXTRA_TRANSFORMERS
 from .utils import SUBMISSION_METHODS, create_submission_transformer, tracked_query
 
 
+class _RecordingSubmitter(object):
+    """
+    Stands in for a submitter on a worker thread, recording submissions for the calling thread to `replay`.
+    """
+
+    def __init__(self, submitter):
+        self._submitter = submitter
+        self._submissions = []  # type: List[Tuple[str, Tuple, Dict[str, Any]]]
+
+    def __getattr__(self, name):
+        if name in SUBMISSION_METHODS:
+            return partial(self._record, name)
+
+        return getattr(self._submitter, name)
+
+    def _record(self, method, *args, **kwargs):
+        self._submissions.append((method, args, kwargs))
+
+    def replay(self):
+        # type: () -> None
+        for method, args, kwargs in self._submissions:
+            getattr(self._submitter, method)(*args, **kwargs)
+
+
 class QueryExecutor(object):
     """
     QueryExecutor is a lower-level implementation of QueryManager which supports multiple instances
@@ -22,6 +52,8 @@ class QueryExecutor(object):
     telemetry via the `submitter` parameter.
     """
 
+    DEFAULT_MAX_WORKERS = 4
+
     def __init__(
         self,
         executor,  # type: QueriesExecutor
@@ -32,6 +64,9 @@ class QueryExecutor(object):
         hostname=None,  # type: str
         logger=None,
         track_operation_time=False,  # type: bool
+        batch_size=None,  # type: int
+        executor_factory=None,  # type: Callable[[], ContextManager[QueriesExecutor]]
+        max_workers=None,  # type: int
     ):  # type: (...) -> QueryExecutor
         self.executor = executor  # type: QueriesExecutor
         self.submitter = submitter  # type: QueriesSubmitter
@@ -48,6 +83,28 @@ class QueryExecutor(object):
         self.logger = logger or logging.getLogger(__name__)
         self.track_operation_time = track_operation_time
 
+        if batch_size is not None and (not isinstance(batch_size, int) or batch_size < 1):
+            raise ValueError('QueryExecutor batch_size must be a positive integer')
+
+        # When set, rows are fetched and processed this many at a time and plain metric columns are submitted in bulk
+        self.batch_size = batch_size  # type: int
+
+        if max_workers is not None and (not isinstance(max_workers, int) or max_workers < 1):
+            raise ValueError('QueryExecutor max_workers must be a positive integer')
+
+        # When set, queries run concurrently on at most `max_workers` threads, each using its own executor
+        # entered from the returned context manager, while results are still processed in query order.
+        # Every result set is then read in full before being processed, up to `max_workers` of them at once
+        self.executor_factory = executor_factory
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS  # type: int
+
+        # The threads and connections are created as needed and kept for the next runs until `close` is called
+        self._pool = None  # type: ThreadPoolExecutor
+        # Executors not currently running a query, every worker thread holds at most one at a time
+        self._idle_executors = queue.Queue()  # type: queue.Queue
+        self._connections = set()  # type: set
+        self._connections_lock = threading.Lock()
+
     def compile_queries(self):
         """This method compiles every `Query` object."""
         column_transformers = COLUMN_TRANSFORMERS.copy()  # type: Dict[str, Transformer]
@@ -55,7 +112,7 @@ class QueryExecutor(object):
         for submission_method, transformer_name in SUBMISSION_METHODS.items():
             method = getattr(self.submitter, submission_method)
             # Save each method in the initializer -> callable format
-            column_transformers[transformer_name] = create_submission_transformer(method)
+            column_transformers[transformer_name] = create_submission_transformer(method, batch_type=submission_method)
 
         for query in self.queries:
             query.compile(column_transformers, EXTRA_TRANSFORMERS.copy())
@@ -67,64 +124,267 @@ class QueryExecutor(object):
         if extra_tags:
             global_tags.extend(list(extra_tags))
 
+        if self.executor_factory is not None:
+            self._execute_concurrently(global_tags)
+            return
+
+        execute_query = self.execute_query_batches if self.batch_size else self.execute_query
+
         for query in self.queries:
-            query_name = query.name
-            query_columns = query.column_transformers
-            extra_transformers = query.extra_transformers
-            query_tags = query.base_tags
+            try:
+                rows = self._run_query(query, execute_query)
+            except Exception as e:
+                self._log_query_error(query.name, e)
+                continue
 
+            if self.batch_size:
+                self._process_row_batches(query, rows, global_tags)
+            else:
+                self._process_rows(query, rows, global_tags)
+
+    def close(self):
+        # type: () -> None
+        """
+        Stop the worker threads and close the connections opened by `executor_factory`.
+
+        Checks running queries concurrently should call this when cancelled. A later `execute` opens new ones.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+        with self._connections_lock:
+            connections = self._connections
+            self._connections = set()
+            # Executors still running a query are returned to the previous queue and dropped with it
+            self._idle_executors = queue.Queue()
+
+        for connection in connections:
+            self._close_connection(connection)
+
+    def _execute_concurrently(self, global_tags):
+        # type: (List[str]) -> None
+        if not self.queries:
+            return
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        pool = self._pool
+        idle_executors = self._idle_executors
+
+        def fetch_rows(query):
+            # type: (Query) -> Tuple[List[Sequence], _RecordingSubmitter]
+            try:
+                connection, executor = idle_executors.get_nowait()
+            except queue.Empty:
+                connection = self.executor_factory()
+                executor = connection.__enter__()
+                with self._connections_lock:
+                    self._connections.add(connection)
+
+            # Submissions made here are replayed by the calling thread, in query order
+            submitter = _RecordingSubmitter(self.submitter)
             try:
+                # Results are fully read on the thread that owns the connection
                 if self.track_operation_time:
-                    with tracked_query(check=self.submitter, operation=query_name):
-                        rows = self.execute_query(query.query)
+                    with tracked_query(check=submitter, operation=query.name):
+                        rows = self._fetch_all(executor, query.query)
                 else:
-                    rows = self.execute_query(query.query)
+                    rows = self._fetch_all(executor, query.query)
+            except Exception:
+                # The connection may be unusable, the next query opens a new one
+                with self._connections_lock:
+                    self._connections.discard(connection)
+                self._close_connection(connection)
+                raise
+
+            idle_executors.put((connection, executor))
+            return rows, submitter
+
+        # Only queue as many queries as there are workers, so that at most `max_workers` result sets
+        # are buffered while waiting for the results of the previous queries to be processed
+        queries = iter(self.queries)
+        futures = deque((query, pool.submit(fetch_rows, query)) for query in islice(queries, self.max_workers))
+
+        # Results are processed in query order, so submissions are the same as when running serially
+        while futures:
+            query, future = futures.popleft()
+            try:
+                rows, submitter = future.result()
             except Exception as e:
-                if self.error_handler:
-                    self.logger.error('Error querying %s: %s', query_name, self.error_handler(str(e)))
-                else:
-                    self.logger.error('Error querying %s: %s', query_name, e)
+                self._log_query_error(query.name, e)
+                continue
+            finally:
+                for next_query in islice(queries, 1):
+                    futures.append((next_query, pool.submit(fetch_rows, next_query)))
+
+            submitter.replay()
+
+            if self.batch_size:
+                self._process_row_batches(query, self._iter_batches(rows, self.batch_size), global_tags)
+            else:
+                self._process_rows(query, rows, global_tags)
+
+    def _close_connection(self, connection):
+        # type: (ContextManager[QueriesExecutor]) -> None
+        try:
+            connection.__exit__(None, None, None)
+        except Exception as e:
+            self.logger.warning('Error closing query executor: %s', e)
+
+    def _run_query(self, query, execute_query):
+        # type: (Query, Callable[[str], Any]) -> Any
+        if self.track_operation_time:
+            with tracked_query(check=self.submitter, operation=query.name):
+                return execute_query(query.query)
+
+        return execute_query(query.query)
+
+    @staticmethod
+    def _fetch_all(executor, query):
+        # type: (QueriesExecutor, str) -> List[Sequence]
+        rows = executor(query)
+        if rows is None:
+            return []
 
+        return list(rows)
+
+    def _log_query_error(self, query_name, error):
+        # type: (str, Exception) -> None
+        if self.error_handler:
+            self.logger.error('Error querying %s: %s', query_name, self.error_handler(str(error)))
+        else:
+            self.logger.error('Error querying %s: %s', query_name, error)
+
+    def _process_rows(self, query, rows, global_tags):
+        # type: (Query, Iterator[Sequence], List[str]) -> None
+        query_columns = query.column_transformers
+        extra_transformers = query.extra_transformers
+        query_tags = query.base_tags
+
+        for row in rows:
+            if not self._is_row_valid(query, row):
                 continue
 
-            for row in rows:
-                if not self._is_row_valid(query, row):
+            # It holds the query results
+            sources = {}  # type: Dict[str, str]
+            # It holds the transformers defined in query_columns along with the column value
+            submission_queue = []  # type: List[Tuple[Transformer, Any]]
+            tags = global_tags + query_tags
+
+            for (column_name, type_transformer), column_value in zip(query_columns, row):
+                # Columns can be ignored via configuration
+                if not column_name:
                     continue
 
-                # It holds the query results
-                sources = {}  # type: Dict[str, str]
-                # It holds the transformers defined in query_columns along with the column value
-                submission_queue = []  # type: List[Tuple[Transformer, Any]]
-                tags = global_tags + query_tags
+                sources[column_name] = column_value
+                column_type, transformer = type_transformer
 
-                for (column_name, type_transformer), column_value in zip(query_columns, row):
-                    # Columns can be ignored via configuration
-                    if not column_name:
-                        continue
+                # The transformer can be None for `source` types. Those such columns do not submit
+                # anything but are collected into the row values for other columns to reference.
+                if transformer is None:
+                    continue
+                elif column_type == 'tag':
+                    tags.append(transformer(None, column_value))  # get_tag transformer
+                elif column_type == 'tag_not_null':
+                    if column_value is not None:
+                        tags.append(transformer(None, column_value))  # get_tag transformer
+                elif column_type == 'tag_list':
+                    tags.extend(transformer(None, column_value))  # get_tag_list transformer
+                else:
+                    submission_queue.append((transformer, column_value))
 
-                    sources[column_name] = column_value
-                    column_type, transformer = type_transformer
+            for transformer, value in submission_queue:
+                transformer(sources, value, tags=tags, hostname=self.hostname)
 
-                    # The transformer can be None for `source` types. Those such columns do not submit
-                    # anything but are collected into the row values for other columns to reference.
-                    if transformer is None:
-                        continue
-                    elif column_type == 'tag':
-                        tags.append(transformer(None, column_value))  # get_tag transformer
-                    elif column_type == 'tag_not_null':
-                        if column_value is not None:
+            for name, transformer in extra_transformers:
+                try:
+                    result = transformer(sources, tags=tags, hostname=self.hostname)
+                except Exception as e:
+                    self.logger.error('Error transforming %s: %s', name, e)
+                    continue
+                else:
+                    if result is not None:
+                        sources[name] = result
+
+    def _process_row_batches(self, query, row_batches, global_tags):
+        # type: (Query, Iterator[Sequence], List[str]) -> None
+        hostname = self.hostname
+        extra_transformers = query.extra_transformers
+        submit_metric_batch = getattr(self.submitter, 'submit_metric_batch', None)
+
+        # Every row starts with the same tags
+        base_tags = global_tags + query.base_tags
+
+        # Sort the columns by what needs to be done with their values once, rather than for every row
+        source_columns = []  # type: List[Tuple[int, str]]
+        tag_columns = []  # type: List[Tuple[int, str, Transformer]]
+        batch_columns = []  # type: List[Tuple[int, Tuple[str, bool, bool], str]]
+        transformer_columns = []  # type: List[Tuple[int, Transformer]]
+        for index, (column_name, type_transformer) in enumerate(query.column_transformers):
+            # Columns can be ignored via configuration
+            if not column_name:
+                continue
+
+            source_columns.append((index, column_name))
+            column_type, transformer = type_transformer
+
+            # The transformer can be None for `source` types. Those such columns do not submit
+            # anything but are collected into the row values for other columns to reference.
+            if transformer is None:
+                continue
+            elif column_type is not None:
+                tag_columns.append((index, column_type, transformer))
+            elif submit_metric_batch is not None and hasattr(transformer, 'batch_submission'):
+                batch_key, metric_name = transformer.batch_submission
+                batch_columns.append((index, batch_key, metric_name))
+            else:
+                transformer_columns.append((index, transformer))
+
+        # Values of other columns are only needed when something might reference them
+        collect_sources = bool(transformer_columns or extra_transformers)
+
+        num_columns = len(query.column_transformers)
+        for rows in row_batches:
+            # Records to submit in bulk per submission method
+            batches = {}  # type: Dict[Tuple[str, bool, bool], List[Tuple[str, Any, List[str], str]]]
+            for batch_key in {batch_key for _, batch_key, _ in batch_columns}:
+                batches[batch_key] = []
+
+            for row in rows:
+                if not row or len(row) != num_columns:
+                    self._is_row_valid(query, row)
+                    continue
+
+                if tag_columns:
+                    tags = list(base_tags)
+                    for index, column_type, transformer in tag_columns:
+                        column_value = row[index]
+                        if column_type == 'tag':
                             tags.append(transformer(None, column_value))  # get_tag transformer
-                    elif column_type == 'tag_list':
-                        tags.extend(transformer(None, column_value))  # get_tag_list transformer
-                    else:
-                        submission_queue.append((transformer, column_value))
+                        elif column_type == 'tag_not_null':
+                            if column_value is not None:
+                                tags.append(transformer(None, column_value))  # get_tag transformer
+                        else:
+                            tags.extend(transformer(None, column_value))  # get_tag_list transformer
+                else:
+                    # Submissions never modify tags so rows without tag columns can share them
+                    tags = base_tags
 
-                for transformer, value in submission_queue:
-                    transformer(sources, value, tags=tags, hostname=self.hostname)
+                for index, batch_key, metric_name in batch_columns:
+                    batches[batch_key].append((metric_name, row[index], tags, hostname))
+
+                if not collect_sources:
+                    continue
+
+                sources = {column_name: row[index] for index, column_name in source_columns}
+                for index, transformer in transformer_columns:
+                    transformer(sources, row[index], tags=tags, hostname=hostname)
 
                 for name, transformer in extra_transformers:
                     try:
-                        result = transformer(sources, tags=tags, hostname=self.hostname)
+                        result = transformer(sources, tags=tags, hostname=hostname)
                     except Exception as e:
                         self.logger.error('Error transforming %s: %s', name, e)
                         continue
@@ -132,6 +392,27 @@ class QueryExecutor(object):
                         if result is not None:
                             sources[name] = result
 
+            for (method, raw, flush_first_value), records in batches.items():
+                submit_metric_batch(method, records, raw=raw, flush_first_value=flush_first_value)
+
+    @staticmethod
+    def _iter_batches(result, batch_size):
+        if hasattr(result, 'fetchmany'):
+            while True:
+                batch = result.fetchmany(batch_size)
+                if not batch:
+                    return
+
+                yield batch
+        else:
+            rows = iter(result)
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    return
+
+                yield batch
+
     def _is_row_valid(self, query, row):
         # type: (Query, List) -> bool
         if not row:
@@ -169,6 +450,25 @@ class QueryExecutor(object):
 
         return chain((first_row,), rows)
 
+    def execute_query_batches(self, query):
+        """
+        Like `execute_query` but this returns an iterator over lists of at most `batch_size` rows. Result sets that
+        support it, like DB-API cursors, are consumed with `fetchmany`.
+        """
+        result = self.executor(query)
+        if result is None:
+            return iter([])
+
+        batches = self._iter_batches(result, self.batch_size)
+
+        # Ensure we trigger query execution
+        try:
+            first_batch = next(batches)
+        except StopIteration:
+            return iter([])
+
+        return chain((first_batch,), batches)
+
 
 class QueryManager(QueryExecutor):
     """
@@ -193,7 +493,13 @@ class QueryManager(QueryExecutor):
     self.check_initializations.append(self._query_manager.compile_queries)
     ```
 
-    Note: This class is not in charge of opening or closing connections, just running queries.
+    Note: This class is not in charge of opening or closing connections, just running queries. The exception is
+    the connections opened from `executor_factory`, which are kept across runs and closed by `close`:
+
+    ```python
+    def cancel(self):
+        self._query_manager.close()
+    ```
     """
 
     def __init__(
@@ -204,6 +510,10 @@ class QueryManager(QueryExecutor):
         tags=None,  # type: List[str]
         error_handler=None,  # type: Callable[[str], str]
         hostname=None,  # type: str
+        batch_size=None,  # type: int
+        executor_factory=None,  # type: Callable[[], ContextManager[QueriesExecutor]]
+        max_workers=None,  # type: int
+        track_operation_time=False,  # type: bool
     ):  # type: (...) -> QueryManager
         """
         - **check** (_AgentCheck_) - an instance of a Check
@@ -213,6 +523,17 @@ class QueryManager(QueryExecutor):
         - **tags** (_List[str]_) - a list of tags to associate with every submission
         - **error_handler** (_callable_) - a callable accepting a `str` error as its sole argument and returning
           a sanitized string, useful for scrubbing potentially sensitive information libraries emit
+        - **batch_size** (_int_) - if set, the number of rows to fetch and process at once, with plain metric
+          columns being submitted in bulk, see `AgentCheck.submit_metric_batch`
+        - **executor_factory** (_callable_) - if set, queries run concurrently. It is called without arguments
+          and must return a context manager, entering it yields an executor with its own connection and exiting
+          it closes that connection. Connections are reused by the following runs and only closed when a query
+          fails on them or by `close`. Results are still submitted in query order. As connections are handed to
+          the next query, each result set is read in full before being processed, so up to `max_workers` of
+          them are held in memory at once
+        - **max_workers** (_int_) - the maximum number of queries running at once, and therefore connections
+          open at once, when using `executor_factory`. Defaults to 4
+        - **track_operation_time** (_bool_) - whether to submit the duration of every query, tagged by its name
         """
         super(QueryManager, self).__init__(
             executor=executor,
@@ -222,6 +543,10 @@ class QueryManager(QueryExecutor):
             error_handler=error_handler,
             hostname=hostname,
             logger=check.log,
+            track_operation_time=track_operation_time,
+            batch_size=batch_size,
+            executor_factory=executor_factory,
+            max_workers=max_workers,
         )
         self.check = check  # type: AgentCheck
 
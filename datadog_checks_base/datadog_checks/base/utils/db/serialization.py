@@ -0,0 +1,90 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+from itertools import islice
+
+from datadog_checks.base.utils.serialization import impl, json
+
+from .utils import default_json_event_encoding
+
+# Payloads above this size risk being rejected by the intake
+DEFAULT_MAX_PAYLOAD_BYTES = 5 * 1024 * 1024
+
+# How many rows to encode at once while filling payloads
+ENCODING_BATCH_SIZE = 100
+
+if impl == 'orjson':
+
+    def dumps_json_event(obj, default=default_json_event_encoding):
+        # type: (object, object) -> bytes
+        """
+        Encode `obj` to JSON bytes, using the fastest implementation available.
+        """
+        return json.dumps(obj, default=default)
+
+else:
+
+    def dumps_json_event(obj, default=default_json_event_encoding):
+        # type: (object, object) -> bytes
+        """
+        Encode `obj` to JSON bytes, using the fastest implementation available.
+        """
+        return json.dumps(obj, default=default, separators=(',', ':')).encode('utf-8')
+
+
+def iter_json_event_chunks(
+    event, rows_key, rows, max_bytes=DEFAULT_MAX_PAYLOAD_BYTES, default=default_json_event_encoding
+):
+    # type: (dict, str, object, int, object) -> object
+    """
+    Serialize `event` with the `rows` iterable set as its `rows_key` field, yielding as many JSON payloads as needed for
+    each of them to stay within `max_bytes`. Every payload holds all the other fields of `event` and a consecutive
+    subset of the rows, in order. An event without any row is still sent once.
+
+    Rows are encoded in small batches as they are consumed, so neither the full document nor, if `rows` is a generator,
+    the full list of rows is ever held in memory. A row that does not fit within `max_bytes` by itself is still sent,
+    alone in its payload. `event` itself must not hold a `rows_key` field.
+    """
+    envelope = dumps_json_event(event, default=default)
+    if len(envelope) > 2:
+        prefix = envelope[:-1] + b',' + dumps_json_event(rows_key) + b':['
+    else:
+        prefix = b'{' + dumps_json_event(rows_key) + b':['
+    suffix = b']}'
+
+    # Every row adds its own size and a separating comma, except for the first one
+    base_size = len(prefix) + len(suffix) - 1
+    chunk = [prefix]
+    chunk_size = base_size
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, ENCODING_BATCH_SIZE))
+        if not batch:
+            break
+
+        # Encoding rows in batches saves most of the per call overhead, rows are only encoded one
+        # by one when the batch would not fit in what is left of the current payload
+        encoded_batch = dumps_json_event(batch, default=default)[1:-1]
+        if chunk_size + len(encoded_batch) + 1 <= max_bytes:
+            if len(chunk) > 1:
+                chunk.append(b',')
+            chunk.append(encoded_batch)
+            chunk_size += len(encoded_batch) + 1
+            continue
+
+        for row in batch:
+            encoded_row = dumps_json_event(row, default=default)
+            if len(chunk) > 1:
+                if chunk_size + len(encoded_row) + 1 > max_bytes:
+                    chunk.append(suffix)
+                    yield b''.join(chunk)
+                    chunk = [prefix]
+                    chunk_size = base_size
+                else:
+                    chunk.append(b',')
+
+            chunk.append(encoded_row)
+            chunk_size += len(encoded_row) + 1
+
+    chunk.append(suffix)
+    yield b''.join(chunk)
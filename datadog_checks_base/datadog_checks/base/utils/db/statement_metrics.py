@@ -2,6 +2,7 @@
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
 import logging
+from operator import add, itemgetter, sub
 
 logger = logging.getLogger(__name__)
 
@@ -38,41 +39,76 @@ class StatementMetrics:
 
         This function resets the statement cache so it should only be called once per check run.
 
-        - **rows** (_List[dict]_) - rows from current check run
+        Rows are consumed one at a time and merged directly into the state kept for the next run, so `rows` can
+        be a generator that is never fully loaded in memory. Besides the metric values of every statement, a row
+        is only kept for the statements whose values changed since the previous run, one per statement.
+
+        - **rows** (_Iterable[dict]_) - rows from current check run, possibly a generator
         - **metrics** (_List[str]_) - the metrics to compute for each row
         - **key** (_callable_) - function for an ID which uniquely identifies a row across runs
         """
         result = []
         new_cache = {}
         metrics = set(metrics)
+        previous_statements = self._previous_statements
+
+        # A row of every statement whose merged values differ from the previous run so far, to build its diffed row
+        changed_rows = {}
 
-        rows = _merge_duplicate_rows(rows, metrics, key)
-        if len(rows) > 0:
-            dropped_metrics = metrics - set(rows[0].keys())
-            if dropped_metrics:
-                logger.warning(
-                    'Some statement metrics are not available from the table: %s', ','.join(m for m in dropped_metrics)
-                )
+        # Rows almost always share the same columns, so the metric columns and how to extract their values
+        # are only recomputed when the columns of a row differ from those of the previous row.
+        row_columns = None
+        metric_columns = ()
+        get_metric_values = _get_values_getter(metric_columns)
 
         for row in rows:
+            if row_columns is None:
+                dropped_metrics = metrics - set(row.keys())
+                if dropped_metrics:
+                    logger.warning(
+                        'Some statement metrics are not available from the table: %s',
+                        ','.join(m for m in dropped_metrics),
+                    )
+
+            if row_columns is None or row.keys() != row_columns:
+                # A set rather than the keys view, which would keep the row alive
+                row_columns = set(row)
+                metric_columns = tuple(sorted(metrics.intersection(row_columns)))
+                get_metric_values = _get_values_getter(metric_columns)
+
             row_key = key(row)
-            if row_key in new_cache:
-                logger.error(
-                    'Unexpected collision in cached query metrics. Dropping existing row, row_key=%s new=%s dropped=%s',
-                    row_key,
-                    row,
-                    new_cache[row_key],
-                )
-
-            # Set the row on the new cache to be checked the next run. This should happen for every row, regardless of
-            # whether a metric is submitted for the row during this run or not.
-            new_cache[row_key] = row
-
-            prev = self._previous_statements.get(row_key)
-            if prev is None:
+            cached = new_cache.get(row_key)
+            if cached is None:
+                # Set the row on the new cache to be checked the next run. This should happen for every row,
+                # regardless of whether a metric is submitted for the row during this run or not. Only the metric
+                # values are needed.
+                columns, values = metric_columns, get_metric_values(row)
+            else:
+                # Merge duplicate rows, as determined by the key function, into the sum of their stats. This is
+                # motivated by database integrations such as postgres that can report many instances of a query
+                # that are considered the same after the agent normalization.
+                columns, cached_values = cached
+                values = get_metric_values(row) if columns == metric_columns else _get_values_getter(columns)(row)
+                values = tuple(map(add, values, cached_values))
+            new_cache[row_key] = (columns, values)
+
+            previous = previous_statements.get(row_key)
+            if previous is None:
+                continue
+
+            if values != _get_previous_values(previous, columns):
+                # Any row of the statement will do, only its metric values are replaced by the diffs
+                changed_rows.setdefault(row_key, row)
+            else:
+                changed_rows.pop(row_key, None)
+
+        # Diffed rows are returned in the order their statements were first read
+        for row_key, (metric_columns, values) in new_cache.items():
+            row = changed_rows.get(row_key)
+            if row is None:
                 continue
 
-            metric_columns = metrics & set(row.keys())
+            prev_values = _get_previous_values(previous_statements[row_key], metric_columns)
 
             # Take the diff of all metric values between the current row and the previous run's row.
             # There are a couple of edge cases to be aware of:
@@ -84,20 +120,21 @@ class StatementMetrics:
             # 2. No changes since the previous run: There is no need to store metrics of 0, since that is implied by
             #    the absence of metrics. On any given check run, most rows will have no difference so this optimization
             #    avoids having to send a lot of unnecessary metrics.
+            diffs = tuple(map(sub, values, prev_values))
 
-            diffed_row = {k: row[k] - prev[k] if k in metric_columns else row[k] for k in row.keys()}
+            # No changes to the query; no metric needed
+            if not any(diffs):
+                continue
 
             # Check for negative values, but only in the columns used for metrics
-            if any(diffed_row[k] < 0 for k in metric_columns):
+            if min(diffs) < 0:
                 # A "break" might be expected here instead of "continue," but there are cases where a subset of rows
                 # are removed. To avoid situations where all results are discarded every check run, we err on the side
                 # of potentially including truncated rows that exceed previous run counts.
                 continue
 
-            # No changes to the query; no metric needed
-            if all(diffed_row[k] == 0 for k in metric_columns):
-                continue
-
+            diffed_row = dict(row)
+            diffed_row.update(zip(metric_columns, diffs))
             result.append(diffed_row)
 
         self._previous_statements = new_cache
@@ -105,29 +142,25 @@ class StatementMetrics:
         return result
 
 
-def _merge_duplicate_rows(rows, metrics, key):
+def _get_previous_values(previous, columns):
     """
-    Given a list of query rows, merge all duplicate rows as determined by the key function into a single row
-    with the sum of the stats of all duplicates. This is motivated by database integrations such as postgres
-    that can report many instances of a query that are considered the same after the agent normalization.
-
-    - **rows** (_List[dict]_) - rows from current check run
-    - **metrics** (_List[str]_) - the metrics to compute for each row
-    - **key** (_callable_) - function for an ID which uniquely identifies a query row across runs
+    Return the values of the given columns from the `(columns, values)` state of the previous run.
     """
+    prev_columns, prev_values = previous
+    if prev_columns != columns:
+        prev_values = _get_values_getter(columns)(dict(zip(prev_columns, prev_values)))
 
-    queries_by_key = {}
-    for row in rows:
-        merged_row = dict(row)
+    return prev_values
 
-        query_key = key(merged_row)
 
-        if query_key in queries_by_key:
-            merged_state = queries_by_key[query_key]
-            queries_by_key[query_key] = {
-                k: merged_row[k] + merged_state[k] if k in metrics else merged_state[k] for k in merged_state.keys()
-            }
-        else:
-            queries_by_key[query_key] = merged_row
-
-    return list(queries_by_key.values())
+def _get_values_getter(columns):
+    """
+    Return a function that extracts the values of the given columns from a row as a tuple.
+    """
+    if len(columns) > 1:
+        return itemgetter(*columns)
+    elif columns:
+        column = columns[0]
+        return lambda row: (row[column],)
+    else:
+        return lambda row: ()
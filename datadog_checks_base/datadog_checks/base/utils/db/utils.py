@@ -10,12 +10,14 @@ import os
 import socket
 import threading
 import time
+from collections import OrderedDict
 from concurrent.futures.thread import ThreadPoolExecutor
 from ipaddress import IPv4Address
 from itertools import chain
 from typing import Any, Callable, Dict, List, Tuple  # noqa: F401
 
 from cachetools import TTLCache
+from six import string_types
 
 from datadog_checks.base import is_affirmative
 from datadog_checks.base.log import get_check_logger
@@ -71,8 +73,20 @@ def _traced_dbm_async_job_method(f):
     return f
 
 
-def create_submission_transformer(submit_method):
-    # type: (Any) -> Callable[[Any, Any, Any], Callable[[Any, List, Dict], Callable[[Any, Any, Any], Transformer]]]
+# Submission methods whose samples may be collected and sent with `AgentCheck.submit_metric_batch`,
+# along with the modifiers that are supported when doing so
+BATCH_SUBMISSION_METHODS = {
+    'gauge': ('raw',),
+    'count': ('raw',),
+    'monotonic_count': ('raw', 'flush_first_value'),
+    'rate': ('raw',),
+    'histogram': ('raw',),
+    'historate': ('raw',),
+}
+
+
+def create_submission_transformer(submit_method, batch_type=None):
+    # type: (Any, str) -> Callable[[Any, Any, Any], Callable[[Any, List, Dict], Callable[[Any, Any, Any], Transformer]]]
     # During the compilation phase every transformer will have access to all the others and may be
     # passed the first arguments (e.g. name) that will be forwarded the actual AgentCheck methods.
     def get_transformer(_transformers, *creation_args, **modifiers):
@@ -86,6 +100,17 @@ def create_submission_transformer(submit_method):
             # submit_method(*creation_args, *call_args, **kwargs)
             submit_method(*chain(creation_args, call_args), **kwargs)
 
+        # Record how to submit the values in bulk instead, for use by `QueryExecutor` when batching rows
+        if (
+            batch_type in BATCH_SUBMISSION_METHODS
+            and len(creation_args) == 1
+            and all(modifier in BATCH_SUBMISSION_METHODS[batch_type] for modifier in modifiers)
+        ):
+            transformer.batch_submission = (
+                (batch_type, bool(modifiers.get('raw')), bool(modifiers.get('flush_first_value'))),
+                creation_args[0],
+            )
+
         return transformer
 
     return get_transformer
@@ -131,6 +156,60 @@ class ConstantRateLimiter:
         self.last_event = time.time()
 
 
+class AdaptiveRateLimiter:
+    """
+    Rate limiter whose period adapts to how long the limited work takes and how loaded the database is. Not thread safe.
+
+    The period is multiplied by `backoff_factor`, up to `max_backoff` times the configured period, whenever the work
+    overruns it or the reported database load reaches `saturation_threshold`. Once the work is cheap again, the period
+    shrinks back by the same factor until the configured rate is reached. Runs that fall behind schedule are started
+    right away to catch up, and any whole period missed on the way is counted as skipped rather than replayed.
+    """
+
+    def __init__(self, rate_limit_s, backoff_factor=2.0, max_backoff=8, saturation_threshold=0.8):
+        """
+        :param rate_limit_s: rate limit in seconds
+        :param backoff_factor: factor by which the period grows or shrinks on every adjustment
+        :param max_backoff: maximum multiple of the configured period
+        :param saturation_threshold: database load, between 0 and 1, above which to back off
+        """
+        self.rate_limit_s = max(rate_limit_s, 0)
+        self.base_period_s = 1.0 / self.rate_limit_s if self.rate_limit_s > 0 else 0
+        self.period_s = self.base_period_s
+        self.max_period_s = self.base_period_s * max_backoff
+        self.backoff_factor = backoff_factor
+        self.saturation_threshold = saturation_threshold
+        self.last_event = 0
+        self.lag_s = 0
+        self.skipped = 0
+
+    def update(self, duration_s, load=None):
+        """
+        Adjusts the period given how long the last run took and, if known, the current load of the database
+        """
+        if duration_s > self.period_s or (load is not None and load >= self.saturation_threshold):
+            self.period_s = min(max(self.period_s, duration_s) * self.backoff_factor, self.max_period_s)
+        elif duration_s * self.backoff_factor <= self.period_s and (load is None or load < self.saturation_threshold):
+            self.period_s = max(self.period_s / self.backoff_factor, self.base_period_s)
+
+    def sleep(self):
+        """
+        Sleeps until the next run is due, keeping track of how late it is and how many runs were skipped
+        """
+        self.lag_s = 0
+        self.skipped = 0
+        if self.last_event:
+            remaining_s = self.last_event + self.period_s - time.time()
+            if remaining_s > 0:
+                time.sleep(remaining_s)
+            else:
+                self.lag_s = -remaining_s
+                if self.period_s > 0:
+                    self.skipped = int(self.lag_s // self.period_s)
+
+        self.last_event = time.time()
+
+
 class RateLimitingTTLCache(TTLCache):
     """
     TTLCache wrapper used for rate limiting by key
@@ -192,14 +271,112 @@ def default_json_event_encoding(o):
     raise TypeError
 
 
-def obfuscate_sql_with_metadata(query, options=None):
+class ObfuscationCache(object):
+    """
+    A thread-safe LRU cache of `obfuscate_sql_with_metadata` results, keyed by the raw query text and obfuscator
+    options. It is bounded by both its number of entries and the approximate number of bytes of text they hold.
+
+    Results are only valid for the obfuscator that produced them, so the cache is cleared whenever another one is
+    used, e.g. when `obfuscate_sql` is mocked in tests.
+    """
+
+    def __init__(self, max_size=10000, max_bytes=16 * 1024 * 1024, enabled=True):
+        # type: (int, int, bool) -> None
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries = OrderedDict()  # type: OrderedDict
+        self._lock = threading.Lock()
+        self._obfuscator = None  # type: Any
+        self.bytes = 0
+        # Lookups since the last call to `pop_stats`
+        self.hits = 0
+        self.misses = 0
+
+    def use_obfuscator(self, obfuscator):
+        # type: (Any) -> None
+        with self._lock:
+            if obfuscator != self._obfuscator:
+                self._obfuscator = obfuscator
+                self._entries.clear()
+                self.bytes = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, statement, size):
+        # type: (Tuple[str, str], Dict[str, Any], int) -> None
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+
+            self._entries[key] = (statement, size)
+            self.bytes += size
+            while len(self._entries) > self.max_size or self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def pop_stats(self):
+        # type: () -> Tuple[int, int]
+        """
+        Return the number of hits and misses since the last call.
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            self.hits = self.misses = 0
+
+        return hits, misses
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared by every check running in the process
+obfuscation_cache = ObfuscationCache()
+
+
+def obfuscate_sql_with_metadata(query, options=None, cache=None):
+    """
+    Obfuscate `query` with the Agent's obfuscator and return the result with its metadata.
+
+    Results are cached in `cache`, which defaults to the cache shared by every check of the process.
+    """
     if not query:
         return {'query': '', 'metadata': {}}
 
+    if cache is None:
+        cache = obfuscation_cache
+
+    cache_key = None
+    if cache.enabled and (options is None or isinstance(options, string_types)):
+        cache.use_obfuscator(datadog_agent.obfuscate_sql)
+        cache_key = (query, options)
+        statement = cache.get(cache_key)
+        if statement is not None:
+            return _copy_statement(statement)
+
     statement = datadog_agent.obfuscate_sql(query, options)
     # The `obfuscate_sql` testing stub returns bytes, so we have to handle that here.
     # The actual `obfuscate_sql` method in the agent's Go code returns a JSON string.
     statement = to_native_string(statement.strip())
+    statement_size = len(statement)
 
     # Older agents may not have the new metadata API which returns a JSON string, so we must support cases where
     # newer integrations are running on an older agent. We use this "shortcut" to determine if we've received
@@ -207,16 +384,26 @@ def obfuscate_sql_with_metadata(query, options=None):
     # to parse these strings which are not valid json. Note, this condition is only relevant for integrations
     # running on agent versions < 7.34
     if not statement.startswith('{'):
-        return {'query': statement, 'metadata': {}}
+        statement_with_metadata = {'query': statement, 'metadata': {}}
+    else:
+        statement_with_metadata = json.loads(statement)
+        metadata = statement_with_metadata.get('metadata', {})
+        tables = metadata.pop('tables_csv', None)
+        tables = [table.strip() for table in tables.split(',') if table != ''] if tables else None
+        statement_with_metadata['metadata']['tables'] = tables
+
+    if cache_key is not None:
+        cache.set(cache_key, statement_with_metadata, len(query) + statement_size)
+        return _copy_statement(statement_with_metadata)
 
-    statement_with_metadata = json.loads(statement)
-    metadata = statement_with_metadata.get('metadata', {})
-    tables = metadata.pop('tables_csv', None)
-    tables = [table.strip() for table in tables.split(',') if table != ''] if tables else None
-    statement_with_metadata['metadata']['tables'] = tables
     return statement_with_metadata
 
 
+def _copy_statement(statement):
+    # Cached statements are shared, callers may only modify their own copy
+    return dict(statement, metadata=dict(statement['metadata']))
+
+
 class DBMAsyncJob(object):
     # Set an arbitrary high limit so that dbm async jobs (which aren't CPU bound) don't
     # get artificially limited by the default max_workers count. Note that since threads are
@@ -239,6 +426,7 @@ class DBMAsyncJob(object):
         expected_db_exceptions=(),
         shutdown_callback=None,
         job_name=None,
+        adaptive_scheduling=False,
     ):
         self._check = check
         self._config_host = config_host
@@ -254,7 +442,8 @@ class DBMAsyncJob(object):
         self._last_check_run = 0
         self._shutdown_callback = shutdown_callback
         self._dbms = dbms
-        self._rate_limiter = ConstantRateLimiter(rate_limit)
+        self._adaptive_scheduling = adaptive_scheduling
+        self._rate_limiter = self._create_rate_limiter(rate_limit)
         self._run_sync = run_sync
         self._enabled = enabled
         self._expected_db_exceptions = expected_db_exceptions
@@ -344,19 +533,68 @@ class DBMAsyncJob(object):
             if self._shutdown_callback:
                 self._shutdown_callback()
 
+    def _create_rate_limiter(self, rate_limit):
+        if self._adaptive_scheduling:
+            return AdaptiveRateLimiter(rate_limit)
+
+        return ConstantRateLimiter(rate_limit)
+
     def _set_rate_limit(self, rate_limit):
         if self._rate_limiter.rate_limit_s != rate_limit:
-            self._rate_limiter = ConstantRateLimiter(rate_limit)
+            self._rate_limiter = self._create_rate_limiter(rate_limit)
 
     def _run_job_rate_limited(self):
+        start_time = time.time()
         self._run_job_traced()
+        duration_s = time.time() - start_time
+        if self._adaptive_scheduling:
+            self._rate_limiter.update(duration_s, self._get_db_load_or_none())
+        self._submit_obfuscation_cache_metrics()
         if not self._cancel_event.isSet():
             self._rate_limiter.sleep()
+            if self._adaptive_scheduling:
+                self._submit_scheduling_metrics(duration_s)
+
+    def _submit_scheduling_metrics(self, duration_s):
+        metric_prefix = "dd.{}.async_job".format(self._dbms)
+        rate_limiter = self._rate_limiter
+        self._check.histogram(metric_prefix + ".duration", duration_s * 1000, tags=self._job_tags, raw=True)
+        self._check.gauge(metric_prefix + ".lag", rate_limiter.lag_s * 1000, tags=self._job_tags, raw=True)
+        self._check.gauge(metric_prefix + ".interval", rate_limiter.period_s * 1000, tags=self._job_tags, raw=True)
+        self._check.count(metric_prefix + ".skipped", rate_limiter.skipped, tags=self._job_tags, raw=True)
+
+    def _submit_obfuscation_cache_metrics(self):
+        if not obfuscation_cache.enabled:
+            return
+
+        # The cache and its lookups belong to the process rather than to this job, whichever job runs next
+        # reports them without the tags of its instance
+        metric_prefix = "dd.dbm.obfuscation_cache"
+        hits, misses = obfuscation_cache.pop_stats()
+        self._check.count(metric_prefix + ".hits", hits, raw=True)
+        self._check.count(metric_prefix + ".misses", misses, raw=True)
+        self._check.gauge(metric_prefix + ".entries", len(obfuscation_cache), raw=True)
+        self._check.gauge(metric_prefix + ".bytes", obfuscation_cache.bytes, raw=True)
 
     @_traced_dbm_async_job_method
     def _run_job_traced(self):
         return self.run_job()
 
+    def _get_db_load_or_none(self):
+        # The job itself succeeded, failing to get the load only leaves the schedule based on its duration
+        try:
+            return self.get_db_load()
+        except Exception as e:
+            self._log.warning("[%s] Failed to get the database load: %s", self._job_tags_str, e)
+            return None
+
+    def get_db_load(self):
+        """
+        Returns how saturated the database is, between 0 and 1, or `None` if unknown. With adaptive scheduling,
+        it is called after every run and the job backs off while it is above the saturation threshold.
+        """
+        return None
+
     def run_job(self):
         raise NotImplementedError()
 
@@ -4,8 +4,11 @@
 import os
 
 import pytest
+from google.protobuf.internal.encoder import _VarintBytes
+from prometheus_client.parser import text_fd_to_metric_families
 
 from datadog_checks.base import OpenMetricsBaseCheckV2
+from datadog_checks.base.utils.prometheus import metrics_pb2
 from datadog_checks.dev import get_here
 from datadog_checks.dev.testing import requires_py3
 
@@ -22,6 +25,36 @@ def fixture_ksm():
     return os.path.join(FIXTURE_PATH, 'ksm.txt')
 
 
+@pytest.fixture
+def fixture_ksm_protobuf(tmp_path, fixture_ksm):
+    """The gauges and counters of the ksm fixture, in the delimited protobuf format."""
+    payload = b''
+    with open(fixture_ksm) as f:
+        for family in text_fd_to_metric_families(f):
+            if family.type == 'gauge':
+                message = metrics_pb2.MetricFamily(name=family.name, help=family.documentation, type=1)
+            elif family.type == 'counter':
+                message = metrics_pb2.MetricFamily(name=family.name + '_total', help=family.documentation, type=0)
+            else:
+                continue
+
+            for sample in family.samples:
+                metric = message.metric.add()
+                for name, value in sample.labels.items():
+                    metric.label.add(name=name, value=value)
+                if family.type == 'gauge':
+                    metric.gauge.value = sample.value
+                else:
+                    metric.counter.value = sample.value
+
+            serialized = message.SerializeToString()
+            payload += _VarintBytes(len(serialized)) + serialized
+
+    path = tmp_path / 'ksm.bin'
+    path.write_bytes(payload)
+    return str(path)
+
+
 @pytest.fixture
 def fixture_amazon_msk_jmx_metrics():
     return os.path.join(FIXTURE_PATH, 'amazon_msk_jmx_metrics.txt')
@@ -37,6 +70,56 @@ def test_ksm_new(benchmark, dd_run_check, mock_http_response, fixture_ksm):
     benchmark(c.check, None)
 
 
+def test_ksm_native_parser(benchmark, dd_run_check, mock_http_response, fixture_ksm):
+    mock_http_response(file_path=fixture_ksm)
+    c = OpenMetricsBaseCheckV2(
+        'test', {}, [{'openmetrics_endpoint': 'foo', 'namespace': 'bar', 'metrics': ['.+'], 'use_native_parser': True}]
+    )
+
+    # Run once to get initialization steps out of the way.
+    dd_run_check(c)
+
+    benchmark(c.check, None)
+
+
+def test_ksm_protobuf(benchmark, dd_run_check, mock_http_response, fixture_ksm_protobuf):
+    mock_http_response(
+        file_path=fixture_ksm_protobuf,
+        headers={
+            'Content-Type': (
+                'application/vnd.google.protobuf; proto=io.prometheus.client.MetricFamily; encoding=delimited'
+            )
+        },
+    )
+    c = OpenMetricsBaseCheckV2(
+        'test', {}, [{'openmetrics_endpoint': 'foo', 'namespace': 'bar', 'metrics': ['.+'], 'use_protobuf': True}]
+    )
+
+    # Run once to get initialization steps out of the way.
+    dd_run_check(c)
+
+    benchmark(c.check, None)
+
+
+@pytest.mark.parametrize('label_cache_size', [0, 100000], ids=['uncached', 'cached'])
+def test_ksm_label_cache(benchmark, dd_run_check, mock_http_response, fixture_ksm, label_cache_size):
+    mock_http_response(file_path=fixture_ksm)
+    instance = {
+        'openmetrics_endpoint': 'foo',
+        'namespace': 'bar',
+        'metrics': ['.+'],
+        'exclude_labels': ['uid'],
+        'rename_labels': {'namespace': 'kube_namespace'},
+        'label_cache_size': label_cache_size,
+    }
+    c = OpenMetricsBaseCheckV2('test', {}, [instance])
+
+    # Run once to get initialization steps out of the way.
+    dd_run_check(c)
+
+    benchmark(c.check, None)
+
+
 def test_amazon_msk_jmx_metrics_new(benchmark, dd_run_check, mock_http_response, fixture_amazon_msk_jmx_metrics):
     mock_http_response(file_path=fixture_amazon_msk_jmx_metrics)
 
@@ -56,6 +139,51 @@ def test_amazon_msk_jmx_metrics_new(benchmark, dd_run_check, mock_http_response,
     benchmark(c.check, None)
 
 
+def test_amazon_msk_jmx_metrics_native_parser(
+    benchmark, dd_run_check, mock_http_response, fixture_amazon_msk_jmx_metrics
+):
+    mock_http_response(file_path=fixture_amazon_msk_jmx_metrics)
+
+    metrics = []
+    for raw_metric_name, metric_name in AMAZON_MSK_JMX_METRICS_MAP.items():
+        config = {raw_metric_name: {'name': metric_name}}
+        if raw_metric_name in AMAZON_MSK_JMX_METRICS_OVERRIDES:
+            config[raw_metric_name]['type'] = AMAZON_MSK_JMX_METRICS_OVERRIDES[raw_metric_name]
+
+        metrics.append(config)
+
+    c = OpenMetricsBaseCheckV2(
+        'test',
+        {},
+        [{'openmetrics_endpoint': 'foo', 'namespace': 'bar', 'metrics': metrics, 'use_native_parser': True}],
+    )
+
+    # Run once to get initialization steps out of the way.
+    dd_run_check(c)
+
+    benchmark(c.check, None)
+
+
+@pytest.mark.parametrize('use_native_parser', [False, True], ids=['prometheus_client', 'native'])
+def test_exclude_metrics(
+    benchmark, dd_run_check, mock_http_response, fixture_amazon_msk_jmx_metrics, use_native_parser
+):
+    mock_http_response(file_path=fixture_amazon_msk_jmx_metrics)
+    instance = {
+        'openmetrics_endpoint': 'foo',
+        'namespace': 'bar',
+        'metrics': ['.+'],
+        'exclude_metrics': ['^kafka_server_'],
+        'use_native_parser': use_native_parser,
+    }
+    c = OpenMetricsBaseCheckV2('test', {}, [instance])
+
+    # Run once to get initialization steps out of the way.
+    dd_run_check(c)
+
+    benchmark(c.check, None)
+
+
 def test_label_joins_new(benchmark, dd_run_check, mock_http_response, fixture_ksm):
     mock_http_response(file_path=fixture_ksm)
     instance = {
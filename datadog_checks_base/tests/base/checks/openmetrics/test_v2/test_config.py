@@ -430,3 +430,31 @@ class TestUseLatestSpec:
         check.configure_scrapers()
         scraper = check.scrapers['test']
         assert scraper.http.options['headers']['Accept'] == 'text/plain'
+
+
+class TestUseProtobuf:
+    def test_protobuf(self, dd_run_check):
+        check = get_check({'use_protobuf': True})
+        check.configure_scrapers()
+        scraper = check.scrapers['test']
+        assert scraper.http.options['headers']['Accept'] == (
+            'application/vnd.google.protobuf;proto=io.prometheus.client.MetricFamily;encoding=delimited;q=0.7,'
+            'text/plain;version=0.0.4;q=0.3'
+        )
+
+    def test_latest_spec_precedence(self, dd_run_check):
+        check = get_check({'use_protobuf': True, 'use_latest_spec': True})
+        check.configure_scrapers()
+        scraper = check.scrapers['test']
+        assert scraper.http.options['headers']['Accept'] == (
+            'application/openmetrics-text;version=1.0.0,application/openmetrics-text;version=0.0.1'
+        )
+
+
+class TestLabelCacheSize:
+    @pytest.mark.parametrize('value', ['10', -1, True])
+    def test_invalid(self, dd_run_check, value):
+        check = get_check({'label_cache_size': value})
+
+        with pytest.raises(Exception, match='^Setting `label_cache_size` must be a non-negative integer$'):
+            dd_run_check(check, extract_message=True)
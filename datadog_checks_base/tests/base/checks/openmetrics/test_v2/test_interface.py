@@ -1,8 +1,14 @@
 # (C) Datadog, Inc. 2020-present
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
+import threading
+import time
+
+import pytest
+
 from datadog_checks.base import OpenMetricsBaseCheckV2
 from datadog_checks.base.constants import ServiceCheck
+from datadog_checks.dev.http import MockResponse
 from datadog_checks.dev.testing import requires_py3
 
 from .utils import get_check
@@ -128,3 +134,135 @@ def test_custom_transformer(aggregator, dd_run_check, mock_http_response):
     dd_run_check(check)
 
     aggregator.assert_metric('test.server.watchdog_mega_miss', metric_type=aggregator.GAUGE, count=2)
+
+
+class TestConcurrentScrapes:
+    PAYLOAD = """
+    # HELP go_memstats_alloc_bytes Number of bytes allocated and still in use.
+    # TYPE go_memstats_alloc_bytes gauge
+    go_memstats_alloc_bytes{{foo="{}"}} 6.396288e+06
+    """
+
+    @staticmethod
+    def get_check(instance):
+        class Check(OpenMetricsBaseCheckV2):
+            def __init__(self, name, init_config, instances):
+                super().__init__(name, init_config, instances)
+                self.scraper_configs = [
+                    {'openmetrics_endpoint': endpoint, 'namespace': endpoint, 'metrics': ['.+'], 'telemetry': True}
+                    for endpoint in ('foo', 'bar', 'baz')
+                ]
+
+        return Check('test', {}, [instance])
+
+    def test(self, aggregator, dd_run_check, mocker):
+        requested_endpoints = []
+        all_requested = threading.Barrier(3, timeout=5)
+
+        def get(url, *args, **kwargs):
+            requested_endpoints.append(url)
+            # Only returns once every endpoint is being fetched at the same time
+            all_requested.wait()
+            return MockResponse(self.PAYLOAD.format(url))
+
+        mocker.patch('requests.get', side_effect=get)
+        check = self.get_check({'openmetrics_endpoint': 'foo', 'concurrent_scrapes': True})
+        dd_run_check(check)
+
+        assert sorted(requested_endpoints) == ['bar', 'baz', 'foo']
+        for endpoint in ('foo', 'bar', 'baz'):
+            aggregator.assert_metric(
+                f'{endpoint}.go_memstats_alloc_bytes',
+                6396288,
+                metric_type=aggregator.GAUGE,
+                tags=[f'endpoint:{endpoint}', f'foo:{endpoint}'],
+            )
+            aggregator.assert_metric(f'{endpoint}.telemetry.fetch.duration', tags=[f'endpoint:{endpoint}'])
+            aggregator.assert_service_check(
+                f'{endpoint}.openmetrics.health', ServiceCheck.OK, tags=[f'endpoint:{endpoint}']
+            )
+
+        # Submissions still happen in the order of the scrapers
+        assert aggregator.service_check_names == [
+            'foo.openmetrics.health',
+            'bar.openmetrics.health',
+            'baz.openmetrics.health',
+        ]
+
+    def test_serial_fetch_duration(self, aggregator, dd_run_check, mocker):
+        mocker.patch('requests.get', side_effect=lambda url, *args, **kwargs: MockResponse(self.PAYLOAD.format(url)))
+        check = self.get_check({'openmetrics_endpoint': 'foo'})
+        dd_run_check(check)
+
+        # Fetches are timed the same way without `concurrent_scrapes` so both modes can be compared
+        for endpoint in ('foo', 'bar', 'baz'):
+            aggregator.assert_metric(f'{endpoint}.telemetry.fetch.duration', count=1, tags=[f'endpoint:{endpoint}'])
+
+    def test_error(self, aggregator, dd_run_check, mocker):
+        def get(url, *args, **kwargs):
+            if url == 'bar':
+                raise Exception('Connection refused')
+
+            return MockResponse(self.PAYLOAD.format(url))
+
+        mocker.patch('requests.get', side_effect=get)
+        check = self.get_check({'openmetrics_endpoint': 'foo', 'concurrent_scrapes': True})
+
+        with pytest.raises(Exception, match='Connection refused'):
+            dd_run_check(check)
+
+        aggregator.assert_service_check('foo.openmetrics.health', ServiceCheck.OK, tags=['endpoint:foo'])
+        aggregator.assert_service_check('bar.openmetrics.health', ServiceCheck.CRITICAL, tags=['endpoint:bar'])
+        aggregator.assert_metric('foo.go_memstats_alloc_bytes')
+        aggregator.assert_metric('baz.go_memstats_alloc_bytes', count=0)
+
+        # Unconsumed responses never leak into the next run
+        assert all(scraper._prefetched is None for scraper in check.scrapers.values())
+
+    def test_max_workers(self, dd_run_check, mocker):
+        lock = threading.Lock()
+        in_flight = []
+        max_in_flight = []
+
+        def get(url, *args, **kwargs):
+            with lock:
+                in_flight.append(url)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.05)
+            with lock:
+                in_flight.remove(url)
+            return MockResponse(self.PAYLOAD.format(url))
+
+        mocker.patch('requests.get', side_effect=get)
+        check = self.get_check(
+            {'openmetrics_endpoint': 'foo', 'concurrent_scrapes': True, 'concurrent_scrapes_max_workers': 2}
+        )
+        dd_run_check(check)
+
+        assert len(max_in_flight) == 3
+        assert max(max_in_flight) <= 2
+
+    def test_executor_reused(self, dd_run_check, mocker):
+        mocker.patch('requests.get', side_effect=lambda url, *args, **kwargs: MockResponse(self.PAYLOAD.format(url)))
+        check = self.get_check({'openmetrics_endpoint': 'foo', 'concurrent_scrapes': True})
+
+        dd_run_check(check)
+        executor = check._prefetch_executor
+        dd_run_check(check)
+
+        assert executor is not None
+        assert check._prefetch_executor is executor
+
+        check.cancel()
+        assert check._prefetch_executor is None
+
+    @pytest.mark.parametrize('max_workers', [0, True, '2'])
+    def test_invalid_max_workers(self, max_workers):
+        with pytest.raises(Exception, match='The setting `concurrent_scrapes_max_workers` must be a positive integer'):
+            self.get_check(
+                {
+                    'openmetrics_endpoint': 'foo',
+                    'concurrent_scrapes': True,
+                    'concurrent_scrapes_max_workers': max_workers,
+                }
+            )
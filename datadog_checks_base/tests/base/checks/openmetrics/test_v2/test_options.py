@@ -1,9 +1,14 @@
 # (C) Datadog, Inc. 2020-present
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
+import logging
+import os
+
+import mock
 import pytest
 from mock import Mock
 
+from datadog_checks.base.checks.openmetrics.v2.scraper import PROTOBUF_CHUNK_SIZE
 from datadog_checks.base.constants import ServiceCheck
 from datadog_checks.dev.testing import requires_py3
 
@@ -11,6 +16,10 @@ from .utils import get_check
 
 pytestmark = [requires_py3]
 
+FIXTURE_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'fixtures', 'prometheus')
+)
+
 
 class TestNamespace:
     def test(self, aggregator, dd_run_check, mock_http_response):
@@ -745,3 +754,295 @@ class TestIgnoreTags:
         )
 
         aggregator.assert_all_metrics_covered()
+
+
+class TestUseNativeParser:
+    def test(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(
+            """
+            # HELP go_memstats_alloc_bytes Number of bytes allocated and still in use.
+            # TYPE go_memstats_alloc_bytes gauge
+            go_memstats_alloc_bytes{foo="bar"} 6.396288e+06
+            # HELP go_memstats_lookups_total Number of pointer lookups.
+            # TYPE go_memstats_lookups_total counter
+            go_memstats_lookups_total{foo="bar",baz="escaped \\"quote\\""} 5
+            """
+        )
+        check = get_check({'metrics': ['.+'], 'use_native_parser': True})
+        dd_run_check(check)
+
+        aggregator.assert_metric(
+            'test.go_memstats_alloc_bytes', 6396288, metric_type=aggregator.GAUGE, tags=['endpoint:test', 'foo:bar']
+        )
+        aggregator.assert_metric(
+            'test.go_memstats_lookups.count',
+            5,
+            metric_type=aggregator.MONOTONIC_COUNT,
+            tags=['endpoint:test', 'foo:bar', 'baz:escaped "quote"'],
+        )
+
+        aggregator.assert_all_metrics_covered()
+
+    def test_exclude_metrics(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(
+            """
+            # HELP go_memstats_alloc_bytes Number of bytes allocated and still in use.
+            # TYPE go_memstats_alloc_bytes gauge
+            go_memstats_alloc_bytes{foo="bar"} 6.396288e+06
+            # HELP go_memstats_gc_sys_bytes Number of bytes used for garbage collection system metadata.
+            # TYPE go_memstats_gc_sys_bytes gauge
+            go_memstats_gc_sys_bytes{bar="foo"} 901120
+            # HELP go_memstats_free_bytes Number of bytes free and available for use.
+            # TYPE go_memstats_free_bytes gauge
+            go_memstats_free_bytes{foo="bar"} 6.396288e+06
+            go_memstats_free_bytes{foo="baz"} 6.396288e+06
+            go_memstats_heap_objects 5
+            """
+        )
+        check = get_check(
+            {
+                'metrics': ['.+'],
+                'exclude_metrics': ['go_memstats_heap_objects', '^go_memstats_(alloc|free)_bytes$'],
+                'telemetry': True,
+                'use_native_parser': True,
+            }
+        )
+        dd_run_check(check)
+
+        aggregator.assert_metric(
+            'test.go_memstats_gc_sys_bytes', 901120, metric_type=aggregator.GAUGE, tags=['endpoint:test', 'bar:foo']
+        )
+        assert sum(m.value for m in aggregator.metrics('test.telemetry.metrics.input.count')) == 5
+        assert sum(m.value for m in aggregator.metrics('test.telemetry.metrics.ignored.count')) == 4
+        assert sum(m.value for m in aggregator.metrics('test.telemetry.metrics.processed.count')) == 1
+
+    def test_exclude_metrics_shared_labels(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(
+            """
+            # HELP go_memstats_alloc_bytes Number of bytes allocated and still in use.
+            # TYPE go_memstats_alloc_bytes gauge
+            go_memstats_alloc_bytes{foo="bar"} 6.396288e+06
+            # HELP go_memstats_gc_sys_bytes Number of bytes used for garbage collection system metadata.
+            # TYPE go_memstats_gc_sys_bytes gauge
+            go_memstats_gc_sys_bytes{bar="foo"} 901120
+            """
+        )
+        check = get_check(
+            {
+                'metrics': ['.+'],
+                'share_labels': {'go_memstats_alloc_bytes': True},
+                'exclude_metrics': ['go_memstats_alloc_bytes'],
+                'use_native_parser': True,
+            }
+        )
+        dd_run_check(check)
+
+        aggregator.assert_metric(
+            'test.go_memstats_gc_sys_bytes',
+            901120,
+            metric_type=aggregator.GAUGE,
+            tags=['endpoint:test', 'bar:foo', 'foo:bar'],
+        )
+
+        aggregator.assert_all_metrics_covered()
+
+    def test_raw_metric_prefix(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(
+            """
+            # HELP foo_go_memstats_alloc_bytes Number of bytes allocated and still in use.
+            # TYPE foo_go_memstats_alloc_bytes gauge
+            foo_go_memstats_alloc_bytes 6.396288e+06
+            # HELP foo_go_memstats_free_bytes Number of bytes free and available for use.
+            # TYPE foo_go_memstats_free_bytes gauge
+            foo_go_memstats_free_bytes 6.396288e+06
+            """
+        )
+        check = get_check(
+            {
+                'metrics': ['.+'],
+                'raw_metric_prefix': 'foo_',
+                'exclude_metrics': ['go_memstats_free_bytes'],
+                'use_native_parser': True,
+            }
+        )
+        dd_run_check(check)
+
+        aggregator.assert_metric(
+            'test.go_memstats_alloc_bytes', 6396288, metric_type=aggregator.GAUGE, tags=['endpoint:test']
+        )
+
+        aggregator.assert_all_metrics_covered()
+
+
+class TestUseProtobuf:
+    def test(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(
+            file_path=os.path.join(FIXTURE_PATH, 'protobuf.bin'),
+            headers={
+                'Content-Type': (
+                    'application/vnd.google.protobuf; proto=io.prometheus.client.MetricFamily; encoding=delimited'
+                )
+            },
+        )
+        check = get_check(
+            {
+                'metrics': ['go_goroutines', 'go_memstats_alloc_bytes', 'go_gc_duration_seconds'],
+                'exclude_metrics': ['go_memstats_alloc_bytes'],
+                'raw_line_filters': ['go_goroutines'],
+                'use_protobuf': True,
+            }
+        )
+        dd_run_check(check)
+
+        aggregator.assert_metric('test.go_goroutines', 23, metric_type=aggregator.GAUGE, tags=['endpoint:test'])
+        aggregator.assert_metric(
+            'test.go_gc_duration_seconds.quantile',
+            metric_type=aggregator.GAUGE,
+            tags=['endpoint:test', 'quantile:0.5'],
+        )
+        aggregator.assert_metric(
+            'test.go_gc_duration_seconds.count', 11, metric_type=aggregator.MONOTONIC_COUNT, tags=['endpoint:test']
+        )
+        aggregator.assert_metric('test.go_gc_duration_seconds.sum', metric_type=aggregator.MONOTONIC_COUNT)
+
+        aggregator.assert_all_metrics_covered()
+
+    def test_text_fallback(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(
+            """
+            # HELP go_memstats_alloc_bytes Number of bytes allocated and still in use.
+            # TYPE go_memstats_alloc_bytes gauge
+            go_memstats_alloc_bytes 6.396288e+06
+            """,
+            headers={'Content-Type': 'text/plain; version=0.0.4'},
+        )
+        check = get_check({'metrics': ['.+'], 'use_protobuf': True})
+        dd_run_check(check)
+
+        aggregator.assert_metric(
+            'test.go_memstats_alloc_bytes', 6396288, metric_type=aggregator.GAUGE, tags=['endpoint:test']
+        )
+
+        aggregator.assert_all_metrics_covered()
+
+    def test_raw_line_filters_warning(self, caplog):
+        check = get_check({'metrics': ['.+'], 'raw_line_filters': ['go_goroutines'], 'use_protobuf': True})
+        with caplog.at_level(logging.WARNING):
+            check.configure_scrapers()
+
+        assert 'Setting `raw_line_filters` has no effect when the endpoint serves the protobuf format' in caplog.text
+
+    def test_chunk_size(self, dd_run_check, mock_http_response):
+        mock_response = mock_http_response(
+            file_path=os.path.join(FIXTURE_PATH, 'protobuf.bin'),
+            headers={
+                'Content-Type': (
+                    'application/vnd.google.protobuf; proto=io.prometheus.client.MetricFamily; encoding=delimited'
+                )
+            },
+        )
+        check = get_check({'metrics': ['.+'], 'use_protobuf': True})
+
+        with mock.patch.object(
+            mock_response.return_value, 'iter_content', wraps=mock_response.return_value.iter_content
+        ) as iter_content:
+            dd_run_check(check)
+
+        assert iter_content.call_count == 1
+        assert iter_content.call_args[1]['chunk_size'] == PROTOBUF_CHUNK_SIZE
+
+
+class TestLabelCacheSize:
+    def test(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(
+            """
+            # HELP go_memstats_alloc_bytes Number of bytes allocated and still in use.
+            # TYPE go_memstats_alloc_bytes gauge
+            go_memstats_alloc_bytes{foo="bar",baz="qux",node="host1"} 6.396288e+06
+            go_memstats_alloc_bytes{foo="bar",baz="quux",node="host2"} 6.396288e+06
+            go_memstats_alloc_bytes{foo="baz",baz="qux",node="host3"} 6.396288e+06
+            """
+        )
+        check = get_check(
+            {
+                'metrics': ['.+'],
+                'exclude_labels': ['baz'],
+                'rename_labels': {'foo': 'bar'},
+                'exclude_metrics_by_labels': {'foo': ['baz']},
+                'hostname_label': 'node',
+                'label_cache_size': 10,
+                'telemetry': True,
+            }
+        )
+
+        for _ in range(2):
+            dd_run_check(check)
+
+            aggregator.assert_metric(
+                'test.go_memstats_alloc_bytes',
+                6396288,
+                metric_type=aggregator.GAUGE,
+                tags=['endpoint:test', 'bar:bar', 'node:host1'],
+                hostname='host1',
+            )
+            aggregator.assert_metric(
+                'test.go_memstats_alloc_bytes',
+                6396288,
+                metric_type=aggregator.GAUGE,
+                tags=['endpoint:test', 'bar:bar', 'node:host2'],
+                hostname='host2',
+            )
+            aggregator.assert_metric('test.go_memstats_alloc_bytes', count=2)
+            aggregator.assert_metric('test.telemetry.label_cache.size', 3)
+            aggregator.reset()
+
+        scraper = check.scrapers['test']
+        assert scraper.label_tag_names == {'foo': 'bar', 'baz': None, 'node': 'node'}
+
+    def test_telemetry(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(
+            """
+            # HELP go_memstats_alloc_bytes Number of bytes allocated and still in use.
+            # TYPE go_memstats_alloc_bytes gauge
+            go_memstats_alloc_bytes{foo="bar"} 6.396288e+06
+            go_memstats_alloc_bytes{foo="baz"} 6.396288e+06
+            go_memstats_alloc_bytes{foo="qux"} 6.396288e+06
+            """
+        )
+        check = get_check({'metrics': ['.+'], 'label_cache_size': 2, 'telemetry': True})
+
+        dd_run_check(check)
+        aggregator.assert_metric('test.telemetry.label_cache.hits', 0)
+        aggregator.assert_metric('test.telemetry.label_cache.misses', 3)
+        aggregator.assert_metric('test.telemetry.label_cache.size', 2)
+        aggregator.reset()
+
+        # The least recently used entry is evicted every time so cycling through more label sets than fit never hits
+        dd_run_check(check)
+        aggregator.assert_metric('test.telemetry.label_cache.hits', 0)
+        aggregator.assert_metric('test.telemetry.label_cache.misses', 3)
+        aggregator.assert_metric('test.telemetry.label_cache.size', 2)
+
+    def test_dynamic_tags(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(
+            """
+            # HELP go_memstats_alloc_bytes Number of bytes allocated and still in use.
+            # TYPE go_memstats_alloc_bytes gauge
+            go_memstats_alloc_bytes{foo="bar"} 6.396288e+06
+            """
+        )
+        check = get_check({'metrics': ['.+'], 'label_cache_size': 10})
+        dd_run_check(check)
+        aggregator.reset()
+
+        check.set_dynamic_tags('baz:qux')
+        dd_run_check(check)
+
+        aggregator.assert_metric(
+            'test.go_memstats_alloc_bytes',
+            6396288,
+            metric_type=aggregator.GAUGE,
+            tags=['endpoint:test', 'foo:bar', 'baz:qux'],
+        )
+
+        aggregator.assert_all_metrics_covered()
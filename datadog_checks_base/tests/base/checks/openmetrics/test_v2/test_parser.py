@@ -0,0 +1,157 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import os
+
+import pytest
+from google.protobuf.internal.encoder import _VarintBytes
+from prometheus_client.parser import text_fd_to_metric_families as parse_prometheus
+
+from datadog_checks.base.checks.openmetrics.v2.parser import protobuf_to_metric_families
+from datadog_checks.base.checks.openmetrics.v2.parser import text_fd_to_metric_families as parse_native
+from datadog_checks.base.utils.prometheus import metrics_pb2
+from datadog_checks.dev import get_here
+from datadog_checks.dev.testing import requires_py3
+
+pytestmark = [requires_py3]
+
+HERE = get_here()
+FIXTURE_PATH = os.path.abspath(os.path.join(os.path.dirname(HERE), '..', '..', '..', 'fixtures', 'prometheus'))
+
+PAYLOAD = r"""
+# HELP go_memstats_lookups_total Number of pointer lookups \\ with \n escapes.
+# TYPE go_memstats_lookups_total counter
+go_memstats_lookups_total{foo="bar\\\"baz,qux=quux",  bar = "baz" , } 5 1000
+go_memstats_lookups_total 6
+untyped_metric 7
+# TYPE go_gc_duration_seconds summary
+go_gc_duration_seconds{quantile="0.5"} 1e-05
+go_gc_duration_seconds_sum 0.5
+go_gc_duration_seconds_count 4
+# TYPE http_requests counter
+http_requests{code="200"} 3
+# TYPE http_request_duration_seconds histogram
+http_request_duration_seconds_bucket{le="0.1"} 1
+http_request_duration_seconds_bucket{le="+Inf"} 2
+http_request_duration_seconds_sum -Inf
+http_request_duration_seconds_count 2
+other_metric{foo="bar"}	8	2000
+"""
+
+
+@pytest.mark.parametrize('fixture', ['ksm.txt', 'amazon_msk_jmx_metrics.txt', 'metrics.txt', 'deprecated.txt'])
+def test_fixtures(fixture):
+    with open(os.path.join(FIXTURE_PATH, fixture)) as f:
+        lines = f.read().splitlines()
+
+    assert list(parse_native(lines)) == list(parse_prometheus(lines))
+
+
+def test_edge_cases():
+    lines = PAYLOAD.splitlines()
+
+    assert list(parse_native(lines)) == list(parse_prometheus(lines))
+
+
+def test_skip_metric():
+    skipped = []
+    metrics = list(
+        parse_native(
+            PAYLOAD.splitlines(),
+            skip_metric=lambda name: name in ('go_memstats_lookups', 'untyped_metric', 'http_request_duration_seconds'),
+            on_skip=lambda name, num_samples: skipped.append((name, num_samples)),
+        )
+    )
+
+    assert [metric.name for metric in metrics] == ['go_gc_duration_seconds', 'http_requests', 'other_metric']
+    assert skipped == [('go_memstats_lookups', 2), ('untyped_metric', 1), ('http_request_duration_seconds', 4)]
+
+
+def test_invalid_value():
+    with pytest.raises(ValueError):
+        list(parse_native(['foo{bar="baz"}']))
+
+
+def get_protobuf_payload():
+    counter = metrics_pb2.MetricFamily(name='go_memstats_lookups_total', help='Number of lookups.', type=0)
+    metric = counter.metric.add(timestamp_ms=1000)
+    metric.label.add(name='foo', value='bar')
+    metric.counter.value = 5
+
+    gauge = metrics_pb2.MetricFamily(name='go_goroutines', type=1)
+    gauge.metric.add().gauge.value = 33
+
+    summary = metrics_pb2.MetricFamily(name='go_gc_duration_seconds', type=2)
+    metric = summary.metric.add()
+    metric.label.add(name='foo', value='bar')
+    metric.summary.quantile.add(quantile=0.5, value=1e-05)
+    metric.summary.quantile.add(quantile=1, value=2e-05)
+    metric.summary.sample_sum = 0.5
+    metric.summary.sample_count = 4
+
+    untyped = metrics_pb2.MetricFamily(name='untyped_metric', type=3)
+    untyped.metric.add().untyped.value = 7
+
+    histogram = metrics_pb2.MetricFamily(name='http_request_duration_seconds', type=4)
+    metric = histogram.metric.add()
+    metric.histogram.bucket.add(upper_bound=0.1, cumulative_count=1)
+    metric.histogram.bucket.add(upper_bound=1, cumulative_count=2)
+    metric.histogram.sample_sum = 1.5
+    metric.histogram.sample_count = 3
+
+    payload = b''
+    for message in (counter, gauge, summary, untyped, histogram):
+        serialized = message.SerializeToString()
+        payload += _VarintBytes(len(serialized)) + serialized
+
+    return payload
+
+
+PROTOBUF_EQUIVALENT_PAYLOAD = """
+# HELP go_memstats_lookups_total Number of lookups.
+# TYPE go_memstats_lookups_total counter
+go_memstats_lookups_total{foo="bar"} 5 1000
+# TYPE go_goroutines gauge
+go_goroutines 33
+# TYPE go_gc_duration_seconds summary
+go_gc_duration_seconds{foo="bar",quantile="0.5"} 1e-05
+go_gc_duration_seconds{foo="bar",quantile="1.0"} 2e-05
+go_gc_duration_seconds_sum{foo="bar"} 0.5
+go_gc_duration_seconds_count{foo="bar"} 4
+# TYPE untyped_metric untyped
+untyped_metric 7
+# TYPE http_request_duration_seconds histogram
+http_request_duration_seconds_bucket{le="0.1"} 1
+http_request_duration_seconds_bucket{le="1.0"} 2
+http_request_duration_seconds_bucket{le="+Inf"} 3
+http_request_duration_seconds_sum 1.5
+http_request_duration_seconds_count 3
+"""
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1024])
+def test_protobuf(chunk_size):
+    payload = get_protobuf_payload()
+    chunks = [payload[i : i + chunk_size] for i in range(0, len(payload), chunk_size)]
+
+    assert list(protobuf_to_metric_families(chunks)) == list(parse_prometheus(PROTOBUF_EQUIVALENT_PAYLOAD.splitlines()))
+
+
+def test_protobuf_skip_metric():
+    skipped = []
+    metrics = list(
+        protobuf_to_metric_families(
+            [get_protobuf_payload()],
+            skip_metric=lambda name: name
+            in ('go_memstats_lookups', 'go_gc_duration_seconds', 'http_request_duration_seconds'),
+            on_skip=lambda name, num_samples: skipped.append((name, num_samples)),
+        )
+    )
+
+    assert [metric.name for metric in metrics] == ['go_goroutines', 'untyped_metric']
+    assert skipped == [('go_memstats_lookups', 1), ('go_gc_duration_seconds', 4), ('http_request_duration_seconds', 5)]
+
+
+def test_protobuf_truncated():
+    with pytest.raises(ValueError):
+        list(protobuf_to_metric_families([get_protobuf_payload()[:-1]]))
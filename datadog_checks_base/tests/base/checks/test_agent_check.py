@@ -5,13 +5,14 @@
 # Licensed under a 3-clause BSD style license (see LICENSE)
 import json
 import logging
+import re
 from typing import Any  # noqa: F401
 
 import mock
 import pytest
 from six import PY3
 
-from datadog_checks.base import AgentCheck, to_native_string
+from datadog_checks.base import AgentCheck, ConfigurationError, to_native_string
 from datadog_checks.base import __version__ as base_package_version
 from datadog_checks.dev.testing import requires_py3
 
@@ -455,6 +456,97 @@ class TestMetrics:
         aggregator.assert_metric(metric_name, count=0)
 
 
+class TestMetricBatch:
+    @pytest.mark.parametrize('metric_type', ['gauge', 'count', 'monotonic_count', 'rate', 'histogram', 'historate'])
+    def test_equivalence(self, aggregator, metric_type):
+        check = AgentCheck('test', {}, [{}])
+        check.__NAMESPACE__ = 'test'
+        records = [('metric', i, ['foo:bar', 'baz:{}'.format(i)], 'host-{}'.format(i % 2)) for i in range(5)]
+
+        for name, value, tags, hostname in records:
+            getattr(check, metric_type)(name, value, tags=tags, hostname=hostname)
+
+        expected = aggregator.metrics('test.metric')
+        aggregator.reset()
+
+        check.submit_metric_batch(metric_type, records)
+
+        assert aggregator.metrics('test.metric') == expected
+
+    def test_multiple_names(self, aggregator):
+        check = AgentCheck()
+        check.__NAMESPACE__ = 'test'
+
+        check.submit_metric_batch('gauge', [('foo', 1, ['tag:1'], None), ('bar', 2, None, 'host'), ('foo', 3, [], '')])
+
+        aggregator.assert_metric('test.foo', 1, tags=['tag:1'], hostname='', count=1)
+        aggregator.assert_metric('test.foo', 3, tags=[], hostname='', count=1)
+        aggregator.assert_metric('test.bar', 2, tags=[], hostname='host', count=1)
+        aggregator.assert_all_metrics_covered()
+
+    def test_raw(self, aggregator):
+        check = AgentCheck()
+        check.__NAMESPACE__ = 'test'
+
+        check.submit_metric_batch('gauge', [('metric', 0, None, None)], raw=True)
+
+        aggregator.assert_metric('metric', count=1)
+
+    def test_flush_first_value(self, aggregator):
+        check = AgentCheck()
+
+        check.submit_metric_batch('monotonic_count', [('metric', 0, None, None)], flush_first_value=True)
+
+        aggregator.assert_metric('metric', count=1, flush_first_value=True)
+
+    def test_none_value(self, aggregator):
+        check = AgentCheck()
+
+        check.submit_metric_batch('gauge', [('metric', None, None, None), ('metric', 1, None, None)])
+
+        aggregator.assert_metric('metric', 1, count=1)
+
+    def test_tags_not_mutated(self, aggregator):
+        check = AgentCheck()
+        tags = ['foo:bar']
+
+        check.submit_metric_batch('gauge', [('metric', 0, tags, None)])
+        tags.append('baz:qux')
+
+        aggregator.assert_metric('metric', tags=['foo:bar'], count=1)
+
+    def test_tags_normalized(self, aggregator):
+        check = AgentCheck('myintegration', {}, [{'disable_generic_tags': True}])
+
+        check.submit_metric_batch('gauge', [('metric', 0, [b'foo:bar', None, 'cluster:my_cluster'], None)])
+
+        aggregator.assert_metric('metric', tags=['foo:bar', 'myintegration_cluster:my_cluster'], count=1)
+
+    def test_metric_patterns(self, aggregator):
+        instance = {'metric_patterns': {'exclude': ['^test\\.foo$']}}
+        check = AgentCheck('myintegration', {}, [instance])
+        check.__NAMESPACE__ = 'test'
+
+        check.submit_metric_batch('gauge', [('foo', 1, None, None), ('bar', 2, None, None), ('foo', 3, None, None)])
+
+        aggregator.assert_metric('test.bar', 2, count=1)
+        aggregator.assert_all_metrics_covered()
+
+    def test_non_float_metric(self, aggregator):
+        check = AgentCheck()
+
+        with pytest.raises(ValueError):
+            check.submit_metric_batch('gauge', [('metric', '85k', None, None)])
+
+        aggregator.assert_metric('metric', count=0)
+
+    def test_unknown_metric_type(self):
+        check = AgentCheck()
+
+        with pytest.raises(ValueError, match='^Unknown metric type `counter`'):
+            check.submit_metric_batch('counter', [])
+
+
 class TestEvents:
     def test_valid_event(self, aggregator):
         check = AgentCheck()
@@ -773,6 +865,41 @@ class TestTags:
         AgentCheck('myintegration', {}, [instance])
         assert expected_log in caplog.text
 
+    def test_metrics_filter_cache(self, aggregator):
+        instance = {'metric_patterns': {'exclude': ['^bar$'], 'include': ['^(foo|bar)$']}}
+        check = AgentCheck('myintegration', {}, [instance])
+        check.exclude_metrics_pattern = mock.Mock(wraps=check.exclude_metrics_pattern)
+
+        for _ in range(3):
+            check.gauge('foo', 0)
+            check.gauge('bar', 0)
+            check.gauge('baz', 0)
+
+        aggregator.assert_metric('foo', count=3)
+        aggregator.assert_all_metrics_covered()
+        assert check.exclude_metrics_pattern.search.call_count == 3
+
+    def test_metrics_filter_cache_invalidation(self, aggregator):
+        check = AgentCheck('myintegration', {}, [{'metric_patterns': {'exclude': ['^foo$']}}])
+        assert not check.should_send_metric('foo')
+
+        check.exclude_metrics_pattern = None
+        assert check._metric_filter_cache is None
+        assert check.should_send_metric('foo')
+
+        check.include_metrics_pattern = re.compile('^bar$')
+        assert not check.should_send_metric('foo')
+        assert check.should_send_metric('bar')
+
+    def test_metrics_filter_cache_bounded(self):
+        check = AgentCheck('myintegration', {}, [{'metric_patterns': {'exclude': ['^foo']}}])
+        check.METRIC_FILTER_CACHE_SIZE = 3
+        check._reset_metric_filter_cache()
+
+        for i in range(10):
+            assert not check.should_send_metric('foo{}'.format(i))
+            assert len(check._metric_filter_cache) <= 3
+
 
 class LimitedCheck(AgentCheck):
     DEFAULT_METRIC_LIMIT = 10
@@ -828,6 +955,26 @@ class TestLimits:
         assert len(check.get_warnings()) == 1
         assert len(aggregator.metrics("metric")) == 29
 
+    def test_metric_limit_batch(self, aggregator):
+        check = LimitedCheck()
+
+        check.submit_metric_batch('gauge', [('metric', 0, None, None)] * 20)
+        assert len(check.get_warnings()) == 1
+        assert len(aggregator.metrics('metric')) == 10
+
+    def test_metric_limit_batch_count(self, aggregator):
+        check = LimitedCheck()
+
+        # Multiple records for a single set of (metric_name, tags) should not trigger
+        check.submit_metric_batch('count', [('metric', 0, None, 'host-single')] * 20)
+        assert len(check.get_warnings()) == 0
+        assert len(aggregator.metrics('metric')) == 20
+
+        # Only 9 new sets of tags should pass through
+        check.submit_metric_batch('count', [('metric', 0, None, 'host-{}'.format(i)) for i in range(20)])
+        assert len(check.get_warnings()) == 1
+        assert len(aggregator.metrics('metric')) == 29
+
     def test_metric_limit_instance_config(self, aggregator):
         instances = [{"max_returned_metrics": 42}]
         check = AgentCheck("test", {}, instances)
@@ -915,6 +1062,100 @@ class TestLimits:
         aggregator.assert_metric('datadog.agent.metrics.contexts.total', 5)
 
 
+class NormalizationCacheCheck(AgentCheck):
+    __NAMESPACE__ = 'test'
+
+    def check(self, _):
+        for i in range(5):
+            self.gauge('foo', i, tags=['foo:bar', 'baz:{}'.format(i % 2)])
+
+
+class TestNormalizationCache:
+    def test_disabled_by_default(self):
+        check = AgentCheck('test', {}, [{}])
+
+        assert check._tag_cache is None
+        assert check._namespace_cache is None
+
+    @pytest.mark.parametrize('size', [-1, '10', None, True, False])
+    def test_invalid_size(self, size):
+        with pytest.raises(ConfigurationError, match='^Setting `normalization_cache_size` must be'):
+            AgentCheck('test', {}, [{'normalization_cache_size': size}])
+
+    def test_tags(self, aggregator):
+        check = AgentCheck('myintegration', {}, [{'normalization_cache_size': 10, 'disable_generic_tags': True}])
+        tags = [b'foo:bar', None, 'cluster:my_cluster']
+
+        for _ in range(3):
+            normalized_tags = check._normalize_tags_type(tags)
+            assert normalized_tags == ['foo:bar', 'myintegration_cluster:my_cluster']
+
+            # Callers get their own copy
+            normalized_tags.append('baz:qux')
+
+        assert check._tag_cache.hits == 2
+        assert check._tag_cache.misses == 1
+
+    def test_tags_device_name(self):
+        check = AgentCheck('test', {}, [{'normalization_cache_size': 10}])
+
+        assert check._normalize_tags_type(['foo:bar'], device_name='sda') == ['device:sda', 'foo:bar']
+        assert check._normalize_tags_type(['foo:bar']) == ['foo:bar']
+        assert len(check._tag_cache) == 1
+
+    def test_tags_generator(self):
+        check = AgentCheck('test', {}, [{'normalization_cache_size': 10}])
+
+        for _ in range(2):
+            assert check._normalize_tags_type(tag for tag in ['foo:bar']) == ['foo:bar']
+
+    def test_namespace(self, aggregator):
+        check = AgentCheck('test', {}, [{'normalization_cache_size': 10}])
+        check.__NAMESPACE__ = 'test'
+
+        check.gauge('metric', 0)
+        check.gauge('metric', 0)
+        check.__NAMESPACE__ = 'other'
+        check.gauge('metric', 0)
+        check.gauge('metric', 0, raw=True)
+
+        aggregator.assert_metric('test.metric', count=2)
+        aggregator.assert_metric('other.metric', count=1)
+        aggregator.assert_metric('metric', count=1)
+        aggregator.assert_all_metrics_covered()
+
+    def test_bounded(self):
+        check = AgentCheck('test', {}, [{'normalization_cache_size': 3}])
+
+        for i in range(10):
+            check._normalize_tags_type(['foo:{}'.format(i)])
+            assert len(check._tag_cache) <= 3
+
+    def test_debug_metrics(self, aggregator, dd_run_check):
+        instance = {'debug_metrics': {'normalization_cache': True}, 'normalization_cache_size': 10}
+        check = NormalizationCacheCheck('test', {}, [instance])
+        dd_run_check(check)
+
+        aggregator.assert_metric('test.foo', count=5)
+        aggregator.assert_metric('datadog.agent.metrics.normalization_cache.tags.hits', 3)
+        aggregator.assert_metric('datadog.agent.metrics.normalization_cache.tags.misses', 2)
+        aggregator.assert_metric('datadog.agent.metrics.normalization_cache.tags.size', 2)
+        aggregator.assert_metric('datadog.agent.metrics.normalization_cache.names.hits', 4)
+        aggregator.assert_metric('datadog.agent.metrics.normalization_cache.names.misses', 1)
+        aggregator.assert_metric('datadog.agent.metrics.normalization_cache.names.size', 1)
+
+        # Stats are per run
+        assert check._tag_cache.hits == 0
+        assert check._namespace_cache.misses == 0
+
+    def test_debug_metrics_disabled(self, aggregator, dd_run_check):
+        check = NormalizationCacheCheck('test', {}, [{'normalization_cache_size': 10}])
+        dd_run_check(check)
+
+        aggregator.assert_metric('test.foo', count=5)
+        aggregator.assert_all_metrics_covered()
+
+
 class TestCheckInitializations:
     def test_success_only_once(self):
         class TestCheck(AgentCheck):
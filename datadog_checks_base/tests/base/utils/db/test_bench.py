@@ -0,0 +1,194 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import datetime
+import decimal
+import itertools
+import random
+import tracemalloc
+
+import pytest
+
+from datadog_checks.base import AgentCheck
+from datadog_checks.base.stubs import aggregator
+from datadog_checks.base.utils.db import QueryExecutor
+from datadog_checks.base.utils.db.serialization import iter_json_event_chunks
+from datadog_checks.base.utils.db.statement_metrics import StatementMetrics
+from datadog_checks.base.utils.db.utils import default_json_event_encoding
+from datadog_checks.base.utils.serialization import json
+
+STATEMENT_METRICS = [
+    'calls',
+    'total_exec_time',
+    'rows',
+    'shared_blks_hit',
+    'shared_blks_read',
+    'shared_blks_dirtied',
+    'shared_blks_written',
+    'local_blks_hit',
+    'local_blks_read',
+    'temp_blks_read',
+    'temp_blks_written',
+]
+
+
+def statement_key(row):
+    return row['query_signature'], row['datname'], row['rolname']
+
+
+def generate_statement_rows(count, previous_rows=None, changed_ratio=0.1, seed=0):
+    """
+    Generate rows resembling those of `pg_stat_statements`, only a fraction of which changed since `previous_rows`.
+    """
+    rng = random.Random(seed)
+    if previous_rows is None:
+        return [
+            dict(
+                {
+                    'queryid': i,
+                    'query': 'SELECT * FROM table_{} WHERE id = $1'.format(i),
+                    'query_signature': '{:016x}'.format(i),
+                    'datname': 'db{}'.format(i % 8),
+                    'rolname': 'user{}'.format(i % 4),
+                },
+                **{metric: rng.randrange(1000000) for metric in STATEMENT_METRICS}
+            )
+            for i in range(count)
+        ]
+
+    rows = []
+    for row in previous_rows:
+        row = dict(row)
+        if rng.random() < changed_ratio:
+            for metric in STATEMENT_METRICS:
+                row[metric] += rng.randrange(100)
+        rows.append(row)
+
+    return rows
+
+
+@pytest.mark.parametrize('row_count', [1000, 50000])
+def test_compute_derivative_rows(benchmark, row_count):
+    rows1 = generate_statement_rows(row_count)
+    rows2 = generate_statement_rows(row_count, previous_rows=rows1)
+    statement_metrics = StatementMetrics()
+
+    tracemalloc.start()
+    statement_metrics.compute_derivative_rows(rows1, STATEMENT_METRICS, key=statement_key)
+    benchmark.extra_info['previous_state_bytes'] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Alternate between both sets of rows so that every round diffs against a full previous run
+    rounds = itertools.cycle([rows2, rows1])
+
+    benchmark(lambda: statement_metrics.compute_derivative_rows(next(rounds), STATEMENT_METRICS, key=statement_key))
+
+
+class SyntheticCursor(object):
+    """
+    A DB-API like cursor over pre-generated rows, only providing what `QueryExecutor` uses.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.position = 0
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def fetchmany(self, size):
+        batch = self.rows[self.position : self.position + size]
+        self.position += size
+        return batch
+
+
+TABLE_STATS_QUERY = {
+    'name': 'table stats',
+    'query': 'SELECT ... FROM pg_stat_user_tables',
+    'columns': [
+        {'name': 'db', 'type': 'tag'},
+        {'name': 'schema', 'type': 'tag'},
+        {'name': 'table', 'type': 'tag'},
+        {'name': 'table.seq_scans', 'type': 'rate'},
+        {'name': 'table.idx_scans', 'type': 'rate'},
+        {'name': 'table.rows_inserted', 'type': 'rate'},
+        {'name': 'table.rows_updated', 'type': 'rate'},
+        {'name': 'table.live_rows', 'type': 'gauge'},
+        {'name': 'table.dead_rows', 'type': 'gauge'},
+        {'name': 'table.vacuumed', 'type': 'monotonic_count'},
+    ],
+}
+
+
+@pytest.mark.parametrize('batch_size', [None, 1000], ids=['rows', 'batched'])
+def test_query_executor(benchmark, batch_size):
+    rows = [
+        ('db{}'.format(i % 4), 'schema{}'.format(i % 16), 'table{}'.format(i), i, i, i, i, i, i, i)
+        for i in range(20000)
+    ]
+    check = AgentCheck('test', {}, [{}])
+    check.__NAMESPACE__ = 'postgresql'
+
+    executor = QueryExecutor(
+        lambda _: SyntheticCursor(rows), check, queries=[TABLE_STATS_QUERY], tags=['env:prod'], batch_size=batch_size
+    )
+    executor.compile_queries()
+
+    def execute():
+        aggregator.reset()
+        executor.execute()
+
+    benchmark(execute)
+
+
+def generate_activity_rows(count, seed=0):
+    """
+    Generate rows resembling the sessions of an activity snapshot, including the types needing a default encoding.
+    """
+    rng = random.Random(seed)
+    start = datetime.datetime(2024, 1, 1)
+    return [
+        {
+            'pid': i,
+            'datname': 'db{}'.format(i % 8),
+            'usename': 'user{}'.format(i % 4),
+            'application_name': 'app{}'.format(i % 16),
+            'client_addr': '10.0.{}.{}'.format(i // 256 % 256, i % 256),
+            'backend_start': start + datetime.timedelta(seconds=rng.randrange(86400)),
+            'query_start': start + datetime.timedelta(seconds=rng.randrange(86400)),
+            'state': rng.choice(['active', 'idle', 'idle in transaction']),
+            'wait_event_type': rng.choice([None, 'Lock', 'IO', 'Client']),
+            'query_signature': '{:016x}'.format(rng.getrandbits(64)),
+            'statement': 'SELECT * FROM table_{} WHERE id = ? AND name = ?'.format(i % 500) + ' OR x = ?' * (i % 20),
+            'duration': decimal.Decimal(rng.randrange(10**9)) / 1000,
+        }
+        for i in range(count)
+    ]
+
+
+def serialize_whole(event, rows):
+    yield json.dumps(dict(event, postgres_activity=rows), default=default_json_event_encoding)
+
+
+def serialize_chunks(event, rows):
+    return iter_json_event_chunks(event, 'postgres_activity', rows, max_bytes=1024 * 1024)
+
+
+@pytest.mark.parametrize('serialize', [serialize_whole, serialize_chunks], ids=['whole', 'chunks'])
+@pytest.mark.parametrize('row_count', [1000, 20000])
+def test_serialize_activity(benchmark, serialize, row_count):
+    rows = generate_activity_rows(row_count)
+    event = {'host': 'db-host', 'ddsource': 'postgres', 'dbm_type': 'activity', 'ddtags': ['env:prod']}
+
+    def submit():
+        # Payloads are submitted as soon as they are produced, so only one of them is held at a time
+        return [len(payload) for payload in serialize(event, rows)]
+
+    tracemalloc.start()
+    payload_sizes = submit()
+    benchmark.extra_info['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    benchmark.extra_info['payloads'] = len(payload_sizes)
+    benchmark.extra_info['largest_payload_bytes'] = max(payload_sizes)
+
+    benchmark(submit)
@@ -3,6 +3,9 @@
 # Licensed under a 3-clause BSD style license (see LICENSE)
 
 import copy
+import random
+import weakref
+from decimal import Decimal
 
 import pytest
 
@@ -181,3 +184,176 @@ class TestStatementMetrics:
         ]
 
         assert expected_merged_metrics == metrics
+
+    def test_compute_derivative_rows_column_changes(self):
+        sm = StatementMetrics()
+
+        def key(row):
+            return row['query']
+
+        metrics = ['count', 'time']
+        sm.compute_derivative_rows([{'count': 1, 'time': 2, 'query': 'a', 'rows': 4}], metrics, key=key)
+        rows = sm.compute_derivative_rows([{'query': 'a', 'time': 3, 'rows': 7, 'count': 5}], metrics, key=key)
+
+        assert rows == [{'query': 'a', 'time': 1, 'rows': 7, 'count': 4}]
+        assert list(rows[0]) == ['query', 'time', 'rows', 'count']
+
+        # Columns that only some rows have
+        rows = sm.compute_derivative_rows([{'query': 'a', 'time': 4, 'count': 6}], metrics + ['rows'], key=key)
+
+        assert rows == [{'query': 'a', 'time': 1, 'count': 1}]
+
+    def test_compute_derivative_rows_does_not_mutate_rows(self):
+        sm = StatementMetrics()
+
+        def key(row):
+            return row['query']
+
+        rows1 = [{'count': 1, 'query': 'a'}, {'count': 2, 'query': 'a'}]
+        rows2 = [{'count': 2, 'query': 'a'}, {'count': 3, 'query': 'a'}]
+        sm.compute_derivative_rows(rows1, ['count'], key=key)
+
+        assert sm.compute_derivative_rows(rows2, ['count'], key=key) == [{'count': 2, 'query': 'a'}]
+        assert rows1 == [{'count': 1, 'query': 'a'}, {'count': 2, 'query': 'a'}]
+        assert rows2 == [{'count': 2, 'query': 'a'}, {'count': 3, 'query': 'a'}]
+
+    def test_compute_derivative_rows_from_generator(self):
+        sm = StatementMetrics()
+
+        def key(row):
+            return row['query']
+
+        def rows(counts):
+            for query, count in counts:
+                yield {'count': count, 'query': query}
+
+        assert sm.compute_derivative_rows(rows([('a', 1), ('b', 1), ('a', 2)]), ['count'], key=key) == []
+        assert sm.compute_derivative_rows(rows([('a', 2), ('c', 1), ('a', 3), ('b', 1)]), ['count'], key=key) == [
+            {'count': 2, 'query': 'a'}
+        ]
+
+    def test_compute_derivative_rows_keeps_changed_rows_only(self):
+        class Row(dict):
+            # Plain dicts cannot be weakly referenced
+            pass
+
+        sm = StatementMetrics()
+        read_rows = []
+        rows_alive = []
+
+        def key(row):
+            # The rows read before this one that are still referenced
+            rows_alive.append(sum(ref() is not None for ref in read_rows))
+            read_rows.append(weakref.ref(row))
+            return row['query']
+
+        def rows(changed):
+            # Every statement is reported twice in a row
+            for i in range(100):
+                yield Row(query='SELECT {}'.format(i // 2), count=1 + (i in changed))
+
+        assert sm.compute_derivative_rows(rows(()), ['count'], key=key) == []
+        assert max(rows_alive) == 0
+
+        del read_rows[:], rows_alive[:]
+        assert sm.compute_derivative_rows(rows({20, 60}), ['count'], key=key) == [
+            {'query': 'SELECT 10', 'count': 1},
+            {'query': 'SELECT 30', 'count': 1},
+        ]
+        # Only the rows of the 2 changed statements are kept, and that of the statement whose duplicate is next
+        assert max(rows_alive) == 3
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_compute_derivative_rows_matches_row_based_implementation(self, seed):
+        rng = random.Random(seed)
+        metrics = ['calls', 'total_time', 'rows', 'missing']
+        sm = StatementMetrics()
+        reference = RowBasedStatementMetrics()
+
+        def key(row):
+            return row['query_signature'], row['user']
+
+        state = {}
+        for _ in range(5):
+            rows = []
+            for i in range(200):
+                # Some queries come and go, some are duplicates of others after normalization
+                if rng.random() < 0.1:
+                    continue
+
+                row_key = (rng.randrange(150), 'user{}'.format(i % 3))
+                previous = state.get((i, row_key), {'calls': 0, 'total_time': 0.0, 'rows': Decimal(0)})
+                if rng.random() < 0.3:
+                    # Occasionally simulate a stats reset
+                    delta = -1 if rng.random() < 0.05 else rng.randrange(3)
+                    previous = {
+                        'calls': previous['calls'] + delta,
+                        'total_time': previous['total_time'] + rng.random() * delta,
+                        'rows': previous['rows'] + Decimal(delta),
+                    }
+                state[(i, row_key)] = previous
+
+                row = {'query': 'SELECT {}'.format(i), 'query_signature': row_key[0], 'user': row_key[1]}
+                row.update(previous)
+                rows.append(row)
+
+            rng.shuffle(rows)
+            queries_by_key = {}
+            for row in rows:
+                queries_by_key.setdefault(key(row), set()).add(row['query'])
+
+            expected = reference.compute_derivative_rows(copy.deepcopy(rows), metrics, key=key)
+            actual = sm.compute_derivative_rows(rows, metrics, key=key)
+
+            # The non-metric columns of duplicates may come from any of their rows rather than the first one
+            for row in actual:
+                assert row['query'] in queries_by_key[key(row)]
+            assert [dict(row, query=None) for row in actual] == [dict(row, query=None) for row in expected]
+            assert [list(row) for row in actual] == [list(row) for row in expected]
+
+
+class RowBasedStatementMetrics:
+    """
+    The original implementation of `StatementMetrics`, which keeps the entire previous row for every query.
+    """
+
+    def __init__(self):
+        self._previous_statements = {}
+
+    def compute_derivative_rows(self, rows, metrics, key):
+        result = []
+        new_cache = {}
+        metrics = set(metrics)
+
+        queries_by_key = {}
+        for row in rows:
+            merged_row = dict(row)
+            query_key = key(merged_row)
+            if query_key in queries_by_key:
+                merged_state = queries_by_key[query_key]
+                queries_by_key[query_key] = {
+                    k: merged_row[k] + merged_state[k] if k in metrics else merged_state[k] for k in merged_state.keys()
+                }
+            else:
+                queries_by_key[query_key] = merged_row
+
+        for row in queries_by_key.values():
+            row_key = key(row)
+            new_cache[row_key] = row
+
+            prev = self._previous_statements.get(row_key)
+            if prev is None:
+                continue
+
+            metric_columns = metrics & set(row.keys())
+            diffed_row = {k: row[k] - prev[k] if k in metric_columns else row[k] for k in row.keys()}
+            if any(diffed_row[k] < 0 for k in metric_columns):
+                continue
+            if all(diffed_row[k] == 0 for k in metric_columns):
+                continue
+
+            result.append(diffed_row)
+
+        self._previous_statements = new_cache
+
+        return result
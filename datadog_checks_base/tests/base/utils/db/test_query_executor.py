@@ -1,6 +1,13 @@
 # (C) Datadog, Inc. 2022-present
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
 from datadog_checks.base import AgentCheck
 from datadog_checks.base.utils.db import QueryExecutor
 
@@ -149,3 +156,426 @@ class TestQueryExecutor:
 
         for i in range(num_queries):
             aggregator.assert_metric('test.metric.{}'.format(i), i, metric_type=aggregator.GAUGE, tags=tags)
+
+
+class MockCursor(object):
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.fetch_sizes = []
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return tuple(batch)
+
+
+def get_submissions(aggregator):
+    metrics = {name: sorted(stubs, key=repr) for name, stubs in aggregator._metrics.items()}
+    service_checks = {name: sorted(stubs, key=repr) for name, stubs in aggregator._service_checks.items()}
+    return metrics, service_checks
+
+
+class TestBatchedExecution:
+    def test_same_submissions(self, aggregator):
+        queries = [
+            {
+                'name': 'q1',
+                'query': 'select ...',
+                'columns': [
+                    {'name': 'db', 'type': 'tag'},
+                    {'name': 'schema', 'type': 'tag_not_null'},
+                    {'name': 'labels', 'type': 'tag_list'},
+                    None,
+                    {'name': 'size', 'type': 'source'},
+                    {'name': 'table.rows', 'type': 'gauge'},
+                    {'name': 'table.scans', 'type': 'monotonic_count', 'flush_first_value': True},
+                    {'name': 'table.reads', 'type': 'rate', 'raw': True},
+                    {'name': 'table.writes', 'type': 'monotonic_gauge'},
+                    {
+                        'name': 'kind',
+                        'type': 'match',
+                        'source': 'size',
+                        'items': {'heap': {'name': 'table.heap_size', 'type': 'gauge'}},
+                    },
+                    {'name': 'table.status', 'type': 'service_check', 'status_map': {'ok': 'OK'}},
+                ],
+                'extras': [
+                    {'name': 'table.total', 'expression': 'table.rows + size', 'submit_type': 'gauge'},
+                    {'name': 'table.used', 'type': 'percent', 'part': 'table.rows', 'total': 'size'},
+                    {'name': 'table.size', 'type': 'count', 'source': 'size'},
+                ],
+            },
+            {
+                'name': 'q2',
+                'query': 'select ...',
+                'columns': [{'name': 'other.metric', 'type': 'gauge'}, {'name': 'other.count', 'type': 'count'}],
+                'tags': ['query:q2'],
+            },
+        ]
+        rows = {
+            'q1': [
+                ('db{}'.format(i % 2), 'public' if i % 3 else None, 'a,b', 'x', i * 10, i, i * 2, i * 3, i, kind, 'ok')
+                for i, kind in zip(range(1, 8), ['heap', 'index'] * 4)
+            ]
+            + [(), ('too', 'short')],
+            'q2': [(i, None) for i in range(5)],
+        }
+
+        def executor(query):
+            return rows[query]
+
+        queries[0]['query'] = 'q1'
+        queries[1]['query'] = 'q2'
+
+        check = AgentCheck('test', {}, [{}])
+        check.__NAMESPACE__ = 'ns'
+
+        qe = QueryExecutor(executor, check, queries=queries, tags=['global:tag'])
+        qe.compile_queries()
+        qe.execute(extra_tags=['extra:tag'])
+        expected = get_submissions(aggregator)
+        aggregator.reset()
+
+        for batch_size in (1, 2, 100):
+            qe = QueryExecutor(executor, check, queries=queries, tags=['global:tag'], batch_size=batch_size)
+            qe.compile_queries()
+            qe.execute(extra_tags=['extra:tag'])
+
+            assert get_submissions(aggregator) == expected
+            aggregator.reset()
+
+    def test_fetchmany(self, aggregator):
+        queries = [{'name': 'q1', 'query': 'select ...', 'columns': [{'name': 'metric', 'type': 'gauge'}]}]
+        cursor = MockCursor([i] for i in range(5))
+
+        check = AgentCheck('test', {}, [{}])
+        qe = QueryExecutor(lambda _: cursor, check, queries=queries, batch_size=2)
+        qe.compile_queries()
+        qe.execute()
+
+        assert cursor.fetch_sizes == [2, 2, 2, 2]
+        for i in range(5):
+            aggregator.assert_metric('metric', i, count=1)
+
+        aggregator.assert_all_metrics_covered()
+
+    def test_query_error(self, caplog, aggregator):
+        queries = [
+            {'name': 'q1', 'query': 'q1', 'columns': [{'name': 'metric1', 'type': 'gauge'}]},
+            {'name': 'q2', 'query': 'q2', 'columns': [{'name': 'metric2', 'type': 'gauge'}]},
+        ]
+
+        def executor(query):
+            if query == 'q1':
+                raise ValueError('boom')
+
+            return [[1]]
+
+        check = AgentCheck('test', {}, [{}])
+        qe = QueryExecutor(executor, check, queries=queries, batch_size=10)
+        qe.compile_queries()
+
+        with caplog.at_level(logging.ERROR):
+            qe.execute()
+
+        assert 'Error querying q1: boom' in caplog.text
+        aggregator.assert_metric('metric2', 1, count=1)
+        aggregator.assert_all_metrics_covered()
+
+    @pytest.mark.parametrize('batch_size', [0, -1, '10'])
+    def test_invalid_batch_size(self, batch_size):
+        with pytest.raises(ValueError, match='^QueryExecutor batch_size must be a positive integer$'):
+            QueryExecutor(mock_executor(), AgentCheck('test', {}, [{}]), batch_size=batch_size)
+
+
+class MockConnections(object):
+    def __init__(self, executor):
+        self.executor = executor
+        self.opened = 0
+        self.closed = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def __call__(self):
+        with self.lock:
+            self.opened += 1
+
+        def execute(query):
+            with self.lock:
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+
+            try:
+                return self.executor(query)
+            finally:
+                with self.lock:
+                    self.active -= 1
+
+        try:
+            yield execute
+        finally:
+            with self.lock:
+                self.closed += 1
+
+
+def create_queries(count):
+    return [
+        {'name': 'q{}'.format(i), 'query': 'q{}'.format(i), 'columns': [{'name': 'metric', 'type': 'gauge'}]}
+        for i in range(count)
+    ]
+
+
+class TestConcurrentExecution:
+    def test_queries_run_concurrently(self, aggregator):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def executor(query):
+            barrier.wait()
+            return [[int(query[1:])]]
+
+        connections = MockConnections(executor)
+        qe = QueryExecutor(
+            mock_executor(), AgentCheck('test', {}, [{}]), queries=create_queries(3), executor_factory=connections
+        )
+        qe.compile_queries()
+        qe.execute()
+
+        assert connections.max_active == 3
+        for i in range(3):
+            aggregator.assert_metric('metric', i, count=1)
+
+    @pytest.mark.parametrize('batch_size', [None, 2])
+    def test_submission_order(self, aggregator, batch_size):
+        def executor(query):
+            # Make earlier queries finish last
+            time.sleep(0.02 * (4 - int(query[1:])))
+            return [[int(query[1:]) * 10 + i] for i in range(3)]
+
+        qe = QueryExecutor(
+            mock_executor(),
+            AgentCheck('test', {}, [{}]),
+            queries=create_queries(4),
+            executor_factory=MockConnections(executor),
+            batch_size=batch_size,
+        )
+        qe.compile_queries()
+        qe.execute()
+
+        assert [metric.value for metric in aggregator.metrics('metric')] == [
+            0,
+            1,
+            2,
+            10,
+            11,
+            12,
+            20,
+            21,
+            22,
+            30,
+            31,
+            32,
+        ]
+
+    def test_same_submissions(self, aggregator):
+        rows = {'q{}'.format(i): [[i, 'a'], [i * 2, 'b'], [], [i * 3, 'c']] for i in range(10)}
+        queries = [
+            {
+                'name': query,
+                'query': query,
+                'columns': [{'name': 'metric', 'type': 'monotonic_count'}, {'name': 'kind', 'type': 'tag'}],
+                'tags': ['query:{}'.format(query)],
+            }
+            for query in rows
+        ]
+        check = AgentCheck('test', {}, [{}])
+
+        qe = QueryExecutor(rows.get, check, queries=queries, tags=['global:tag'])
+        qe.compile_queries()
+        qe.execute(extra_tags=['extra:tag'])
+        expected = get_submissions(aggregator)
+        aggregator.reset()
+
+        qe = QueryExecutor(
+            mock_executor(),
+            check,
+            queries=queries,
+            tags=['global:tag'],
+            executor_factory=MockConnections(rows.get),
+            max_workers=3,
+        )
+        qe.compile_queries()
+        qe.execute(extra_tags=['extra:tag'])
+
+        assert get_submissions(aggregator) == expected
+
+    def test_bounded_connections(self, aggregator):
+        def executor(query):
+            time.sleep(0.01)
+            return [[1]]
+
+        connections = MockConnections(executor)
+        qe = QueryExecutor(
+            mock_executor(),
+            AgentCheck('test', {}, [{}]),
+            queries=create_queries(12),
+            executor_factory=connections,
+            max_workers=2,
+        )
+        qe.compile_queries()
+        qe.execute()
+
+        assert connections.max_active <= 2
+        assert 1 <= connections.opened <= 2
+        assert connections.closed == 0
+        aggregator.assert_metric('metric', 1, count=12)
+
+    def test_connections_reused(self, aggregator):
+        connections = MockConnections(lambda query: [[1]])
+        qe = QueryExecutor(
+            mock_executor(),
+            AgentCheck('test', {}, [{}]),
+            queries=create_queries(6),
+            executor_factory=connections,
+            max_workers=2,
+        )
+        qe.compile_queries()
+        qe.execute()
+        pool = qe._pool
+        opened = connections.opened
+
+        for _ in range(3):
+            qe.execute()
+
+        assert qe._pool is pool
+        assert connections.opened == opened
+        assert connections.closed == 0
+        aggregator.assert_metric('metric', 1, count=24)
+
+        qe.close()
+        assert qe._pool is None
+        assert connections.closed == opened
+
+        # Closing is not final, the next run reconnects
+        qe.execute()
+        assert connections.opened > opened
+        aggregator.assert_metric('metric', 1, count=30)
+        qe.close()
+        assert connections.closed == connections.opened
+
+    def test_query_error(self, caplog, aggregator):
+        def executor(query):
+            if query == 'q1':
+                raise ValueError('boom {}'.format(query))
+
+            return [[int(query[1:])]]
+
+        connections = MockConnections(executor)
+        qe = QueryExecutor(
+            mock_executor(),
+            AgentCheck('test', {}, [{}]),
+            queries=create_queries(3),
+            error_handler=lambda error: error.replace('boom', 'sanitized'),
+            executor_factory=connections,
+        )
+        qe.compile_queries()
+
+        with caplog.at_level(logging.ERROR):
+            qe.execute()
+
+        assert 'Error querying q1: sanitized q1' in caplog.text
+        aggregator.assert_metric('metric', 0, count=1)
+        aggregator.assert_metric('metric', 2, count=1)
+        aggregator.assert_all_metrics_covered()
+
+        # Only the connection the query failed on is closed
+        assert connections.closed == 1
+        assert len(qe._connections) == connections.opened - 1
+
+        qe.close()
+        assert connections.closed == connections.opened
+
+    def test_connection_error(self, caplog, aggregator):
+        @contextmanager
+        def executor_factory():
+            raise ConnectionError('unreachable')
+            yield  # pragma: no cover
+
+        qe = QueryExecutor(
+            mock_executor(), AgentCheck('test', {}, [{}]), queries=create_queries(2), executor_factory=executor_factory
+        )
+        qe.compile_queries()
+
+        with caplog.at_level(logging.ERROR):
+            qe.execute()
+
+        assert 'Error querying q0: unreachable' in caplog.text
+        assert 'Error querying q1: unreachable' in caplog.text
+        aggregator.assert_all_metrics_covered()
+
+    def test_operation_time(self, aggregator):
+        def executor(query):
+            # Make earlier queries finish last
+            time.sleep(0.02 * (3 - int(query[1:])))
+            return [[1]]
+
+        submitting_threads = []
+
+        class Check(AgentCheck):
+            def histogram(self, *args, **kwargs):
+                submitting_threads.append(threading.current_thread())
+                super(Check, self).histogram(*args, **kwargs)
+
+        qe = QueryExecutor(
+            mock_executor(),
+            Check('test', {}, [{}]),
+            queries=create_queries(3),
+            executor_factory=MockConnections(executor),
+            track_operation_time=True,
+        )
+        qe.compile_queries()
+        qe.execute()
+
+        # Durations are submitted by the calling thread, in query order
+        assert [metric.tags for metric in aggregator.metrics('dd.test.operation.time')] == [
+            ['operation:q0'],
+            ['operation:q1'],
+            ['operation:q2'],
+        ]
+        assert submitting_threads == [threading.current_thread()] * 3
+
+    def test_bounded_buffering(self, aggregator):
+        lock = threading.Lock()
+        fetched = []
+        buffered = []
+
+        def executor(query):
+            with lock:
+                fetched.append(query)
+            return [[int(query[1:])]]
+
+        class Check(AgentCheck):
+            def gauge(self, *args, **kwargs):
+                # Results fetched but not processed yet, the current one included
+                with lock:
+                    buffered.append(len(fetched) - len(buffered))
+                super(Check, self).gauge(*args, **kwargs)
+
+        qe = QueryExecutor(
+            mock_executor(),
+            Check('test', {}, [{}]),
+            queries=create_queries(10),
+            executor_factory=MockConnections(executor),
+            max_workers=2,
+        )
+        qe.compile_queries()
+        qe.execute()
+
+        assert len(buffered) == 10
+        assert max(buffered) <= 3
+
+    @pytest.mark.parametrize('max_workers', [0, -1, '4'])
+    def test_invalid_max_workers(self, max_workers):
+        with pytest.raises(ValueError, match='^QueryExecutor max_workers must be a positive integer$'):
+            QueryExecutor(mock_executor(), AgentCheck('test', {}, [{}]), max_workers=max_workers)
@@ -0,0 +1,58 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import datetime
+import decimal
+import json
+
+import pytest
+
+from datadog_checks.base.utils.db.serialization import dumps_json_event, iter_json_event_chunks
+
+
+def test_dumps_json_event():
+    payload = dumps_json_event({'value': decimal.Decimal('1.5'), 'at': datetime.date(2020, 1, 1), 'raw': b'text'})
+    assert isinstance(payload, bytes)
+    assert json.loads(payload) == {'value': 1.5, 'at': '2020-01-01', 'raw': 'text'}
+
+
+def test_iter_json_event_chunks_single_payload():
+    rows = [{'id': i, 'query': 'SELECT {}'.format(i)} for i in range(10)]
+    payloads = list(iter_json_event_chunks({'host': 'db', 'tags': ['a:b']}, 'rows', rows))
+
+    assert len(payloads) == 1
+    assert json.loads(payloads[0]) == {'host': 'db', 'tags': ['a:b'], 'rows': rows}
+
+
+@pytest.mark.parametrize('max_bytes', [100, 1000, 5000])
+def test_iter_json_event_chunks_split(max_bytes):
+    rows = [{'id': i, 'query': 'SELECT {}'.format(i)} for i in range(250)]
+    payloads = list(iter_json_event_chunks({'host': 'db'}, 'rows', iter(rows), max_bytes=max_bytes))
+
+    assert len(payloads) > 1
+    assert all(len(payload) <= max_bytes for payload in payloads)
+
+    events = [json.loads(payload) for payload in payloads]
+    assert all(event['host'] == 'db' for event in events)
+    assert [row for event in events for row in event['rows']] == rows
+
+
+def test_iter_json_event_chunks_exact_fit():
+    rows = [{'id': i} for i in range(4)]
+    full_size = len(next(iter_json_event_chunks({'host': 'db'}, 'rows', rows)))
+
+    assert len(list(iter_json_event_chunks({'host': 'db'}, 'rows', rows, max_bytes=full_size))) == 1
+    assert len(list(iter_json_event_chunks({'host': 'db'}, 'rows', rows, max_bytes=full_size - 1))) == 2
+
+
+def test_iter_json_event_chunks_oversized_row():
+    rows = [{'id': 1}, {'id': 2, 'query': 'x' * 500}, {'id': 3}]
+    events = [json.loads(payload) for payload in iter_json_event_chunks({}, 'rows', rows, max_bytes=100)]
+
+    assert events == [{'rows': [rows[0]]}, {'rows': [rows[1]]}, {'rows': [rows[2]]}]
+
+
+def test_iter_json_event_chunks_no_rows():
+    payloads = list(iter_json_event_chunks({'host': 'db'}, 'rows', []))
+
+    assert [json.loads(payload) for payload in payloads] == [{'host': 'db', 'rows': []}]
@@ -4,6 +4,7 @@
 # Licensed under a 3-clause BSD style license (see LICENSE)
 import datetime
 import decimal
+import logging
 import time
 from concurrent.futures.thread import ThreadPoolExecutor
 from ipaddress import IPv4Address
@@ -14,8 +15,10 @@ import pytest
 from datadog_checks.base import AgentCheck
 from datadog_checks.base.stubs.datadog_agent import datadog_agent
 from datadog_checks.base.utils.db.utils import (
+    AdaptiveRateLimiter,
     ConstantRateLimiter,
     DBMAsyncJob,
+    ObfuscationCache,
     RateLimitingTTLCache,
     default_json_event_encoding,
     obfuscate_sql_with_metadata,
@@ -59,6 +62,50 @@ def test_constant_rate_limiter():
     assert max_expected_count - 1 <= sleep_count <= max_expected_count + 1
 
 
+def test_adaptive_rate_limiter_update():
+    ratelimiter = AdaptiveRateLimiter(10, max_backoff=4)
+    assert ratelimiter.period_s == 0.1
+
+    # overrunning the period backs off past the duration of the run, up to the maximum
+    ratelimiter.update(0.15)
+    assert ratelimiter.period_s == 0.3
+    ratelimiter.update(0.35)
+    assert ratelimiter.period_s == 0.4
+
+    # a saturated database keeps the period up even though runs are cheap
+    ratelimiter.update(0.01, load=0.9)
+    assert ratelimiter.period_s == 0.4
+
+    # runs that are neither cheap nor overrunning leave the period as is
+    ratelimiter.update(0.3)
+    assert ratelimiter.period_s == 0.4
+
+    # cheap runs on an idle database shrink the period back to the configured rate
+    ratelimiter.update(0.01, load=0.1)
+    assert ratelimiter.period_s == 0.2
+    ratelimiter.update(0.01)
+    ratelimiter.update(0.01)
+    assert ratelimiter.period_s == 0.1
+
+
+def test_adaptive_rate_limiter_sleep():
+    ratelimiter = AdaptiveRateLimiter(10)
+    with mock.patch('time.sleep') as sleep, mock.patch('time.time', side_effect=[100, 100.04, 100.1]):
+        ratelimiter.sleep()
+        ratelimiter.sleep()
+    sleep.assert_called_once_with(pytest.approx(0.06))
+    assert ratelimiter.lag_s == 0
+    assert ratelimiter.skipped == 0
+
+    # a run that is late by more than a period is started right away, skipping the missed ones
+    with mock.patch('time.sleep') as sleep, mock.patch('time.time', side_effect=[100.45, 100.45]):
+        ratelimiter.sleep()
+    sleep.assert_not_called()
+    assert ratelimiter.lag_s == pytest.approx(0.25)
+    assert ratelimiter.skipped == 2
+    assert ratelimiter.last_event == 100.45
+
+
 def test_ratelimiting_ttl_cache():
     ttl = 0.1
     cache = RateLimitingTTLCache(maxsize=5, ttl=ttl)
@@ -169,8 +216,120 @@ def test_obfuscate_sql_with_metadata(obfuscator_return_value, expected_value):
     assert statement['metadata'] == {}
 
 
+@pytest.fixture
+def obfuscation_cache():
+    cache = ObfuscationCache(max_size=3, max_bytes=1000)
+    with mock.patch('datadog_checks.base.utils.db.utils.obfuscation_cache', cache):
+        yield cache
+
+
+def test_obfuscation_cache_other_obfuscator(obfuscation_cache):
+    assert obfuscate_sql_with_metadata('SELECT 1') == {'query': 'SELECT 1', 'metadata': {}}
+    assert obfuscate_sql_with_metadata('SELECT 1') == {'query': 'SELECT 1', 'metadata': {}}
+    assert obfuscation_cache.pop_stats() == (1, 1)
+
+    # Results of the previous obfuscator are not reused
+    with mock.patch.object(datadog_agent, 'obfuscate_sql', passthrough=True) as mock_agent:
+        mock_agent.return_value = 'SELECT ?'
+        assert obfuscate_sql_with_metadata('SELECT 1') == {'query': 'SELECT ?', 'metadata': {}}
+        assert obfuscate_sql_with_metadata('SELECT 1') == {'query': 'SELECT ?', 'metadata': {}}
+
+    assert mock_agent.call_count == 1
+    assert obfuscation_cache.pop_stats() == (1, 1)
+
+    assert obfuscate_sql_with_metadata('SELECT 1') == {'query': 'SELECT 1', 'metadata': {}}
+    assert obfuscation_cache.pop_stats() == (0, 1)
+
+
+def test_obfuscate_sql_with_metadata_cached(obfuscation_cache):
+    options = '{"return_json_metadata": true}'
+    return_value = json.dumps({'query': 'SELECT * FROM datadog', 'metadata': {'tables_csv': 'datadog'}})
+
+    with mock.patch.object(datadog_agent, 'obfuscate_sql', passthrough=True) as mock_agent:
+        mock_agent.return_value = return_value
+        first = obfuscate_sql_with_metadata('SELECT * FROM datadog', options)
+        first['metadata']['tables'] = None
+        second = obfuscate_sql_with_metadata('SELECT * FROM datadog', options)
+        # Different options are cached separately
+        obfuscate_sql_with_metadata('SELECT * FROM datadog', None)
+
+    assert second == {'query': 'SELECT * FROM datadog', 'metadata': {'tables': ['datadog']}}
+    assert mock_agent.call_count == 2
+    assert obfuscation_cache.hits == 1
+    assert obfuscation_cache.misses == 2
+    assert len(obfuscation_cache) == 2
+
+
+def test_obfuscate_sql_with_metadata_not_cached():
+    cache = ObfuscationCache(enabled=False)
+    with mock.patch.object(datadog_agent, 'obfuscate_sql', passthrough=True) as mock_agent:
+        mock_agent.return_value = 'SELECT ?'
+        for _ in range(2):
+            assert obfuscate_sql_with_metadata('SELECT 1', cache=cache) == {'query': 'SELECT ?', 'metadata': {}}
+
+    assert mock_agent.call_count == 2
+    assert len(cache) == 0
+
+
+def test_obfuscate_sql_with_metadata_injected_cache(obfuscation_cache):
+    cache = ObfuscationCache()
+    for _ in range(2):
+        obfuscate_sql_with_metadata('SELECT 1', cache=cache)
+
+    assert cache.pop_stats() == (1, 1)
+    assert len(cache) == 1
+    assert obfuscation_cache.pop_stats() == (0, 0)
+
+
+def test_obfuscation_cache_eviction():
+    cache = ObfuscationCache(max_size=3, max_bytes=100)
+    for i in range(3):
+        cache.set(('query{}'.format(i), None), {'query': str(i)}, 10)
+
+    # Least recently used entries are evicted first
+    cache.get(('query0', None))
+    cache.set(('query3', None), {'query': '3'}, 10)
+    assert cache.get(('query1', None)) is None
+    assert cache.get(('query0', None)) == {'query': '0'}
+    assert len(cache) == 3
+    assert cache.bytes == 30
+
+    cache.set(('query4', None), {'query': '4'}, 90)
+    assert len(cache) == 2
+    assert cache.bytes == 100
+    assert cache.get(('query0', None)) == {'query': '0'}
+
+    # Entries larger than the cache are never stored
+    cache.set(('query5', None), {'query': '5'}, 101)
+    assert cache.get(('query5', None)) is None
+    assert cache.bytes == 100
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.bytes == 0
+
+
+def test_obfuscation_cache_threads():
+    cache = ObfuscationCache(max_size=50, max_bytes=1000)
+
+    def use_cache(worker):
+        for i in range(1000):
+            key = ('query{}'.format((i * worker) % 100), None)
+            if cache.get(key) is None:
+                cache.set(key, {'query': key[0]}, 10)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(use_cache, range(1, 9)))
+
+    assert cache.hits + cache.misses == 8000
+    assert len(cache) <= 50
+    assert cache.bytes == 10 * len(cache)
+
+
 class TestJob(DBMAsyncJob):
-    def __init__(self, check, run_sync=False, enabled=True, rate_limit=10, min_collection_interval=15):
+    def __init__(
+        self, check, run_sync=False, enabled=True, rate_limit=10, min_collection_interval=15, adaptive_scheduling=False
+    ):
         super(TestJob, self).__init__(
             check,
             run_sync=run_sync,
@@ -182,6 +341,7 @@ class TestJob(DBMAsyncJob):
             rate_limit=rate_limit,
             job_name="test-job",
             shutdown_callback=self.test_shutdown,
+            adaptive_scheduling=adaptive_scheduling,
         )
 
     def test_shutdown(self):
@@ -254,6 +414,32 @@ def test_dbm_async_job_rate_limit(aggregator):
     assert max_collections / 2.0 <= len(metrics) <= max_collections
 
 
+def test_dbm_async_job_adaptive_scheduling(aggregator):
+    job = TestJob(AgentCheck(), run_sync=True, rate_limit=10, adaptive_scheduling=True)
+    with mock.patch.object(job, 'get_db_load', return_value=0.95):
+        job.run_job_loop(['hello:there'])
+
+    tags = ['hello:there', 'job:test-job']
+    aggregator.assert_metric("dbm.async_job_test.run_job")
+    aggregator.assert_metric("dd.test-dbms.async_job.duration", tags=tags, count=1)
+    aggregator.assert_metric("dd.test-dbms.async_job.lag", 0, tags=tags)
+    aggregator.assert_metric("dd.test-dbms.async_job.interval", 200, tags=tags)
+    aggregator.assert_metric("dd.test-dbms.async_job.skipped", 0, tags=tags)
+
+
+def test_dbm_async_job_adaptive_scheduling_load_error(aggregator, caplog):
+    job = TestJob(AgentCheck(), run_sync=True, rate_limit=10, adaptive_scheduling=True)
+    with mock.patch.object(job, 'get_db_load', side_effect=Exception('connection lost')):
+        with caplog.at_level(logging.WARNING):
+            job.run_job_loop(['hello:there'])
+
+    # The run still completes and is scheduled on its duration alone
+    tags = ['hello:there', 'job:test-job']
+    assert 'Failed to get the database load: connection lost' in caplog.text
+    aggregator.assert_metric("dbm.async_job_test.run_job")
+    aggregator.assert_metric("dd.test-dbms.async_job.interval", 100, tags=tags)
+
+
 def test_dbm_async_job_inactive_stop(aggregator):
     job = TestJob(AgentCheck(), rate_limit=10, min_collection_interval=1)
     job.run_job_loop([])
@@ -290,3 +476,26 @@ def test_tracked_query(aggregator):
         aggregator.assert_metric(
             "dd.testcheck.operation.time", tags=["test:tag", "operation:test_query"], count=1, value=1000.0
         )
+
+
+def test_dbm_async_job_obfuscation_cache_metrics(aggregator):
+    cache = ObfuscationCache()
+    cache.set(('SELECT 1', None), {'query': 'SELECT ?', 'metadata': {}}, 16)
+    cache.get(('SELECT 1', None))
+    cache.get(('SELECT 2', None))
+
+    with mock.patch('datadog_checks.base.utils.db.utils.obfuscation_cache', cache):
+        job = TestJob(AgentCheck(), run_sync=True)
+        job.run_job_loop(['hello:there'])
+        # Lookups of the process-wide cache are not attributed to the instance of the job reporting them
+        aggregator.assert_metric('dd.dbm.obfuscation_cache.hits', 1, tags=[])
+        aggregator.assert_metric('dd.dbm.obfuscation_cache.misses', 1, tags=[])
+        aggregator.assert_metric('dd.dbm.obfuscation_cache.entries', 1, tags=[])
+        aggregator.assert_metric('dd.dbm.obfuscation_cache.bytes', 16, tags=[])
+
+        # Only the lookups made since the previous run are reported
+        aggregator.reset()
+        cache.get(('SELECT 1', None))
+        job.run_job_loop(['hello:there'])
+        aggregator.assert_metric('dd.dbm.obfuscation_cache.hits', 1, tags=[])
+        aggregator.assert_metric('dd.dbm.obfuscation_cache.misses', 0, tags=[])
@@ -1108,6 +1108,17 @@ def test_template_recursion():
             #   - <INCLUDE_REGEX>
             #   exclude:
             #   - <EXCLUDE_REGEX>
+
+            ## @param normalization_cache_size - integer - optional - default: 0
+            ## The maximum number of distinct sets of tags, and separately of metric names, whose normalized
+            ## form is memoized. This saves time for checks submitting the same metrics every run,
+            ## set to 0 to disable it.
+            ##
+            ## The hits, misses and size of both caches are submitted every run as the
+            ## `datadog.agent.metrics.normalization_cache.<tags|names>.<hits|misses|size>` gauges
+            ## when `normalization_cache` is set to true in the `debug_metrics` option.
+            #
+            # normalization_cache_size: 0
         """
     )
 
@@ -48,6 +48,7 @@ class InstanceConfig(BaseModel):
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
     name: Optional[str] = None
+    normalization_cache_size: Optional[int] = None
     pattern: Optional[str] = None
     recursive: Optional[bool] = None
     service: Optional[str] = None
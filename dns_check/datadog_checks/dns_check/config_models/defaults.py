@@ -28,6 +28,10 @@ def instance_nameserver_port():
     return 53
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_record_type():
     return 'A'
 
@@ -42,6 +42,7 @@ class InstanceConfig(BaseModel):
     name: Optional[str] = None
     nameserver: Optional[str] = None
     nameserver_port: Optional[int] = None
+    normalization_cache_size: Optional[int] = None
     record_type: Optional[str] = None
     resolves_as: Optional[str] = None
     service: Optional[str] = None
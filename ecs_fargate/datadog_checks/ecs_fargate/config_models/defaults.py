@@ -52,6 +52,10 @@ def instance_min_collection_interval():
     return 20
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_persist_connections():
     return False
 
@@ -84,6 +84,10 @@ def instance_node_name_as_host():
     return False
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_pending_task_stats():
     return True
 
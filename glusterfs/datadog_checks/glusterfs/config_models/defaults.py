@@ -24,5 +24,9 @@ def instance_min_collection_interval():
     return 60
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_use_sudo():
     return True
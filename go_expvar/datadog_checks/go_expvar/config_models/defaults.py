@@ -56,6 +56,10 @@ def instance_namespace():
     return 'go_expvar'
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_persist_connections():
     return False
 
@@ -89,6 +89,7 @@ class InstanceConfig(BaseModel):
     metrics: Optional[tuple[Metric, ...]] = None
     min_collection_interval: Optional[float] = None
     namespace: Optional[str] = None
+    normalization_cache_size: Optional[int] = None
     ntlm_domain: Optional[str] = None
     password: Optional[str] = None
     persist_connections: Optional[bool] = None
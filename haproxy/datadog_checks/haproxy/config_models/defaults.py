@@ -60,6 +60,14 @@ def instance_collect_status_metrics_by_host():
     return False
 
 
+def instance_concurrent_scrapes():
+    return False
+
+
+def instance_concurrent_scrapes_max_workers():
+    return 8
+
+
 def instance_count_status_by_service():
     return True
 
@@ -108,6 +116,10 @@ def instance_kerberos_force_initiate():
     return False
 
 
+def instance_label_cache_size():
+    return 0
+
+
 def instance_log_requests():
     return False
 
@@ -120,6 +132,10 @@ def instance_non_cumulative_histogram_buckets():
     return False
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_persist_connections():
     return False
 
@@ -200,6 +216,10 @@ def instance_use_legacy_auth_encoding():
     return True
 
 
+def instance_use_native_parser():
+    return False
+
+
 def instance_use_openmetrics():
     return False
 
@@ -210,3 +230,7 @@ def instance_use_process_start_time():
 
 def instance_use_prometheus():
     return False
+
+
+def instance_use_protobuf():
+    return False
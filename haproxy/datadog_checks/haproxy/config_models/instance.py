@@ -127,6 +127,8 @@ class InstanceConfig(BaseModel):
     collect_histogram_buckets: Optional[bool] = None
     collect_status_metrics: Optional[bool] = None
     collect_status_metrics_by_host: Optional[bool] = None
+    concurrent_scrapes: Optional[bool] = None
+    concurrent_scrapes_max_workers: Optional[int] = None
     connect_timeout: Optional[float] = None
     count_status_by_service: Optional[bool] = None
     disable_generic_tags: Optional[bool] = None
@@ -156,6 +158,7 @@ class InstanceConfig(BaseModel):
     kerberos_hostname: Optional[str] = None
     kerberos_keytab: Optional[str] = None
     kerberos_principal: Optional[str] = None
+    label_cache_size: Optional[int] = None
     label_joins: Optional[LabelJoins] = None
     label_to_hostname: Optional[str] = None
     labels_mapper: Optional[MappingProxyType[str, Any]] = None
@@ -165,6 +168,7 @@ class InstanceConfig(BaseModel):
     min_collection_interval: Optional[float] = None
     namespace: Optional[str] = Field(None, pattern='\\w*')
     non_cumulative_histogram_buckets: Optional[bool] = None
+    normalization_cache_size: Optional[int] = None
     ntlm_domain: Optional[str] = None
     openmetrics_endpoint: Optional[str] = None
     password: Optional[str] = None
@@ -207,9 +211,11 @@ class InstanceConfig(BaseModel):
     url: Optional[str] = None
     use_latest_spec: Optional[bool] = None
     use_legacy_auth_encoding: Optional[bool] = None
+    use_native_parser: Optional[bool] = None
     use_openmetrics: Optional[bool] = None
     use_process_start_time: Optional[bool] = None
     use_prometheus: Optional[bool] = None
+    use_protobuf: Optional[bool] = None
     username: Optional[str] = None
 
     @model_validator(mode='before')
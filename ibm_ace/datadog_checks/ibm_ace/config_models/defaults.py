@@ -28,6 +28,10 @@ def instance_mqcd_version():
     return 9
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_persist_connections():
     return False
 
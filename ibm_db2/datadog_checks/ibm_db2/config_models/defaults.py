@@ -24,6 +24,10 @@ def instance_min_collection_interval():
     return 15
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_only_custom_queries():
     return False
 
@@ -55,6 +55,7 @@ class InstanceConfig(BaseModel):
     host: Optional[str] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     only_custom_queries: Optional[bool] = None
     password: str
     port: Optional[int] = None
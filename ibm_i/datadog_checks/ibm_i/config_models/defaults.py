@@ -28,6 +28,10 @@ def instance_min_collection_interval():
     return 15
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_queries():
     return [
         {'name': 'disk_usage'},
@@ -59,6 +59,7 @@ class InstanceConfig(BaseModel):
     message_queue_info: Optional[MessageQueueInfo] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     password: Optional[str] = None
     queries: Optional[tuple[Query, ...]] = None
     query_timeout: Optional[int] = Field(None, gt=0)
@@ -52,6 +52,10 @@ def instance_mqcd_version():
     return 6
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_override_hostname():
     return False
 
@@ -87,6 +87,7 @@ class InstanceConfig(BaseModel):
     log_requests: Optional[bool] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     ntlm_domain: Optional[str] = None
     only_custom_queries: Optional[bool] = None
     password: Optional[str] = None
@@ -117,6 +117,7 @@ class InstanceConfig(BaseModel):
     metrics: Optional[MappingProxyType[str, Metrics]] = None
     min_collection_interval: Optional[float] = None
     namespace: Optional[str] = Field(None, pattern='\\w*')
+    normalization_cache_size: Optional[int] = None
     password: Optional[str] = None
     server: Optional[str] = None
     server_tag: Optional[str] = None
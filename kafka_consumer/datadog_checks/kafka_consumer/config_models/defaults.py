@@ -40,6 +40,10 @@ def instance_monitor_unlisted_consumer_groups():
     return False
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_sasl_kerberos_principal():
     return 'kafkaclient'
 
@@ -57,6 +57,7 @@ class InstanceConfig(BaseModel):
     min_collection_interval: Optional[float] = None
     monitor_all_broker_highwatermarks: Optional[bool] = None
     monitor_unlisted_consumer_groups: Optional[bool] = None
+    normalization_cache_size: Optional[int] = None
     sasl_kerberos_domain_name: Optional[str] = None
     sasl_kerberos_keytab: Optional[str] = None
     sasl_kerberos_principal: Optional[str] = None
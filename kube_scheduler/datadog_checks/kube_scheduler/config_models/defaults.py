@@ -76,6 +76,10 @@ def instance_namespace():
     return 'service'
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_persist_connections():
     return False
 
@@ -22,3 +22,7 @@ def instance_include_interrupt_metrics():
 
 def instance_min_collection_interval():
     return 15
+
+
+def instance_normalization_cache_size():
+    return 0
@@ -39,6 +39,7 @@ class InstanceConfig(BaseModel):
     include_interrupt_metrics: Optional[bool] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     service: Optional[str] = None
     tags: Optional[tuple[str, ...]] = None
 
@@ -41,6 +41,7 @@ class InstanceConfig(BaseModel):
     metric_patterns: Optional[MetricPatterns] = None
     metric_whitelist: Optional[tuple[str, ...]] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     service: Optional[str] = None
     stream_path: Optional[str] = None
     streams_count: Optional[int] = None
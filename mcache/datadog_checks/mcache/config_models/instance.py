@@ -39,6 +39,7 @@ class InstanceConfig(BaseModel):
     empty_default_hostname: Optional[bool] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     options: Optional[MappingProxyType[str, Any]] = None
     password: Optional[str] = None
     port: Optional[int] = None
@@ -116,6 +116,7 @@ class MySQLActivity(DBMAsyncJob):
             rate_limit=1 / float(self.collection_interval),
             job_name="query-activity",
             shutdown_callback=self._close_db_conn,
+            adaptive_scheduling=config.adaptive_job_scheduling,
         )
         self._check = check
         self._config = config
@@ -8,6 +8,10 @@
 #     ddev -x validate models -s <INTEGRATION_NAME>
 
 
+def instance_adaptive_job_scheduling():
+    return False
+
+
 def instance_connect_timeout():
     return 10
 
@@ -44,6 +48,10 @@ def instance_min_collection_interval():
     return 15
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_only_custom_queries():
     return False
 
@@ -129,6 +129,7 @@ class QueryMetrics(BaseModel):
     )
     collection_interval: Optional[float] = None
     enabled: Optional[bool] = None
+    stream_rows: Optional[bool] = None
 
 
 class QuerySamples(BaseModel):
@@ -168,6 +169,7 @@ class InstanceConfig(BaseModel):
         arbitrary_types_allowed=True,
         frozen=True,
     )
+    adaptive_job_scheduling: Optional[bool] = None
     additional_status: Optional[tuple[MappingProxyType[str, Any], ...]] = None
     additional_variable: Optional[tuple[MappingProxyType[str, Any], ...]] = None
     aws: Optional[Aws] = None
@@ -188,6 +190,7 @@ class InstanceConfig(BaseModel):
     max_custom_queries: Optional[int] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     obfuscator_options: Optional[ObfuscatorOptions] = None
     only_custom_queries: Optional[bool] = None
     options: Optional[Options] = None
@@ -22,6 +22,517 @@ def _are_values_numeric(array):
     return all(v.isdigit() for v in array)
 
 
+def _split_row(line):
+    return [item.strip(',').strip(';').strip('[').strip(']') for item in INNODB_STATUS_ROW_SEPARATOR.split(line)]
+
+
+def _starts_with(text):
+    return re.escape(text)
+
+
+def _contains(text):
+    # Same as `line.find(text) > 0`
+    return '(?!{0}).+?{0}'.format(re.escape(text))
+
+
+INNODB_STATUS_ROW_SEPARATOR = re.compile(' +')
+INNODB_STATUS_SECTION_HEADER = re.compile('[A-Z][A-Z/ ]+$')
+INNODB_STATUS_END = 'END OF INNODB MONITOR OUTPUT'
+
+# Lines repeated for every transaction are parsed directly, instead of being tokenized
+TABLES_IN_USE_PATTERN = re.compile(r'mysql tables in use (\d+), locked (\d+)$')
+LOCK_STRUCTS_PATTERN = re.compile(r'(LOCK WAIT |ROLLING BACK )?(\d+) lock struct\(s\)')
+
+# Every rule matches the beginning of a line of the InnoDB status and names the `InnoDBStatusParser` method
+# handling it, along with the sections it is looked for in. Rules are tried in order and the first match wins.
+# This is heavily inspired by the Percona monitoring plugins work
+INNODB_STATUS_RULES = (
+    # Only needed when the individual buffer pools are not in their own section
+    ('_buffer_pool', _starts_with('---BUFFER POOL'), ()),
+    # SEMAPHORES
+    ('_mutex_spin_waits', _starts_with('Mutex spin waits'), ('SEMAPHORES',)),
+    ('_rw_shared_spins', _starts_with('RW-shared spins'), ('SEMAPHORES',)),
+    ('_rw_excl_spins', _starts_with('RW-excl spins'), ('SEMAPHORES',)),
+    ('_semaphore_wait', _contains('seconds the semaphore:'), ('SEMAPHORES',)),
+    # TRANSACTIONS
+    ('_trx_id_counter', _starts_with('Trx id counter'), ('TRANSACTIONS',)),
+    ('_history_list_length', _starts_with('History list length'), ('TRANSACTIONS',)),
+    ('_transaction', _starts_with('---TRANSACTION'), ('TRANSACTIONS',)),
+    ('_read_views', _contains('read views open inside InnoDB'), ('TRANSACTIONS', 'ROW OPERATIONS')),
+    ('_tables_in_use', _starts_with('mysql tables in use'), ('TRANSACTIONS',)),
+    ('_lock_structs', _contains('lock struct(s)'), ('TRANSACTIONS',)),
+    # FILE I/O
+    ('_os_file_reads', _contains(' OS file reads, '), ('FILE I/O',)),
+    ('_pending_normal_aio', _starts_with('Pending normal aio reads:'), ('FILE I/O',)),
+    ('_pending_ibuf_aio', _starts_with('ibuf aio reads'), ('FILE I/O',)),
+    ('_pending_flushes', _starts_with('Pending flushes (fsync)'), ('FILE I/O',)),
+    # INSERT BUFFER AND ADAPTIVE HASH INDEX
+    ('_ibuf_for_space', _starts_with('Ibuf for space 0: size '), ('INSERT BUFFER AND ADAPTIVE HASH INDEX',)),
+    ('_ibuf', _starts_with('Ibuf: size '), ('INSERT BUFFER AND ADAPTIVE HASH INDEX',)),
+    ('_ibuf_merged_operations', _contains(', delete mark '), ('INSERT BUFFER AND ADAPTIVE HASH INDEX',)),
+    ('_ibuf_merged_recs', _contains(' merged recs, '), ('INSERT BUFFER AND ADAPTIVE HASH INDEX',)),
+    ('_hash_table_size', _starts_with('Hash table size '), ('INSERT BUFFER AND ADAPTIVE HASH INDEX',)),
+    # LOG
+    ('_log_writes', _contains(" log i/o's done, "), ('LOG',)),
+    ('_pending_log_writes', _contains(' pending log writes, '), ('LOG',)),
+    ('_lsn_current', _starts_with('Log sequence number'), ('LOG',)),
+    ('_lsn_flushed', _starts_with('Log flushed up to'), ('LOG',)),
+    ('_lsn_last_checkpoint', _starts_with('Last checkpoint at'), ('LOG',)),
+    # BUFFER POOL AND MEMORY
+    ('_mem_total', _starts_with('Total memory allocated'), ('BUFFER POOL AND MEMORY',)),
+    ('_mem_adaptive_hash', _starts_with('Adaptive hash index '), ('BUFFER POOL AND MEMORY',)),
+    ('_mem_page_hash', _starts_with('Page hash           '), ('BUFFER POOL AND MEMORY',)),
+    ('_mem_dictionary', _starts_with('Dictionary cache    '), ('BUFFER POOL AND MEMORY',)),
+    ('_mem_file_system', _starts_with('File system         '), ('BUFFER POOL AND MEMORY',)),
+    ('_mem_lock_system', _starts_with('Lock system         '), ('BUFFER POOL AND MEMORY',)),
+    ('_mem_recovery_system', _starts_with('Recovery system     '), ('BUFFER POOL AND MEMORY',)),
+    ('_mem_thread_hash', _starts_with('Threads             '), ('BUFFER POOL AND MEMORY',)),
+    ('_buffer_pool_size', _starts_with('Buffer pool size '), ('BUFFER POOL AND MEMORY',)),
+    ('_free_buffers', _starts_with('Free buffers'), ('BUFFER POOL AND MEMORY',)),
+    ('_database_pages', _starts_with('Database pages'), ('BUFFER POOL AND MEMORY',)),
+    ('_modified_db_pages', _starts_with('Modified db pages'), ('BUFFER POOL AND MEMORY',)),
+    # Must come BEFORE the next rule, otherwise it'll get fooled by this line from the new plugin:
+    # Pages read ahead 0.00/s, evicted without access 0.06/s
+    ('_pages_read_ahead', _starts_with('Pages read ahead'), ('BUFFER POOL AND MEMORY',)),
+    ('_pages_read', _starts_with('Pages read'), ('BUFFER POOL AND MEMORY',)),
+    # ROW OPERATIONS
+    ('_rows', _starts_with('Number of rows inserted'), ('ROW OPERATIONS',)),
+    ('_queries_inside', _contains(' queries inside InnoDB, '), ('ROW OPERATIONS',)),
+)
+
+
+def _compile_innodb_status_rules(section=None):
+    patterns = [
+        '(?P<{}>{})'.format(name, pattern)
+        for name, pattern, sections in INNODB_STATUS_RULES
+        if section is None or section in sections
+    ]
+    return re.compile('|'.join(patterns)) if patterns else None
+
+
+# Lines that come before the first section or belong to unknown sections are matched against every rule
+ALL_INNODB_STATUS_RULES = _compile_innodb_status_rules()
+
+# Sections without any rules, e.g. the latest detected deadlock, are skipped entirely. The individual
+# buffer pools are skipped as well since only aggregated buffer pool metrics are reported.
+INNODB_STATUS_SECTION_RULES = {
+    section: _compile_innodb_status_rules(section)
+    for section in (
+        'BACKGROUND THREAD',
+        'SEMAPHORES',
+        'LATEST FOREIGN KEY ERROR',
+        'LATEST DETECTED DEADLOCK',
+        'TRANSACTIONS',
+        'FILE I/O',
+        'INSERT BUFFER AND ADAPTIVE HASH INDEX',
+        'LOG',
+        'BUFFER POOL AND MEMORY',
+        'INDIVIDUAL BUFFER POOL INFO',
+        'ROW OPERATIONS',
+    )
+}
+
+
+class InnoDBStatusParser(object):
+    """
+    Parses the text of `SHOW ENGINE INNODB STATUS` into the metrics it reports.
+
+    Sections are recognized by their headers and each one is only matched against its own precompiled rules,
+    so lines are only tokenized when a rule matches them and sections without any rules are skipped entirely.
+    """
+
+    def __init__(self, log):
+        self.log = log
+        self.results = defaultdict(int)
+        self.txn_seen = False
+        # Only return aggregated buffer pool metrics
+        self.buffer_pool_seen = False
+
+    def parse(self, text):
+        rules = ALL_INNODB_STATUS_RULES
+        line = ''
+        for raw_line in text.splitlines():
+            prev_line, line = line, raw_line.strip()
+
+            # Section headers are surrounded by lines of dashes, e.g.
+            # --------
+            # FILE I/O
+            # --------
+            if prev_line[:1] == '-' and not prev_line.strip('-') and INNODB_STATUS_SECTION_HEADER.match(line):
+                if line == INNODB_STATUS_END:
+                    break
+
+                rules = INNODB_STATUS_SECTION_RULES.get(line, ALL_INNODB_STATUS_RULES)
+                continue
+
+            if rules is None:
+                continue
+
+            match = rules.match(line)
+            if match:
+                getattr(self, match.lastgroup)(line, prev_line)
+
+        return self.results
+
+    def _buffer_pool(self, line, prev_line):
+        self.buffer_pool_seen = True
+
+    # SEMAPHORES
+    def _mutex_spin_waits(self, line, prev_line):
+        # Mutex spin waits 79626940, rounds 157459864, OS waits 698719
+        # Mutex spin waits 0, rounds 247280272495, OS waits 316513438
+        row = _split_row(line)
+        self.results['Innodb_mutex_spin_waits'] = long(row[3])
+        self.results['Innodb_mutex_spin_rounds'] = long(row[5])
+        self.results['Innodb_mutex_os_waits'] = long(row[8])
+
+    def _rw_shared_spins(self, line, prev_line):
+        row = _split_row(line)
+        if line.find(';') > 0:
+            # RW-shared spins 3859028, OS waits 2100750; RW-excl spins
+            # 4641946, OS waits 1530310
+            self.results['Innodb_s_lock_spin_waits'] = long(row[2])
+            self.results['Innodb_x_lock_spin_waits'] = long(row[8])
+            self.results['Innodb_s_lock_os_waits'] = long(row[5])
+            self.results['Innodb_x_lock_os_waits'] = long(row[11])
+        else:
+            # Post 5.5.17 SHOW ENGINE INNODB STATUS syntax
+            # RW-shared spins 604733, rounds 8107431, OS waits 241268
+            self.results['Innodb_s_lock_spin_waits'] = long(row[2])
+            self.results['Innodb_s_lock_spin_rounds'] = long(row[4])
+            self.results['Innodb_s_lock_os_waits'] = long(row[7])
+
+    def _rw_excl_spins(self, line, prev_line):
+        # Post 5.5.17 SHOW ENGINE INNODB STATUS syntax
+        # RW-excl spins 604733, rounds 8107431, OS waits 241268
+        row = _split_row(line)
+        self.results['Innodb_x_lock_spin_waits'] = long(row[2])
+        self.results['Innodb_x_lock_spin_rounds'] = long(row[4])
+        self.results['Innodb_x_lock_os_waits'] = long(row[7])
+
+    def _semaphore_wait(self, line, prev_line):
+        # --Thread 907205 has waited at handler/ha_innodb.cc line 7156 for 1.00 seconds the semaphore:
+        row = _split_row(line)
+        self.results['Innodb_semaphore_waits'] += 1
+        self.results['Innodb_semaphore_wait_time'] += long(float(row[9])) * 1000
+
+    # TRANSACTIONS
+    def _trx_id_counter(self, line, prev_line):
+        # The beginning of the TRANSACTIONS section: start counting
+        # transactions
+        # Trx id counter 0 1170664159
+        # Trx id counter 861B144C
+        self.txn_seen = True
+
+    def _history_list_length(self, line, prev_line):
+        # History list length 132
+        row = _split_row(line)
+        self.results['Innodb_history_list_length'] = long(row[3])
+
+    def _transaction(self, line, prev_line):
+        # ---TRANSACTION 0, not started, process no 13510, OS thread id 1170446656
+        if self.txn_seen:
+            self.results['Innodb_current_transactions'] += 1
+            if line.find('ACTIVE') > 0:
+                self.results['Innodb_active_transactions'] += 1
+
+    def _read_views(self, line, prev_line):
+        # 1 read views open inside InnoDB
+        row = _split_row(line)
+        self.results['Innodb_read_views'] = long(row[0])
+
+    def _tables_in_use(self, line, prev_line):
+        # mysql tables in use 2, locked 2
+        match = TABLES_IN_USE_PATTERN.match(line)
+        if match:
+            tables_in_use, locked_tables = match.groups()
+        else:
+            row = _split_row(line)
+            tables_in_use, locked_tables = row[4], row[6]
+
+        self.results['Innodb_tables_in_use'] += long(tables_in_use)
+        self.results['Innodb_locked_tables'] += long(locked_tables)
+
+    def _lock_structs(self, line, prev_line):
+        # 23 lock struct(s), heap size 3024, undo log entries 27
+        # LOCK WAIT 12 lock struct(s), heap size 3024, undo log entries 5
+        # LOCK WAIT 2 lock struct(s), heap size 368
+        if not self.txn_seen:
+            return
+
+        match = LOCK_STRUCTS_PATTERN.match(line)
+        if match:
+            state, lock_structs = match.groups()
+            self.results['Innodb_lock_structs'] += long(lock_structs)
+            if state == 'LOCK WAIT ':
+                self.results['Innodb_locked_transactions'] += 1
+            return
+
+        row = _split_row(line)
+        if line.find('LOCK WAIT') == 0:
+            self.results['Innodb_lock_structs'] += long(row[2])
+            self.results['Innodb_locked_transactions'] += 1
+        elif line.find('ROLLING BACK') == 0:
+            # ROLLING BACK 127539 lock struct(s), heap size 15201832,
+            # 4411492 row lock(s), undo log entries 1042488
+            self.results['Innodb_lock_structs'] += long(row[2])
+        else:
+            self.results['Innodb_lock_structs'] += long(row[0])
+
+    # FILE I/O
+    def _os_file_reads(self, line, prev_line):
+        # 8782182 OS file reads, 15635445 OS file writes, 947800 OS
+        # fsyncs
+        row = _split_row(line)
+        self.results['Innodb_os_file_reads'] = long(row[0])
+        self.results['Innodb_os_file_writes'] = long(row[4])
+        self.results['Innodb_os_file_fsyncs'] = long(row[8])
+
+    def _pending_normal_aio(self, line, prev_line):
+        row = _split_row(line)
+        try:
+            if len(row) == 8:
+                # (len(row) == 8)  Pending normal aio reads: 0, aio writes: 0,
+                self.results['Innodb_pending_normal_aio_reads'] = long(row[4])
+                self.results['Innodb_pending_normal_aio_writes'] = long(row[7])
+            elif len(row) == 14:
+                # (len(row) == 14) Pending normal aio reads: 0 [0, 0] , aio writes: 0 [0, 0] ,
+                self.results['Innodb_pending_normal_aio_reads'] = long(row[4])
+                self.results['Innodb_pending_normal_aio_writes'] = long(row[10])
+            elif len(row) == 16:
+                # (len(row) == 16) Pending normal aio reads: [0, 0, 0, 0] , aio writes: [0, 0, 0, 0] ,
+                if _are_values_numeric(row[4:8]) and _are_values_numeric(row[11:15]):
+                    self.results['Innodb_pending_normal_aio_reads'] = (
+                        long(row[4]) + long(row[5]) + long(row[6]) + long(row[7])
+                    )
+                    self.results['Innodb_pending_normal_aio_writes'] = (
+                        long(row[11]) + long(row[12]) + long(row[13]) + long(row[14])
+                    )
+
+                # (len(row) == 16) Pending normal aio reads: 0 [0, 0, 0, 0] , aio writes: 0 [0, 0] ,
+                elif _are_values_numeric(row[4:9]) and _are_values_numeric(row[12:15]):
+                    self.results['Innodb_pending_normal_aio_reads'] = long(row[4])
+                    self.results['Innodb_pending_normal_aio_writes'] = long(row[12])
+                else:
+                    self.log.warning("Can't parse result line %s", line)
+            elif len(row) == 18:
+                # (len(row) == 18) Pending normal aio reads: 0 [0, 0, 0, 0] , aio writes: 0 [0, 0, 0, 0] ,
+                self.results['Innodb_pending_normal_aio_reads'] = long(row[4])
+                self.results['Innodb_pending_normal_aio_writes'] = long(row[12])
+            elif len(row) == 22:
+                # (len(row) == 22)
+                # Pending normal aio reads: 0 [0, 0, 0, 0, 0, 0, 0, 0] , aio writes: 0 [0, 0, 0, 0] ,
+                self.results['Innodb_pending_normal_aio_reads'] = long(row[4])
+                self.results['Innodb_pending_normal_aio_writes'] = long(row[16])
+        except ValueError as e:
+            self.log.warning("Can't parse result line %s: %s", line, e)
+
+    def _pending_ibuf_aio(self, line, prev_line):
+        #  ibuf aio reads: 0, log i/o's: 0, sync i/o's: 0
+        #  or ibuf aio reads:, log i/o's:, sync i/o's:
+        row = _split_row(line)
+        if len(row) == 10:
+            self.results['Innodb_pending_ibuf_aio_reads'] = long(row[3])
+            self.results['Innodb_pending_aio_log_ios'] = long(row[6])
+            self.results['Innodb_pending_aio_sync_ios'] = long(row[9])
+        elif len(row) == 7:
+            self.results['Innodb_pending_ibuf_aio_reads'] = 0
+            self.results['Innodb_pending_aio_log_ios'] = 0
+            self.results['Innodb_pending_aio_sync_ios'] = 0
+
+    def _pending_flushes(self, line, prev_line):
+        row = _split_row(line)
+        if len(row) == 4:
+            # Pending flushes (fsync): 0
+            self.results['Innodb_pending_buffer_pool_flushes'] = long(row[3])
+        else:
+            # Pending flushes (fsync) log: 0; buffer pool: 0
+            self.results['Innodb_pending_log_flushes'] = long(row[4])
+            self.results['Innodb_pending_buffer_pool_flushes'] = long(row[7])
+
+    # INSERT BUFFER AND ADAPTIVE HASH INDEX
+    def _ibuf_for_space(self, line, prev_line):
+        # Older InnoDB code seemed to be ready for an ibuf per tablespace.  It
+        # had two lines in the output.  Newer has just one line, see below.
+        # Ibuf for space 0: size 1, free list len 887, seg size 889, is not empty
+        # Ibuf for space 0: size 1, free list len 887, seg size 889,
+        row = _split_row(line)
+        self.results['Innodb_ibuf_size'] = long(row[5])
+        self.results['Innodb_ibuf_free_list'] = long(row[9])
+        self.results['Innodb_ibuf_segment_size'] = long(row[12])
+
+    def _ibuf(self, line, prev_line):
+        # Ibuf: size 1, free list len 4634, seg size 4636,
+        row = _split_row(line)
+        self.results['Innodb_ibuf_size'] = long(row[2])
+        self.results['Innodb_ibuf_free_list'] = long(row[6])
+        self.results['Innodb_ibuf_segment_size'] = long(row[9])
+
+        if line.find('merges') > -1:
+            self.results['Innodb_ibuf_merges'] = long(row[10])
+
+    def _ibuf_merged_operations(self, line, prev_line):
+        # Output of show engine innodb status has changed in 5.5
+        # merged operations:
+        # insert 593983, delete mark 387006, delete 73092
+        if prev_line.find('merged operations:') != 0:
+            return
+
+        row = _split_row(line)
+        self.results['Innodb_ibuf_merged_inserts'] = long(row[1])
+        self.results['Innodb_ibuf_merged_delete_marks'] = long(row[4])
+        self.results['Innodb_ibuf_merged_deletes'] = long(row[6])
+        self.results['Innodb_ibuf_merged'] = (
+            self.results['Innodb_ibuf_merged_inserts']
+            + self.results['Innodb_ibuf_merged_delete_marks']
+            + self.results['Innodb_ibuf_merged_deletes']
+        )
+
+    def _ibuf_merged_recs(self, line, prev_line):
+        # 19817685 inserts, 19817684 merged recs, 3552620 merges
+        row = _split_row(line)
+        self.results['Innodb_ibuf_merged_inserts'] = long(row[0])
+        self.results['Innodb_ibuf_merged'] = long(row[2])
+        self.results['Innodb_ibuf_merges'] = long(row[5])
+
+    def _hash_table_size(self, line, prev_line):
+        # In some versions of InnoDB, the used cells is omitted.
+        # Hash table size 4425293, used cells 4229064, ....
+        # Hash table size 57374437, node heap has 72964 buffer(s) <--
+        # no used cells
+        row = _split_row(line)
+        self.results['Innodb_hash_index_cells_total'] = long(row[3])
+        self.results['Innodb_hash_index_cells_used'] = long(row[6]) if line.find('used cells') > 0 else 0
+
+    # LOG
+    def _log_writes(self, line, prev_line):
+        # 3430041 log i/o's done, 17.44 log i/o's/second
+        # 520835887 log i/o's done, 17.28 log i/o's/second, 518724686
+        # syncs, 2980893 checkpoints
+        row = _split_row(line)
+        self.results['Innodb_log_writes'] = long(row[0])
+
+    def _pending_log_writes(self, line, prev_line):
+        # 0 pending log writes, 0 pending chkp writes
+        row = _split_row(line)
+        self.results['Innodb_pending_log_writes'] = long(row[0])
+        self.results['Innodb_pending_checkpoint_writes'] = long(row[4])
+
+    def _lsn_current(self, line, prev_line):
+        # This number is NOT printed in hex in InnoDB plugin.
+        # Log sequence number 272588624
+        row = _split_row(line)
+        self.results['Innodb_lsn_current'] = long(row[3])
+
+    def _lsn_flushed(self, line, prev_line):
+        # This number is NOT printed in hex in InnoDB plugin.
+        # Log flushed up to   272588624
+        row = _split_row(line)
+        self.results['Innodb_lsn_flushed'] = long(row[4])
+
+    def _lsn_last_checkpoint(self, line, prev_line):
+        # Last checkpoint at  272588624
+        row = _split_row(line)
+        self.results['Innodb_lsn_last_checkpoint'] = long(row[3])
+
+    # BUFFER POOL AND MEMORY
+    def _mem_total(self, line, prev_line):
+        # Total memory allocated 29642194944; in additional pool allocated 0
+        # Total memory allocated by read views 96
+        if line.find('in additional pool allocated') > 0:
+            row = _split_row(line)
+            self.results['Innodb_mem_total'] = long(row[3])
+            self.results['Innodb_mem_additional_pool'] = long(row[8])
+
+    def _mem_adaptive_hash(self, line, prev_line):
+        #   Adaptive hash index 1538240664     (186998824 + 1351241840)
+        row = _split_row(line)
+        self.results['Innodb_mem_adaptive_hash'] = long(row[3])
+
+    def _mem_page_hash(self, line, prev_line):
+        #   Page hash           11688584
+        row = _split_row(line)
+        self.results['Innodb_mem_page_hash'] = long(row[2])
+
+    def _mem_dictionary(self, line, prev_line):
+        #   Dictionary cache    145525560      (140250984 + 5274576)
+        row = _split_row(line)
+        self.results['Innodb_mem_dictionary'] = long(row[2])
+
+    def _mem_file_system(self, line, prev_line):
+        #   File system         313848         (82672 + 231176)
+        row = _split_row(line)
+        self.results['Innodb_mem_file_system'] = long(row[2])
+
+    def _mem_lock_system(self, line, prev_line):
+        #   Lock system         29232616       (29219368 + 13248)
+        row = _split_row(line)
+        self.results['Innodb_mem_lock_system'] = long(row[2])
+
+    def _mem_recovery_system(self, line, prev_line):
+        #   Recovery system     0      (0 + 0)
+        row = _split_row(line)
+        self.results['Innodb_mem_recovery_system'] = long(row[2])
+
+    def _mem_thread_hash(self, line, prev_line):
+        #   Threads             409336         (406936 + 2400)
+        row = _split_row(line)
+        self.results['Innodb_mem_thread_hash'] = long(row[1])
+
+    def _buffer_pool_size(self, line, prev_line):
+        # The " " after size is necessary to avoid matching the wrong line:
+        # Buffer pool size        1769471
+        # Buffer pool size, bytes 28991012864
+        if not self.buffer_pool_seen:
+            row = _split_row(line)
+            self.results['Innodb_buffer_pool_pages_total'] = long(row[3])
+
+    def _free_buffers(self, line, prev_line):
+        # Free buffers            0
+        if not self.buffer_pool_seen:
+            row = _split_row(line)
+            self.results['Innodb_buffer_pool_pages_free'] = long(row[2])
+
+    def _database_pages(self, line, prev_line):
+        # Database pages          1696503
+        if not self.buffer_pool_seen:
+            row = _split_row(line)
+            self.results['Innodb_buffer_pool_pages_data'] = long(row[2])
+
+    def _modified_db_pages(self, line, prev_line):
+        # Modified db pages       160602
+        if not self.buffer_pool_seen:
+            row = _split_row(line)
+            self.results['Innodb_buffer_pool_pages_dirty'] = long(row[3])
+
+    def _pages_read_ahead(self, line, prev_line):
+        pass
+
+    def _pages_read(self, line, prev_line):
+        # Pages read 15240822, created 1770238, written 21705836
+        if not self.buffer_pool_seen:
+            row = _split_row(line)
+            self.results['Innodb_pages_read'] = long(row[2])
+            self.results['Innodb_pages_created'] = long(row[4])
+            self.results['Innodb_pages_written'] = long(row[6])
+
+    # ROW OPERATIONS
+    def _rows(self, line, prev_line):
+        # Number of rows inserted 50678311, updated 66425915, deleted
+        # 20605903, read 454561562
+        row = _split_row(line)
+        self.results['Innodb_rows_inserted'] = long(row[4])
+        self.results['Innodb_rows_updated'] = long(row[6])
+        self.results['Innodb_rows_deleted'] = long(row[8])
+        self.results['Innodb_rows_read'] = long(row[10])
+
+    def _queries_inside(self, line, prev_line):
+        # 0 queries inside InnoDB, 0 queries in queue
+        row = _split_row(line)
+        self.results['Innodb_queries_inside'] = long(row[0])
+        self.results['Innodb_queries_queued'] = long(row[4])
+
+
 class InnoDBMetrics(object):
     def __init__(self):
         self.log = get_check_logger()
@@ -61,292 +572,7 @@ class InnoDBMetrics(object):
         innodb_status = cursor.fetchone()
         innodb_status_text = innodb_status[2]
 
-        results = defaultdict(int)
-
-        # Here we now parse InnoDB STATUS one line at a time
-        # This is heavily inspired by the Percona monitoring plugins work
-        txn_seen = False
-        prev_line = ''
-        # Only return aggregated buffer pool metrics
-        buffer_id = -1
-        for line in innodb_status_text.splitlines():
-            line = line.strip()
-            row = re.split(" +", line)
-            row = [item.strip(',') for item in row]
-            row = [item.strip(';') for item in row]
-            row = [item.strip('[') for item in row]
-            row = [item.strip(']') for item in row]
-
-            if line.startswith('---BUFFER POOL'):
-                buffer_id = long(row[2])
-
-            # SEMAPHORES
-            if line.find('Mutex spin waits') == 0:
-                # Mutex spin waits 79626940, rounds 157459864, OS waits 698719
-                # Mutex spin waits 0, rounds 247280272495, OS waits 316513438
-                results['Innodb_mutex_spin_waits'] = long(row[3])
-                results['Innodb_mutex_spin_rounds'] = long(row[5])
-                results['Innodb_mutex_os_waits'] = long(row[8])
-            elif line.find('RW-shared spins') == 0 and line.find(';') > 0:
-                # RW-shared spins 3859028, OS waits 2100750; RW-excl spins
-                # 4641946, OS waits 1530310
-                results['Innodb_s_lock_spin_waits'] = long(row[2])
-                results['Innodb_x_lock_spin_waits'] = long(row[8])
-                results['Innodb_s_lock_os_waits'] = long(row[5])
-                results['Innodb_x_lock_os_waits'] = long(row[11])
-            elif line.find('RW-shared spins') == 0 and line.find('; RW-excl spins') == -1:
-                # Post 5.5.17 SHOW ENGINE INNODB STATUS syntax
-                # RW-shared spins 604733, rounds 8107431, OS waits 241268
-                results['Innodb_s_lock_spin_waits'] = long(row[2])
-                results['Innodb_s_lock_spin_rounds'] = long(row[4])
-                results['Innodb_s_lock_os_waits'] = long(row[7])
-            elif line.find('RW-excl spins') == 0:
-                # Post 5.5.17 SHOW ENGINE INNODB STATUS syntax
-                # RW-excl spins 604733, rounds 8107431, OS waits 241268
-                results['Innodb_x_lock_spin_waits'] = long(row[2])
-                results['Innodb_x_lock_spin_rounds'] = long(row[4])
-                results['Innodb_x_lock_os_waits'] = long(row[7])
-            elif line.find('seconds the semaphore:') > 0:
-                # --Thread 907205 has waited at handler/ha_innodb.cc line 7156 for 1.00 seconds the semaphore:
-                results['Innodb_semaphore_waits'] += 1
-                results['Innodb_semaphore_wait_time'] += long(float(row[9])) * 1000
-
-            # TRANSACTIONS
-            elif line.find('Trx id counter') == 0:
-                # The beginning of the TRANSACTIONS section: start counting
-                # transactions
-                # Trx id counter 0 1170664159
-                # Trx id counter 861B144C
-                txn_seen = True
-            elif line.find('History list length') == 0:
-                # History list length 132
-                results['Innodb_history_list_length'] = long(row[3])
-            elif txn_seen and line.find('---TRANSACTION') == 0:
-                # ---TRANSACTION 0, not started, process no 13510, OS thread id 1170446656
-                results['Innodb_current_transactions'] += 1
-                if line.find('ACTIVE') > 0:
-                    results['Innodb_active_transactions'] += 1
-            elif line.find('read views open inside InnoDB') > 0:
-                # 1 read views open inside InnoDB
-                results['Innodb_read_views'] = long(row[0])
-            elif line.find('mysql tables in use') == 0:
-                # mysql tables in use 2, locked 2
-                results['Innodb_tables_in_use'] += long(row[4])
-                results['Innodb_locked_tables'] += long(row[6])
-            elif txn_seen and line.find('lock struct(s)') > 0:
-                # 23 lock struct(s), heap size 3024, undo log entries 27
-                # LOCK WAIT 12 lock struct(s), heap size 3024, undo log entries 5
-                # LOCK WAIT 2 lock struct(s), heap size 368
-                if line.find('LOCK WAIT') == 0:
-                    results['Innodb_lock_structs'] += long(row[2])
-                    results['Innodb_locked_transactions'] += 1
-                elif line.find('ROLLING BACK') == 0:
-                    # ROLLING BACK 127539 lock struct(s), heap size 15201832,
-                    # 4411492 row lock(s), undo log entries 1042488
-                    results['Innodb_lock_structs'] += long(row[2])
-                else:
-                    results['Innodb_lock_structs'] += long(row[0])
-
-            # FILE I/O
-            elif line.find(' OS file reads, ') > 0:
-                # 8782182 OS file reads, 15635445 OS file writes, 947800 OS
-                # fsyncs
-                results['Innodb_os_file_reads'] = long(row[0])
-                results['Innodb_os_file_writes'] = long(row[4])
-                results['Innodb_os_file_fsyncs'] = long(row[8])
-            elif line.find('Pending normal aio reads:') == 0:
-                try:
-                    if len(row) == 8:
-                        # (len(row) == 8)  Pending normal aio reads: 0, aio writes: 0,
-                        results['Innodb_pending_normal_aio_reads'] = long(row[4])
-                        results['Innodb_pending_normal_aio_writes'] = long(row[7])
-                    elif len(row) == 14:
-                        # (len(row) == 14) Pending normal aio reads: 0 [0, 0] , aio writes: 0 [0, 0] ,
-                        results['Innodb_pending_normal_aio_reads'] = long(row[4])
-                        results['Innodb_pending_normal_aio_writes'] = long(row[10])
-                    elif len(row) == 16:
-                        # (len(row) == 16) Pending normal aio reads: [0, 0, 0, 0] , aio writes: [0, 0, 0, 0] ,
-                        if _are_values_numeric(row[4:8]) and _are_values_numeric(row[11:15]):
-                            results['Innodb_pending_normal_aio_reads'] = (
-                                long(row[4]) + long(row[5]) + long(row[6]) + long(row[7])
-                            )
-                            results['Innodb_pending_normal_aio_writes'] = (
-                                long(row[11]) + long(row[12]) + long(row[13]) + long(row[14])
-                            )
-
-                        # (len(row) == 16) Pending normal aio reads: 0 [0, 0, 0, 0] , aio writes: 0 [0, 0] ,
-                        elif _are_values_numeric(row[4:9]) and _are_values_numeric(row[12:15]):
-                            results['Innodb_pending_normal_aio_reads'] = long(row[4])
-                            results['Innodb_pending_normal_aio_writes'] = long(row[12])
-                        else:
-                            self.log.warning("Can't parse result line %s", line)
-                    elif len(row) == 18:
-                        # (len(row) == 18) Pending normal aio reads: 0 [0, 0, 0, 0] , aio writes: 0 [0, 0, 0, 0] ,
-                        results['Innodb_pending_normal_aio_reads'] = long(row[4])
-                        results['Innodb_pending_normal_aio_writes'] = long(row[12])
-                    elif len(row) == 22:
-                        # (len(row) == 22)
-                        # Pending normal aio reads: 0 [0, 0, 0, 0, 0, 0, 0, 0] , aio writes: 0 [0, 0, 0, 0] ,
-                        results['Innodb_pending_normal_aio_reads'] = long(row[4])
-                        results['Innodb_pending_normal_aio_writes'] = long(row[16])
-                except ValueError as e:
-                    self.log.warning("Can't parse result line %s: %s", line, e)
-            elif line.find('ibuf aio reads') == 0:
-                #  ibuf aio reads: 0, log i/o's: 0, sync i/o's: 0
-                #  or ibuf aio reads:, log i/o's:, sync i/o's:
-                if len(row) == 10:
-                    results['Innodb_pending_ibuf_aio_reads'] = long(row[3])
-                    results['Innodb_pending_aio_log_ios'] = long(row[6])
-                    results['Innodb_pending_aio_sync_ios'] = long(row[9])
-                elif len(row) == 7:
-                    results['Innodb_pending_ibuf_aio_reads'] = 0
-                    results['Innodb_pending_aio_log_ios'] = 0
-                    results['Innodb_pending_aio_sync_ios'] = 0
-            elif line.find('Pending flushes (fsync)') == 0:
-                if len(row) == 4:
-                    # Pending flushes (fsync): 0
-                    results['Innodb_pending_buffer_pool_flushes'] = long(row[3])
-                else:
-                    # Pending flushes (fsync) log: 0; buffer pool: 0
-                    results['Innodb_pending_log_flushes'] = long(row[4])
-                    results['Innodb_pending_buffer_pool_flushes'] = long(row[7])
-
-            # INSERT BUFFER AND ADAPTIVE HASH INDEX
-            elif line.find('Ibuf for space 0: size ') == 0:
-                # Older InnoDB code seemed to be ready for an ibuf per tablespace.  It
-                # had two lines in the output.  Newer has just one line, see below.
-                # Ibuf for space 0: size 1, free list len 887, seg size 889, is not empty
-                # Ibuf for space 0: size 1, free list len 887, seg size 889,
-                results['Innodb_ibuf_size'] = long(row[5])
-                results['Innodb_ibuf_free_list'] = long(row[9])
-                results['Innodb_ibuf_segment_size'] = long(row[12])
-            elif line.find('Ibuf: size ') == 0:
-                # Ibuf: size 1, free list len 4634, seg size 4636,
-                results['Innodb_ibuf_size'] = long(row[2])
-                results['Innodb_ibuf_free_list'] = long(row[6])
-                results['Innodb_ibuf_segment_size'] = long(row[9])
-
-                if line.find('merges') > -1:
-                    results['Innodb_ibuf_merges'] = long(row[10])
-            elif line.find(', delete mark ') > 0 and prev_line.find('merged operations:') == 0:
-                # Output of show engine innodb status has changed in 5.5
-                # merged operations:
-                # insert 593983, delete mark 387006, delete 73092
-                results['Innodb_ibuf_merged_inserts'] = long(row[1])
-                results['Innodb_ibuf_merged_delete_marks'] = long(row[4])
-                results['Innodb_ibuf_merged_deletes'] = long(row[6])
-                results['Innodb_ibuf_merged'] = (
-                    results['Innodb_ibuf_merged_inserts']
-                    + results['Innodb_ibuf_merged_delete_marks']
-                    + results['Innodb_ibuf_merged_deletes']
-                )
-            elif line.find(' merged recs, ') > 0:
-                # 19817685 inserts, 19817684 merged recs, 3552620 merges
-                results['Innodb_ibuf_merged_inserts'] = long(row[0])
-                results['Innodb_ibuf_merged'] = long(row[2])
-                results['Innodb_ibuf_merges'] = long(row[5])
-            elif line.find('Hash table size ') == 0:
-                # In some versions of InnoDB, the used cells is omitted.
-                # Hash table size 4425293, used cells 4229064, ....
-                # Hash table size 57374437, node heap has 72964 buffer(s) <--
-                # no used cells
-                results['Innodb_hash_index_cells_total'] = long(row[3])
-                results['Innodb_hash_index_cells_used'] = long(row[6]) if line.find('used cells') > 0 else 0
-
-            # LOG
-            elif line.find(" log i/o's done, ") > 0:
-                # 3430041 log i/o's done, 17.44 log i/o's/second
-                # 520835887 log i/o's done, 17.28 log i/o's/second, 518724686
-                # syncs, 2980893 checkpoints
-                results['Innodb_log_writes'] = long(row[0])
-            elif line.find(" pending log writes, ") > 0:
-                # 0 pending log writes, 0 pending chkp writes
-                results['Innodb_pending_log_writes'] = long(row[0])
-                results['Innodb_pending_checkpoint_writes'] = long(row[4])
-            elif line.find("Log sequence number") == 0:
-                # This number is NOT printed in hex in InnoDB plugin.
-                # Log sequence number 272588624
-                results['Innodb_lsn_current'] = long(row[3])
-            elif line.find("Log flushed up to") == 0:
-                # This number is NOT printed in hex in InnoDB plugin.
-                # Log flushed up to   272588624
-                results['Innodb_lsn_flushed'] = long(row[4])
-            elif line.find("Last checkpoint at") == 0:
-                # Last checkpoint at  272588624
-                results['Innodb_lsn_last_checkpoint'] = long(row[3])
-
-            # BUFFER POOL AND MEMORY
-            elif line.find("Total memory allocated") == 0 and line.find("in additional pool allocated") > 0:
-                # Total memory allocated 29642194944; in additional pool allocated 0
-                # Total memory allocated by read views 96
-                results['Innodb_mem_total'] = long(row[3])
-                results['Innodb_mem_additional_pool'] = long(row[8])
-            elif line.find('Adaptive hash index ') == 0:
-                #   Adaptive hash index 1538240664     (186998824 + 1351241840)
-                results['Innodb_mem_adaptive_hash'] = long(row[3])
-            elif line.find('Page hash           ') == 0:
-                #   Page hash           11688584
-                results['Innodb_mem_page_hash'] = long(row[2])
-            elif line.find('Dictionary cache    ') == 0:
-                #   Dictionary cache    145525560      (140250984 + 5274576)
-                results['Innodb_mem_dictionary'] = long(row[2])
-            elif line.find('File system         ') == 0:
-                #   File system         313848         (82672 + 231176)
-                results['Innodb_mem_file_system'] = long(row[2])
-            elif line.find('Lock system         ') == 0:
-                #   Lock system         29232616       (29219368 + 13248)
-                results['Innodb_mem_lock_system'] = long(row[2])
-            elif line.find('Recovery system     ') == 0:
-                #   Recovery system     0      (0 + 0)
-                results['Innodb_mem_recovery_system'] = long(row[2])
-            elif line.find('Threads             ') == 0:
-                #   Threads             409336         (406936 + 2400)
-                results['Innodb_mem_thread_hash'] = long(row[1])
-            elif line.find("Buffer pool size ") == 0:
-                # The " " after size is necessary to avoid matching the wrong line:
-                # Buffer pool size        1769471
-                # Buffer pool size, bytes 28991012864
-                if buffer_id == -1:
-                    results['Innodb_buffer_pool_pages_total'] = long(row[3])
-            elif line.find("Free buffers") == 0:
-                # Free buffers            0
-                if buffer_id == -1:
-                    results['Innodb_buffer_pool_pages_free'] = long(row[2])
-            elif line.find("Database pages") == 0:
-                # Database pages          1696503
-                if buffer_id == -1:
-                    results['Innodb_buffer_pool_pages_data'] = long(row[2])
-
-            elif line.find("Modified db pages") == 0:
-                # Modified db pages       160602
-                if buffer_id == -1:
-                    results['Innodb_buffer_pool_pages_dirty'] = long(row[3])
-            elif line.find("Pages read ahead") == 0:
-                # Must do this BEFORE the next test, otherwise it'll get fooled by this
-                # line from the new plugin:
-                # Pages read ahead 0.00/s, evicted without access 0.06/s
-                pass
-            elif line.find("Pages read") == 0:
-                # Pages read 15240822, created 1770238, written 21705836
-                if buffer_id == -1:
-                    results['Innodb_pages_read'] = long(row[2])
-                    results['Innodb_pages_created'] = long(row[4])
-                    results['Innodb_pages_written'] = long(row[6])
-
-            # ROW OPERATIONS
-            elif line.find('Number of rows inserted') == 0:
-                # Number of rows inserted 50678311, updated 66425915, deleted
-                # 20605903, read 454561562
-                results['Innodb_rows_inserted'] = long(row[4])
-                results['Innodb_rows_updated'] = long(row[6])
-                results['Innodb_rows_deleted'] = long(row[8])
-                results['Innodb_rows_read'] = long(row[10])
-            elif line.find(" queries inside InnoDB, ") > 0:
-                # 0 queries inside InnoDB, 0 queries in queue
-                results['Innodb_queries_inside'] = long(row[0])
-                results['Innodb_queries_queued'] = long(row[4])
-
-            prev_line = line
+        results = InnoDBStatusParser(self.log).parse(innodb_status_text)
 
         # We need to calculate this metric separately
         try:
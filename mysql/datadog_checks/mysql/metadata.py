@@ -55,6 +55,7 @@ class MySQLMetadata(DBMAsyncJob):
             expected_db_exceptions=(pymysql.err.DatabaseError,),
             job_name="database-metadata",
             shutdown_callback=self._close_db_conn,
+            adaptive_scheduling=config.adaptive_job_scheduling,
         )
         self._check = check
         self._config = config
@@ -189,6 +189,7 @@ class MySQLStatementSamples(DBMAsyncJob):
             expected_db_exceptions=(pymysql.err.DatabaseError,),
             job_name="statement-samples",
             shutdown_callback=self._close_db_conn,
+            adaptive_scheduling=config.adaptive_job_scheduling,
         )
         self._config = config
         self._version_processed = False
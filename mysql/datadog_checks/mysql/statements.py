@@ -5,7 +5,7 @@ import copy
 import time
 from contextlib import closing
 from operator import attrgetter
-from typing import Any, Callable, Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Tuple  # noqa: F401
 
 import pymysql
 from cachetools import TTLCache
@@ -13,6 +13,7 @@ from cachetools import TTLCache
 from datadog_checks.base import is_affirmative
 from datadog_checks.base.log import get_check_logger
 from datadog_checks.base.utils.common import to_native_string
+from datadog_checks.base.utils.db.serialization import iter_json_event_chunks
 from datadog_checks.base.utils.db.sql import compute_sql_signature
 from datadog_checks.base.utils.db.statement_metrics import StatementMetrics
 from datadog_checks.base.utils.db.utils import DBMAsyncJob, default_json_event_encoding, obfuscate_sql_with_metadata
@@ -46,6 +47,26 @@ METRICS_COLUMNS = {
     'sum_no_good_index_used',
 }
 
+STATEMENT_SUMMARY_QUERY = """\
+    SELECT `schema_name`,
+           `digest`,
+           `digest_text`,
+           `count_star`,
+           `sum_timer_wait`,
+           `sum_lock_time`,
+           `sum_errors`,
+           `sum_rows_affected`,
+           `sum_rows_sent`,
+           `sum_rows_examined`,
+           `sum_select_scan`,
+           `sum_select_full_join`,
+           `sum_no_index_used`,
+           `sum_no_good_index_used`
+    FROM performance_schema.events_statements_summary_by_digest
+    WHERE `digest_text` NOT LIKE 'EXPLAIN %' OR `digest_text` IS NULL
+    ORDER BY `count_star` DESC
+    LIMIT 10000"""
+
 
 def _row_key(row):
     """
@@ -75,9 +96,11 @@ class MySQLStatementMetrics(DBMAsyncJob):
             dbms="mysql",
             job_name="statement-metrics",
             shutdown_callback=self._close_db_conn,
+            adaptive_scheduling=config.adaptive_job_scheduling,
         )
         self._check = check
         self._metric_collection_interval = collection_interval
+        self._stream_rows = is_affirmative(config.statement_metrics_config.get('stream_rows', False))
         self._connection_args = connection_args
         self._db = None
         self._config = config
@@ -151,9 +174,9 @@ class MySQLStatementMetrics(DBMAsyncJob):
             'min_collection_interval': self._metric_collection_interval,
             'tags': tags,
             'cloud_metadata': self._config.cloud_metadata,
-            'mysql_rows': rows,
         }
-        self._check.database_monitoring_query_metrics(json.dumps(payload, default=default_json_event_encoding))
+        for chunk in iter_json_event_chunks(payload, 'mysql_rows', rows):
+            self._check.database_monitoring_query_metrics(chunk)
         self._check.count(
             "dd.mysql.collect_per_statement_metrics.rows",
             len(rows),
@@ -163,8 +186,10 @@ class MySQLStatementMetrics(DBMAsyncJob):
 
     def _collect_per_statement_metrics(self):
         # type: () -> List[PyMysqlRow]
-        monotonic_rows = self._query_summary_per_statement()
-        monotonic_rows = self._normalize_queries(monotonic_rows)
+        if self._stream_rows:
+            monotonic_rows = self._iter_normalized_queries(self._stream_summary_per_statement())
+        else:
+            monotonic_rows = self._normalize_queries(self._query_summary_per_statement())
         rows = self._state.compute_derivative_rows(monotonic_rows, METRICS_COLUMNS, key=_row_key)
         return rows
 
@@ -176,36 +201,30 @@ class MySQLStatementMetrics(DBMAsyncJob):
         values to get the counts for the elapsed period. This is similar to monotonic_count, but
         several fields must be further processed from the delta values.
         """
-
-        sql_statement_summary = """\
-            SELECT `schema_name`,
-                   `digest`,
-                   `digest_text`,
-                   `count_star`,
-                   `sum_timer_wait`,
-                   `sum_lock_time`,
-                   `sum_errors`,
-                   `sum_rows_affected`,
-                   `sum_rows_sent`,
-                   `sum_rows_examined`,
-                   `sum_select_scan`,
-                   `sum_select_full_join`,
-                   `sum_no_index_used`,
-                   `sum_no_good_index_used`
-            FROM performance_schema.events_statements_summary_by_digest
-            WHERE `digest_text` NOT LIKE 'EXPLAIN %' OR `digest_text` IS NULL
-            ORDER BY `count_star` DESC
-            LIMIT 10000"""
-
         with closing(self._get_db_connection().cursor(pymysql.cursors.DictCursor)) as cursor:
-            cursor.execute(sql_statement_summary)
+            cursor.execute(STATEMENT_SUMMARY_QUERY)
 
             rows = cursor.fetchall() or []  # type: ignore
 
         return rows
 
+    def _stream_summary_per_statement(self):
+        # type: () -> Iterator[PyMysqlRow]
+        """
+        Same as `_query_summary_per_statement`, but rows are read from the server as they are consumed
+        with an unbuffered cursor rather than all loaded at once, so that they can be processed while
+        the rest of the result set is still being transferred.
+        """
+        with closing(self._get_db_connection().cursor(pymysql.cursors.SSDictCursor)) as cursor:
+            cursor.execute(STATEMENT_SUMMARY_QUERY)
+
+            for row in cursor:
+                yield row
+
     def _normalize_queries(self, rows):
-        normalized_rows = []
+        return list(self._iter_normalized_queries(rows))
+
+    def _iter_normalized_queries(self, rows):
         for row in rows:
             normalized_row = dict(copy.copy(row))
             try:
@@ -220,9 +239,7 @@ class MySQLStatementMetrics(DBMAsyncJob):
             metadata = statement['metadata']
             normalized_row['dd_tables'] = metadata.get('tables', None)
             normalized_row['dd_commands'] = metadata.get('commands', None)
-            normalized_rows.append(normalized_row)
-
-        return normalized_rows
+            yield normalized_row
 
     def _rows_to_fqt_events(self, rows, tags):
         for row in rows:
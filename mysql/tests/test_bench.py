@@ -0,0 +1,44 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import pytest
+
+from datadog_checks.mysql.innodb_metrics import InnoDBMetrics
+
+from .test_innodb_metrics import MockStatusDatabase, load_innodb_status
+
+pytestmark = pytest.mark.unit
+
+TRANSACTION = """\
+---TRANSACTION {trx_id}, ACTIVE {seconds} sec fetching rows
+mysql tables in use 2, locked 2
+LOCK WAIT 6 lock struct(s), heap size 1136, 14 row lock(s), undo log entries 3
+MySQL thread id {thread_id}, OS thread handle 139897230563072, query id 88329911 10.0.2.15 app Sending data
+SELECT o.id, o.total FROM orders o JOIN order_items i ON i.order_id = o.id WHERE o.customer_id = 1881 FOR UPDATE
+------- TRX HAS BEEN WAITING 1 SEC FOR THIS LOCK TO BE GRANTED:
+RECORD LOCKS space id 412 page no 3 n bits 80 index PRIMARY of table `shop`.`orders` trx id {trx_id} lock_mode X waiting
+------------------
+"""
+
+
+def busy_innodb_status(transactions):
+    """
+    Make the status of a busy server from a captured one, by adding `transactions` transactions to its list.
+    """
+    innodb_status_text = load_innodb_status('mysql57.txt')
+    marker = 'LIST OF TRANSACTIONS FOR EACH SESSION:\n'
+    transaction_list = ''.join(
+        TRANSACTION.format(trx_id=93860000 + i, seconds=i % 30, thread_id=6000 + i) for i in range(transactions)
+    )
+
+    return innodb_status_text.replace(marker, marker + transaction_list)
+
+
+@pytest.mark.parametrize('transactions', [0, 1000, 10000])
+def test_get_stats_from_innodb_status(benchmark, transactions):
+    db = MockStatusDatabase(busy_innodb_status(transactions))
+    idb = InnoDBMetrics()
+
+    results = benchmark(idb.get_stats_from_innodb_status, db)
+
+    assert results['Innodb_current_transactions'] == str(transactions + 5)
@@ -2,11 +2,42 @@
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
 import logging
+import os
 
 import pytest
 
 from datadog_checks.mysql.innodb_metrics import InnoDBMetrics
 
+INNODB_STATUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'innodb_status')
+
+
+def load_innodb_status(filename):
+    with open(os.path.join(INNODB_STATUS_DIR, filename), 'r') as f:
+        return f.read()
+
+
+class MockStatusCursor:
+    def __init__(self, innodb_status_text):
+        self.innodb_status_text = innodb_status_text
+        self.rowcount = 1
+
+    def execute(self, command):
+        pass
+
+    def fetchone(self):
+        return 'InnoDB', '', self.innodb_status_text
+
+    def close(self):
+        pass
+
+
+class MockStatusDatabase:
+    def __init__(self, innodb_status_text):
+        self.innodb_status_text = innodb_status_text
+
+    def cursor(self):
+        return MockStatusCursor(self.innodb_status_text)
+
 
 @pytest.mark.unit
 def test_innodb_status_unicode_error(caplog):
@@ -25,3 +56,90 @@ def test_innodb_status_unicode_error(caplog):
     idb = InnoDBMetrics()
     assert idb.get_stats_from_innodb_status(MockDatabase()) == {}
     assert 'Unicode error while getting INNODB status' in caplog.text
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    'filename, expected_metrics',
+    [
+        pytest.param(
+            'mysql55.txt',
+            {
+                'Innodb_mutex_spin_waits': '79626940',
+                'Innodb_s_lock_os_waits': '2100750',
+                'Innodb_x_lock_os_waits': '1530310',
+                'Innodb_history_list_length': '132',
+                'Innodb_current_transactions': '2',
+                'Innodb_active_transactions': '1',
+                'Innodb_lock_structs': '23',
+                'Innodb_tables_in_use': '1',
+                'Innodb_os_file_fsyncs': '947800',
+                'Innodb_pending_normal_aio_reads': '0',
+                'Innodb_pending_aio_log_ios': '0',
+                'Innodb_ibuf_merged': '19817684',
+                'Innodb_ibuf_merges': '3552620',
+                'Innodb_hash_index_cells_used': '4229064',
+                'Innodb_log_writes': '3430041',
+                'Innodb_checkpoint_age': '24',
+                'Innodb_mem_total': '29642194944',
+                'Innodb_mem_thread_hash': '409336',
+                'Innodb_buffer_pool_pages_total': '1769471',
+                'Innodb_buffer_pool_pages_dirty': '160602',
+                'Innodb_pages_read': '15240822',
+                'Innodb_read_views': '1',
+                'Innodb_rows_read': '454561562',
+            },
+            id='5.5',
+        ),
+        pytest.param(
+            'mysql57.txt',
+            {
+                'Innodb_semaphore_waits': '2',
+                'Innodb_semaphore_wait_time': '4000',
+                'Innodb_s_lock_spin_rounds': '3150716',
+                'Innodb_x_lock_os_waits': '405721',
+                'Innodb_current_transactions': '5',
+                'Innodb_active_transactions': '3',
+                'Innodb_locked_transactions': '1',
+                'Innodb_lock_structs': '1028',
+                # Transactions of the latest detected deadlock are not counted
+                'Innodb_tables_in_use': '3',
+                'Innodb_locked_tables': '3',
+                'Innodb_pending_normal_aio_reads': '3',
+                'Innodb_pending_normal_aio_writes': '1',
+                'Innodb_pending_ibuf_aio_reads': '0',
+                'Innodb_pending_log_flushes': '1',
+                'Innodb_pending_buffer_pool_flushes': '3',
+                'Innodb_ibuf_merged': '113319',
+                'Innodb_ibuf_merges': '78121',
+                'Innodb_hash_index_cells_used': '0',
+                'Innodb_lsn_flushed': '1928371725982',
+                'Innodb_checkpoint_age': '12914238',
+                # Only aggregated buffer pool metrics are reported
+                'Innodb_buffer_pool_pages_total': '2293760',
+                'Innodb_buffer_pool_pages_free': '8192',
+                'Innodb_pages_written': '17721089',
+                'Innodb_read_views': '3',
+                'Innodb_queries_inside': '0',
+                'Innodb_rows_inserted': '88120118',
+            },
+            id='5.7',
+        ),
+    ],
+)
+def test_innodb_status(filename, expected_metrics):
+    results = InnoDBMetrics().get_stats_from_innodb_status(MockStatusDatabase(load_innodb_status(filename)))
+
+    assert {metric: results.get(metric) for metric in expected_metrics} == expected_metrics
+
+
+@pytest.mark.unit
+def test_innodb_status_without_sections():
+    innodb_status_text = load_innodb_status('mysql55.txt')
+    # Without section headers, every line is matched against every rule
+    lines = [line for line in innodb_status_text.splitlines() if not line or line.strip('-')]
+
+    idb = InnoDBMetrics()
+    assert idb.get_stats_from_innodb_status(MockStatusDatabase('\n'.join(lines))) == idb.get_stats_from_innodb_status(
+        MockStatusDatabase(innodb_status_text)
+    )
@@ -176,8 +176,9 @@ def _obfuscate_sql(query, options=None):
 
 @pytest.mark.integration
 @pytest.mark.usefixtures('dd_environment')
+@pytest.mark.parametrize("stream_rows", [False, True])
 @mock.patch.dict('os.environ', {'DDEV_SKIP_GENERIC_TAGS_CHECK': 'true'})
-def test_statement_metrics_with_duplicates(aggregator, dd_run_check, dbm_instance, datadog_agent):
+def test_statement_metrics_with_duplicates(aggregator, dd_run_check, dbm_instance, datadog_agent, stream_rows):
     query_one = 'select * from information_schema.processlist where state in (\'starting\')'
     query_two = 'select * from information_schema.processlist where state in (\'starting\', \'Waiting on empty queue\')'
     normalized_query = 'SELECT * FROM `information_schema` . `processlist` where state in ( ? )'
@@ -186,6 +187,7 @@ def test_statement_metrics_with_duplicates(aggregator, dd_run_check, dbm_instanc
     # mysql and varies across versions.
     query_signature = '94caeb4c54f97849'
 
+    dbm_instance['query_metrics']['stream_rows'] = stream_rows
     mysql_check = MySql(common.CHECK_NAME, {}, [dbm_instance])
 
     def obfuscate_sql(query, options=None):
@@ -9,6 +9,7 @@ import pymysql
 import pytest
 
 from datadog_checks.mysql import MySql
+from datadog_checks.mysql.statements import METRICS_COLUMNS
 from datadog_checks.mysql.version_utils import get_version
 
 from . import common
@@ -309,3 +310,53 @@ def test_service_check(disable_generic_tags, expected_tags, hostname):
     check = MySql(common.CHECK_NAME, {}, instances=[config])
 
     assert set(check._service_check_tags(hostname)) == expected_tags
+
+
+@pytest.mark.parametrize(
+    'stream_rows,cursor_class,rows_read_when_normalized',
+    [
+        pytest.param(False, pymysql.cursors.DictCursor, [2, 2], id='buffered'),
+        pytest.param(True, pymysql.cursors.SSDictCursor, [1, 2], id='streamed'),
+    ],
+)
+def test_statement_metrics_stream_rows(stream_rows, cursor_class, rows_read_when_normalized):
+    instance = {'server': 'localhost', 'user': 'datadog', 'dbm': True, 'query_metrics': {'stream_rows': stream_rows}}
+    statement_metrics = MySql(common.CHECK_NAME, {}, instances=[instance])._statement_metrics
+    rows_read = []
+
+    def summary_rows(counts):
+        for digest, count_star in counts:
+            rows_read.append(digest)
+            row = dict.fromkeys(METRICS_COLUMNS, 0)
+            row.update(schema_name='testdb', digest=digest, digest_text='SELECT ' + digest, count_star=count_star)
+            yield row
+
+    rows_read_by_query = {}
+
+    def obfuscate_sql(query, options=None):
+        rows_read_by_query[query] = len(rows_read)
+        return {'query': query, 'metadata': {}}
+
+    def collect(counts):
+        del rows_read[:]
+        cursor = mock.MagicMock()
+        if stream_rows:
+            cursor.__iter__.return_value = summary_rows(counts)
+        else:
+            cursor.fetchall.side_effect = lambda: list(summary_rows(counts))
+        db = mock.MagicMock()
+        db.cursor.return_value = cursor
+        with mock.patch.object(statement_metrics, '_get_db_connection', return_value=db), mock.patch(
+            'datadog_checks.mysql.statements.obfuscate_sql_with_metadata', side_effect=obfuscate_sql
+        ):
+            rows = statement_metrics._collect_per_statement_metrics()
+
+        db.cursor.assert_called_once_with(cursor_class)
+        return rows
+
+    assert collect([('a', 1), ('b', 1)]) == []
+    # Streamed rows are normalized as they are read, rather than once they are all loaded
+    assert [rows_read_by_query['SELECT a'], rows_read_by_query['SELECT b']] == rows_read_when_normalized
+
+    rows = collect([('a', 3), ('b', 1)])
+    assert [(row['digest'], row['count_star']) for row in rows] == [('a', 2)]
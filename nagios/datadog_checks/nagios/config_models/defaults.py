@@ -32,5 +32,9 @@ def instance_min_collection_interval():
     return 15
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_passive_checks_events():
     return False
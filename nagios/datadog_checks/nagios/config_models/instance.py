@@ -42,6 +42,7 @@ class InstanceConfig(BaseModel):
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
     nagios_conf: str
+    normalization_cache_size: Optional[int] = None
     passive_checks_events: Optional[bool] = None
     service: Optional[str] = None
     tags: Optional[tuple[str, ...]] = None
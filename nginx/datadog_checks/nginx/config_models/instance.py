@@ -76,6 +76,7 @@ class InstanceConfig(BaseModel):
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
     nginx_status_url: str
+    normalization_cache_size: Optional[int] = None
     ntlm_domain: Optional[str] = None
     only_query_enabled_endpoints: Optional[bool] = None
     password: Optional[str] = None
@@ -40,6 +40,7 @@ class InstanceConfig(BaseModel):
     empty_default_hostname: Optional[bool] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     password: Optional[str] = None
     service: Optional[str] = None
     ssl_ca_certs: Optional[str] = None
@@ -46,3 +46,7 @@ def instance_empty_default_hostname():
 
 def instance_min_collection_interval():
     return 15
+
+
+def instance_normalization_cache_size():
+    return 0
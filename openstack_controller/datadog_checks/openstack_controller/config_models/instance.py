@@ -372,6 +372,7 @@ class InstanceConfig(BaseModel):
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
     name: Optional[str] = None
+    normalization_cache_size: Optional[int] = None
     nova_microversion: Optional[str] = None
     ntlm_domain: Optional[str] = None
     openstack_cloud_name: Optional[str] = None
@@ -54,6 +54,7 @@ class InstanceConfig(BaseModel):
     jdbc_truststore_type: Optional[str] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     only_custom_queries: Optional[bool] = None
     password: str
     protocol: Optional[str] = None
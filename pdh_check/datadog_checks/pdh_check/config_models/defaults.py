@@ -26,3 +26,7 @@ def instance_host():
 
 def instance_min_collection_interval():
     return 15
+
+
+def instance_normalization_cache_size():
+    return 0
@@ -44,6 +44,7 @@ class InstanceConfig(BaseModel):
     metric_patterns: Optional[MetricPatterns] = None
     metrics: tuple[tuple[str, ...], ...]
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     password: Optional[str] = None
     service: Optional[str] = None
     tags: Optional[tuple[str, ...]] = None
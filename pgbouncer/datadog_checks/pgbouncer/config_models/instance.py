@@ -42,6 +42,7 @@ class InstanceConfig(BaseModel):
     host: Optional[str] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     password: Optional[str] = None
     port: Optional[int] = None
     service: Optional[str] = None
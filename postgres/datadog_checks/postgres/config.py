@@ -49,6 +49,10 @@ class PostgresConfig:
                 "To monitor more databases, add them to the `database_autodiscovery` includelist."
             )
 
+        self.discovery_max_concurrent_databases = self.discovery_config.get('max_concurrent_databases', 1)
+        if not isinstance(self.discovery_max_concurrent_databases, int) or self.discovery_max_concurrent_databases < 1:
+            raise ConfigurationError("`database_autodiscovery.max_concurrent_databases` must be a positive integer.")
+
         self.application_name = instance.get('application_name', 'datadog-agent')
         if not self.isascii(self.application_name):
             raise ConfigurationError("Application name can include only ASCII characters: %s", self.application_name)
@@ -91,6 +95,7 @@ class PostgresConfig:
         self.min_collection_interval = instance.get('min_collection_interval', 15)
         # database monitoring adds additional telemetry for query metrics & samples
         self.dbm_enabled = is_affirmative(instance.get('dbm', instance.get('deep_database_monitoring', False)))
+        self.adaptive_job_scheduling = is_affirmative(instance.get('adaptive_job_scheduling', False))
         self.full_statement_text_cache_max_size = instance.get('full_statement_text_cache_max_size', 10000)
         self.full_statement_text_samples_per_hour_per_query = instance.get(
             'full_statement_text_samples_per_hour_per_query', 1
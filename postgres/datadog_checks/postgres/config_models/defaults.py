@@ -12,6 +12,10 @@ def instance_activity_metrics_excluded_aggregations():
     return []
 
 
+def instance_adaptive_job_scheduling():
+    return False
+
+
 def instance_application_name():
     return 'datadog-agent'
 
@@ -100,6 +104,10 @@ def instance_min_collection_interval():
     return 15
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_pg_stat_statements_view():
     return 'show_pg_stat_statements()'
 
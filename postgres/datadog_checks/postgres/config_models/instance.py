@@ -65,6 +65,7 @@ class CollectSchemas(BaseModel):
     )
     collection_interval: Optional[float] = None
     enabled: Optional[bool] = None
+    full_refresh_interval: Optional[float] = None
     max_columns: Optional[float] = None
     max_tables: Optional[float] = None
 
@@ -86,6 +87,7 @@ class DatabaseAutodiscovery(BaseModel):
     enabled: Optional[bool] = None
     exclude: Optional[tuple[str, ...]] = None
     include: Optional[tuple[str, ...]] = None
+    max_concurrent_databases: Optional[int] = None
     max_databases: Optional[int] = None
     refresh: Optional[int] = None
 
@@ -155,7 +157,9 @@ class QueryMetrics(BaseModel):
     )
     collection_interval: Optional[float] = None
     enabled: Optional[bool] = None
+    incremental_query_text: Optional[bool] = None
     pg_stat_statements_max_warning_threshold: Optional[float] = None
+    query_text_cache_max_size: Optional[int] = None
 
 
 class QuerySamples(BaseModel):
@@ -192,6 +196,7 @@ class InstanceConfig(BaseModel):
         frozen=True,
     )
     activity_metrics_excluded_aggregations: Optional[tuple[str, ...]] = None
+    adaptive_job_scheduling: Optional[bool] = None
     application_name: Optional[str] = None
     aws: Optional[Aws] = None
     azure: Optional[Azure] = None
@@ -224,6 +229,7 @@ class InstanceConfig(BaseModel):
     max_relations: Optional[int] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     obfuscator_options: Optional[ObfuscatorOptions] = None
     password: Optional[str] = None
     pg_stat_statements_view: Optional[str] = None
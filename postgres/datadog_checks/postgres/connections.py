@@ -6,7 +6,7 @@ import datetime
 import inspect
 import threading
 import time
-from typing import Callable, Dict
+from typing import Callable, Dict, Set
 
 import psycopg2
 
@@ -71,6 +71,8 @@ class MultiDatabaseConnectionPool(object):
         self._stats = self.Stats()
         self._mu = threading.RLock()
         self._conns: Dict[str, ConnectionInfo] = {}
+        # Databases that a connection is being opened to, they count towards `max_conns`
+        self._connecting: Set[str] = set()
 
         if hasattr(inspect, 'signature'):
             connect_sig = inspect.signature(connect_fn)
@@ -96,41 +98,67 @@ class MultiDatabaseConnectionPool(object):
         """
         start = datetime.datetime.now()
         self.prune_connections()
-        with self._mu:
-            conn = self._conns.pop(dbname, None)
-            db = conn.connection if conn else None
-            if db is None or db.closed:
-                if self.max_conns is not None:
-                    # try to free space until we succeed
-                    while len(self._conns) >= self.max_conns:
+        while True:
+            connect = False
+            with self._mu:
+                if dbname in self._connecting:
+                    # Another thread is opening a connection to this database, wait for it
+                    pass
+                else:
+                    conn = self._conns.pop(dbname, None)
+                    db = conn.connection if conn else None
+                    if db is not None and not db.closed:
+                        # if already in pool, retain persistence status
+                        persistent = conn.persistent
+                        self._add_connection_unsafe(dbname, db, ttl_ms, persistent)
+                        return db
+                    elif self.max_conns is None or len(self._conns) + len(self._connecting) < self.max_conns:
+                        self._stats.connection_opened += 1
+                        self._connecting.add(dbname)
+                        connect = True
+                    else:
+                        # try to free space until we succeed
                         self.prune_connections()
-                        self.evict_lru()
+                        if self.evict_lru() is not None:
+                            continue
                         if timeout is not None and (datetime.datetime.now() - start).total_seconds() > timeout:
                             raise ConnectionPoolFullError(self.max_conns, timeout)
-                        time.sleep(0.01)
-                        continue
-                self._stats.connection_opened += 1
-                db = self.connect_fn(dbname)
-                if startup_fn:
-                    startup_fn(db)
-            else:
-                # if already in pool, retain persistence status
-                persistent = conn.persistent
-
-            if db.status != psycopg2.extensions.STATUS_READY:
-                # Some transaction went wrong and the connection is in an unhealthy state. Let's fix that
-                db.rollback()
-
-            deadline = datetime.datetime.now() + datetime.timedelta(milliseconds=ttl_ms)
-            self._conns[dbname] = ConnectionInfo(
-                connection=db,
-                deadline=deadline,
-                active=True,
-                last_accessed=datetime.datetime.now(),
-                thread=threading.current_thread(),
-                persistent=persistent,
-            )
-            return db
+
+            if connect:
+                # Connect without holding the lock, so that other threads can use the pool meanwhile
+                try:
+                    db = self.connect_fn(dbname)
+                    if startup_fn:
+                        startup_fn(db)
+                except Exception:
+                    with self._mu:
+                        self._connecting.discard(dbname)
+                    raise
+
+                with self._mu:
+                    self._connecting.discard(dbname)
+                    self._add_connection_unsafe(dbname, db, ttl_ms, persistent)
+                return db
+
+            # Wait without holding the lock, so that connections in use by other threads can be released
+            time.sleep(0.01)
+
+    def _add_connection_unsafe(
+        self, dbname: str, db: psycopg2.extensions.connection, ttl_ms: int, persistent: bool
+    ) -> None:
+        if db.status != psycopg2.extensions.STATUS_READY:
+            # Some transaction went wrong and the connection is in an unhealthy state. Let's fix that
+            db.rollback()
+
+        deadline = datetime.datetime.now() + datetime.timedelta(milliseconds=ttl_ms)
+        self._conns[dbname] = ConnectionInfo(
+            connection=db,
+            deadline=deadline,
+            active=True,
+            last_accessed=datetime.datetime.now(),
+            thread=threading.current_thread(),
+            persistent=persistent,
+        )
 
     @contextlib.contextmanager
     def get_connection(
@@ -151,8 +179,7 @@ class MultiDatabaseConnectionPool(object):
         connections must be manually closed by `close_all_connections()`.
         """
         try:
-            with self._mu:
-                db = self._get_connection_raw(dbname, ttl_ms, timeout, startup_fn, persistent)
+            db = self._get_connection_raw(dbname, ttl_ms, timeout, startup_fn, persistent)
             yield db
         finally:
             with self._mu:
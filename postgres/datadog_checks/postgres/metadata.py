@@ -23,6 +23,7 @@ from .version_utils import VersionUtils
 DEFAULT_SETTINGS_COLLECTION_INTERVAL = 600
 DEFAULT_SCHEMAS_COLLECTION_INTERVAL = 600
 DEFAULT_RESOURCES_COLLECTION_INTERVAL = 300
+DEFAULT_SCHEMAS_FULL_REFRESH_INTERVAL = 3600
 
 PG_SETTINGS_QUERY = """
 SELECT name, setting FROM pg_settings
@@ -42,6 +43,30 @@ FROM   pg_catalog.pg_database db
 WHERE  datname LIKE '{dbname}';
 """
 
+# Changing the definition of a table writes new versions of the catalog rows describing it, so the transaction
+# ids of these rows tell whether a table needs to be queried again since the last collection
+TABLE_FINGERPRINT = """md5(concat_ws('|',
+           c.xmin :: text,
+           t.relname,
+           (SELECT string_agg(a.xmin :: text, ',' ORDER BY a.attnum)
+            FROM   pg_attribute a
+            WHERE  a.attrelid = c.oid),
+           (SELECT string_agg(ad.xmin :: text, ',' ORDER BY ad.adnum)
+            FROM   pg_attrdef ad
+            WHERE  ad.adrelid = c.oid),
+           (SELECT string_agg(i.xmin :: text || ':' || ic.xmin :: text, ',' ORDER BY i.indexrelid)
+            FROM   pg_index i
+                   JOIN pg_class ic
+                     ON ic.oid = i.indexrelid
+            WHERE  i.indrelid = c.oid),
+           (SELECT string_agg(co.xmin :: text, ',' ORDER BY co.oid)
+            FROM   pg_constraint co
+            WHERE  co.conrelid = c.oid),
+           (SELECT count(*)
+            FROM   pg_inherits inh
+            WHERE  inh.inhparent = c.oid) :: text
+       ))"""
+
 PG_TABLES_QUERY_V10_PLUS = """
 SELECT c.oid                 AS id,
        c.relname             AS name,
@@ -51,27 +76,33 @@ SELECT c.oid                 AS id,
            WHEN c.relkind = 'p' THEN TRUE
            ELSE FALSE
          END )               AS has_partitions,
-       t.relname             AS toast_table
+       t.relname             AS toast_table,
+       {fingerprint}         AS fingerprint
 FROM   pg_class c
        left join pg_class t
               ON c.reltoastrelid = t.oid
 WHERE  c.relkind IN ( 'r', 'p' )
        AND c.relispartition != 't'
-       AND c.relnamespace = {schema_oid};
-"""
+       AND c.relnamespace = {{schema_oid}};
+""".format(
+    fingerprint=TABLE_FINGERPRINT
+)
 
 PG_TABLES_QUERY_V9 = """
 SELECT c.oid                 AS id,
        c.relname             AS name,
        c.relhasindex         AS hasindexes,
        c.relowner :: regrole AS owner,
-       t.relname             AS toast_table
+       t.relname             AS toast_table,
+       {fingerprint}         AS fingerprint
 FROM   pg_class c
        left join pg_class t
               ON c.reltoastrelid = t.oid
 WHERE  c.relkind IN ( 'r' )
-       AND c.relnamespace = {schema_oid};
-"""
+       AND c.relnamespace = {{schema_oid}};
+""".format(
+    fingerprint=TABLE_FINGERPRINT
+)
 
 
 SCHEMA_QUERY = """
@@ -167,6 +198,9 @@ class PostgresMetadata(DBMAsyncJob):
         self.schemas_collection_interval = config.schemas_metadata_config.get(
             'collection_interval', DEFAULT_SCHEMAS_COLLECTION_INTERVAL
         )
+        self.schemas_full_refresh_interval = config.schemas_metadata_config.get(
+            'full_refresh_interval', DEFAULT_SCHEMAS_FULL_REFRESH_INTERVAL
+        )
 
         collection_interval = config.resources_metadata_config.get(
             'collection_interval', DEFAULT_RESOURCES_COLLECTION_INTERVAL
@@ -185,6 +219,7 @@ class PostgresMetadata(DBMAsyncJob):
             expected_db_exceptions=(psycopg2.errors.DatabaseError,),
             job_name="database-metadata",
             shutdown_callback=shutdown_callback,
+            adaptive_scheduling=config.adaptive_job_scheduling,
         )
         self._check = check
         self._config = config
@@ -194,6 +229,8 @@ class PostgresMetadata(DBMAsyncJob):
         self._pg_settings_cached = None
         self._time_since_last_settings_query = 0
         self._time_since_last_schemas_query = 0
+        # dbname -> tables collected during the last schema collection, see `_get_schema_cache`
+        self._schema_cache = {}
         self._conn_ttl_ms = self._config.idle_connection_timeout
         self._tags_no_db = None
         self.tags = None
@@ -369,7 +406,12 @@ class PostgresMetadata(DBMAsyncJob):
         return table_info[:limit]
 
     def _query_table_information_for_schema(
-        self, cursor: psycopg2.extensions.cursor, schema_id: str, dbname: str
+        self,
+        cursor: psycopg2.extensions.cursor,
+        schema_id: str,
+        dbname: str,
+        cached_tables: Optional[Dict[str, Dict]] = None,
+        collected_tables: Optional[Dict] = None,
     ) -> List[Dict[str, Union[str, Dict]]]:
         """
         Collect table information per schema. Returns a list of dictionaries
@@ -391,57 +433,125 @@ class PostgresMetadata(DBMAsyncJob):
             "toast_table": str (if associated toast table exists)
             "partition_key": str (if has partitions)
             "num_partitions": int (if has partitions)
+
+        Only the tables missing from `cached_tables` or whose fingerprint changed are queried, the payloads of
+        the others are reused. All tables are added to `collected_tables`.
         """
         tables_info = self._get_table_info(cursor, dbname, schema_id)
         table_payloads = []
         for table in tables_info:
-            this_payload = {}
-            name = table['name']
-            table_id = table['id']
-            this_payload.update({'id': str(table['id'])})
-            this_payload.update({'name': name})
-            if table["hasindexes"]:
-                cursor.execute(PG_INDEXES_QUERY.format(tablename=name))
-                rows = cursor.fetchall()
-                idxs = [dict(row) for row in rows]
-                this_payload.update({'indexes': idxs})
-
-            if VersionUtils.transform_version(str(self._check.version))['version.major'] != "9":
-                if table['has_partitions']:
-                    cursor.execute(PARTITION_KEY_QUERY.format(parent=name))
-                    row = cursor.fetchone()
-                    this_payload.update({'partition_key': row['partition_key']})
-
-                    cursor.execute(NUM_PARTITIONS_QUERY.format(parent_oid=table_id))
-                    row = cursor.fetchone()
-                    this_payload.update({'num_partitions': row['num_partitions']})
-
-            if table['toast_table'] is not None:
-                this_payload.update({'toast_table': table['toast_table']})
-
-            # Get foreign keys
-            cursor.execute(PG_CHECK_FOR_FOREIGN_KEY.format(oid=table_id))
-            row = cursor.fetchone()
-            if row['count'] > 0:
-                cursor.execute(PG_CONSTRAINTS_QUERY.format(oid=table_id))
-                rows = cursor.fetchall()
-                if rows:
-                    fks = [dict(row) for row in rows]
-                    this_payload.update({'foreign_keys': fks})
-
-            # Get columns
-            cursor.execute(COLUMNS_QUERY.format(oid=table_id))
-            rows = cursor.fetchall()[:]
-            max_columns = self._config.schemas_metadata_config.get('max_columns', 50)
-            columns = [dict(row) for row in rows][:max_columns]
-            this_payload.update({'columns': columns})
+            table_id = str(table['id'])
+            cached_table = cached_tables.get(table_id) if cached_tables else None
+            if cached_table and cached_table['fingerprint'] == table['fingerprint']:
+                this_payload = cached_table['payload']
+            else:
+                this_payload = self._query_table_information(cursor, table)
+                if collected_tables is not None:
+                    collected_tables['queried'] += 1
 
+            if collected_tables is not None:
+                collected_tables['tables'][table_id] = {'fingerprint': table['fingerprint'], 'payload': this_payload}
             table_payloads.append(this_payload)
 
         return table_payloads
 
+    def _query_table_information(self, cursor: psycopg2.extensions.cursor, table: Dict) -> Dict[str, Union[str, Dict]]:
+        this_payload = {}
+        name = table['name']
+        table_id = table['id']
+        this_payload.update({'id': str(table['id'])})
+        this_payload.update({'name': name})
+        if table["hasindexes"]:
+            cursor.execute(PG_INDEXES_QUERY.format(tablename=name))
+            rows = cursor.fetchall()
+            idxs = [dict(row) for row in rows]
+            this_payload.update({'indexes': idxs})
+
+        if VersionUtils.transform_version(str(self._check.version))['version.major'] != "9":
+            if table['has_partitions']:
+                cursor.execute(PARTITION_KEY_QUERY.format(parent=name))
+                row = cursor.fetchone()
+                this_payload.update({'partition_key': row['partition_key']})
+
+                cursor.execute(NUM_PARTITIONS_QUERY.format(parent_oid=table_id))
+                row = cursor.fetchone()
+                this_payload.update({'num_partitions': row['num_partitions']})
+
+        if table['toast_table'] is not None:
+            this_payload.update({'toast_table': table['toast_table']})
+
+        # Get foreign keys
+        cursor.execute(PG_CHECK_FOR_FOREIGN_KEY.format(oid=table_id))
+        row = cursor.fetchone()
+        if row['count'] > 0:
+            cursor.execute(PG_CONSTRAINTS_QUERY.format(oid=table_id))
+            rows = cursor.fetchall()
+            if rows:
+                fks = [dict(row) for row in rows]
+                this_payload.update({'foreign_keys': fks})
+
+        # Get columns
+        cursor.execute(COLUMNS_QUERY.format(oid=table_id))
+        rows = cursor.fetchall()[:]
+        max_columns = self._config.schemas_metadata_config.get('max_columns', 50)
+        columns = [dict(row) for row in rows][:max_columns]
+        this_payload.update({'columns': columns})
+
+        return this_payload
+
+    def _get_schema_cache(self, dbname):
+        """
+        Returns the tables collected for `dbname` during the last schema collection, by table id, along with the
+        fingerprint of their definition. It is kept in the persistent cache so that it survives Agent restarts.
+        Returns None when all tables must be queried again, i.e. every `full_refresh_interval` seconds.
+        """
+        schema_cache = self._schema_cache.get(dbname)
+        if schema_cache is None:
+            try:
+                persisted_cache = self._check.read_persistent_cache(self._schema_cache_key(dbname))
+                if persisted_cache:
+                    schema_cache = json.loads(persisted_cache)
+            except Exception as e:
+                self._log.debug("Unable to load the cached schemas of database %s: %s", dbname, e)
+
+        if (
+            not schema_cache
+            or schema_cache.get('max_columns') != self._config.schemas_metadata_config.get('max_columns', 50)
+            or time.time() - schema_cache.get('full_refresh', 0) >= self.schemas_full_refresh_interval
+        ):
+            return None
+
+        return schema_cache
+
+    def _set_schema_cache(self, dbname, schema_cache, collected_tables):
+        if schema_cache is not None:
+            if not collected_tables['queried'] and collected_tables['tables'].keys() == schema_cache['tables'].keys():
+                # Nothing changed since the last collection
+                self._schema_cache[dbname] = schema_cache
+                return
+            full_refresh = schema_cache['full_refresh']
+        else:
+            full_refresh = time.time()
+
+        schema_cache = {
+            'full_refresh': full_refresh,
+            'max_columns': self._config.schemas_metadata_config.get('max_columns', 50),
+            'tables': collected_tables['tables'],
+        }
+        self._schema_cache[dbname] = schema_cache
+        self._check.write_persistent_cache(
+            self._schema_cache_key(dbname), json.dumps(schema_cache, default=default_json_event_encoding)
+        )
+
+    @staticmethod
+    def _schema_cache_key(dbname):
+        return 'schemas_metadata_{}'.format(dbname)
+
     def _collect_metadata_for_database(self, dbname):
         metadata = {}
+        schema_cache = self._get_schema_cache(dbname)
+        cached_tables = schema_cache['tables'] if schema_cache else {}
+        collected_tables = {'tables': {}, 'queried': 0}
         with self.db_pool.get_connection(dbname, self._config.idle_connection_timeout) as conn:
             with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cursor:
                 database_info = self._query_database_information(cursor, dbname)
@@ -457,10 +567,26 @@ class PostgresMetadata(DBMAsyncJob):
                 )
                 schema_info = self._query_schema_information(cursor, dbname)
                 for schema in schema_info:
-                    tables_info = self._query_table_information_for_schema(cursor, schema['id'], dbname)
+                    tables_info = self._query_table_information_for_schema(
+                        cursor, schema['id'], dbname, cached_tables, collected_tables
+                    )
                     schema.update({"tables": tables_info})
                     metadata['schemas'].append(schema)
 
+        self._set_schema_cache(dbname, schema_cache, collected_tables)
+
+        tags = self._dbtags(dbname) + self._check._get_debug_tags()
+        for name, value in (
+            ('queried', collected_tables['queried']),
+            ('cached', len(collected_tables['tables']) - collected_tables['queried']),
+        ):
+            self._check.gauge(
+                'dd.postgres.schemas.tables.{}'.format(name),
+                value,
+                tags=tags,
+                hostname=self._check.resolved_hostname,
+            )
+
         return metadata
 
     @tracked_method(agent_check_getter=agent_check_getter)
@@ -5,6 +5,7 @@ import contextlib
 import copy
 import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
 from time import time
 
 import psycopg2
@@ -20,7 +21,7 @@ from datadog_checks.base.utils.db.utils import (
 from datadog_checks.base.utils.db.utils import resolve_db_host as agent_host_resolver
 from datadog_checks.base.utils.serialization import json
 from datadog_checks.postgres import aws, azure
-from datadog_checks.postgres.connections import MultiDatabaseConnectionPool
+from datadog_checks.postgres.connections import ConnectionPoolFullError, MultiDatabaseConnectionPool
 from datadog_checks.postgres.discovery import PostgresAutodiscovery
 from datadog_checks.postgres.metadata import PostgresMetadata
 from datadog_checks.postgres.metrics_cache import PostgresMetricsCache
@@ -600,11 +601,25 @@ class PostgreSql(AgentCheck):
 
         start_time = time()
         databases = self.autodiscovery.get_items()
-        for db in databases:
-            with self.db_pool.get_connection(db, self._config.idle_connection_timeout) as conn:
-                with conn.cursor() as cursor:
-                    for scope in relations_scopes:
-                        self._query_scope(cursor, scope, instance_tags, False, db)
+        max_workers = min(self._config.discovery_max_concurrent_databases, len(databases))
+        if self._config.max_connections:
+            # Leave room in the connection pool for the main database, which other jobs keep using meanwhile
+            max_workers = min(max_workers, self._config.max_connections - 1)
+
+        if max_workers > 1:
+            # Give up on a database if no connection frees up in the pool within the idle connection timeout,
+            # rather than holding up the other databases
+            timeout = self._config.idle_connection_timeout / 1000
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._collect_relations_database, db, instance_tags, relations_scopes, timeout)
+                    for db in databases
+                ]
+                for future in futures:
+                    future.result()
+        else:
+            for db in databases:
+                self._collect_relations_database(db, instance_tags, relations_scopes)
         elapsed_ms = (time() - start_time) * 1000
         self.histogram(
             "dd.postgres._collect_relations_autodiscovery.time",
@@ -625,6 +640,25 @@ class PostgreSql(AgentCheck):
                 ),
             )
 
+    def _collect_relations_database(self, db, instance_tags, relations_scopes, timeout=None):
+        start_time = time()
+        try:
+            with self.db_pool.get_connection(db, self._config.idle_connection_timeout, timeout=timeout) as conn:
+                with conn.cursor() as cursor:
+                    for scope in relations_scopes:
+                        self._query_scope(cursor, scope, instance_tags, False, db)
+        except ConnectionPoolFullError as e:
+            if timeout is None:
+                raise
+            self.log.warning("Skipping the relation metrics of database %s: %s", db, e)
+            return
+        self.histogram(
+            "dd.postgres._collect_relations_autodiscovery.database.time",
+            (time() - start_time) * 1000,
+            tags=self.tags_without_db + ["db:{}".format(db)] + self._get_debug_tags(),
+            hostname=self.resolved_hostname,
+        )
+
     def _collect_dynamic_queries_autodiscovery(self, queries):
         if not self.autodiscovery:
             return
@@ -106,6 +106,17 @@ PG_ACTIVE_CONNECTIONS_QUERY = re.sub(
 """,
 ).strip()
 
+# Share of `max_connections` taken by the sessions running a query, used as the load of the database
+PG_ACTIVE_SESSIONS_LOAD_QUERY = re.sub(
+    r'\s+',
+    ' ',
+    """
+    SELECT count(*) / current_setting('max_connections')::float
+    FROM {pg_stat_activity_view}
+    WHERE pid != pg_backend_pid() AND client_port IS NOT NULL AND state = 'active'
+""",
+).strip()
+
 EXPLAIN_VALIDATION_QUERY = "SELECT * FROM pg_stat_activity"
 
 
@@ -160,6 +171,7 @@ class PostgresStatementSamples(DBMAsyncJob):
             expected_db_exceptions=(psycopg2.errors.DatabaseError,),
             job_name="query-samples",
             shutdown_callback=shutdown_callback,
+            adaptive_scheduling=config.adaptive_job_scheduling,
         )
         self._check = check
         self._config = config
@@ -238,6 +250,17 @@ class PostgresStatementSamples(DBMAsyncJob):
         self._log.debug("Loaded %s rows from %s", len(rows), self._config.pg_stat_activity_view)
         return [dict(row) for row in rows]
 
+    def get_db_load(self):
+        """
+        Returns the share of `max_connections` taken by active sessions
+        """
+        query = PG_ACTIVE_SESSIONS_LOAD_QUERY.format(pg_stat_activity_view=self._config.pg_stat_activity_view)
+        with self._check._get_main_db() as conn:
+            with conn.cursor() as cursor:
+                self._log.debug("Running query [%s]", query)
+                cursor.execute(query)
+                return cursor.fetchone()[0]
+
     @tracked_method(agent_check_getter=agent_check_getter, track_result_length=True)
     def _get_new_pg_stat_activity(self, available_activity_columns):
         start_time = time.time()
@@ -8,10 +8,11 @@ import time
 
 import psycopg2
 import psycopg2.extras
-from cachetools import TTLCache
+from cachetools import LRUCache, TTLCache
 
 from datadog_checks.base import is_affirmative
 from datadog_checks.base.utils.common import to_native_string
+from datadog_checks.base.utils.db.serialization import iter_json_event_chunks
 from datadog_checks.base.utils.db.sql import compute_sql_signature
 from datadog_checks.base.utils.db.statement_metrics import StatementMetrics
 from datadog_checks.base.utils.db.utils import DBMAsyncJob, default_json_event_encoding, obfuscate_sql_with_metadata
@@ -39,6 +40,24 @@ SELECT {cols}
   {extra_clauses}
 """
 
+# Only the counters, the text of each query is fetched once per queryid with PG_STAT_STATEMENTS_QUERY_TEXT_QUERY
+STATEMENTS_COUNTERS_QUERY = """
+SELECT {cols}
+  FROM pg_stat_statements(false) as pg_stat_statements
+  LEFT JOIN pg_roles
+         ON pg_stat_statements.userid = pg_roles.oid
+  LEFT JOIN pg_database
+         ON pg_stat_statements.dbid = pg_database.oid
+  WHERE pg_stat_statements.queryid IS NOT NULL
+  {filters}
+"""
+
+PG_STAT_STATEMENTS_QUERY_TEXT_QUERY = """
+SELECT DISTINCT ON (queryid) queryid, query
+  FROM pg_stat_statements
+  WHERE queryid = ANY(%s)
+"""
+
 # Use pg_stat_statements(false) when available as an optimization to avoid pulling SQL text from disk
 PG_STAT_STATEMENTS_COUNT_QUERY = "SELECT COUNT(*) FROM pg_stat_statements(false)"
 PG_STAT_STATEMENTS_COUNT_QUERY_LT_9_4 = "SELECT COUNT(*) FROM pg_stat_statements"
@@ -105,6 +124,7 @@ def _row_key(row):
 
 
 DEFAULT_COLLECTION_INTERVAL = 10
+DEFAULT_QUERY_TEXT_CACHE_MAX_SIZE = 10000
 
 
 class PostgresStatementMetrics(DBMAsyncJob):
@@ -126,6 +146,7 @@ class PostgresStatementMetrics(DBMAsyncJob):
             rate_limit=1 / float(collection_interval),
             job_name="query-metrics",
             shutdown_callback=shutdown_callback,
+            adaptive_scheduling=config.adaptive_job_scheduling,
         )
         self._check = check
         self._metrics_collection_interval = collection_interval
@@ -144,6 +165,22 @@ class PostgresStatementMetrics(DBMAsyncJob):
             maxsize=config.full_statement_text_cache_max_size,
             ttl=60 * 60 / config.full_statement_text_samples_per_hour_per_query,
         )
+        # query_text_cache: queryid -> normalized query text, only used when polling pg_stat_statements without text
+        self._query_text_cache = None
+        if is_affirmative(config.statement_metrics_config.get('incremental_query_text', False)):
+            if config.pg_stat_statements_view == 'pg_stat_statements':
+                self._query_text_cache = LRUCache(
+                    maxsize=int(
+                        config.statement_metrics_config.get(
+                            'query_text_cache_max_size', DEFAULT_QUERY_TEXT_CACHE_MAX_SIZE
+                        )
+                    )
+                )
+            else:
+                self._log.warning(
+                    "query_metrics.incremental_query_text is not supported with a custom pg_stat_statements_view, "
+                    "query text will be collected on every run"
+                )
 
     def _execute_query(self, cursor, query, params=()):
         try:
@@ -200,18 +237,18 @@ class PostgresStatementMetrics(DBMAsyncJob):
                 'min_collection_interval': self._metrics_collection_interval,
                 'tags': self._tags_no_db,
                 'cloud_metadata': self._config.cloud_metadata,
-                'postgres_rows': rows,
                 'postgres_version': payload_pg_version(self._check.version),
                 'ddagentversion': datadog_agent.get_version(),
                 "ddagenthostname": self._check.agent_hostname,
             }
-            self._check.database_monitoring_query_metrics(json.dumps(payload, default=default_json_event_encoding))
+            for chunk in iter_json_event_chunks(payload, 'postgres_rows', rows):
+                self._check.database_monitoring_query_metrics(chunk)
         except Exception:
             self._log.exception('Unable to collect statement metrics due to an error')
             return []
 
     @tracked_method(agent_check_getter=agent_check_getter, track_result_length=True)
-    def _load_pg_stat_statements(self):
+    def _load_pg_stat_statements(self, showtext=True):
         try:
             available_columns = set(self._get_pg_stat_statements_columns())
             missing_columns = PG_STAT_STATEMENTS_REQUIRED_COLUMNS - available_columns
@@ -267,6 +304,9 @@ class PostgresStatementMetrics(DBMAsyncJob):
                     ),
                 )
 
+            if not showtext:
+                desired_columns -= {'query'}
+
             query_columns = sorted(available_columns & desired_columns)
             params = ()
             filters = ""
@@ -278,18 +318,18 @@ class PostgresStatementMetrics(DBMAsyncJob):
                     "pg_database.datname NOT ILIKE %s" for _ in self._config.ignore_databases
                 )
                 params = params + tuple(self._config.ignore_databases)
+            if showtext:
+                query = STATEMENTS_QUERY.format(
+                    cols=', '.join(query_columns),
+                    pg_stat_statements_view=self._config.pg_stat_statements_view,
+                    filters=filters,
+                    extra_clauses="",
+                )
+            else:
+                query = STATEMENTS_COUNTERS_QUERY.format(cols=', '.join(query_columns), filters=filters)
             with self._check._get_main_db() as conn:
                 with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cursor:
-                    return self._execute_query(
-                        cursor,
-                        STATEMENTS_QUERY.format(
-                            cols=', '.join(query_columns),
-                            pg_stat_statements_view=self._config.pg_stat_statements_view,
-                            filters=filters,
-                            extra_clauses="",
-                        ),
-                        params=params,
-                    )
+                    return self._execute_query(cursor, query, params=params)
         except psycopg2.Error as e:
             error_tag = "error:database-{}".format(type(e).__name__)
 
@@ -401,9 +441,13 @@ class PostgresStatementMetrics(DBMAsyncJob):
     def _collect_metrics_rows(self):
         self._emit_pg_stat_statements_metrics()
         self._emit_pg_stat_statements_dealloc()
-        rows = self._load_pg_stat_statements()
-
-        rows = self._normalize_queries(rows)
+        # pg_stat_statements(showtext := false) requires 9.4+, which is also when queryid was added
+        if self._query_text_cache is not None and self._check.version >= V9_4:
+            rows = self._load_pg_stat_statements(showtext=False)
+            rows = self._add_query_texts(rows)
+        else:
+            rows = self._load_pg_stat_statements()
+            rows = self._normalize_queries(rows)
         if not rows:
             return []
 
@@ -418,17 +462,21 @@ class PostgresStatementMetrics(DBMAsyncJob):
         )
         return rows
 
+    def _obfuscate_query(self, query):
+        try:
+            return obfuscate_sql_with_metadata(query, self._obfuscate_options)
+        except Exception as e:
+            if self._config.log_unobfuscated_queries:
+                self._log.warning("Failed to obfuscate query=[%s] | err=[%s]", query, e)
+            else:
+                self._log.debug("Failed to obfuscate query | err=[%s]", e)
+
     def _normalize_queries(self, rows):
         normalized_rows = []
         for row in rows:
             normalized_row = dict(copy.copy(row))
-            try:
-                statement = obfuscate_sql_with_metadata(row['query'], self._obfuscate_options)
-            except Exception as e:
-                if self._config.log_unobfuscated_queries:
-                    self._log.warning("Failed to obfuscate query=[%s] | err=[%s]", row['query'], e)
-                else:
-                    self._log.debug("Failed to obfuscate query | err=[%s]", e)
+            statement = self._obfuscate_query(row['query'])
+            if statement is None:
                 continue
 
             obfuscated_query = statement['query']
@@ -441,6 +489,95 @@ class PostgresStatementMetrics(DBMAsyncJob):
 
         return normalized_rows
 
+    def _normalize_query_text(self, query):
+        """
+        Return the `query`, `query_signature`, `dd_tables` and `dd_commands` columns for the text of a query, or
+        None if rows of that query must be excluded like `STATEMENTS_QUERY` does.
+        """
+        if query == '<insufficient privilege>' or query.startswith('EXPLAIN '):
+            return None
+
+        statement = self._obfuscate_query(query)
+        if statement is None:
+            return None
+
+        obfuscated_query = statement['query']
+        metadata = statement['metadata']
+        return {
+            'query': obfuscated_query,
+            'query_signature': compute_sql_signature(obfuscated_query),
+            'dd_tables': metadata.get('tables', None),
+            'dd_commands': metadata.get('commands', None),
+        }
+
+    @tracked_method(agent_check_getter=agent_check_getter, track_result_length=True)
+    def _add_query_texts(self, rows):
+        """
+        Add the normalized query text to rows loaded without it. Only the text of queries whose queryid was not
+        seen before is fetched from pg_stat_statements and obfuscated.
+        """
+        if not rows:
+            return []
+
+        # Keep the texts of this run aside, adding the missing texts to the cache can evict others
+        # when pg_stat_statements tracks more queries than the cache holds
+        query_texts = {}
+        missing_queryids = []
+        for queryid in {row['queryid'] for row in rows}:
+            try:
+                query_texts[queryid] = self._query_text_cache[queryid]
+            except KeyError:
+                missing_queryids.append(queryid)
+
+        hits = len(query_texts)
+        if missing_queryids:
+            with self._check._get_main_db() as conn:
+                with conn.cursor() as cursor:
+                    text_rows = self._execute_query(
+                        cursor, PG_STAT_STATEMENTS_QUERY_TEXT_QUERY, params=(missing_queryids,)
+                    )
+
+            for queryid, query in text_rows:
+                query_texts[queryid] = self._query_text_cache[queryid] = self._normalize_query_text(query)
+
+        normalized_rows = []
+        unknown_queryids = set()
+        for row in rows:
+            queryid = row['queryid']
+            if queryid not in query_texts:
+                unknown_queryids.add(queryid)
+                continue
+
+            normalized_query = query_texts[queryid]
+            if normalized_query is None:
+                continue
+
+            normalized_row = dict(row)
+            normalized_row.update(normalized_query)
+            normalized_rows.append(normalized_row)
+
+        if unknown_queryids:
+            # Queries can be evicted from pg_stat_statements before their text is fetched, try again next run
+            self._log.debug(
+                "Skipping the rows of %s queries evicted from pg_stat_statements before their text could be fetched",
+                len(unknown_queryids),
+            )
+
+        tags = self.tags + self._check._get_debug_tags()
+        for name, value in (
+            ('size', len(self._query_text_cache)),
+            ('hits', hits),
+            ('misses', len(missing_queryids)),
+        ):
+            self._check.gauge(
+                'dd.postgres.statement_metrics.query_text_cache.{}'.format(name),
+                value,
+                tags=tags,
+                hostname=self._check.resolved_hostname,
+            )
+
+        return normalized_rows
+
     def _rows_to_fqt_events(self, rows):
         for row in rows:
             query_cache_key = _row_key(row)
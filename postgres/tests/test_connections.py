@@ -7,6 +7,7 @@ import threading
 import time
 import uuid
 
+import mock
 import psycopg2
 import pytest
 
@@ -316,6 +317,81 @@ def test_conn_pool_context_managed(pg_instance):
     assert pool._stats.connection_closed == limit + 1
 
 
+@pytest.mark.integration
+@pytest.mark.usefixtures('dd_environment')
+def test_conn_pool_wait_for_release(pg_instance):
+    """
+    Test that threads waiting for room in a full pool get a connection once another thread is done with its own.
+    """
+    limit = 2
+    check = PostgreSql('postgres', {}, [pg_instance])
+    pool = MultiDatabaseConnectionPool(check._new_connection, limit)
+
+    def run_query(dbname):
+        with pool.get_connection(dbname, 10000) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("select pg_sleep(0.2)")
+
+    threadpool = [threading.Thread(target=run_query, args=('dogs_{}'.format(i),)) for i in range(limit * 3)]
+    for thread in threadpool:
+        thread.start()
+    for thread in threadpool:
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+
+    assert pool._stats.connection_opened == limit * 3
+    assert len(pool._conns) <= limit
+    pool.close_all_connections()
+
+
+@pytest.mark.unit
+def test_conn_pool_connects_without_lock():
+    """
+    Test that opening a connection doesn't prevent other threads from using the pool, and that concurrent requests
+    for the same database share a single new connection.
+    """
+    connecting = threading.Event()
+    release = threading.Event()
+    connected = []
+
+    def connect(dbname):
+        connected.append(dbname)
+        if dbname == 'slow':
+            connecting.set()
+            release.wait(5)
+        return mock.MagicMock(closed=False, status=psycopg2.extensions.STATUS_READY)
+
+    pool = MultiDatabaseConnectionPool(connect, 3)
+    fast = pool._get_connection_raw('fast', 10000)
+
+    slow_connections = []
+
+    def get_slow():
+        with pool.get_connection('slow', 10000) as conn:
+            slow_connections.append(conn)
+
+    threads = [threading.Thread(target=get_slow) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    assert connecting.wait(5)
+
+    # The pool remains usable while the connection is being opened
+    with pool.get_connection('fast', 10000) as conn:
+        assert conn is fast
+    with pool.get_connection('other', 10000):
+        pass
+
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+    assert connected == ['fast', 'slow', 'other']
+    assert len(slow_connections) == 2
+    assert slow_connections[0] is slow_connections[1]
+    assert pool._stats.connection_opened == 3
+
+
 @pytest.mark.integration
 @pytest.mark.usefixtures('dd_environment')
 def test_conn_terminated_prematurely(pg_instance):
@@ -191,6 +191,40 @@ def test_autodiscovery_collect_all_relations(aggregator, integration_check, pg_i
     )
 
 
+@pytest.mark.integration
+@pytest.mark.usefixtures('dd_environment')
+def test_autodiscovery_collect_relations_concurrently(aggregator, integration_check, pg_instance):
+    """
+    Check that relation metrics get collected for each database discovered when collecting concurrently,
+    without opening more connections than allowed.
+    """
+    pg_instance["database_autodiscovery"] = copy.deepcopy(DISCOVERY_CONFIG)
+    pg_instance["database_autodiscovery"]["max_concurrent_databases"] = 8
+    pg_instance['relations'] = [
+        {'relation_regex': '.*'},
+    ]
+    pg_instance['max_connections'] = 5
+    del pg_instance['dbname']
+
+    check = integration_check(pg_instance)
+    check.check(pg_instance)
+
+    databases = check.autodiscovery.get_items()
+    assert len(check.db_pool._conns) <= pg_instance['max_connections']
+    for db in databases:
+        expected_tags = _get_expected_tags(check, pg_instance, db=db, table='breed', schema='public')
+        for metric in RELATION_METRICS:
+            aggregator.assert_metric(metric, tags=expected_tags)
+
+        aggregator.assert_metric(
+            'dd.postgres._collect_relations_autodiscovery.database.time',
+            count=1,
+            tags=_get_expected_tags(check, pg_instance, db=db) + check._get_debug_tags(),
+        )
+
+    aggregator.assert_metric('dd.postgres._collect_relations_autodiscovery.time', count=1)
+
+
 @pytest.mark.integration
 @pytest.mark.usefixtures('dd_environment')
 def test_autodiscovery_exceeds_min_interval(aggregator, integration_check, pg_instance):
@@ -232,3 +266,14 @@ def test_autodiscovery_dbname_specified(integration_check, pg_instance):
 
     with pytest.raises(ConfigurationError):
         integration_check(pg_instance)
+
+
+@pytest.mark.parametrize('max_concurrent_databases', [0, -1, '4'])
+def test_autodiscovery_invalid_max_concurrent_databases(integration_check, pg_instance, max_concurrent_databases):
+    pg_instance["database_autodiscovery"] = copy.deepcopy(DISCOVERY_CONFIG)
+    pg_instance["database_autodiscovery"]["max_concurrent_databases"] = max_concurrent_databases
+    pg_instance['relations'] = ['breed']
+    del pg_instance['dbname']
+
+    with pytest.raises(ConfigurationError, match='max_concurrent_databases'):
+        integration_check(pg_instance)
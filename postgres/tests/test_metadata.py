@@ -4,11 +4,12 @@
 from concurrent.futures.thread import ThreadPoolExecutor
 from typing import List
 
+import psycopg2
 import pytest
 
 from datadog_checks.base.utils.db.utils import DBMAsyncJob
 
-from .common import POSTGRES_VERSION
+from .common import HOST, PASSWORD_ADMIN, POSTGRES_VERSION, USER_ADMIN
 from .utils import run_one_check
 
 pytestmark = [pytest.mark.integration, pytest.mark.usefixtures('dd_environment')]
@@ -113,6 +114,62 @@ def test_collect_schemas(integration_check, dbm_instance, aggregator):
     assert_not_fields(tables_got, tables_not_reported_set)
 
 
+def test_collect_schemas_only_changed_tables(integration_check, dbm_instance, aggregator, datadog_agent):
+    # Requesting `datadog_agent` resets its persistent cache, which would otherwise hold the tables collected
+    # by the previous tests with the same configuration
+    dbm_instance["collect_schemas"] = {'enabled': True, 'collection_interval': 0.5}
+    dbm_instance['relations'] = [{'relation_regex': ".*"}]
+    dbm_instance["database_autodiscovery"] = {"enabled": True, "include": ["datadog"]}
+    del dbm_instance['dbname']
+    check = integration_check(dbm_instance)
+
+    def collect_schemas():
+        aggregator.reset()
+        check.metadata_samples._time_since_last_schemas_query = 0
+        run_one_check(check, dbm_instance, cancel=False)
+        schema_event = next(
+            e for e in aggregator.get_event_platform_events("dbm-metadata") if e['kind'] == 'pg_databases'
+        )
+        tables = {
+            table['name']: table
+            for schema in schema_event['metadata'][0]['schemas']
+            if schema['name'] == 'public'
+            for table in schema['tables']
+        }
+        queried = aggregator.metrics('dd.postgres.schemas.tables.queried')[0].value
+        return tables, queried
+
+    tables, queried = collect_schemas()
+    assert queried == len(tables)
+
+    unchanged_tables, queried = collect_schemas()
+    assert queried == 0
+    assert unchanged_tables == tables
+
+    conn = psycopg2.connect(host=HOST, dbname='datadog_test', user=USER_ADMIN, password=PASSWORD_ADMIN)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("ALTER TABLE cities ADD COLUMN population integer")
+        changed_tables, queried = collect_schemas()
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute("ALTER TABLE cities DROP COLUMN IF EXISTS population")
+        conn.close()
+
+    assert queried == 1
+    assert 'population' in [column['name'] for column in changed_tables['cities']['columns']]
+    assert {name: table for name, table in changed_tables.items() if name != 'cities'} == {
+        name: table for name, table in tables.items() if name != 'cities'
+    }
+
+    # All tables are queried again once the full refresh interval elapsed
+    check.metadata_samples.schemas_full_refresh_interval = 0
+    _, queried = collect_schemas()
+    assert queried == len(tables)
+    check.cancel()
+
+
 def assert_fields(keys: List[str], fields: List[str]):
     for field in fields:
         assert field in keys
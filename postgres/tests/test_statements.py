@@ -10,13 +10,14 @@ from concurrent.futures.thread import ThreadPoolExecutor
 
 import mock
 import psycopg2
+import psycopg2.extras
 import pytest
 from dateutil import parser
 from semver import VersionInfo
 from six import string_types
 
 from datadog_checks.base.utils.db.sql import compute_sql_signature
-from datadog_checks.base.utils.db.utils import DBMAsyncJob
+from datadog_checks.base.utils.db.utils import DBMAsyncJob, obfuscate_sql_with_metadata
 from datadog_checks.base.utils.serialization import json
 from datadog_checks.base.utils.time import UTC
 from datadog_checks.postgres.statement_samples import (
@@ -228,6 +229,59 @@ def test_statement_metrics(
         conn.close()
 
 
+@requires_over_10
+def test_statement_metrics_incremental_query_text(aggregator, integration_check, dbm_instance, datadog_agent):
+    # don't need samples for this test
+    dbm_instance['query_samples'] = {'enabled': False}
+    dbm_instance['query_activity'] = {'enabled': False}
+    dbm_instance['query_metrics'] = {
+        'enabled': True,
+        'run_sync': True,
+        'collection_interval': 0.1,
+        'incremental_query_text': True,
+    }
+    username, password, dbname, query, arg = SAMPLE_QUERIES[0]
+    conn = psycopg2.connect(host=HOST, dbname=dbname, user=username, password=password)
+
+    # Make sure the query is not tracked yet
+    with _get_superconn(dbm_instance) as super_conn:
+        with super_conn.cursor() as cursor:
+            cursor.execute("SELECT pg_stat_statements_reset()")
+
+    check = integration_check(dbm_instance)
+    check._connect()
+    run_one_check(check, dbm_instance, cancel=False)
+
+    expected_query = query % '$1'
+    query_signature = compute_sql_signature(expected_query)
+    with mock.patch(
+        'datadog_checks.postgres.statements.obfuscate_sql_with_metadata',
+        side_effect=obfuscate_sql_with_metadata,
+    ) as obfuscate:
+        for _ in range(2):
+            aggregator.reset()
+            conn.cursor().execute(query, (arg,))
+            run_one_check(check, dbm_instance, cancel=False)
+
+            events = aggregator.get_event_platform_events("dbm-metrics")
+            assert len(events) == 1
+            matching_rows = [r for r in events[0]['postgres_rows'] if r['query_signature'] == query_signature]
+            assert len(matching_rows) == 1
+            row = matching_rows[0]
+            assert row['calls'] == 1
+            assert row['datname'] == dbname
+            assert row['rolname'] == username
+            assert row['query'] == expected_query
+
+        obfuscated_queries = [call.args[0] for call in obfuscate.call_args_list]
+        # The text of the query is only obfuscated by the first run that sees it
+        assert obfuscated_queries.count(expected_query) == 1
+
+    for name in ('size', 'hits', 'misses'):
+        aggregator.assert_metric('dd.postgres.statement_metrics.query_text_cache.{}'.format(name), count=1)
+    conn.close()
+
+
 @pytest.mark.parametrize(
     "input_cloud_metadata,output_cloud_metadata",
     [
@@ -1484,6 +1538,40 @@ def test_activity_collection_rate_limit(aggregator, integration_check, dbm_insta
     assert max_activity_collections / 2.0 <= len(activity_metrics) <= max_activity_collections
 
 
+def test_statement_samples_adaptive_scheduling_db_load(aggregator, integration_check, dbm_instance):
+    dbm_instance['adaptive_job_scheduling'] = True
+    # Don't need query metrics for this one
+    dbm_instance['query_metrics']['enabled'] = False
+    check = integration_check(dbm_instance)
+    check._connect()
+    check.check(dbm_instance)
+    rate_limiter = check.statement_samples._rate_limiter
+    period_s = rate_limiter.period_s
+
+    conn = psycopg2.connect(host=HOST, dbname=DB_NAME, user="bob", password="bob", async_=1)
+    try:
+        psycopg2.extras.wait_select(conn)
+        # keep a session active while the job runs
+        conn.cursor().execute("SELECT pg_sleep(3)")
+        time.sleep(0.1)
+        # the test server allows 1000 connections, so one active session is far from saturating it
+        load = check.statement_samples.get_db_load()
+        assert 0.001 <= load < rate_limiter.saturation_threshold
+
+        # ... unless the saturation threshold is below its load
+        rate_limiter.saturation_threshold = 0.001
+        check.check(dbm_instance)
+    finally:
+        conn.close()
+
+    assert rate_limiter.period_s > period_s
+    aggregator.assert_metric(
+        "dd.postgres.async_job.interval",
+        value=rate_limiter.period_s * 1000,
+        tags=_expected_dbm_job_err_tags(dbm_instance) + ['job:query-samples'],
+    )
+
+
 @pytest.mark.skip(reason='debugging flaky test (2021-09-03)')
 def test_statement_samples_unique_plans_rate_limits(aggregator, integration_check, dbm_instance, bob_conn):
     # tests rate limiting ingestion of samples per unique (query, plan)
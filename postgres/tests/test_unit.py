@@ -13,6 +13,7 @@ from semver import VersionInfo
 from six import iteritems
 
 from datadog_checks.postgres import PostgreSql, util
+from datadog_checks.postgres.connections import ConnectionPoolFullError
 
 from .common import PORT, check_performance_metrics
 from .utils import requires_over_10
@@ -365,3 +366,82 @@ def test_resolved_hostname(disable_generic_tags, expected_hostname, pg_instance)
         check = PostgreSql('test_instance', {}, [instance])
         assert check.resolved_hostname == expected_hostname
         assert resolve_db_host_mock.called is True
+
+
+def test_statement_metrics_query_text_cache_eviction(aggregator, integration_check, pg_instance):
+    pg_instance['dbm'] = True
+    pg_instance['query_metrics'] = {'incremental_query_text': True, 'query_text_cache_max_size': 2}
+    check = integration_check(pg_instance)
+    statement_metrics = check.statement_metrics
+    statement_metrics.tags = []
+
+    query_texts = {
+        1: 'SELECT 1',
+        2: 'SELECT 2',
+        3: 'SELECT 3',
+        4: 'EXPLAIN SELECT 4',
+    }
+    fetched_queryids = []
+
+    cursor = MagicMock()
+
+    def execute(query, params):
+        fetched_queryids.append(sorted(params[0]))
+        cursor.fetchall.return_value = [
+            (queryid, query_texts[queryid]) for queryid in params[0] if queryid in query_texts
+        ]
+
+    cursor.execute.side_effect = execute
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    @contextlib.contextmanager
+    def get_main_db():
+        yield conn
+
+    check._get_main_db = get_main_db
+
+    # Queryid 5 was evicted from pg_stat_statements before its text could be fetched
+    rows = [{'queryid': queryid, 'calls': queryid} for queryid in (1, 2, 3, 4, 5)]
+    normalized_rows = statement_metrics._add_query_texts(rows)
+
+    # Every query with a text is kept, even though the cache only holds 2 of them
+    assert [(row['queryid'], row['query']) for row in normalized_rows] == [
+        (1, 'SELECT 1'),
+        (2, 'SELECT 2'),
+        (3, 'SELECT 3'),
+    ]
+    assert fetched_queryids == [[1, 2, 3, 4, 5]]
+    assert len(statement_metrics._query_text_cache) == 2
+
+    # Texts still in the cache are not fetched again, the others are
+    aggregator.reset()
+    normalized_rows = statement_metrics._add_query_texts(rows)
+
+    assert [(row['queryid'], row['query']) for row in normalized_rows] == [
+        (1, 'SELECT 1'),
+        (2, 'SELECT 2'),
+        (3, 'SELECT 3'),
+    ]
+    assert len(fetched_queryids) == 2
+    assert len(fetched_queryids[1]) == 3
+    aggregator.assert_metric('dd.postgres.statement_metrics.query_text_cache.hits', 2)
+    aggregator.assert_metric('dd.postgres.statement_metrics.query_text_cache.misses', 3)
+
+
+def test_collect_relations_database_pool_full(integration_check, pg_instance):
+    check = integration_check(pg_instance)
+    check.db_pool = MagicMock()
+    check.db_pool.get_connection.side_effect = ConnectionPoolFullError(2, 60)
+    check.log = MagicMock()
+
+    check._collect_relations_database('dogs', [], [], timeout=60)
+
+    assert check.db_pool.get_connection.call_args == mock.call('dogs', 60000, timeout=60)
+    check.log.warning.assert_called_once()
+
+    # Without a timeout, as when collecting databases one at a time, errors are raised as before
+    with pytest.raises(ConnectionPoolFullError):
+        check._collect_relations_database('dogs', [], [])
+
+    assert check.db_pool.get_connection.call_args == mock.call('dogs', 60000, timeout=None)
@@ -43,6 +43,7 @@ class InstanceConfig(BaseModel):
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
     name: str
+    normalization_cache_size: Optional[int] = None
     pid: Optional[int] = None
     pid_cache_duration: Optional[int] = None
     pid_file: Optional[str] = None
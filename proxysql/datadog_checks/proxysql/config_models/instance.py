@@ -41,6 +41,7 @@ class InstanceConfig(BaseModel):
     host: str
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     password: str
     port: int
     read_timeout: Optional[int] = None
@@ -44,6 +44,7 @@ class InstanceConfig(BaseModel):
     keys: Optional[tuple[str, ...]] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     password: Optional[str] = None
     port: int
     service: Optional[str] = None
@@ -43,6 +43,7 @@ class InstanceConfig(BaseModel):
     metric_patterns: Optional[MetricPatterns] = None
     metrics: Optional[tuple[str, ...]] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     port: Optional[int] = None
     s3_root: Optional[str] = None
     service: Optional[str] = None
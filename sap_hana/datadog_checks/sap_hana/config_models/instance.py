@@ -52,6 +52,7 @@ class InstanceConfig(BaseModel):
     empty_default_hostname: Optional[bool] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     only_custom_queries: Optional[bool] = None
     password: str
     persist_db_connections: Optional[bool] = None
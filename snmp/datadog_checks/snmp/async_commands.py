@@ -0,0 +1,240 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+"""
+SNMP commands sent from an asyncio event loop, for the `asyncio` poller. Only SNMP v2c is supported.
+
+Unlike the functions of `commands.py`, which run a PySNMP dispatcher until each request is answered, the requests of
+every device share a single UDP socket and any number of them can be outstanding at once.
+"""
+import asyncio
+import itertools
+import socket
+from typing import Any, Dict, List, Tuple  # noqa: F401
+
+from pyasn1.codec.ber import decoder, encoder
+from pyasn1.type.univ import Null
+from pysnmp.hlapi.asyncore.cmdgen import vbProcessor
+from pysnmp.proto import api
+from pysnmp.proto.rfc1905 import endOfMibView
+
+from datadog_checks.base.errors import CheckException
+
+from .config import InstanceConfig  # noqa: F401
+
+V2C = api.protoModules[api.protoVersion2c]
+
+_NULL = V2C.Null('')
+
+# Request IDs are signed 32 bits integers
+_MAX_REQUEST_ID = 2**31 - 1
+
+
+class SnmpProtocol(asyncio.DatagramProtocol):
+    """
+    Hand the SNMP responses received on a socket to the requests waiting for them.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self.transport = None  # type: Any
+        self.pending = {}  # type: Dict[Tuple[Any, int], asyncio.Future]
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, address):
+        try:
+            message, _ = decoder.decode(data, asn1Spec=V2C.Message())
+            pdu = V2C.apiMessage.getPDU(message)
+            request_id = int(V2C.apiPDU.getRequestID(pdu))
+        except Exception:
+            # Not an SNMP v2c message, there is no request to hand it to
+            return
+
+        future = self.pending.pop((address[:2], request_id), None)
+        if future is not None and not future.done():
+            future.set_result(pdu)
+
+    def error_received(self, exc):
+        # ICMP errors cannot be matched with a request, the requests they relate to will time out
+        pass
+
+
+class SnmpClient(object):
+    """
+    Send SNMP requests to any number of devices, over one socket per address family.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self._endpoints = {}  # type: Dict[int, asyncio.Future]
+        self._request_ids = itertools.count(1)
+
+    async def resolve(self, host, port):
+        # type: (str, int) -> Tuple[int, Any]
+        loop = asyncio.get_running_loop()
+        family, _, _, _, address = (await loop.getaddrinfo(host, port, type=socket.SOCK_DGRAM))[0]
+        return family, address
+
+    async def _get_protocol(self, family):
+        # type: (int) -> SnmpProtocol
+        if family not in self._endpoints:
+            loop = asyncio.get_running_loop()
+            self._endpoints[family] = asyncio.ensure_future(loop.create_datagram_endpoint(SnmpProtocol, family=family))
+
+        _, protocol = await self._endpoints[family]
+        return protocol
+
+    async def request(self, destination, pdu, community, timeout, retries):
+        # type: (Tuple[int, Any], Any, str, float, int) -> Any
+        """
+        Send `pdu` to `destination` and return the PDU of the response, raising `asyncio.TimeoutError`
+        if none was received after `retries` retries of `timeout` seconds.
+        """
+        family, address = destination
+        protocol = await self._get_protocol(family)
+
+        request_id = next(self._request_ids) % _MAX_REQUEST_ID + 1
+        V2C.apiPDU.setRequestID(pdu, request_id)
+        message = V2C.Message()
+        V2C.apiMessage.setDefaults(message)
+        V2C.apiMessage.setCommunity(message, community)
+        V2C.apiMessage.setPDU(message, pdu)
+        data = encoder.encode(message)
+
+        key = (address[:2], request_id)
+        loop = asyncio.get_running_loop()
+        for _ in range(retries + 1):
+            response = loop.create_future()
+            protocol.pending[key] = response
+            protocol.transport.sendto(data, address)
+            try:
+                return await asyncio.wait_for(response, timeout)
+            except asyncio.TimeoutError:
+                continue
+            finally:
+                protocol.pending.pop(key, None)
+
+        raise asyncio.TimeoutError
+
+    async def close(self):
+        # type: () -> None
+        for endpoint in self._endpoints.values():
+            try:
+                transport, _ = await endpoint
+            except OSError:
+                continue
+            transport.close()
+        self._endpoints.clear()
+
+
+class SnmpSession(object):
+    """
+    Run SNMP commands on the device of an instance, with at most `max_requests` of them in flight at once.
+
+    The commands return the same variable bindings as their counterparts of `commands.py`.
+    """
+
+    def __init__(self, client, config, max_requests):
+        # type: (SnmpClient, InstanceConfig, int) -> None
+        if config.device is None:
+            raise RuntimeError('No device set')  # pragma: no cover
+
+        self._client = client
+        self._config = config
+        self._engine = config._snmp_engine
+        self._community = str(config._auth_data.communityName)
+        self._slots = asyncio.Semaphore(max_requests)
+        self._destination = None  # type: Any
+
+    async def _request(self, pdu):
+        # type: (Any) -> Any
+        device = self._config.device
+        if self._destination is None:
+            self._destination = await self._client.resolve(device.ip, device.port)
+
+        async with self._slots:
+            try:
+                return await self._client.request(
+                    self._destination, pdu, self._community, self._config.timeout, self._config.retries
+                )
+            except asyncio.TimeoutError:
+                raise CheckException('No SNMP response received before timeout for device {}'.format(device))
+
+    def _check_increasing(self, names, var_binds):
+        # type: (List[Any], List[Tuple[Any, Any]]) -> None
+        for requested_name, (name, value) in zip(names, var_binds):
+            if isinstance(value, Null):
+                continue
+            if requested_name.asTuple() >= name.asTuple():
+                raise CheckException('OIDs are not increasing for device {}'.format(self._config.device))
+
+    async def get(self, oids, lookup_mib):
+        # type: (list, bool) -> list
+        """Call SNMP GET on a list of oids."""
+        pdu = V2C.GetRequestPDU()
+        V2C.apiPDU.setDefaults(pdu)
+        V2C.apiPDU.setVarBinds(
+            pdu, [(var_bind[0].getOid(), _NULL) for var_bind in vbProcessor.makeVarBinds(self._engine, oids)]
+        )
+
+        response = await self._request(pdu)
+
+        return vbProcessor.unmakeVarBinds(self._engine, V2C.apiPDU.getVarBinds(response), lookup_mib)
+
+    async def getnext(self, oids, lookup_mib, ignore_nonincreasing_oid):
+        # type: (list, bool, bool) -> list
+        """Call SNMP GETNEXT on a list of oids, as long as the results are under the same prefix."""
+        initial_names = [var_bind[0].getOid() for var_bind in vbProcessor.makeVarBinds(self._engine, oids)]
+        names = initial_names
+        results = []
+
+        while True:
+            pdu = V2C.GetNextRequestPDU()
+            V2C.apiPDU.setDefaults(pdu)
+            V2C.apiPDU.setVarBinds(pdu, [(name, _NULL) for name in names])
+
+            var_binds = V2C.apiPDU.getVarBinds(await self._request(pdu))
+            if not ignore_nonincreasing_oid:
+                self._check_increasing(names, var_binds)
+
+            next_names = []
+            next_initial_names = []
+            for col, (name, value) in enumerate(var_binds):
+                if not isinstance(value, Null) and initial_names[col].isPrefixOf(name):
+                    results.append((name, value))
+                    next_names.append(name)
+                    next_initial_names.append(initial_names[col])
+
+            if not next_names:
+                return vbProcessor.unmakeVarBinds(self._engine, results, lookup_mib)
+
+            names = next_names
+            initial_names = next_initial_names
+
+    async def bulk(self, oid, non_repeaters, max_repetitions, lookup_mib, ignore_nonincreasing_oid):
+        # type: (Any, int, int, bool, bool) -> list
+        """Call SNMP GETBULK on an oid."""
+        initial_name = vbProcessor.makeVarBinds(self._engine, [oid])[0][0].getOid()
+        name = initial_name
+        results = []
+
+        while True:
+            pdu = V2C.GetBulkRequestPDU()
+            V2C.apiBulkPDU.setDefaults(pdu)
+            V2C.apiBulkPDU.setNonRepeaters(pdu, non_repeaters)
+            V2C.apiBulkPDU.setMaxRepetitions(pdu, max_repetitions)
+            V2C.apiBulkPDU.setVarBinds(pdu, [(name, _NULL)])
+
+            var_bind_table = V2C.apiBulkPDU.getVarBindTable(pdu, await self._request(pdu))
+            if not var_bind_table:
+                return vbProcessor.unmakeVarBinds(self._engine, results, lookup_mib)
+            if not ignore_nonincreasing_oid:
+                self._check_increasing([name], var_bind_table[0])
+
+            for row in var_bind_table:
+                name, value = row[0]
+                if endOfMibView.isSameTypeWith(value) or not initial_name.isPrefixOf(name):
+                    return vbProcessor.unmakeVarBinds(self._engine, results, lookup_mib)
+                results.append((name, value))
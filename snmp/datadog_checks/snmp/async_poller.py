@@ -0,0 +1,154 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+"""
+The `asyncio` poller: devices are checked concurrently on one event loop rather than on a pool of threads.
+
+Each step mirrors its counterpart of `SnmpCheck`, only the SNMP commands are awaited.
+"""
+import asyncio
+from typing import Any, List, Optional, Tuple  # noqa: F401
+
+from datadog_checks.base.errors import CheckException
+
+from .async_commands import SnmpClient, SnmpSession
+from .config import InstanceConfig  # noqa: F401
+from .exceptions import PySnmpError
+from .pysnmp_types import ObjectIdentity, ObjectType
+from .snmp import SnmpCheck, reply_invalid  # noqa: F401
+from .utils import OIDPrinter, batches
+
+
+def check_devices(check, configs):
+    # type: (SnmpCheck, List[InstanceConfig]) -> List[Tuple[Optional[str], List[str]]]
+    """
+    Check the devices of `configs` and return the error and tags of each of them, in the same order.
+    """
+    return asyncio.run(_check_devices(check, configs))
+
+
+async def _check_devices(check, configs):
+    # type: (SnmpCheck, List[InstanceConfig]) -> List[Tuple[Optional[str], List[str]]]
+    client = SnmpClient()
+    slots = asyncio.Semaphore(check._config.max_concurrent_devices)
+
+    async def check_device(config):
+        async with slots:
+            session = SnmpSession(client, config, check._config.max_requests_per_device)
+            return await _check_device(check, config, session)
+
+    try:
+        return await asyncio.gather(*(check_device(config) for config in configs))
+    finally:
+        await client.close()
+
+
+async def _check_device(check, config, session):
+    # type: (SnmpCheck, InstanceConfig, SnmpSession) -> Tuple[Optional[str], List[str]]
+    error = results = None
+    tags = config.tags
+    if config.oid_config.should_reset():
+        config.oid_config.reset()
+    try:
+        if not config.oid_config.has_oids():
+            check._refresh_profile(config, await _fetch_sysobject_oid(check, session))
+
+        if config.oid_config.has_oids():
+            check.log.debug('Querying %s', config.device)
+            config.add_uptime_metric()
+            results, scalar_oids, error = await _fetch_results(check, config, session)
+            tags = check._report_results(config, results, scalar_oids)
+    except CheckException as e:
+        error = str(e)
+        check.warning(error)
+    except Exception as e:
+        if not error:
+            error = 'Failed to collect metrics for {} - {}'.format(check._get_instance_name(config.instance), e)
+        check.log.debug(error, exc_info=True)
+        check.warning(error)
+    finally:
+        check._submit_device_status(tags, error, results)
+    return error, tags
+
+
+async def _fetch_sysobject_oid(check, session):
+    # type: (SnmpCheck, SnmpSession) -> str
+    oid = ObjectType(ObjectIdentity((1, 3, 6, 1, 2, 1, 1, 2, 0)))
+    check.log.debug('Running SNMP command on OID: %s', OIDPrinter((oid,), with_values=False))
+    var_binds = await session.get([oid], lookup_mib=False)
+    check.log.debug('Returned vars: %s', OIDPrinter(var_binds, with_values=True))
+    return var_binds[0][1].prettyPrint()
+
+
+async def _fetch_results(check, config, session):
+    # type: (SnmpCheck, InstanceConfig, SnmpSession) -> Tuple[Any, List[Any], Optional[str]]
+    """
+    Same as `SnmpCheck.fetch_results`, except that the batches of each command are all sent at once.
+    """
+    enforce_constraints = config.enforce_constraints
+    fetch_id = check._get_next_fetch_id()
+    errors = []  # type: List[str]
+
+    async def run(command_name, oids, command):
+        try:
+            check.log.debug(
+                '[%s] Running SNMP command %s on OIDS: %s', fetch_id, command_name, OIDPrinter(oids, with_values=False)
+            )
+            var_binds = await command
+            check.log.debug('[%s] Returned vars: %s', fetch_id, OIDPrinter(var_binds, with_values=True))
+            return var_binds
+        except (PySnmpError, CheckException) as e:
+            message = '[{}] Failed to collect some metrics: {}'.format(fetch_id, e)
+            errors.append(message)
+            check.warning(message)
+            return []
+
+    scalar_oids = [oid.as_object_type() for oid in config.oid_config.scalar_oids]
+    next_oids = [oid.as_object_type() for oid in config.oid_config.next_oids]
+    all_binds = []
+
+    get_results = await asyncio.gather(
+        *(
+            run('get', oids_batch, session.get(oids_batch, lookup_mib=enforce_constraints))
+            for oids_batch in batches(scalar_oids, size=check.oid_batch_size)
+        )
+    )
+    for var_binds in get_results:
+        for var in var_binds:
+            result_oid, value = var
+            if reply_invalid(value):
+                # If we didn't catch the metric using snmpget, try snmpnext
+                next_oids.append(ObjectType(ObjectIdentity(result_oid.asTuple())))
+            else:
+                all_binds.append(var)
+
+    commands = [
+        run(
+            'getNext',
+            oids_batch,
+            session.getnext(
+                oids_batch, lookup_mib=enforce_constraints, ignore_nonincreasing_oid=check.ignore_nonincreasing_oid
+            ),
+        )
+        for oids_batch in batches(next_oids, size=check.oid_batch_size)
+    ]
+    for oid in config.oid_config.bulk_oids:
+        oid_object_type = oid.as_object_type()
+        commands.append(
+            run(
+                'getBulk',
+                (oid_object_type,),
+                session.bulk(
+                    oid_object_type,
+                    check._NON_REPEATERS,
+                    check._MAX_REPETITIONS,
+                    enforce_constraints,
+                    check.ignore_nonincreasing_oid,
+                ),
+            )
+        )
+    for binds in await asyncio.gather(*commands):
+        all_binds.extend(binds)
+
+    results, scalar_oids = check._build_results(config, all_binds, fetch_id)
+    return results, scalar_oids, errors[0] if errors else None
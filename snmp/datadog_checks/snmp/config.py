@@ -8,6 +8,8 @@ from collections import defaultdict
 from logging import Logger, getLogger  # noqa: F401
 from typing import Any, DefaultDict, Dict, Iterator, List, Optional, Set, Tuple  # noqa: F401
 
+from six import PY2
+
 from datadog_checks.base import ConfigurationError, is_affirmative
 
 from .mibs import MIBLoader
@@ -39,6 +41,11 @@ class InstanceConfig:
     DEFAULT_ALLOWED_FAILURES = 3
     DEFAULT_BULK_THRESHOLD = 0
     DEFAULT_WORKERS = 5
+    DEFAULT_DISCOVERY_WORKERS = 5
+    DEFAULT_DISCOVERY_RATE_LIMIT = 0  # `0` means unlimited
+    DEFAULT_POLLER = 'threads'
+    DEFAULT_MAX_CONCURRENT_DEVICES = 100
+    DEFAULT_MAX_REQUESTS_PER_DEVICE = 4
     DEFAULT_REFRESH_OIDS_CACHE_INTERVAL = 0  # `0` means disabled
 
     AUTH_PROTOCOL_MAPPING = {
@@ -106,14 +113,35 @@ class InstanceConfig:
         self.failing_instances = defaultdict(int)  # type: DefaultDict[str, int]
         self.allowed_failures = int(instance.get('discovery_allowed_failures', self.DEFAULT_ALLOWED_FAILURES))
         self.workers = int(instance.get('workers', self.DEFAULT_WORKERS))
+        self.discovery_workers = int(instance.get('discovery_workers', self.DEFAULT_DISCOVERY_WORKERS))
+        if self.discovery_workers < 1:
+            raise ConfigurationError('discovery_workers should be at least 1 (got {})'.format(self.discovery_workers))
+        self.discovery_rate_limit = float(instance.get('discovery_rate_limit', self.DEFAULT_DISCOVERY_RATE_LIMIT))
+        # Duration and number of hosts probed of the last discovery sweep, set by the discovery thread
+        self.last_discovery_sweep = None  # type: Optional[Tuple[float, int]]
 
         self.bulk_threshold = int(instance.get('bulk_threshold', self.DEFAULT_BULK_THRESHOLD))
 
         self._auth_data = self.get_auth_data(instance)
         self._context_data = ContextData(*self.get_context_data(instance))
 
-        timeout = int(instance.get('timeout', self.DEFAULT_TIMEOUT))
-        retries = int(instance.get('retries', self.DEFAULT_RETRIES))
+        self.timeout = int(instance.get('timeout', self.DEFAULT_TIMEOUT))
+        self.retries = int(instance.get('retries', self.DEFAULT_RETRIES))
+
+        self.poller = instance.get('poller', self.DEFAULT_POLLER)
+        if self.poller not in ('threads', 'asyncio'):
+            raise ConfigurationError("poller should be either 'threads' or 'asyncio' (got {!r})".format(self.poller))
+
+        if self.poller == 'asyncio':
+            if PY2:
+                raise ConfigurationError('The asyncio poller requires Python 3')
+            if not isinstance(self._auth_data, CommunityData) or self._auth_data.mpModel != 1:
+                raise ConfigurationError('The asyncio poller only supports SNMP v2c')
+
+        self.max_concurrent_devices = int(instance.get('max_concurrent_devices', self.DEFAULT_MAX_CONCURRENT_DEVICES))
+        self.max_requests_per_device = int(
+            instance.get('max_requests_per_device', self.DEFAULT_MAX_REQUESTS_PER_DEVICE)
+        )
 
         ip_address = instance.get('ip_address')
         network_address = instance.get('network_address')
@@ -130,8 +158,8 @@ class InstanceConfig:
             target = register_device_target(
                 ip_address,
                 port,
-                timeout=timeout,
-                retries=retries,
+                timeout=self.timeout,
+                retries=self.retries,
                 engine=self._snmp_engine,
                 auth_data=self._auth_data,
                 context_data=self._context_data,
@@ -5,7 +5,8 @@
 import json
 import time
 import weakref  # noqa: F401
-from typing import TYPE_CHECKING
+from concurrent import futures
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple  # noqa: F401
 
 from datadog_checks.base import ConfigurationError
 
@@ -15,6 +16,9 @@ from .config import InstanceConfig  # noqa: F401
 if TYPE_CHECKING:
     from .snmp import SnmpCheck  # noqa: F401
 
+# Minimum number of seconds between two writes of the discovered hosts during a sweep
+CACHE_WRITE_INTERVAL = 10
+
 
 def discover_instances(config, interval, check_ref):
     # type: (InstanceConfig, float, weakref.ref[SnmpCheck]) -> None
@@ -25,46 +29,111 @@ def discover_instances(config, interval, check_ref):
     the reference to the instance, the check is garbage collected properly and
     that function can stop.
     """
+    executor = futures.ThreadPoolExecutor(max_workers=config.discovery_workers)
+    try:
+        while True:
+            start_time = time.time()
+            hosts_probed = _sweep_network(config, check_ref, executor)
+            if hosts_probed is None:
+                return
 
-    while True:
-        start_time = time.time()
-        for host in config.network_hosts():
             check = check_ref()
-            if check is None or not check._running:
+            if check is None:
                 return
+            # Write again at the end of the loop, in case some host have been removed since last
+            write_persistent_cache(check.check_id, json.dumps(list(config.discovered_instances)))
+            del check
 
-            host_config = check._build_autodiscovery_config(config.instance, host)
-
-            try:
-                sys_object_oid = check.fetch_sysobject_oid(host_config)
-            except Exception as e:
-                check.log.debug("Error scanning host %s: %s", host, e)
-                del check
-                continue
-
-            try:
-                profile = check._profile_for_sysobject_oid(sys_object_oid)
-            except ConfigurationError:
-                if not host_config.oid_config.has_oids():
-                    check.log.warning("Host %s didn't match a profile for sysObjectID %s", host, sys_object_oid)
-                    del check
-                    continue
-            else:
-                host_config.refresh_with_profile(check.profiles[profile])
-                host_config.add_profile_tag(profile)
+            time_elapsed = time.time() - start_time
+            config.last_discovery_sweep = (time_elapsed, hosts_probed)
+            if interval - time_elapsed > 0:
+                time.sleep(interval - time_elapsed)
+    finally:
+        executor.shutdown(wait=False)
 
-            config.discovered_instances[host] = host_config
 
-            write_persistent_cache(check.check_id, json.dumps(list(config.discovered_instances)))
-            del check
+def _sweep_network(config, check_ref, executor):
+    # type: (InstanceConfig, weakref.ref[SnmpCheck], futures.Executor) -> Optional[int]
+    """
+    Probe the hosts of the network on `executor`, with at most `discovery_workers` probes in flight and,
+    if set, at most `discovery_rate_limit` probes started per second.
+
+    Discovered hosts are written to the persistent cache as the sweep progresses. Return the number of
+    hosts probed, or `None` if the check was stopped meanwhile.
+    """
+    probe_interval = 1.0 / config.discovery_rate_limit if config.discovery_rate_limit > 0 else 0
+    next_probe_time = 0.0
+    last_write_time = 0.0
+    unsaved = False
+    hosts_probed = 0
+    pending = set()  # type: set
 
+    for host in config.network_hosts():
         check = check_ref()
-        if check is None:
-            return
-        # Write again at the end of the loop, in case some host have been removed since last
-        write_persistent_cache(check.check_id, json.dumps(list(config.discovered_instances)))
+        if check is None or not check._running:
+            return None
+        check_id = check.check_id
         del check
 
-        time_elapsed = time.time() - start_time
-        if interval - time_elapsed > 0:
-            time.sleep(interval - time_elapsed)
+        if len(pending) >= config.discovery_workers:
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            unsaved = _add_discovered_hosts(config, done) or unsaved
+            if unsaved and time.time() - last_write_time >= CACHE_WRITE_INTERVAL:
+                write_persistent_cache(check_id, json.dumps(list(config.discovered_instances)))
+                last_write_time = time.time()
+                unsaved = False
+
+        if probe_interval:
+            now = time.time()
+            if next_probe_time > now:
+                time.sleep(next_probe_time - now)
+            next_probe_time = max(now, next_probe_time) + probe_interval
+
+        pending.add(executor.submit(_probe_host, config, host, check_ref))
+        hosts_probed += 1
+
+    done, _ = futures.wait(pending)
+    _add_discovered_hosts(config, done)
+    return hosts_probed
+
+
+def _probe_host(config, host, check_ref):
+    # type: (InstanceConfig, str, weakref.ref[SnmpCheck]) -> Tuple[str, Optional[InstanceConfig]]
+    """
+    Return the configuration to monitor `host` with, or `None` if it isn't a device we can monitor.
+    """
+    check = check_ref()
+    if check is None or not check._running:
+        return host, None
+
+    host_config = check._build_autodiscovery_config(config.instance, host)
+
+    try:
+        sys_object_oid = check.fetch_sysobject_oid(host_config)
+    except Exception as e:
+        check.log.debug("Error scanning host %s: %s", host, e)
+        return host, None
+
+    try:
+        profile = check._profile_for_sysobject_oid(sys_object_oid)
+    except ConfigurationError:
+        if not host_config.oid_config.has_oids():
+            check.log.warning("Host %s didn't match a profile for sysObjectID %s", host, sys_object_oid)
+            return host, None
+    else:
+        host_config.refresh_with_profile(check.profiles[profile])
+        host_config.add_profile_tag(profile)
+
+    return host, host_config
+
+
+def _add_discovered_hosts(config, probes):
+    # type: (InstanceConfig, Iterable[futures.Future]) -> bool
+    discovered = False
+    for probe in probes:
+        host, host_config = probe.result()
+        if host_config is not None:
+            config.discovered_instances[host] = host_config
+            discovered = True
+
+    return discovered
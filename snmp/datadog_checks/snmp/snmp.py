@@ -206,7 +206,6 @@ class SnmpCheck(AgentCheck):
         dict[oid/metric_name][row index] = value
         In case of scalar objects, the row index is just 0
         """
-        results = defaultdict(dict)  # type: DefaultDict[str, Dict[Tuple[str, ...], Any]]
         enforce_constraints = config.enforce_constraints
         fetch_id = self._get_next_fetch_id()
 
@@ -240,6 +239,15 @@ class SnmpCheck(AgentCheck):
                     error = message
                 self.warning(message)
 
+        results, scalar_oids = self._build_results(config, all_binds, fetch_id)
+        return results, scalar_oids, error
+
+    def _build_results(self, config, all_binds, fetch_id):
+        # type: (InstanceConfig, List[Any], str) -> Tuple[Dict[str, Dict[Tuple[str, ...], Any]], List[OID]]
+        """
+        Index the values of `all_binds` by metric name and row index, see `fetch_results`.
+        """
+        results = defaultdict(dict)  # type: DefaultDict[str, Dict[Tuple[str, ...], Any]]
         scalar_oids = []
         for result_oid, value in all_binds:
             oid = OID(result_oid)
@@ -249,7 +257,7 @@ class SnmpCheck(AgentCheck):
         self.log.debug('[%s] Raw results: %s', fetch_id, OIDPrinter(results, with_values=False))
         # Freeze the result
         results.default_factory = None  # type: ignore
-        return results, scalar_oids, error
+        return results, scalar_oids
 
     def fetch_oids(self, config, scalar_oids, next_oids, enforce_constraints, fetch_id):
         # type: (InstanceConfig, List[OID], List[OID], bool, str) -> Tuple[List[Any], Optional[str]]
@@ -381,20 +389,34 @@ class SnmpCheck(AgentCheck):
             if self._thread is None:
                 self._start_discovery()
 
-            executor = self._executor
-            if executor is None:
-                raise RuntimeError("Expected executor be set")
+            if config.poller == 'asyncio':
+                # Only importable on Python 3
+                from .async_poller import check_devices
+
+                devices = list(config.discovered_instances.items())
+                results = check_devices(self, [discovered for _, discovered in devices])
+                for (host, _), (error, _) in zip(devices, results):
+                    self._on_device_checked(host, error)
+            else:
+                executor = self._executor
+                if executor is None:
+                    raise RuntimeError("Expected executor be set")
 
-            sent = []
-            for host, discovered in list(config.discovered_instances.items()):
-                future = executor.submit(self._check_device, discovered)  # type: Any
-                sent.append(future)
-                future.add_done_callback(functools.partial(self._on_check_device_done, host))
-            futures.wait(sent)
+                sent = []
+                for host, discovered in list(config.discovered_instances.items()):
+                    future = executor.submit(self._check_device, discovered)  # type: Any
+                    sent.append(future)
+                    future.add_done_callback(functools.partial(self._on_check_device_done, host))
+                futures.wait(sent)
 
             tags = ['network:{}'.format(config.ip_network), 'autodiscovery_subnet:{}'.format(config.ip_network)]
             tags.extend(config.tags)
             self.gauge('snmp.discovered_devices_count', len(config.discovered_instances), tags=tags)
+            self.submit_discovery_metrics(tags)
+        elif config.poller == 'asyncio':
+            from .async_poller import check_devices
+
+            [(error, tags)] = check_devices(self, [config])
         else:
             error, tags = self._check_device(config)
             # no need to handle error here since it's already handled inside `self._check_device`
@@ -412,10 +434,26 @@ class SnmpCheck(AgentCheck):
         self.gauge('datadog.snmp.check_duration', check_duration, tags=telemetry_tags)
         self.gauge('datadog.snmp.submitted_metrics', self._submitted_metrics, tags=telemetry_tags)
 
+    def submit_discovery_metrics(self, tags):
+        # type: (List[str]) -> None
+        if self._config.last_discovery_sweep is None:
+            return
+
+        duration, hosts_probed = self._config.last_discovery_sweep
+        telemetry_tags = tags + [LOADER_TAG]
+        self.gauge('datadog.snmp.discovery.sweep_duration', duration, tags=telemetry_tags)
+        self.gauge('datadog.snmp.discovery.hosts_probed', hosts_probed, tags=telemetry_tags)
+        if duration > 0:
+            self.gauge('datadog.snmp.discovery.hosts_probed_per_second', hosts_probed / duration, tags=telemetry_tags)
+
     def _on_check_device_done(self, host, future):
         # type: (str, futures.Future) -> None
-        config = self._config
         error, _ = future.result()
+        self._on_device_checked(host, error)
+
+    def _on_device_checked(self, host, error):
+        # type: (str, Optional[str]) -> None
+        config = self._config
         if error:
             config.failing_instances[host] += 1
             if config.failing_instances[host] >= config.allowed_failures:
@@ -440,19 +478,13 @@ class SnmpCheck(AgentCheck):
             config.oid_config.reset()
         try:
             if not config.oid_config.has_oids():
-                sys_object_oid = self.fetch_sysobject_oid(config)
-                profile = self._profile_for_sysobject_oid(sys_object_oid)
-                config.refresh_with_profile(self.profiles[profile])
-                config.add_profile_tag(profile)
+                self._refresh_profile(config, self.fetch_sysobject_oid(config))
 
             if config.oid_config.has_oids():
                 self.log.debug('Querying %s', config.device)
                 config.add_uptime_metric()
                 results, scalar_oids, error = self.fetch_results(config)
-                config.oid_config.update_scalar_oids(scalar_oids)
-                tags = self.extract_metric_tags(config.parsed_metric_tags, results)
-                tags.extend(config.tags)
-                self.report_metrics(config.parsed_metrics, results, tags)
+                tags = self._report_results(config, results, scalar_oids)
         except CheckException as e:
             error = str(e)
             self.warning(error)
@@ -463,20 +495,37 @@ class SnmpCheck(AgentCheck):
             self.warning(error)
         finally:
             # At this point, `tags` might include some extra tags added in try clause
-
-            # Sending `snmp.devices_monitored` with value 1 will allow users to count devices
-            # by using `sum by {X}` queries in UI. X being a tag like `autodiscovery_subnet`, `snmp_profile`, etc
-            self.gauge('snmp.devices_monitored', 1, tags=tags + [LOADER_TAG])
-
-            # Report service checks
-            status = self.OK
-            if error:
-                status = self.CRITICAL
-                if results:
-                    status = self.WARNING
-            self.service_check(self.SC_STATUS, status, tags=tags, message=error)
+            self._submit_device_status(tags, error, results)
         return error, tags
 
+    def _refresh_profile(self, config, sys_object_oid):
+        # type: (InstanceConfig, str) -> None
+        profile = self._profile_for_sysobject_oid(sys_object_oid)
+        config.refresh_with_profile(self.profiles[profile])
+        config.add_profile_tag(profile)
+
+    def _report_results(self, config, results, scalar_oids):
+        # type: (InstanceConfig, Dict[str, Dict[Tuple[str, ...], Any]], List[OID]) -> List[str]
+        config.oid_config.update_scalar_oids(scalar_oids)
+        tags = self.extract_metric_tags(config.parsed_metric_tags, results)
+        tags.extend(config.tags)
+        self.report_metrics(config.parsed_metrics, results, tags)
+        return tags
+
+    def _submit_device_status(self, tags, error, results):
+        # type: (List[str], Optional[str], Any) -> None
+        # Sending `snmp.devices_monitored` with value 1 will allow users to count devices
+        # by using `sum by {X}` queries in UI. X being a tag like `autodiscovery_subnet`, `snmp_profile`, etc
+        self.gauge('snmp.devices_monitored', 1, tags=tags + [LOADER_TAG])
+
+        # Report service checks
+        status = self.OK
+        if error:
+            status = self.CRITICAL
+            if results:
+                status = self.WARNING
+        self.service_check(self.SC_STATUS, status, tags=tags, message=error)
+
     def extract_metric_tags(self, metric_tags, results):
         # type: (List[SymbolTag], Dict[str, dict]) -> List[str]
         extracted_tags = []  # type: List[str]
@@ -0,0 +1,43 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+from concurrent import futures
+
+import mock
+import pytest
+
+from datadog_checks.snmp import SnmpCheck
+from datadog_checks.snmp.config import InstanceConfig
+
+from . import common
+
+pytestmark = [pytest.mark.usefixtures('dd_environment'), common.py3_plus_only, common.snmp_integration_only]
+
+
+@pytest.mark.parametrize('device_count', [10, 100])
+@pytest.mark.parametrize('poller', ['threads', 'asyncio'])
+def test_poll_devices(benchmark, poller, device_count):
+    """
+    Check a network of simulated devices, all served by the snmpsim container.
+    """
+    metrics = common.SUPPORTED_METRIC_TYPES + common.TABULAR_OBJECTS
+    instance = {
+        'network_address': '192.168.0.0/24',
+        'community_string': 'public',
+        'metrics': metrics,
+        'poller': poller,
+        'timeout': 1,
+        'retries': 0,
+    }
+    check = SnmpCheck('snmp', {}, [instance])
+    check._start_discovery = lambda: None
+    check._thread = mock.Mock()
+    check._executor = futures.ThreadPoolExecutor(max_workers=check._config.workers)
+
+    for i in range(device_count):
+        device_instance = dict(common.generate_instance_config(metrics), poller=poller, timeout=1, retries=0)
+        check._config.discovered_instances['192.168.0.{}'.format(i)] = InstanceConfig(device_instance)
+
+    benchmark(check.check, instance)
+
+    assert len(check._config.discovered_instances) == device_count
@@ -924,7 +924,11 @@ def test_discovery(aggregator):
     try:
         for _ in range(30):
             check.check(instance)
-            if 'snmp.IAmAGauge32' in aggregator.metric_names:
+            # Sweep metrics are only reported once a sweep of the network is complete
+            if (
+                'snmp.IAmAGauge32' in aggregator.metric_names
+                and 'datadog.snmp.discovery.hosts_probed' in aggregator.metric_names
+            ):
                 break
             time.sleep(1)
             aggregator.reset()
@@ -938,6 +942,10 @@ def test_discovery(aggregator):
 
     aggregator.assert_metric('snmp.sysUpTimeInstance')
     aggregator.assert_metric('snmp.discovered_devices_count', tags=network_tags)
+    telemetry_tags = network_tags + ['loader:python']
+    aggregator.assert_metric('datadog.snmp.discovery.sweep_duration', tags=telemetry_tags, count=1)
+    aggregator.assert_metric('datadog.snmp.discovery.hosts_probed', value=6, tags=telemetry_tags, count=1)
+    aggregator.assert_metric('datadog.snmp.discovery.hosts_probed_per_second', tags=telemetry_tags, count=1)
 
     common.assert_common_device_metrics(aggregator, tags=check_tags)
     common.assert_common_check_run_metrics(aggregator, network_tags)
@@ -1236,6 +1244,39 @@ def test_timeout(aggregator, caplog):
     )
 
 
+@pytest.mark.parametrize(
+    'metrics, bulk_threshold',
+    [
+        pytest.param(common.SUPPORTED_METRIC_TYPES, 0, id='scalar'),
+        pytest.param(common.TABULAR_OBJECTS, 0, id='table'),
+        pytest.param(common.BULK_TABULAR_OBJECTS, 5, id='bulk table'),
+    ],
+)
+@common.py3_plus_only
+def test_asyncio_poller(aggregator, metrics, bulk_threshold):
+    """
+    The asyncio poller reports the same metrics as the thread pool.
+    """
+
+    def collect(poller):
+        aggregator.reset()
+        instance = common.generate_instance_config(metrics)
+        instance['bulk_threshold'] = bulk_threshold
+        instance['poller'] = poller
+        check = common.create_check(instance)
+        check.check(instance)
+
+        aggregator.assert_service_check("snmp.can_check", status=SnmpCheck.OK, tags=common.CHECK_TAGS, at_least=1)
+        return sorted(
+            (name, stub.value, sorted(stub.tags))
+            for name in aggregator.metric_names
+            if not name.startswith('datadog.snmp.')
+            for stub in aggregator.metrics(name)
+        )
+
+    assert collect('asyncio') == collect('threads')
+
+
 def test_oids_cache_metrics_collected_using_scalar_oids(aggregator):
     """
     Test if we still collect all metrics using saved scalar oids.
@@ -652,6 +652,10 @@ def test_e2e_discovery(dd_agent_check):
         'datadog.snmp.check_interval',
         'datadog.snmp.submitted_metrics',
         'datadog.snmp.check_duration',
+        # only the python integration reports its discovery sweeps
+        'datadog.snmp.discovery.sweep_duration',
+        'datadog.snmp.discovery.hosts_probed',
+        'datadog.snmp.discovery.hosts_probed_per_second',
     ]
     # we don't assert count, since the count might be off by 1 due to devices not being discovered at first check run
     assert_python_vs_core(
@@ -3,8 +3,10 @@
 # Licensed under Simplified BSD License (see LICENSE)
 
 import copy
+import json
 import logging
 import os
+import threading
 import time
 import weakref
 from concurrent import futures
@@ -329,6 +331,53 @@ def test_removing_host():
     assert all(msg in warning for warning in warnings)
 
 
+@common.py3_plus_only
+def test_removing_host_asyncio_poller():
+    instance = common.generate_instance_config(common.SUPPORTED_METRIC_TYPES)
+    instance['poller'] = 'asyncio'
+    instance['timeout'] = 1
+    instance['retries'] = 0
+    discovered_instance = instance.copy()
+    discovered_instance['ip_address'] = '1.1.1.1'
+    instance.pop('ip_address')
+    instance['network_address'] = '192.168.0.0/24'
+    check = SnmpCheck('snmp', {}, [instance])
+    warnings = []
+    check.warning = warnings.append
+    check._config.discovered_instances['1.1.1.1'] = InstanceConfig(discovered_instance)
+    check._start_discovery = lambda: None
+    check._thread = mock.Mock()
+
+    for expected_warnings in (1, 2, 3):
+        check.check(instance)
+        assert len(warnings) == expected_warnings
+        assert all('No SNMP response received before timeout' in warning for warning in warnings)
+
+    assert check._config.discovered_instances == {}
+
+
+@pytest.mark.parametrize(
+    'instance_extra, message',
+    [
+        pytest.param({'poller': 'gevent'}, "poller should be either 'threads' or 'asyncio'", id='unknown'),
+        pytest.param({'snmp_version': 1}, 'The asyncio poller only supports SNMP v2c', id='snmp v1'),
+        pytest.param(
+            {'community_string': None, 'user': 'datadogSHAAES', 'authKey': common.AUTH_KEY},
+            'The asyncio poller only supports SNMP v2c',
+            id='snmp v3',
+        ),
+    ],
+)
+@common.py3_plus_only
+def test_invalid_poller(instance_extra, message):
+    instance = common.generate_instance_config(common.SUPPORTED_METRIC_TYPES)
+    instance['poller'] = 'asyncio'
+    instance.update(instance_extra)
+
+    with pytest.raises(ConfigurationError, match=message):
+        InstanceConfig(instance)
+
+
 def test_invalid_discovery_interval():
     instance = common.generate_instance_config(common.SUPPORTED_METRIC_TYPES)
 
@@ -592,6 +641,8 @@ def test_discovery_tags():
 
     instance['network_address'] = '192.168.0.0/29'
     instance['tags'] = ['test:check']
+    # Probe hosts one at a time, in order
+    instance['discovery_workers'] = 1
 
     check = SnmpCheck('snmp', {}, [instance])
 
@@ -616,6 +667,122 @@ def test_discovery_tags():
     }
 
 
+@mock.patch("datadog_checks.snmp.discovery.write_persistent_cache")
+def test_discovery_parallel_sweep(write_mock):
+    instance = common.generate_instance_config(common.SUPPORTED_METRIC_TYPES)
+    instance.pop('ip_address')
+    instance['network_address'] = '192.168.0.0/28'
+    instance['discovery_workers'] = 4
+
+    check = SnmpCheck('snmp', {}, [instance])
+    lock = threading.Lock()
+    probes = []
+    in_flight = []
+    peaks = []
+
+    def mock_fetch(cfg):
+        with lock:
+            probes.append(cfg.device)
+            in_flight.append(cfg.device)
+            peaks.append(len(in_flight))
+        time.sleep(0.05)
+        with lock:
+            in_flight.remove(cfg.device)
+            if len(probes) == 14:
+                # Every host has been probed, stop before the next sweep
+                check._running = False
+        if int(cfg.device.ip.rsplit('.', 1)[1]) % 2:
+            return '1.3.6.1.4.5'
+        raise RuntimeError("Not snmp")
+
+    check.fetch_sysobject_oid = mock_fetch
+
+    discover_instances(check._config, 0, weakref.ref(check))
+
+    assert 1 < max(peaks) <= 4
+    discovered = ['192.168.0.{}'.format(i) for i in range(1, 15, 2)]
+    assert sorted(check._config.discovered_instances) == sorted(discovered)
+    assert sorted(json.loads(write_mock.call_args[0][1])) == sorted(discovered)
+    assert check._config.last_discovery_sweep[1] == 14
+
+
+@mock.patch("datadog_checks.snmp.discovery.write_persistent_cache")
+def test_discovery_rate_limit(write_mock):
+    instance = common.generate_instance_config(common.SUPPORTED_METRIC_TYPES)
+    instance.pop('ip_address')
+    instance['network_address'] = '192.168.0.0/29'
+    instance['discovery_rate_limit'] = 20
+
+    check = SnmpCheck('snmp', {}, [instance])
+    probes = []
+
+    def mock_fetch(cfg):
+        probes.append(cfg.device)
+        if len(probes) == 6:
+            check._running = False
+        raise RuntimeError("Not snmp")
+
+    check.fetch_sysobject_oid = mock_fetch
+
+    discover_instances(check._config, 0, weakref.ref(check))
+
+    # The first probe starts right away, the 5 others one every 50ms
+    duration, hosts_probed = check._config.last_discovery_sweep
+    assert hosts_probed == 6
+    assert duration >= 0.25
+
+
+@mock.patch("datadog_checks.snmp.discovery.write_persistent_cache")
+def test_discovery_metrics(write_mock, aggregator):
+    instance = common.generate_instance_config(common.SUPPORTED_METRIC_TYPES)
+    instance.pop('ip_address')
+    instance['network_address'] = '192.168.0.0/29'
+    instance['discovery_rate_limit'] = 20
+    check = SnmpCheck('snmp', {}, [instance])
+    check._start_discovery = lambda: None
+    check._thread = mock.Mock()
+    check._executor = futures.ThreadPoolExecutor(max_workers=1)
+
+    # Only reported once a sweep of the network is complete
+    check.check(instance)
+    aggregator.assert_metric('datadog.snmp.discovery.sweep_duration', count=0)
+
+    probes = []
+
+    def mock_fetch(cfg):
+        probes.append(cfg.device)
+        if len(probes) == 6:
+            # Every host has been probed, stop before the next sweep
+            check._running = False
+        raise RuntimeError("Not snmp")
+
+    check.fetch_sysobject_oid = mock_fetch
+    discover_instances(check._config, 0, weakref.ref(check))
+    check._running = True
+    aggregator.reset()
+    check.check(instance)
+
+    tags = ['network:192.168.0.0/29', 'autodiscovery_subnet:192.168.0.0/29', 'loader:python']
+    sweep_duration = aggregator.metrics('datadog.snmp.discovery.sweep_duration')
+    assert [metric.tags for metric in sweep_duration] == [tags]
+    # The first probe starts right away, the 5 others one every 50ms
+    assert sweep_duration[0].value >= 0.25
+    aggregator.assert_metric('datadog.snmp.discovery.hosts_probed', value=6, tags=tags, count=1)
+    aggregator.assert_metric(
+        'datadog.snmp.discovery.hosts_probed_per_second', value=6 / sweep_duration[0].value, tags=tags, count=1
+    )
+
+
+def test_invalid_discovery_workers():
+    instance = common.generate_instance_config(common.SUPPORTED_METRIC_TYPES)
+    instance.pop('ip_address')
+    instance['network_address'] = '192.168.0.0/24'
+    instance['discovery_workers'] = 0
+
+    with pytest.raises(ConfigurationError, match='discovery_workers should be at least 1'):
+        InstanceConfig(instance)
+
+
 @mock.patch("datadog_checks.snmp.snmp.read_persistent_cache")
 @mock.patch("threading.Thread")
 def test_cache_loading_tags(thread_mock, read_mock):
@@ -58,6 +58,7 @@ class InstanceConfig(BaseModel):
     metric_groups: Optional[tuple[str, ...]] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     ocsp_response_cache_filename: Optional[str] = None
     only_custom_queries: Optional[bool] = None
     password: Optional[str] = None
@@ -171,6 +171,7 @@ class SqlserverActivity(DBMAsyncJob):
             rate_limit=1 / float(collection_interval),
             job_name="query-activity",
             shutdown_callback=self._close_db_conn,
+            adaptive_scheduling=self._config.adaptive_job_scheduling,
         )
         self._conn_key_prefix = "dbm-activity-"
         self._activity_payload_max_bytes = MAX_PAYLOAD_BYTES
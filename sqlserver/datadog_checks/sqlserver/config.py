@@ -29,6 +29,7 @@ class SQLServerConfig:
 
         # DBM
         self.dbm_enabled: bool = is_affirmative(instance.get('dbm', False))
+        self.adaptive_job_scheduling: bool = is_affirmative(instance.get('adaptive_job_scheduling', False))
         self.statement_metrics_config: dict = instance.get('query_metrics', {}) or {}
         self.procedure_metrics_config: dict = instance.get('procedure_metrics', {}) or {}
         self.settings_config: dict = instance.get('collect_settings', {}) or {}
@@ -134,6 +134,9 @@ class QueryMetrics(BaseModel):
     enabled: Optional[bool] = None
     enforce_collection_interval_deadline: Optional[bool] = None
     max_queries: Optional[int] = None
+    plan_cache_maxsize: Optional[int] = None
+    plan_lookup_batch_size: Optional[int] = None
+    plan_obfuscation_workers: Optional[int] = None
     samples_per_hour_per_query: Optional[int] = None
 
 
@@ -143,6 +146,7 @@ class InstanceConfig(BaseModel):
         arbitrary_types_allowed=True,
         frozen=True,
     )
+    adaptive_job_scheduling: Optional[bool] = None
     adoprovider: Optional[str] = None
     ao_database: Optional[str] = None
     autodiscovery_db_service_check: Optional[bool] = None
@@ -184,6 +188,7 @@ class InstanceConfig(BaseModel):
     managed_identity: Optional[ManagedIdentity] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     obfuscator_options: Optional[ObfuscatorOptions] = None
     only_custom_queries: Optional[bool] = None
     only_emit_local: Optional[bool] = None
@@ -75,6 +75,7 @@ class SqlserverMetadata(DBMAsyncJob):
             rate_limit=1 / float(self.collection_interval),
             job_name="database-metadata",
             shutdown_callback=self._close_db_conn,
+            adaptive_scheduling=self._config.adaptive_job_scheduling,
         )
         self.disable_secondary_tags = is_affirmative(
             self._config.statement_metrics_config.get('disable_secondary_tags', False)
@@ -26,7 +26,8 @@ class BaseSqlServerMetric(object):
     query to collect all the information in one request.  This query gets
     executed as part of the classmethod `fetch_all_values` and the data gets passed
     to the instance method `fetch_metric` which extracts the appropriate metric from
-    within the larger collection.
+    within the larger collection. The performance counter metrics instead all read
+    a single `PerformanceCounters` snapshot.
 
     This approach limits the load on the server during each check run.
     """
@@ -88,73 +89,88 @@ class BaseSqlServerMetric(object):
 
 
 # https://docs.microsoft.com/en-us/sql/relational-databases/system-dynamic-management-views/sys-dm-os-performance-counters-transact-sql
-class SqlSimpleMetric(BaseSqlServerMetric):
-    TABLE = 'sys.dm_os_performance_counters'
-    DEFAULT_METRIC_TYPE = None  # can be either rate or gauge
-    QUERY_BASE = """select counter_name, instance_name, object_name, cntr_value
-                    from {table} where counter_name in ({{placeholders}})""".format(
-        table=TABLE
-    )
-    OPERATION_NAME = 'simple_metrics'
-
-    @classmethod
-    def fetch_all_values(cls, cursor, counters_list, logger, databases=None):
-        return cls._fetch_generic_values(cursor, counters_list, logger)
-
-    def fetch_metric(self, rows, columns, values_cache=None):
-        for counter_name_long, instance_name_long, object_name, cntr_value in rows:
-            counter_name = counter_name_long.strip()
-            instance_name = instance_name_long.strip()
-            object_name = object_name.strip()
-            if counter_name.strip() == self.sql_name:
-                matched = False
-                metric_tags = list(self.tags)
-
-                if (self.instance == ALL_INSTANCES and instance_name != "_Total") or (
-                    (instance_name == self.instance or instance_name == self.physical_db_name)
-                    and (not self.object_name or object_name == self.object_name)
-                ):
-                    matched = True
-
-                if matched:
-                    if self.instance == ALL_INSTANCES:
-                        metric_tags.append('{}:{}'.format(self.tag_by, instance_name.strip()))
-                    self.report_function(self.metric_name, cntr_value, tags=metric_tags)
-                    if self.instance != ALL_INSTANCES:
-                        break
-
+class PerformanceCounters(object):
+    """
+    Snapshot of the performance counters needed by all the metric classes reading them, fetched in a single
+    query per check run. Names are stripped once and counters are indexed by counter name as well as by
+    counter and instance name, in the order they were returned.
+    """
 
-class SqlFractionMetric(BaseSqlServerMetric):
     TABLE = 'sys.dm_os_performance_counters'
-    DEFAULT_METRIC_TYPE = 'gauge'
     QUERY_BASE = """select counter_name, cntr_type, cntr_value, instance_name, object_name
                     from {table}
                     where counter_name in ({{placeholders}})
                     order by cntr_type;""".format(
         table=TABLE
     )
-    OPERATION_NAME = 'fraction_metrics'
+    OPERATION_NAME = 'performance_counter_metrics'
 
-    @classmethod
-    def fetch_all_values(cls, cursor, counters_list, logger, databases=None):
-        placeholders = ', '.join('?' for _ in counters_list)
-        query = cls.QUERY_BASE.format(placeholders=placeholders)
-
-        logger.debug("%s: fetch_all executing query: %s, %s", cls.__name__, query, str(counters_list))
-        cursor.execute(query, counters_list)
-        rows = cursor.fetchall()
-        results = defaultdict(list)
+    def __init__(self, rows):
+        self._by_counter = defaultdict(list)
+        self._by_instance = defaultdict(list)
 
         for counter_name, cntr_type, cntr_value, instance_name, object_name in rows:
-            counter_result = {
+            counter_name = counter_name.strip()
+            counter = {
                 'cntr_type': cntr_type,
                 'cntr_value': cntr_value,
                 'instance_name': instance_name.strip(),
                 'object_name': object_name.strip(),
             }
-            logger.debug("Adding new counter_result %s", str(counter_result))
-            results[counter_name.strip()].append(counter_result)
-        return results, None
+            self._by_counter[counter_name].append(counter)
+            self._by_instance[(counter_name, counter['instance_name'])].append(counter)
+
+    def __repr__(self):
+        return repr(dict(self._by_counter))
+
+    @classmethod
+    def fetch(cls, cursor, counters_list, logger):
+        placeholders = ', '.join('?' for _ in counters_list)
+        query = cls.QUERY_BASE.format(placeholders=placeholders)
+
+        logger.debug("%s: fetch executing query: %s, %s", cls.__name__, query, str(counters_list))
+        cursor.execute(query, counters_list)
+        rows = cursor.fetchall()
+        logger.debug("%s: received %d rows", cls.__name__, len(rows))
+        return cls(rows)
+
+    def get(self, counter_name):
+        """
+        Return the counters named `counter_name` for all instances, or `None` if there are none.
+        """
+        return self._by_counter.get(counter_name)
+
+    def get_instance(self, counter_name, instance_name):
+        """
+        Return the counters named `counter_name` for the instance `instance_name`.
+        """
+        return self._by_instance.get((counter_name, instance_name), [])
+
+
+class SqlSimpleMetric(BaseSqlServerMetric):
+    TABLE = PerformanceCounters.TABLE
+    DEFAULT_METRIC_TYPE = None  # can be either rate or gauge
+
+    def fetch_metric(self, counters, columns, values_cache=None):
+        if self.instance == ALL_INSTANCES:
+            for counter in counters.get(self.sql_name) or []:
+                instance_name = counter['instance_name']
+                if instance_name != "_Total":
+                    metric_tags = list(self.tags)
+                    metric_tags.append('{}:{}'.format(self.tag_by, instance_name))
+                    self.report_function(self.metric_name, counter['cntr_value'], tags=metric_tags)
+            return
+
+        for instance_name in (self.instance, self.physical_db_name):
+            for counter in counters.get_instance(self.sql_name, instance_name):
+                if not self.object_name or counter['object_name'] == self.object_name:
+                    self.report_function(self.metric_name, counter['cntr_value'], tags=list(self.tags))
+                    return
+
+
+class SqlFractionMetric(BaseSqlServerMetric):
+    TABLE = PerformanceCounters.TABLE
+    DEFAULT_METRIC_TYPE = 'gauge'
 
     def fetch_metric(self, results, columns, values_cache=None):
         if not self.base_name:
@@ -227,8 +243,6 @@ class SqlIncrFractionMetric(SqlFractionMetric):
     the current value and the base value (denominator) between two collection points that are one second apart.
     """
 
-    OPERATION_NAME = 'incr_fraction_metrics'
-
     def report_fraction(self, value, base, metric_tags, previous_values):
         # return if nil is passed as the values cache, as this should be instantiated
         # at check instantiation
@@ -1120,7 +1134,9 @@ class SqlDbIndexUsageStats(BaseSqlServerMetric):
             self.report_function(metric_name, column_val, tags=metric_tags)
 
 
-DEFAULT_PERFORMANCE_TABLE = "sys.dm_os_performance_counters"
+DEFAULT_PERFORMANCE_TABLE = PerformanceCounters.TABLE
+# Metric classes served from a single `PerformanceCounters` snapshot
+PERFORMANCE_COUNTER_METRICS = {cls.__name__ for cls in (SqlSimpleMetric, SqlFractionMetric, SqlIncrFractionMetric)}
 VALID_TABLES = {cls.TABLE for cls in BaseSqlServerMetric.__subclasses__() if cls.CUSTOM_QUERIES_AVAILABLE}
 TABLE_MAPPING = {
     cls.TABLE: (cls.DEFAULT_METRIC_TYPE, cls)
@@ -788,10 +788,14 @@ class SQLServer(AgentCheck):
                     self._make_metric_list_to_collect(self._config.custom_metrics)
 
                 instance_results = {}
+                performance_counters = set()
                 # Execute the `fetch_all` operations first to minimize the database calls
                 for cls, metric_names in six.iteritems(self.instance_per_type_metrics):
                     if not metric_names:
                         instance_results[cls] = None, None
+                    elif cls in metrics.PERFORMANCE_COUNTER_METRICS:
+                        # All performance counters are fetched at once below
+                        performance_counters.update(metric_names)
                     else:
                         try:
                             db_names = [d.name for d in self.databases] or [
@@ -808,6 +812,18 @@ class SQLServer(AgentCheck):
 
                         instance_results[cls] = rows, cols
 
+                if performance_counters:
+                    try:
+                        with tracked_query(self, operation=metrics.PerformanceCounters.OPERATION_NAME):
+                            counters = metrics.PerformanceCounters.fetch(cursor, sorted(performance_counters), self.log)
+                    except Exception as e:
+                        self.log.error("Error fetching performance counters - skipping.  Error: %s", e)
+                        counters = None
+
+                    for cls, metric_names in six.iteritems(self.instance_per_type_metrics):
+                        if metric_names and cls in metrics.PERFORMANCE_COUNTER_METRICS:
+                            instance_results[cls] = counters, None
+
                 for metric in self.instance_metrics:
                     key = metric.__class__.__name__
                     if key not in instance_results:
@@ -5,12 +5,14 @@
 import binascii
 import math
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-from cachetools import TTLCache
+from cachetools import LRUCache, TTLCache
 from lxml import etree as ET
 
 from datadog_checks.base import is_affirmative
 from datadog_checks.base.utils.common import ensure_unicode, to_native_string
+from datadog_checks.base.utils.db.serialization import iter_json_event_chunks
 from datadog_checks.base.utils.db.sql import compute_sql_signature
 from datadog_checks.base.utils.db.statement_metrics import StatementMetrics
 from datadog_checks.base.utils.db.utils import (
@@ -147,6 +149,13 @@ select cast(query_plan as nvarchar(max)) as query_plan, encrypted as is_encrypte
 from sys.dm_exec_query_plan(CONVERT(varbinary(max), ?, 1))
 """
 
+# The values are formatted with one `(<index>, CONVERT(varbinary(max), ?, 1))` per plan handle
+PLAN_BATCH_LOOKUP_QUERY = """\
+select h.idx, cast(qp.query_plan as nvarchar(max)) as query_plan, qp.encrypted as is_encrypted
+from (values {plan_handles}) as h(idx, plan_handle)
+cross apply sys.dm_exec_query_plan(h.plan_handle) qp
+"""
+
 
 def _row_key(row):
     """
@@ -222,6 +231,7 @@ class SqlserverStatementMetrics(DBMAsyncJob):
             rate_limit=1 / float(collection_interval),
             job_name="query-metrics",
             shutdown_callback=self._close_db_conn,
+            adaptive_scheduling=self._config.adaptive_job_scheduling,
         )
         self.disable_secondary_tags = is_affirmative(
             self._config.statement_metrics_config.get('disable_secondary_tags', False)
@@ -238,6 +248,8 @@ class SqlserverStatementMetrics(DBMAsyncJob):
         self._statement_metrics_query = None
         self._last_stats_query_time = None
         self._max_query_metrics = self._config.statement_metrics_config.get("max_queries", 250)
+        self._plan_lookup_batch_size = int(self._config.statement_metrics_config.get('plan_lookup_batch_size', 20))
+        self._plan_obfuscation_workers = int(self._config.statement_metrics_config.get('plan_obfuscation_workers', 4))
 
     def _init_caches(self):
         # full_statement_text_cache: limit the ingestion rate of full statement text events per query_signature
@@ -255,6 +267,10 @@ class SqlserverStatementMetrics(DBMAsyncJob):
             ttl=60 * 60 / int(self._check.instance.get('samples_per_hour_per_query', 4)),
         )
 
+        # plan_cache: obfuscated plans by plan key, so that plans are only looked up and obfuscated once
+        # even though they are submitted again every time the rate limit allows it
+        self._plan_cache = LRUCache(maxsize=int(self._config.statement_metrics_config.get('plan_cache_maxsize', 1000)))
+
     def _close_db_conn(self):
         pass
 
@@ -415,7 +431,8 @@ class SqlserverStatementMetrics(DBMAsyncJob):
                 for event in self._rows_to_fqt_events(rows):
                     self._check.database_monitoring_query_sample(json.dumps(event, default=default_json_event_encoding))
                 payload = self._to_metrics_payload(rows, self._max_query_metrics)
-                self._check.database_monitoring_query_metrics(json.dumps(payload, default=default_json_event_encoding))
+                for chunk in iter_json_event_chunks(payload, 'sqlserver_rows', payload.pop('sqlserver_rows')):
+                    self._check.database_monitoring_query_metrics(chunk)
                 for event in self._collect_plans(rows, cursor, deadline):
                     self._check.database_monitoring_query_sample(json.dumps(event, default=default_json_event_encoding))
                     plans_submitted += 1
@@ -428,6 +445,9 @@ class SqlserverStatementMetrics(DBMAsyncJob):
             len(self._seen_plans_ratelimiter),
             **self._check.debug_stats_kwargs()
         )
+        self._check.gauge(
+            "dd.sqlserver.statements.plan_cache.len", len(self._plan_cache), **self._check.debug_stats_kwargs()
+        )
         self._check.gauge(
             "dd.sqlserver.statements.fqt_cache.len",
             len(self._full_statement_text_cache),
@@ -483,89 +503,174 @@ class SqlserverStatementMetrics(DBMAsyncJob):
             self.log.debug("plan was null in the plan cache")
         return raw_plan, is_plan_encrypted
 
+    @tracked_method(agent_check_getter=agent_check_getter)
+    def _load_plans(self, plan_handles, cursor):
+        """
+        Load the plans of many plan handles in a single round trip.
+        :return: a dict of plan handle to the same `(raw_plan, is_plan_encrypted)` tuple `_load_plan` returns
+        """
+        if len(plan_handles) == 1:
+            return {plan_handles[0]: self._load_plan(plan_handles[0], cursor)}
+
+        self.log.debug("collecting %d plans", len(plan_handles))
+        query = PLAN_BATCH_LOOKUP_QUERY.format(
+            plan_handles=", ".join("({}, CONVERT(varbinary(max), ?, 1))".format(i) for i in range(len(plan_handles)))
+        )
+        params = tuple("0x" + plan_handle for plan_handle in plan_handles)
+        self.log.debug("Running query [%s] %s", query, params)
+        cursor.execute(query, params)
+
+        plans = dict.fromkeys(plan_handles, (None, None))
+        for idx, raw_plan, is_plan_encrypted in cursor.fetchall():
+            plans[plan_handles[idx]] = (raw_plan, is_plan_encrypted)
+
+        return plans
+
+    def _obfuscate_plan(self, row, raw_plan):
+        """
+        :return: a tuple of the obfuscated plan and its collection errors
+        """
+        if not raw_plan:
+            return None, None
+
+        try:
+            return obfuscate_xml_plan(raw_plan, self._config.obfuscator_options), None
+        except Exception as e:
+            context = (
+                "query_signature=[{0}] query_hash=[{1}] query_plan_hash=[{2}] plan_handle=[{3}] err=[{4}]"
+            ).format(row['query_signature'], row['query_hash'], row['query_plan_hash'], row['plan_handle'], e)
+            if self._config.log_unobfuscated_plans:
+                self.log.warning("Failed to obfuscate plan=[%s] | %s", raw_plan, context)
+            else:
+                self.log.debug("Failed to obfuscate plan | %s", context)
+            self._check.count(
+                "dd.sqlserver.statements.error",
+                1,
+                **self._check.debug_stats_kwargs(tags=["error:obfuscate-xml-plan-{}".format(type(e))])
+            )
+            return None, [{'code': "obfuscate_xml_plan_error", 'message': str(e)}]
+
+    def _get_plans(self, plan_rows, cursor, executor):
+        """
+        Get the obfuscated plans of rows, from the plan cache when possible. The plans that are missing from it are
+        looked up in batches and obfuscated concurrently.
+        :param plan_rows: a list of `(row, plan_key)` tuples
+        :return: a list of `(obfuscated_plan, is_plan_encrypted, collection_errors)` tuples, one per row
+        """
+        plans = {}
+        missing_rows = []
+        for row, plan_key in plan_rows:
+            plan = self._plan_cache.get(plan_key)
+            if plan is None:
+                missing_rows.append((row, plan_key))
+            else:
+                plans[plan_key] = plan
+
+        self._check.count(
+            "dd.sqlserver.statements.plan_cache.hits",
+            len(plan_rows) - len(missing_rows),
+            **self._check.debug_stats_kwargs()
+        )
+        if missing_rows:
+            self._check.count(
+                "dd.sqlserver.statements.plan_cache.misses", len(missing_rows), **self._check.debug_stats_kwargs()
+            )
+            raw_plans = self._load_plans(list({row['plan_handle']: None for row, _ in missing_rows}), cursor)
+            results = executor.map(
+                lambda row: self._obfuscate_plan(row, raw_plans[row['plan_handle']][0]),
+                [row for row, _ in missing_rows],
+            )
+            for (row, plan_key), (obfuscated_plan, collection_errors) in zip(missing_rows, results):
+                plan = (obfuscated_plan, raw_plans[row['plan_handle']][1], collection_errors)
+                plans[plan_key] = plan
+                if obfuscated_plan:
+                    self._plan_cache[plan_key] = plan
+
+        return [plans[plan_key] for _, plan_key in plan_rows]
+
     @tracked_method(agent_check_getter=agent_check_getter)
     def _collect_plans(self, rows, cursor, deadline):
-        for row in rows:
-            if self.enforce_collection_interval_deadline and time.time() > deadline:
-                self.log.debug("ending plan collection early because check deadline has been exceeded")
-                self._check.count("dd.sqlserver.statements.deadline_exceeded", 1, **self._check.debug_stats_kwargs())
-                return
-            plan_key = (row['query_signature'], row['query_hash'], row['query_plan_hash'])
-            # for stored procedures, we only want to look up plans for the entire procedure
-            # not every query that is executed within the proc. In order to accomplish this,
-            # we use the plan handle
-            if row['is_proc'] or row['is_encrypted']:
-                plan_key = row['plan_handle']
-            if self._seen_plans_ratelimiter.acquire(plan_key):
-                raw_plan, is_plan_encrypted = self._load_plan(row['plan_handle'], cursor)
-                obfuscated_plan, collection_errors = None, None
-
-                try:
-                    if raw_plan:
-                        obfuscated_plan = obfuscate_xml_plan(raw_plan, self._config.obfuscator_options)
-                except Exception as e:
-                    context = (
-                        "query_signature=[{0}] query_hash=[{1}] query_plan_hash=[{2}] plan_handle=[{3}] err=[{4}]"
-                    ).format(row['query_signature'], row['query_hash'], row['query_plan_hash'], row['plan_handle'], e)
-                    if self._config.log_unobfuscated_plans:
-                        self.log.warning("Failed to obfuscate plan=[%s] | %s", raw_plan, context)
-                    else:
-                        self.log.debug("Failed to obfuscate plan | %s", context)
-                    collection_errors = [{'code': "obfuscate_xml_plan_error", 'message': str(e)}]
+        with ThreadPoolExecutor(max_workers=max(self._plan_obfuscation_workers, 1)) as executor:
+            plan_rows = []
+            for row in rows:
+                if self.enforce_collection_interval_deadline and time.time() > deadline:
+                    self.log.debug("ending plan collection early because check deadline has been exceeded")
                     self._check.count(
-                        "dd.sqlserver.statements.error",
-                        1,
-                        **self._check.debug_stats_kwargs(tags=["error:obfuscate-xml-plan-{}".format(type(e))])
+                        "dd.sqlserver.statements.deadline_exceeded", 1, **self._check.debug_stats_kwargs()
                     )
-                tags = list(self.tags)
+                    break
+                plan_key = (row['query_signature'], row['query_hash'], row['query_plan_hash'])
+                # for stored procedures, we only want to look up plans for the entire procedure
+                # not every query that is executed within the proc. In order to accomplish this,
+                # we use the plan handle
+                if row['is_proc'] or row['is_encrypted']:
+                    plan_key = row['plan_handle']
+                if self._seen_plans_ratelimiter.acquire(plan_key):
+                    plan_rows.append((row, plan_key))
+                    if len(plan_rows) >= self._plan_lookup_batch_size:
+                        for event in self._to_plan_events(plan_rows, cursor, executor):
+                            yield event
+                        plan_rows = []
+
+            # Plans of rows that already acquired the rate limit are always collected
+            for event in self._to_plan_events(plan_rows, cursor, executor):
+                yield event
+
+    def _to_plan_events(self, plan_rows, cursor, executor):
+        if not plan_rows:
+            return
+
+        plans = self._get_plans(plan_rows, cursor, executor)
+        for (row, _), (obfuscated_plan, is_plan_encrypted, collection_errors) in zip(plan_rows, plans):
+            tags = list(self.tags)
 
-                # for stored procedures, we want to send the plan
-                # events with the full procedure text, not the text
-                # for the individual statement encapsulated within the proc
-                text_key = 'text'
-                if row['is_proc']:
-                    text_key = 'procedure_text'
-                query_signature = row['query_signature']
-                # for procedure plans, it only makes sense to send the
-                # procedure_signature
-                if row['is_proc']:
-                    query_signature = None
-                if 'database_name' in row:
-                    tags += ["db:{}".format(row['database_name'])]
-                yield {
-                    "host": self._check.resolved_hostname,
-                    "ddagentversion": datadog_agent.get_version(),
-                    "ddsource": "sqlserver",
-                    "ddtags": ",".join(tags),
-                    "timestamp": time.time() * 1000,
-                    "dbm_type": "plan",
-                    "cloud_metadata": self._config.cloud_metadata,
-                    'sqlserver_version': self._check.static_info_cache.get(STATIC_INFO_VERSION, ""),
-                    'sqlserver_engine_edition': self._check.static_info_cache.get(STATIC_INFO_ENGINE_EDITION, ""),
-                    "db": {
-                        "instance": row.get("database_name", None),
-                        "plan": {
-                            "definition": obfuscated_plan,
-                            "signature": row['query_plan_hash'],
-                            "collection_errors": collection_errors,
-                        },
-                        "query_signature": query_signature,
-                        "procedure_signature": row.get('procedure_signature', None),
-                        "procedure_name": row.get('procedure_name', None),
-                        "statement": row[text_key],
-                        "metadata": {
-                            "tables": row['dd_tables'],
-                            "commands": row['dd_commands'],
-                            "comments": row['dd_comments'],
-                        },
+            # for stored procedures, we want to send the plan
+            # events with the full procedure text, not the text
+            # for the individual statement encapsulated within the proc
+            text_key = 'text'
+            if row['is_proc']:
+                text_key = 'procedure_text'
+            query_signature = row['query_signature']
+            # for procedure plans, it only makes sense to send the
+            # procedure_signature
+            if row['is_proc']:
+                query_signature = None
+            if 'database_name' in row:
+                tags += ["db:{}".format(row['database_name'])]
+            yield {
+                "host": self._check.resolved_hostname,
+                "ddagentversion": datadog_agent.get_version(),
+                "ddsource": "sqlserver",
+                "ddtags": ",".join(tags),
+                "timestamp": time.time() * 1000,
+                "dbm_type": "plan",
+                "cloud_metadata": self._config.cloud_metadata,
+                'sqlserver_version': self._check.static_info_cache.get(STATIC_INFO_VERSION, ""),
+                'sqlserver_engine_edition': self._check.static_info_cache.get(STATIC_INFO_ENGINE_EDITION, ""),
+                "db": {
+                    "instance": row.get("database_name", None),
+                    "plan": {
+                        "definition": obfuscated_plan,
+                        "signature": row['query_plan_hash'],
+                        "collection_errors": collection_errors,
                     },
-                    'sqlserver': {
-                        "is_plan_encrypted": is_plan_encrypted,
-                        "is_statement_encrypted": row['is_encrypted'],
-                        'query_hash': row['query_hash'],
-                        'query_plan_hash': row['query_plan_hash'],
-                        'plan_handle': row['plan_handle'],
-                        'execution_count': row.get('execution_count', None),
-                        'total_elapsed_time': row.get('total_elapsed_time', None),
+                    "query_signature": query_signature,
+                    "procedure_signature": row.get('procedure_signature', None),
+                    "procedure_name": row.get('procedure_name', None),
+                    "statement": row[text_key],
+                    "metadata": {
+                        "tables": row['dd_tables'],
+                        "commands": row['dd_commands'],
+                        "comments": row['dd_comments'],
                     },
-                }
+                },
+                'sqlserver': {
+                    "is_plan_encrypted": is_plan_encrypted,
+                    "is_statement_encrypted": row['is_encrypted'],
+                    'query_hash': row['query_hash'],
+                    'query_plan_hash': row['query_plan_hash'],
+                    'plan_handle': row['plan_handle'],
+                    'execution_count': row.get('execution_count', None),
+                    'total_elapsed_time': row.get('total_elapsed_time', None),
+                },
+            }
@@ -5,12 +5,9 @@
 import time
 
 from datadog_checks.base import is_affirmative
+from datadog_checks.base.utils.db.serialization import iter_json_event_chunks
 from datadog_checks.base.utils.db.statement_metrics import StatementMetrics
-from datadog_checks.base.utils.db.utils import (
-    DBMAsyncJob,
-    default_json_event_encoding,
-)
-from datadog_checks.base.utils.serialization import json
+from datadog_checks.base.utils.db.utils import DBMAsyncJob
 from datadog_checks.base.utils.tracking import tracked_method
 from datadog_checks.sqlserver.config import SQLServerConfig
 
@@ -90,6 +87,7 @@ class SqlserverProcedureMetrics(DBMAsyncJob):
             rate_limit=1 / float(collection_interval),
             job_name="procedure-metrics",
             shutdown_callback=self._close_db_conn,
+            adaptive_scheduling=self._config.adaptive_job_scheduling,
         )
         self.dm_exec_procedure_stats_row_limit = int(
             self._config.procedure_metrics_config.get('dm_exec_procedure_stats_row_limit', 10000)
@@ -176,7 +174,8 @@ class SqlserverProcedureMetrics(DBMAsyncJob):
                     self.log.debug("collect_procedure_metrics: no rows returned")
                     return
                 payload = self._to_metrics_payload(rows, self._max_procedure_metrics)
-                self._check.database_monitoring_query_metrics(json.dumps(payload, default=default_json_event_encoding))
+                for chunk in iter_json_event_chunks(payload, 'sqlserver_rows', payload.pop('sqlserver_rows')):
+                    self._check.database_monitoring_query_metrics(chunk)
 
     def run_job(self):
         self.collect_procedure_metrics()
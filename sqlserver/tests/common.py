@@ -231,13 +231,11 @@ INIT_CONFIG_ALT_TABLES = {
 }
 
 OPERATION_TIME_METRICS = [
-    'simple_metrics',
+    'performance_counter_metrics',
     'database_stats_metrics',
-    'fraction_metrics',
     'db_file_space_usage_metrics',
     'database_backup_metrics',
     'database_file_stats_metrics',
-    'incr_fraction_metrics',
     'db_index_usage_stats_metrics',
 ]
 
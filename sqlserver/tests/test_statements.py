@@ -810,6 +810,56 @@ def test_obfuscate_xml_plan(test_file, obfuscated_file, datadog_agent):
         assert result == expected_result, "incorrect obfuscation"
 
 
+def _plan_row(i, is_proc=False):
+    return {
+        'query_signature': 'sig{}'.format(i),
+        'query_hash': 'hash{}'.format(i),
+        'query_plan_hash': 'planhash{}'.format(i),
+        'plan_handle': 'handle{}'.format(i),
+        'is_proc': is_proc,
+        'is_encrypted': False,
+        'text': 'SELECT {}'.format(i),
+        'procedure_text': None,
+        'dd_tables': None,
+        'dd_commands': None,
+        'dd_comments': None,
+    }
+
+
+def test_collect_plans_batched_and_cached(aggregator, dbm_instance, datadog_agent):
+    dbm_instance['query_metrics']['plan_lookup_batch_size'] = 3
+    check = SQLServer(CHECK_NAME, {}, [dbm_instance])
+    statement_metrics = check.statement_metrics
+    rows = [_plan_row(i) for i in range(5)]
+
+    cursor = mock.MagicMock()
+    cursor.fetchall.side_effect = lambda: [
+        (idx, '<ShowPlanXML>{}</ShowPlanXML>'.format(handle), False)
+        for idx, handle in enumerate(cursor.execute.call_args[0][1])
+    ]
+    cursor.fetchone.side_effect = lambda: (
+        '<ShowPlanXML>{}</ShowPlanXML>'.format(cursor.execute.call_args[0][1][0]),
+        False,
+    )
+
+    with mock.patch('datadog_checks.sqlserver.statements.obfuscate_xml_plan', side_effect=lambda plan, _: plan):
+        events = list(statement_metrics._collect_plans(rows, cursor, time.time() + 60))
+
+    # one batch of 3 plans and a single plan lookup for the last 2 distinct handles
+    assert cursor.execute.call_count == 2
+    assert [event['db']['plan']['definition'] for event in events] == [
+        '<ShowPlanXML>0xhandle{}</ShowPlanXML>'.format(i) for i in range(5)
+    ]
+    assert len(statement_metrics._plan_cache) == 5
+
+    # cached plans are sent again once the rate limiter allows it, without being looked up
+    cursor.reset_mock()
+    statement_metrics._seen_plans_ratelimiter.clear()
+    events = list(statement_metrics._collect_plans(rows, cursor, time.time() + 60))
+    assert len(events) == 5
+    assert cursor.execute.call_count == 0
+
+
 PORT = 1432
 
 
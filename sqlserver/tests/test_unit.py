@@ -13,7 +13,19 @@ from datadog_checks.base.errors import ConfigurationError
 from datadog_checks.dev import EnvVars
 from datadog_checks.sqlserver import SQLServer
 from datadog_checks.sqlserver.connection import split_sqlserver_host_port
-from datadog_checks.sqlserver.metrics import SqlDbIndexUsageStats, SqlFractionMetric, SqlMasterDatabaseFileStats
+from datadog_checks.sqlserver.const import (
+    PERF_AVERAGE_BULK,
+    PERF_COUNTER_BULK_COUNT,
+    PERF_LARGE_RAW_BASE,
+    PERF_RAW_LARGE_FRACTION,
+)
+from datadog_checks.sqlserver.metrics import (
+    DEFAULT_PERFORMANCE_TABLE,
+    PerformanceCounters,
+    SqlDbIndexUsageStats,
+    SqlFractionMetric,
+    SqlMasterDatabaseFileStats,
+)
 from datadog_checks.sqlserver.sqlserver import SQLConnectionError
 from datadog_checks.sqlserver.utils import (
     Database,
@@ -326,10 +338,8 @@ def test_SqlFractionMetric_base(caplog, base_name):
         column=None,
         logger=mock.MagicMock(),
     )
-    results_rows, results_cols = SqlFractionMetric.fetch_all_values(
-        mock_cursor, ['Buffer cache hit ratio', base_name], mock.mock.MagicMock()
-    )
-    metric_obj.fetch_metric(results_rows, results_cols)
+    counters = PerformanceCounters.fetch(mock_cursor, ['Buffer cache hit ratio', base_name], mock.MagicMock())
+    metric_obj.fetch_metric(counters, None)
     if base_name:
         report_function.assert_called_with(
             'sqlserver.buffer.cache_hit_ratio',
@@ -371,10 +381,8 @@ def test_SqlFractionMetric_group_by_instance(caplog):
         column=None,
         logger=mock.MagicMock(),
     )
-    results_rows, results_cols = SqlFractionMetric.fetch_all_values(
-        mock_cursor, ['Foo counter base', 'Foo counter'], mock.mock.MagicMock()
-    )
-    metric_obj.fetch_metric(results_rows, results_cols)
+    counters = PerformanceCounters.fetch(mock_cursor, ['Foo counter base', 'Foo counter'], mock.MagicMock())
+    metric_obj.fetch_metric(counters, None)
     report_function.assert_any_call(
         'sqlserver.test.metric',
         0.02,
@@ -391,6 +399,69 @@ def test_SqlFractionMetric_group_by_instance(caplog):
     )
 
 
+def test_collect_metrics_performance_counters_single_query(aggregator, instance_docker):
+    check = SQLServer(CHECK_NAME, {}, [instance_docker])
+    check._resolved_hostname = 'stubbed.hostname'
+
+    Row = namedtuple('Row', ['counter_name', 'cntr_type', 'cntr_value', 'instance_name', 'object_name'])
+    cursor = mock.MagicMock()
+    cursor.fetchall.return_value = [
+        Row('Transactions/sec  ', PERF_COUNTER_BULK_COUNT, 10, 'master  ', 'SQLServer:Databases  '),
+        Row('Buffer cache hit ratio', PERF_RAW_LARGE_FRACTION, 33453, '', 'SQLServer:Buffer Manager'),
+        Row('Buffer cache hit ratio base', PERF_LARGE_RAW_BASE, 33531, '', 'SQLServer:Buffer Manager'),
+        Row('Average Wait Time (ms)', PERF_AVERAGE_BULK, 100, '_Total', 'SQLServer:Locks'),
+        Row('Average Wait Time Base', PERF_LARGE_RAW_BASE, 10, '_Total', 'SQLServer:Locks'),
+    ]
+    check.connection = mock.MagicMock()
+    check.connection.get_managed_cursor.return_value.__enter__.return_value = cursor
+    check.server_state_queries = mock.MagicMock()
+    check._dynamic_queries = mock.MagicMock()
+    check._query_manager = mock.MagicMock()
+
+    # One counter of each type read from `sys.dm_os_performance_counters`
+    for name, counter_name, instance_name, base_name, sql_counter_type in (
+        ('sqlserver.database.transactions', 'Transactions/sec', 'master', None, PERF_COUNTER_BULK_COUNT),
+        (
+            'sqlserver.buffer.cache_hit_ratio',
+            'Buffer cache hit ratio',
+            '',
+            'Buffer cache hit ratio base',
+            PERF_RAW_LARGE_FRACTION,
+        ),
+        ('sqlserver.locks.wait_time', 'Average Wait Time (ms)', '_Total', 'Average Wait Time Base', PERF_AVERAGE_BULK),
+    ):
+        cfg = {'name': name, 'counter_name': counter_name, 'instance_name': instance_name, 'tags': ['optional:tag1']}
+        metric = check.typed_metric(
+            cfg_inst=cfg, table=DEFAULT_PERFORMANCE_TABLE, base_name=base_name, sql_counter_type=sql_counter_type
+        )
+        check.instance_metrics.append(metric)
+        check.instance_per_type_metrics[metric.__class__.__name__].add(counter_name)
+        if base_name:
+            check.instance_per_type_metrics[metric.__class__.__name__].add(base_name)
+
+    assert set(check.instance_per_type_metrics) == {'SqlSimpleMetric', 'SqlFractionMetric', 'SqlIncrFractionMetric'}
+
+    check.collect_metrics()
+
+    performance_counter_queries = [
+        call.args for call in cursor.execute.call_args_list if 'sys.dm_os_performance_counters' in call.args[0]
+    ]
+    assert len(performance_counter_queries) == 1
+    assert performance_counter_queries[0][1] == [
+        'Average Wait Time (ms)',
+        'Average Wait Time Base',
+        'Buffer cache hit ratio',
+        'Buffer cache hit ratio base',
+        'Transactions/sec',
+    ]
+    aggregator.assert_metric('sqlserver.database.transactions', 10, metric_type=aggregator.RATE, tags=['optional:tag1'])
+    aggregator.assert_metric('sqlserver.buffer.cache_hit_ratio', 33453 / 33531, tags=['optional:tag1'])
+    # Incremental fractions are only reported from the second run
+    assert check.sqlserver_incr_fraction_metric_previous_values == {
+        'sqlserver.locks.wait_time:optional:tag1': (100, 10)
+    }
+
+
 def _mock_database_list():
     Row = namedtuple('Row', 'name')
     fetchall_results = [
@@ -40,6 +40,7 @@ class InstanceConfig(BaseModel):
     host: str
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     password: Optional[str] = None
     port: Optional[int] = None
     private_key_file: Optional[str] = None
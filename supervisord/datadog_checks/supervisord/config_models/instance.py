@@ -41,6 +41,7 @@ class InstanceConfig(BaseModel):
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
     name: str
+    normalization_cache_size: Optional[int] = None
     password: Optional[str] = None
     port: Optional[int] = None
     proc_names: Optional[tuple[str, ...]] = None
@@ -32,5 +32,9 @@ def instance_multiple_ips():
     return False
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_timeout():
     return 10
@@ -44,6 +44,7 @@ class InstanceConfig(BaseModel):
     min_collection_interval: Optional[float] = None
     multiple_ips: Optional[bool] = None
     name: str
+    normalization_cache_size: Optional[int] = None
     port: int
     service: Optional[str] = None
     tags: Optional[tuple[str, ...]] = None
@@ -67,6 +67,7 @@ class InstanceConfig(BaseModel):
     https_port: Optional[int] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     only_custom_queries: Optional[bool] = None
     password: Optional[str] = None
     port: Optional[int] = None
@@ -46,6 +46,7 @@ class InstanceConfig(BaseModel):
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
     name: Optional[str] = None
+    normalization_cache_size: Optional[int] = None
     port: Optional[int] = None
     seconds_critical: Optional[int] = None
     seconds_warning: Optional[int] = None
@@ -42,6 +42,7 @@ class InstanceConfig(BaseModel):
     metrics_filter: Optional[tuple[str, ...]] = None
     min_collection_interval: Optional[float] = None
     name: Optional[str] = None
+    normalization_cache_size: Optional[int] = None
     secretfile: Optional[str] = None
     service: Optional[str] = None
     tags: Optional[tuple[str, ...]] = None
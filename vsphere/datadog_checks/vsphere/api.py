@@ -4,11 +4,11 @@
 import datetime as dt  # noqa: F401
 import functools
 import ssl
-from typing import Any, Callable, List, TypeVar, cast  # noqa: F401
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, cast  # noqa: F401
 
 from pyVim import connect
 from pyVmomi import vim, vmodl
-from six import itervalues
+from six import iteritems, itervalues
 
 from datadog_checks.base.log import CheckLoggingAdapter  # noqa: F401
 from datadog_checks.vsphere.config import VSphereConfig  # noqa: F401
@@ -20,7 +20,7 @@ from datadog_checks.vsphere.constants import (
     UNLIMITED_HIST_METRICS_PER_QUERY,
 )
 from datadog_checks.vsphere.event import ALLOWED_EVENTS
-from datadog_checks.vsphere.types import InfrastructureData
+from datadog_checks.vsphere.types import InfrastructureData, InfrastructureDataItem  # noqa: F401
 from datadog_checks.vsphere.utils import properties_to_collect
 
 CallableT = TypeVar('CallableT', bound=Callable)
@@ -100,6 +100,9 @@ class VSphereAPI(object):
         self.log = log
 
         self._conn = cast(vim.ServiceInstance, None)
+        self._update_collector = None  # type: Optional[vmodl.query.PropertyCollector]
+        self._update_view = None  # type: Optional[vim.view.ContainerView]
+        self._update_version = None  # type: Optional[str]
         self.smart_connect()
 
     def smart_connect(self):
@@ -172,13 +175,10 @@ class VSphereAPI(object):
         """
         return self._conn.content.perfManager.QueryPerfCounterByLevel(collection_level)
 
-    @smart_retry
-    def _get_raw_infrastructure(self):
-        # type: () -> List[vmodl.query.PropertyCollector.ObjectContent]
-        """Traverse the whole vSphere infrastructure and returns the list of raw pyvmomi MOR objects with
-        the required pre-fetched attributes."""
-        content = self._conn.content  # vim.ServiceInstanceContent reference from the connection
-
+    def _get_infrastructure_filter_spec(self, view_ref):
+        # type: (vim.view.ContainerView) -> vmodl.query.PropertyCollector.FilterSpec
+        """Build the property collector filter selecting every resource of the given view along with the
+        attributes that need to be pre-fetched."""
         property_specs = []
         # Specify which attributes we want to retrieve per object
         for resource in ALL_RESOURCES:
@@ -205,24 +205,34 @@ class VSphereAPI(object):
         traversal_spec.skip = False
         traversal_spec.type = vim.view.ContainerView
 
-        retr_opts = vmodl.query.PropertyCollector.RetrieveOptions()
-        # To limit the number of objects retrieved per call.
-        # If batch_collector_size is 0, collect maximum number of objects.
-        retr_opts.maxObjects = self.config.batch_collector_size
-
         # Specify the root object from where we collect the rest of the objects
         obj_spec = vmodl.query.PropertyCollector.ObjectSpec()
+        obj_spec.obj = view_ref
         obj_spec.skip = True
         obj_spec.selectSet = [traversal_spec]
 
         # Create our filter spec from the above specs
         filter_spec = vmodl.query.PropertyCollector.FilterSpec()
         filter_spec.propSet = property_specs
+        filter_spec.objectSet = [obj_spec]
+
+        return filter_spec
+
+    @smart_retry
+    def _get_raw_infrastructure(self):
+        # type: () -> List[vmodl.query.PropertyCollector.ObjectContent]
+        """Traverse the whole vSphere infrastructure and returns the list of raw pyvmomi MOR objects with
+        the required pre-fetched attributes."""
+        content = self._conn.content  # vim.ServiceInstanceContent reference from the connection
+
+        retr_opts = vmodl.query.PropertyCollector.RetrieveOptions()
+        # To limit the number of objects retrieved per call.
+        # If batch_collector_size is 0, collect maximum number of objects.
+        retr_opts.maxObjects = self.config.batch_collector_size
 
         view_ref = content.viewManager.CreateContainerView(content.rootFolder, ALL_RESOURCES, True)
         try:
-            obj_spec.obj = view_ref
-            filter_spec.objectSet = [obj_spec]
+            filter_spec = self._get_infrastructure_filter_spec(view_ref)
 
             # Collect the objects and their properties
             res = content.propertyCollector.RetrievePropertiesEx([filter_spec], retr_opts)
@@ -244,6 +254,116 @@ class VSphereAPI(object):
 
         return obj_content_list
 
+    @smart_retry
+    def start_infrastructure_updates(self):
+        # type: () -> InfrastructureData
+        """Create a dedicated property collector with a filter over the whole vSphere infrastructure, which is kept
+        alive so that `get_infrastructure_updates` can then retrieve only what changed. The initial state of the
+        infrastructure is returned in the same format as `get_infrastructure`."""
+        self.stop_infrastructure_updates()
+
+        content = self._conn.content
+        self._update_collector = content.propertyCollector.CreatePropertyCollector()
+        self._update_view = content.viewManager.CreateContainerView(content.rootFolder, ALL_RESOURCES, True)
+        # Without partial updates, every change reports the whole value of one of the requested properties
+        self._update_collector.CreateFilter(self._get_infrastructure_filter_spec(self._update_view), False)
+        self._update_version = ''
+
+        # The first update set holds every resource
+        infrastructure_data, _, _ = self.get_infrastructure_updates()
+
+        # Add the root folder entity as it can't be fetched from the previous api calls.
+        root_folder = content.rootFolder
+        root_props = {"name": root_folder.name, "parent": None}
+        self._normalize_properties(root_props, {})
+        infrastructure_data[root_folder] = root_props
+
+        return infrastructure_data
+
+    def stop_infrastructure_updates(self):
+        # type: () -> None
+        """Destroy the property collector used for infrastructure updates, along with its filter and view."""
+        for managed_object in (self._update_collector, self._update_view):
+            if managed_object is None:
+                continue
+            try:
+                managed_object.Destroy()
+            except Exception as e:
+                # The objects belong to the session, they may already be gone after a reconnection
+                self.log.debug("Could not destroy %s: %s", managed_object, e)
+
+        self._update_collector = None
+        self._update_view = None
+        self._update_version = None
+
+    def get_infrastructure_updates(self):
+        # type: () -> Tuple[InfrastructureData, InfrastructureData, List[vim.ManagedEntity]]
+        """Retrieve the changes to the vSphere infrastructure since the previous call, without waiting for any.
+
+        Errors are not retried since the property collector is bound to the session, callers are expected to start
+        over with `start_infrastructure_updates` and a full `get_infrastructure`. This includes version gaps, which
+        vCenter reports with an `InvalidCollectorVersion` fault.
+
+        :return: a tuple made of
+            - the new resources mapped to their properties, as returned by `get_infrastructure`
+            - the modified resources mapped to their changed properties, `None` meaning the property was removed
+            - the removed resources
+        """
+        if self._update_collector is None:
+            raise APIResponseError("Infrastructure updates were not started")
+
+        wait_options = vmodl.query.PropertyCollector.WaitOptions()
+        wait_options.maxWaitSeconds = 0
+        if self.config.batch_collector_size:
+            wait_options.maxObjectUpdates = self.config.batch_collector_size
+
+        entered = {}  # type: InfrastructureData
+        modified = {}  # type: InfrastructureData
+        left = []  # type: List[vim.ManagedEntity]
+        while True:
+            update_set = self._update_collector.WaitForUpdatesEx(self._update_version, wait_options)
+            # There is no update set at all when nothing changed
+            if update_set is None:
+                break
+
+            self._update_version = update_set.version
+            for filter_update in update_set.filterSet:
+                for object_update in filter_update.objectSet:
+                    mor = object_update.obj
+                    changes = {}
+                    for change in object_update.changeSet:
+                        changes[change.name] = None if change.op in ('remove', 'indirectRemove') else change.val
+
+                    if object_update.kind == 'enter':
+                        modified.pop(mor, None)
+                        entered[mor] = {name: val for name, val in iteritems(changes) if val is not None}
+                    elif object_update.kind == 'modify':
+                        if mor in entered:
+                            entered[mor].update(changes)
+                        else:
+                            modified.setdefault(mor, {}).update(changes)
+                    elif object_update.kind == 'leave':
+                        entered.pop(mor, None)
+                        modified.pop(mor, None)
+                        left.append(mor)
+
+            # The update set is truncated when it holds more than `maxObjectUpdates` objects
+            if not update_set.truncated:
+                break
+
+        for props in itervalues(entered):
+            for name in [name for name, val in iteritems(props) if val is None]:
+                del props[name]
+
+        if entered or modified:
+            attribute_keys = self._get_attribute_keys()
+            for props in itervalues(entered):
+                self._normalize_properties(props, attribute_keys)
+            for props in itervalues(modified):
+                self._normalize_properties(props, attribute_keys, partial=True)
+
+        return entered, modified, left
+
     @smart_retry
     def _fetch_all_attributes(self):
         # type: () -> List[vim.CustomFieldsManager.FieldDef]
@@ -280,35 +400,58 @@ class VSphereAPI(object):
         root_folder = self._conn.content.rootFolder
         infrastructure_data[root_folder] = {"name": root_folder.name, "parent": None}
 
-        if self.config.should_collect_attributes or self.config.collect_property_metrics:
-            # Clean up attributes in infrastructure_data,
-            # at this point they are custom pyvmomi objects and the attribute keys are not resolved.
-
-            attribute_keys = {x.key: x.name for x in self._fetch_all_attributes()}
-            for props in itervalues(infrastructure_data):
-                mor_attributes = []
-                if self.config.collect_property_metrics:
-                    all_properties = {}
-                    for attribute_name in ALL_PROPERTIES:
-                        attribute_val = props.pop(attribute_name, None)
-                        if attribute_val is not None:
-                            all_properties[attribute_name] = attribute_val
-                    props['properties'] = all_properties
-
-                if 'customValue' not in props:
-                    continue
-                for attribute in props.pop('customValue'):
-                    # The attribute key is always unique
-                    attr_key_name = attribute_keys.get(attribute.key)
-                    if attr_key_name is None:
-                        self.log.debug("Unable to resolve attribute key with ID: %s", attribute.key)
-                        continue
-                    attr_value = attribute.value
-                    mor_attributes.append("{}{}:{}".format(self.config.attr_prefix, attr_key_name, attr_value))
-
-                props['attributes'] = mor_attributes
+        attribute_keys = self._get_attribute_keys()
+        for props in itervalues(infrastructure_data):
+            self._normalize_properties(props, attribute_keys)
+
         return cast(InfrastructureData, infrastructure_data)
 
+    def _get_attribute_keys(self):
+        # type: () -> Dict[int, str]
+        if not self.config.should_collect_attributes and not self.config.collect_property_metrics:
+            return {}
+
+        return {x.key: x.name for x in self._fetch_all_attributes()}
+
+    def _normalize_properties(self, props, attribute_keys, partial=False):
+        # type: (InfrastructureDataItem, Dict[int, str], bool) -> None
+        """Clean up the properties of a resource, at this point they are custom pyvmomi objects and the attribute
+        keys are not resolved. When `partial` is set, `props` only holds changed properties, `None` values meaning
+        that they were removed."""
+        if not self.config.should_collect_attributes and not self.config.collect_property_metrics:
+            return
+
+        if self.config.collect_property_metrics:
+            all_properties = {}
+            for attribute_name in ALL_PROPERTIES:
+                if partial and attribute_name in props:
+                    all_properties[attribute_name] = props.pop(attribute_name)
+                    continue
+                attribute_val = props.pop(attribute_name, None)
+                if attribute_val is not None:
+                    all_properties[attribute_name] = attribute_val
+            if all_properties or not partial:
+                props['properties'] = all_properties
+
+        if 'customValue' not in props:
+            return
+        custom_values = props.pop('customValue')
+        if custom_values is None:
+            props['attributes'] = None
+            return
+
+        mor_attributes = []
+        for attribute in custom_values:
+            # The attribute key is always unique
+            attr_key_name = attribute_keys.get(attribute.key)
+            if attr_key_name is None:
+                self.log.debug("Unable to resolve attribute key with ID: %s", attribute.key)
+                continue
+            attr_value = attribute.value
+            mor_attributes.append("{}{}:{}".format(self.config.attr_prefix, attr_key_name, attr_value))
+
+        props['attributes'] = mor_attributes
+
     @smart_retry
     def query_metrics(self, query_specs):
         # type: (List[vim.PerformanceManager.QuerySpec]) -> List[vim.PerformanceManager.EntityMetricBase]
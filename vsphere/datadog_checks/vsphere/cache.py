@@ -6,9 +6,12 @@ from contextlib import contextmanager
 from typing import Any, Dict, Generator, Iterator, List, Type  # noqa: F401
 
 from pyVmomi import vim  # noqa: F401
-from six import iterkeys
+from six import iteritems, iterkeys
 
-from datadog_checks.vsphere.types import CounterId, MetricName, ResourceTags  # noqa: F401
+from datadog_checks.vsphere.constants import MOR_TYPE_AS_STRING
+from datadog_checks.vsphere.types import CounterId, InfrastructureData, MetricName, ResourceTags  # noqa: F401
+
+STRING_AS_MOR_TYPE = {mor_type_str: mor_type for mor_type, mor_type_str in iteritems(MOR_TYPE_AS_STRING)}
 
 
 class VSphereCache(object):
@@ -44,6 +47,17 @@ class VSphereCache(object):
             self._content = old_content
             raise
 
+    def restore(self, content, last_ts):
+        # type: (Dict[Any, Any], float) -> None
+        """Replace the content of the cache with data saved by a previous run, as it was at `last_ts`."""
+        self._content = content
+        self._last_ts = last_ts
+
+    def mark_updated(self):
+        # type: () -> None
+        """Reset the expiration of the cache after it was updated in place."""
+        self._last_ts = time.time()
+
     def is_expired(self):
         # type: () -> bool
         """The cache has a global time to live, all elements expire at the same time.
@@ -74,6 +88,23 @@ class MetricsMetadataCache(VSphereCache):
         # type: (Type[vim.ManagedEntity], Dict[CounterId, MetricName]) -> None
         self._content[resource_type] = metadata
 
+    def dump(self):
+        # type: () -> Dict[str, Dict[str, MetricName]]
+        """Serialize the content of the cache to a JSON compatible dict, which `load` can restore."""
+        return {
+            MOR_TYPE_AS_STRING[resource_type]: {str(counter_id): name for counter_id, name in iteritems(metadata)}
+            for resource_type, metadata in iteritems(self._content)
+            if resource_type in MOR_TYPE_AS_STRING
+        }
+
+    def load(self, data, last_ts):
+        # type: (Dict[str, Dict[str, MetricName]], float) -> None
+        content = {
+            STRING_AS_MOR_TYPE[resource_type_str]: {int(counter_id): name for counter_id, name in iteritems(metadata)}
+            for resource_type_str, metadata in iteritems(data)
+        }
+        self.restore(content, last_ts)
+
 
 class InfrastructureCache(VSphereCache):
     """A VSphere cache dedicated to store the infrastructure data from a user environment.
@@ -92,9 +123,14 @@ class InfrastructureCache(VSphereCache):
             <RESOURCE_TYPE>: {
                 <RESOURCE_MOR_ID>: ['<CATEGORY_NAME>:<TAG_NAME>', ...]
             },
+        },
+        'infrastructure_data': {
+            <MOR_REFERENCE>: <RAW_MOR_PROPS_DICT>
         }
-        ...
     }
+
+    'infrastructure_data' holds the properties of every resource as returned by the API, it is only kept when the
+    infrastructure is refreshed incrementally.
     """
 
     @property
@@ -121,6 +157,10 @@ class InfrastructureCache(VSphereCache):
         # type: (ResourceTags) -> None
         self._content['tags'] = value
 
+    def get_all_tags(self):
+        # type: () -> ResourceTags
+        return self._tags
+
     def get_mor_tags(self, mor):
         # type: (vim.ManagedEntity) -> List[str]
         """
@@ -149,6 +189,87 @@ class InfrastructureCache(VSphereCache):
             self._mors[mor_type] = {}
         self._mors[mor_type][mor] = mor_data
 
+    def remove_mor(self, mor):
+        # type: (vim.ManagedEntity) -> None
+        self._mors.get(type(mor), {}).pop(mor, None)
+
+    def get_infrastructure_data(self):
+        # type: () -> InfrastructureData
+        if 'infrastructure_data' not in self._content:
+            self._content['infrastructure_data'] = {}
+        return self._content['infrastructure_data']
+
+    def set_infrastructure_data(self, infrastructure_data):
+        # type: (InfrastructureData) -> None
+        self._content['infrastructure_data'] = infrastructure_data
+
+    def apply_infrastructure_updates(self, entered, modified, left):
+        # type: (InfrastructureData, InfrastructureData, List[vim.ManagedEntity]) -> bool
+        """
+        Apply changes, as returned by `VSphereAPI.get_infrastructure_updates`, to the stored infrastructure data.
+        Resource payloads and tags are left untouched.
+
+        :return: False if a modified resource is unknown, meaning that some changes were missed.
+        """
+        infrastructure_data = self.get_infrastructure_data()
+        for mor in modified:
+            if mor not in infrastructure_data:
+                return False
+
+        for mor in left:
+            infrastructure_data.pop(mor, None)
+
+        infrastructure_data.update(entered)
+
+        for mor, changes in iteritems(modified):
+            props = infrastructure_data[mor]
+            for name, value in iteritems(changes):
+                if name == 'properties':
+                    all_properties = props.setdefault('properties', {})
+                    for property_name, property_value in iteritems(value):
+                        if property_value is None:
+                            all_properties.pop(property_name, None)
+                        else:
+                            all_properties[property_name] = property_value
+                elif value is None:
+                    props.pop(name, None)
+                else:
+                    props[name] = value
+
+        return True
+
+    def dump(self):
+        # type: () -> Dict[str, Any]
+        """Serialize the payloads and tags of the cache to a JSON compatible dict, which `load` can restore.
+        Properties are left out since they are pyVmomi objects, and so are the raw infrastructure data."""
+        mors = {}
+        for mor_type, mor_payloads in iteritems(self._mors):
+            if mor_type not in MOR_TYPE_AS_STRING:
+                continue
+            mors[MOR_TYPE_AS_STRING[mor_type]] = {
+                mor._moId: {key: value for key, value in iteritems(payload) if key != 'properties'}
+                for mor, payload in iteritems(mor_payloads)
+            }
+
+        tags = {
+            MOR_TYPE_AS_STRING[mor_type]: mor_tags
+            for mor_type, mor_tags in iteritems(self._tags)
+            if mor_type in MOR_TYPE_AS_STRING
+        }
+        return {'mors': mors, 'tags': tags}
+
+    def load(self, data, last_ts):
+        # type: (Dict[str, Any], float) -> None
+        """Restore the content of the cache from the output of `dump`. Resources are restored as references without
+        a connection, which is enough to query their metrics."""
+        mors = {}  # type: Dict[Type[vim.ManagedEntity], Dict[vim.ManagedEntity, Any]]
+        for mor_type_str, mor_payloads in iteritems(data['mors']):
+            mor_type = STRING_AS_MOR_TYPE[mor_type_str]
+            mors[mor_type] = {mor_type(mo_id): payload for mo_id, payload in iteritems(mor_payloads)}
+
+        tags = {STRING_AS_MOR_TYPE[mor_type_str]: mor_tags for mor_type_str, mor_tags in iteritems(data['tags'])}
+        self.restore({'mors': mors, 'tags': tags}, last_ts)
+
     def clear_properties(self):
         # type: () -> None
         for _, mors in self._mors.items():
@@ -18,8 +18,10 @@ from datadog_checks.vsphere.constants import (
     BOTH,
     DEFAULT_BATCH_COLLECTOR_SIZE,
     DEFAULT_EVENT_RESOURCES,
+    DEFAULT_FULL_INFRASTRUCTURE_REFRESH_INTERVAL,
     DEFAULT_MAX_QUERY_METRICS,
     DEFAULT_METRICS_PER_QUERY,
+    DEFAULT_PERSISTENT_CACHE_MAX_AGE,
     DEFAULT_REFRESH_INFRASTRUCTURE_CACHE_INTERVAL,
     DEFAULT_REFRESH_METRICS_METADATA_CACHE_INTERVAL,
     DEFAULT_TAGS_COLLECTOR_SIZE,
@@ -98,9 +100,17 @@ class VSphereConfig(object):
         self.refresh_infrastructure_cache_interval = instance.get(
             'refresh_infrastructure_cache_interval', DEFAULT_REFRESH_INFRASTRUCTURE_CACHE_INTERVAL
         )
+        self.incremental_infrastructure_refresh = is_affirmative(
+            instance.get('incremental_infrastructure_refresh', False)
+        )
+        self.full_infrastructure_refresh_interval = instance.get(
+            'full_infrastructure_refresh_interval', DEFAULT_FULL_INFRASTRUCTURE_REFRESH_INTERVAL
+        )
         self.refresh_metrics_metadata_cache_interval = instance.get(
             'refresh_metrics_metadata_cache_interval', DEFAULT_REFRESH_METRICS_METADATA_CACHE_INTERVAL
         )
+        self.persist_cache = is_affirmative(instance.get('persist_cache', False))
+        self.persistent_cache_max_age = instance.get('persistent_cache_max_age', DEFAULT_PERSISTENT_CACHE_MAX_AGE)
         self.connection_reset_timeout = instance.get("connection_reset_timeout", 900)
 
         # Always collect events if `collect_events_only` is true
@@ -60,10 +60,18 @@ def instance_excluded_host_tags():
     return []
 
 
+def instance_full_infrastructure_refresh_interval():
+    return 3600
+
+
 def instance_include_datastore_cluster_folder_tag():
     return True
 
 
+def instance_incremental_infrastructure_refresh():
+    return False
+
+
 def instance_max_historical_metrics():
     return 256
 
@@ -76,6 +84,18 @@ def instance_min_collection_interval():
     return 15
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
+def instance_persist_cache():
+    return False
+
+
+def instance_persistent_cache_max_age():
+    return 86400
+
+
 def instance_refresh_infrastructure_cache_interval():
     return 300
 
@@ -145,14 +145,19 @@ class InstanceConfig(BaseModel):
     empty_default_hostname: bool
     event_resource_filters: Optional[tuple[str, ...]] = None
     excluded_host_tags: Optional[tuple[str, ...]] = None
+    full_infrastructure_refresh_interval: Optional[int] = None
     host: str
     include_datastore_cluster_folder_tag: Optional[bool] = None
+    incremental_infrastructure_refresh: Optional[bool] = None
     max_historical_metrics: Optional[int] = None
     metric_filters: Optional[MetricFilters] = None
     metric_patterns: Optional[MetricPatterns] = None
     metrics_per_query: Optional[int] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     password: str
+    persist_cache: Optional[bool] = None
+    persistent_cache_max_age: Optional[int] = None
     refresh_infrastructure_cache_interval: Optional[int] = None
     refresh_metrics_metadata_cache_interval: Optional[int] = None
     resource_filters: Optional[tuple[ResourceFilter, ...]] = None
@@ -63,6 +63,12 @@ DEFAULT_THREAD_COUNT = 4
 
 DEFAULT_REFRESH_METRICS_METADATA_CACHE_INTERVAL = 1800
 DEFAULT_REFRESH_INFRASTRUCTURE_CACHE_INTERVAL = 300
+DEFAULT_FULL_INFRASTRUCTURE_REFRESH_INTERVAL = 3600
+DEFAULT_PERSISTENT_CACHE_MAX_AGE = 86400
+
+# Key and format version of the caches saved in the persistent cache
+PERSISTENT_CACHE_KEY = 'caches'
+PERSISTENT_CACHE_VERSION = 1
 
 REFERENCE_METRIC = "cpu.usage.avg"
 
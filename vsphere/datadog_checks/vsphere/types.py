@@ -2,7 +2,7 @@
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
 
-from typing import Any, Dict, List, Optional, Pattern, Type, TypedDict
+from typing import Any, Dict, List, Optional, Pattern, Tuple, Type, TypedDict
 
 # CONFIG ALIASES
 from pyVmomi import VmomiSupport, vim
@@ -87,3 +87,6 @@ TagAssociation = TypedDict('TagAssociation', {'object_id': Dict[str, str], 'tag_
 MetricFilters = Dict[str, List[Pattern]]
 
 MorBatch = Dict[vim.ManagedEntity, List[vim.PerformanceManager.MetricId]]
+
+# A metric ready to be submitted: its name, value, hostname and tags
+MetricRecord = Tuple[str, float, Optional[str], List[str]]
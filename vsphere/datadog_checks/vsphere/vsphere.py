@@ -4,9 +4,10 @@
 from __future__ import division
 
 import datetime as dt
+import json
 import logging
 from collections import defaultdict
-from concurrent.futures import as_completed
+from concurrent.futures import Future, as_completed  # noqa: F401
 from concurrent.futures.thread import ThreadPoolExecutor
 from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Set, Type, cast  # noqa: F401
 
@@ -25,6 +26,8 @@ from datadog_checks.vsphere.constants import (
     HISTORICAL,
     HOST_RESOURCES,
     MAX_QUERY_METRICS_OPTION,
+    PERSISTENT_CACHE_KEY,
+    PERSISTENT_CACHE_VERSION,
     PROPERTY_COUNT_METRICS,
     REALTIME_METRICS_INTERVAL_ID,
     UNLIMITED_HIST_METRICS_PER_QUERY,
@@ -38,6 +41,7 @@ from datadog_checks.vsphere.types import (
     InfrastructureDataItem,  # noqa: F401
     InstanceConfig,
     MetricName,  # noqa: F401
+    MetricRecord,  # noqa: F401
     MorBatch,  # noqa: F401
     ResourceTags,  # noqa: F401
     VmomiObject,  # noqa: F401
@@ -94,8 +98,13 @@ class VSphereCheck(AgentCheck):
         self._hostname = None
         self.thread_pool = ThreadPoolExecutor(max_workers=self._config.threads_count)
         self.check_initializations.append(self.initiate_api_connection)
+        if self._config.persist_cache and not self._config.collect_events_only:
+            self.check_initializations.append(self.restore_caches)
 
         self.last_connection_time = get_timestamp()
+        self.last_full_infrastructure_refresh_time = 0  # type: float
+        # Discovery of the infrastructure running in the background, while restored caches are used
+        self.infrastructure_refresh = None  # type: Optional[Future]
 
     def initiate_api_connection(self):
         # type: () -> None
@@ -168,10 +177,11 @@ class VSphereCheck(AgentCheck):
         # Apparently only when the server restarts?
         # https://pubs.vmware.com/vsphere-50/index.jsp?topic=%2Fcom.vmware.wssdk.pg.doc_50%2FPG_Ch16_Performance.18.5.html
 
-    def collect_tags(self, infrastructure_data):
-        # type: (InfrastructureData) -> ResourceTags
+    def collect_tags(self, infrastructure_data, mors=None):
+        # type: (InfrastructureData, Optional[Iterable[vim.ManagedEntity]]) -> ResourceTags
         """
         Fetch the all tags, build tags for each monitored resources and store all of that into the tags_cache.
+        Tags can be fetched for only some of the resources by passing them as `mors`.
         """
         if not self.api_rest:
             return {}
@@ -180,8 +190,8 @@ class VSphereCheck(AgentCheck):
         # All filters are applied except the ones based on tags of course.
         resource_filters_without_tags = [f for f in self._config.resource_filters if not isinstance(f, TagFilter)]
         filtered_infra_data = {
-            mor: props
-            for mor, props in iteritems(infrastructure_data)
+            mor: infrastructure_data[mor]
+            for mor in (infrastructure_data if mors is None else mors)
             if isinstance(mor, tuple(self._config.collected_resource_types))
             and is_resource_collected_by_filters(mor, infrastructure_data, resource_filters_without_tags)
         }
@@ -204,23 +214,35 @@ class VSphereCheck(AgentCheck):
 
         return mor_tags
 
-    def refresh_infrastructure_cache(self):
-        # type: () -> None
-        """Fetch the complete infrastructure, generate tags for each monitored resources and store all of that
-        into the infrastructure_cache. It also computes the resource `hostname` property to be used when submitting
-        metrics for this mor."""
-        self.log.debug("Refreshing the infrastructure cache...")
+    def fetch_infrastructure(self):
+        # type: () -> InfrastructureData
+        """Fetch the complete infrastructure from vCenter.
+        Warning: can be called in threads
+        """
         t0 = Timer()
-        infrastructure_data = self.api.get_infrastructure()
-        collect_property_metrics = self._config.collect_property_metrics
+        if self._config.incremental_infrastructure_refresh:
+            infrastructure_data = self.api.start_infrastructure_updates()
+        else:
+            infrastructure_data = self.api.get_infrastructure()
         self.gauge(
             "datadog.vsphere.refresh_infrastructure_cache.time",
             t0.total(),
-            tags=self._config.base_tags + ['collect_property_metrics:{}'.format(collect_property_metrics)],
+            tags=self._config.base_tags + ['collect_property_metrics:{}'.format(self._config.collect_property_metrics)],
             raw=True,
             hostname=self._hostname,
         )
         self.log.debug("Infrastructure cache refreshed in %.3f seconds.", t0.total())
+        return infrastructure_data
+
+    def refresh_infrastructure_cache(self, infrastructure_data=None):
+        # type: (Optional[InfrastructureData]) -> None
+        """Fetch the complete infrastructure, unless it was already fetched as `infrastructure_data`, generate tags
+        for each monitored resources and store all of that into the infrastructure_cache. It also computes the
+        resource `hostname` property to be used when submitting metrics for this mor."""
+        self.log.debug("Refreshing the infrastructure cache...")
+        if infrastructure_data is None:
+            infrastructure_data = self.fetch_infrastructure()
+        collect_property_metrics = self._config.collect_property_metrics
 
         # When collecting property metrics, there are pyVmomi objects in the cache at this point
         if collect_property_metrics:
@@ -233,125 +255,257 @@ class VSphereCheck(AgentCheck):
             all_tags = self.collect_tags(infrastructure_data)
         self.infrastructure_cache.set_all_tags(all_tags)
 
+        self.build_infrastructure_cache(infrastructure_data)
+
+        if self._config.incremental_infrastructure_refresh:
+            # Keep the data of every resource around to apply the next changes to it
+            self.infrastructure_cache.set_infrastructure_data(infrastructure_data)
+            self.last_full_infrastructure_refresh_time = get_timestamp()
+
+    def update_infrastructure_cache(self):
+        # type: () -> Optional[Set[vim.ManagedEntity]]
+        """Apply the changes made to the infrastructure since its previous refresh to the infrastructure_cache.
+        When only VMs changed, which is by far the most common, only their payload is computed again since no other
+        resource gets its tags from them.
+
+        :return: the resources whose payload was computed again, or `None` if the changes could not be retrieved,
+            in which case the whole infrastructure must be refreshed.
+        """
+        self.log.debug("Updating the infrastructure cache...")
+        t0 = Timer()
+        try:
+            entered, modified, left = self.api.get_infrastructure_updates()
+        except Exception as e:
+            self.log.warning("Could not retrieve the changes to the infrastructure, refreshing all of it: %s", e)
+            return None
+
+        if not self.infrastructure_cache.apply_infrastructure_updates(entered, modified, left):
+            self.log.warning("Some changes to the infrastructure were missed, refreshing all of it")
+            return None
+
+        self.gauge(
+            "datadog.vsphere.update_infrastructure_cache.time",
+            t0.total(),
+            tags=self._config.base_tags,
+            raw=True,
+            hostname=self._hostname,
+        )
+        self.gauge(
+            "datadog.vsphere.update_infrastructure_cache.changes",
+            len(entered) + len(modified) + len(left),
+            tags=self._config.base_tags,
+            raw=True,
+            hostname=self._hostname,
+        )
+        self.log.debug(
+            "Infrastructure cache updated in %.3f seconds: %d new, %d modified and %d removed resources.",
+            t0.total(),
+            len(entered),
+            len(modified),
+            len(left),
+        )
+
+        infrastructure_data = self.infrastructure_cache.get_infrastructure_data()
+        all_tags = self.infrastructure_cache.get_all_tags()
+        for mor in left:
+            all_tags.get(type(mor), {}).pop(mor._moId, None)
+        if entered and self._config.should_collect_tags:
+            for resource_type, mor_tags in iteritems(self.collect_tags(infrastructure_data, mors=entered)):
+                all_tags.setdefault(resource_type, {}).update(mor_tags)
+
+        changed_mors = list(entered) + list(modified) + left
+        if not all(isinstance(mor, vim.VirtualMachine) for mor in changed_mors):
+            with self.infrastructure_cache.update():
+                self.infrastructure_cache.set_infrastructure_data(infrastructure_data)
+                self.infrastructure_cache.set_all_tags(all_tags)
+                self.build_infrastructure_cache(infrastructure_data)
+
+            return set(infrastructure_data)
+
+        updated_mors = set()
+        for mor in changed_mors:
+            self.infrastructure_cache.remove_mor(mor)
+            if mor not in infrastructure_data or not isinstance(mor, tuple(self._config.collected_resource_types)):
+                continue
+
+            mor_payload = self.build_mor_payload(mor, infrastructure_data[mor], infrastructure_data)
+            if mor_payload is not None:
+                self.infrastructure_cache.set_mor_props(mor, mor_payload)
+                updated_mors.add(mor)
+
+        self.infrastructure_cache.mark_updated()
+        return updated_mors
+
+    def save_caches(self):
+        # type: () -> None
+        """Save the caches to the persistent cache, so that the check can resume collecting metrics right away
+        after a restart."""
+        snapshot = {
+            'version': PERSISTENT_CACHE_VERSION,
+            'timestamp': get_timestamp(),
+            'metrics_metadata': self.metrics_metadata_cache.dump(),
+            'infrastructure': self.infrastructure_cache.dump(),
+        }
+        try:
+            self.write_persistent_cache(PERSISTENT_CACHE_KEY, json.dumps(snapshot))
+        except Exception as e:
+            self.log.warning("Unable to save the caches: %s", e)
+
+    def restore_caches(self):
+        # type: () -> None
+        """Restore the caches saved by a previous run if they are recent enough. The restored resources are only
+        validated against vCenter lazily: metrics are collected for them while the infrastructure is discovered
+        again in the background, and whatever no longer exists is dropped once the discovery completes."""
+        try:
+            snapshot = json.loads(self.read_persistent_cache(PERSISTENT_CACHE_KEY) or '{}')
+            if snapshot.get('version') != PERSISTENT_CACHE_VERSION:
+                self.log.debug("No saved caches to restore")
+                return
+
+            age = get_timestamp() - snapshot['timestamp']
+            if age > self._config.persistent_cache_max_age:
+                self.log.debug("Not restoring saved caches that are %d seconds old", age)
+                return
+
+            self.metrics_metadata_cache.load(snapshot['metrics_metadata'], snapshot['timestamp'])
+            self.infrastructure_cache.load(snapshot['infrastructure'], get_timestamp())
+        except Exception as e:
+            self.log.warning("Unable to restore the saved caches, building them from scratch: %s", e)
+            return
+
+        self.log.info("Restored caches saved %d seconds ago, discovering the infrastructure in the background", age)
+        self.infrastructure_refresh = self.thread_pool.submit(self.fetch_infrastructure)
+
+    def build_infrastructure_cache(self, infrastructure_data):
+        # type: (InfrastructureData) -> None
+        """Compute and store into the infrastructure_cache the payload of every monitored resource."""
         for mor, properties in iteritems(infrastructure_data):
             if not isinstance(mor, tuple(self._config.collected_resource_types)):
                 # Do nothing for the resource types we do not collect
                 continue
 
-            mor_name = to_string(properties.get("name", "unknown"))
-            mor_type_str = MOR_TYPE_AS_STRING[type(mor)]
-            hostname = None
-            tags = []
-            mor_payload = {}  # type: Dict[str, Any]
-            if self._config.collect_property_metrics:
-                all_properties = properties.get('properties', {})
-                mor_payload['properties'] = all_properties
-
-            if isinstance(mor, vim.VirtualMachine):
-                power_state = properties.get("runtime.powerState")
-                if power_state != vim.VirtualMachinePowerState.poweredOn:
-                    # Skipping because the VM is not powered on
-                    # TODO: Sometimes VM are "poweredOn" but "disconnected" and thus have no metrics
-                    self.log.debug("Skipping VM %s in state %s", mor_name, to_string(power_state))
-                    continue
-
-                # Hosts are not considered as parents of the VMs they run, we use the `runtime.host` property
-                # to get the name of the ESXi host
-                runtime_host = properties.get("runtime.host")
-                runtime_host_props = {}  # type: InfrastructureDataItem
-                if runtime_host:
-                    if runtime_host in infrastructure_data:
-                        runtime_host_props = infrastructure_data.get(runtime_host, {})
-                    else:
-                        self.log.debug("Missing runtime.host details for VM %s", mor_name)
-                runtime_hostname = to_string(runtime_host_props.get("name", "unknown"))
-                tags.append('vsphere_host:{}'.format(runtime_hostname))
-
-                if self._config.use_guest_hostname:
-                    hostname = properties.get("guest.hostName", mor_name)
+            mor_payload = self.build_mor_payload(mor, properties, infrastructure_data)
+            if mor_payload is not None:
+                self.infrastructure_cache.set_mor_props(mor, mor_payload)
+
+    def build_mor_payload(self, mor, properties, infrastructure_data):
+        # type: (vim.ManagedEntity, InfrastructureDataItem, InfrastructureData) -> Optional[Dict[str, Any]]
+        """Compute the payload to cache for a resource, i.e. its tags, `hostname` and properties. Returns `None`
+        if the resource should not be monitored."""
+        mor_name = to_string(properties.get("name", "unknown"))
+        mor_type_str = MOR_TYPE_AS_STRING[type(mor)]
+        hostname = None
+        tags = []
+        mor_payload = {}  # type: Dict[str, Any]
+        if self._config.collect_property_metrics:
+            all_properties = properties.get('properties', {})
+            mor_payload['properties'] = all_properties
+
+        if isinstance(mor, vim.VirtualMachine):
+            power_state = properties.get("runtime.powerState")
+            if power_state != vim.VirtualMachinePowerState.poweredOn:
+                # Skipping because the VM is not powered on
+                # TODO: Sometimes VM are "poweredOn" but "disconnected" and thus have no metrics
+                self.log.debug("Skipping VM %s in state %s", mor_name, to_string(power_state))
+                return None
+
+            # Hosts are not considered as parents of the VMs they run, we use the `runtime.host` property
+            # to get the name of the ESXi host
+            runtime_host = properties.get("runtime.host")
+            runtime_host_props = {}  # type: InfrastructureDataItem
+            if runtime_host:
+                if runtime_host in infrastructure_data:
+                    runtime_host_props = infrastructure_data.get(runtime_host, {})
                 else:
-                    hostname = mor_name
-            elif isinstance(mor, vim.HostSystem):
-                hostname = mor_name
+                    self.log.debug("Missing runtime.host details for VM %s", mor_name)
+            runtime_hostname = to_string(runtime_host_props.get("name", "unknown"))
+            tags.append('vsphere_host:{}'.format(runtime_hostname))
 
+            if self._config.use_guest_hostname:
+                hostname = properties.get("guest.hostName", mor_name)
             else:
-                tags.append('vsphere_{}:{}'.format(mor_type_str, mor_name))
+                hostname = mor_name
+        elif isinstance(mor, vim.HostSystem):
+            hostname = mor_name
 
-            parent = properties.get('parent')
-            runtime_host = properties.get('runtime.host')
-            if parent is not None:
-                tags.extend(
-                    get_tags_recursively(parent, infrastructure_data, self._config.include_datastore_cluster_folder_tag)
+        else:
+            tags.append('vsphere_{}:{}'.format(mor_type_str, mor_name))
+
+        parent = properties.get('parent')
+        runtime_host = properties.get('runtime.host')
+        if parent is not None:
+            tags.extend(
+                get_tags_recursively(parent, infrastructure_data, self._config.include_datastore_cluster_folder_tag)
+            )
+        if runtime_host is not None:
+            tags.extend(
+                get_tags_recursively(
+                    runtime_host,
+                    infrastructure_data,
+                    self._config.include_datastore_cluster_folder_tag,
+                    include_only=['vsphere_cluster'],
                 )
-            if runtime_host is not None:
-                tags.extend(
-                    get_tags_recursively(
-                        runtime_host,
-                        infrastructure_data,
-                        self._config.include_datastore_cluster_folder_tag,
-                        include_only=['vsphere_cluster'],
+            )
+        tags.append('vsphere_type:{}'.format(mor_type_str))
+
+        # Attach tags from fetched attributes.
+        tags.extend(properties.get('attributes', []))
+        resource_tags = self.infrastructure_cache.get_mor_tags(mor) + tags
+        if not is_resource_collected_by_filters(
+            mor,
+            infrastructure_data,
+            self._config.resource_filters,
+            resource_tags,
+        ):
+            # The resource does not match the specified whitelist/blacklist patterns.
+            self.log.debug("Skipping resource not matched by filters. resource=`%s` tags=`%s`", mor_name, resource_tags)
+            return None
+
+        # after retrieving tags, add hostname suffix if specified
+        if isinstance(mor, vim.VirtualMachine):
+            if self._config.vm_hostname_suffix_tag is not None:
+                hostname_suffix = None
+
+                all_tags = resource_tags + self._config.custom_tags
+                sorted_tags = sorted(all_tags)
+                for resource_tag in sorted_tags:
+                    resource_tag_key, _, resource_tag_value = resource_tag.partition(":")
+                    if resource_tag_key == self._config.vm_hostname_suffix_tag:
+                        hostname_suffix = resource_tag_value
+                        break
+
+                if hostname_suffix is not None:
+                    hostname = "{}-{}".format(hostname, hostname_suffix)
+                    self.log.debug(
+                        "Attached hostname suffix key %s, new hostname: %s",
+                        self._config.vm_hostname_suffix_tag,
+                        hostname,
                     )
-                )
-            tags.append('vsphere_type:{}'.format(mor_type_str))
-
-            # Attach tags from fetched attributes.
-            tags.extend(properties.get('attributes', []))
-            resource_tags = self.infrastructure_cache.get_mor_tags(mor) + tags
-            if not is_resource_collected_by_filters(
-                mor,
-                infrastructure_data,
-                self._config.resource_filters,
-                resource_tags,
-            ):
-                # The resource does not match the specified whitelist/blacklist patterns.
-                self.log.debug(
-                    "Skipping resource not matched by filters. resource=`%s` tags=`%s`", mor_name, resource_tags
-                )
-                continue
 
-            # after retrieving tags, add hostname suffix if specified
-            if isinstance(mor, vim.VirtualMachine):
-                if self._config.vm_hostname_suffix_tag is not None:
-                    hostname_suffix = None
-
-                    all_tags = resource_tags + self._config.custom_tags
-                    sorted_tags = sorted(all_tags)
-                    for resource_tag in sorted_tags:
-                        resource_tag_key, _, resource_tag_value = resource_tag.partition(":")
-                        if resource_tag_key == self._config.vm_hostname_suffix_tag:
-                            hostname_suffix = resource_tag_value
-                            break
-
-                    if hostname_suffix is not None:
-                        hostname = "{}-{}".format(hostname, hostname_suffix)
-                        self.log.debug(
-                            "Attached hostname suffix key %s, new hostname: %s",
-                            self._config.vm_hostname_suffix_tag,
-                            hostname,
-                        )
-
-                    else:
-                        self.log.debug(
-                            "Could not attach hostname suffix key %s for host: %s",
-                            self._config.vm_hostname_suffix_tag,
-                            hostname,
-                        )
+                else:
+                    self.log.debug(
+                        "Could not attach hostname suffix key %s for host: %s",
+                        self._config.vm_hostname_suffix_tag,
+                        hostname,
+                    )
 
-            mor_payload["tags"] = tags  # type: Dict[str, Any]
+        mor_payload["tags"] = tags  # type: Dict[str, Any]
 
-            if hostname:
-                mor_payload['hostname'] = hostname
+        if hostname:
+            mor_payload['hostname'] = hostname
 
-            self.infrastructure_cache.set_mor_props(mor, mor_payload)
+        return mor_payload
 
-    def submit_metrics_callback(self, query_results):
-        # type: (List[vim.PerformanceManager.EntityMetricBase]) -> None
+    def process_metrics_results(self, query_results):
+        # type: (List[vim.PerformanceManager.EntityMetricBase]) -> List[MetricRecord]
         """
-        Callback of the collection of metrics. This is run in the main thread!
+        Turn the results of a metric query into records that are ready to be submitted, resolving their tags and
+        selecting their value. The caches are only read, so this is safe to run in the threads making the queries.
 
         `query_results` currently contain results of one resource type in practice, but this function is generic
         and can handle results with mixed resource types.
         """
+        records = []  # type: List[MetricRecord]
 
         # `have_instance_value` is used later to avoid collecting aggregated metrics
         # when instance metrics are collected.
@@ -454,8 +608,18 @@ class VSphereCheck(AgentCheck):
                     hostname,
                     tags,
                 )
-                # vSphere "rates" should be submitted as gauges (rate is precomputed).
-                self.gauge(to_string(metric_name), value, hostname=hostname, tags=tags)
+                records.append((to_string(metric_name), value, hostname, tags))
+
+        return records
+
+    def submit_metric_records(self, records):
+        # type: (List[MetricRecord]) -> None
+        """
+        Submit the records built by `process_metrics_results`. This is run in the main thread!
+        """
+        for metric_name, value, hostname, tags in records:
+            # vSphere "rates" should be submitted as gauges (rate is precomputed).
+            self.gauge(metric_name, value, hostname=hostname, tags=tags)
 
     def query_metrics_wrapper(self, query_specs):
         # type: (List[vim.PerformanceManager.QuerySpec]) -> List[vim.PerformanceManager.EntityMetricBase]
@@ -473,6 +637,36 @@ class VSphereCheck(AgentCheck):
         )
         return metrics_values
 
+    def collect_metric_records(self, query_specs):
+        # type: (List[vim.PerformanceManager.QuerySpec]) -> List[MetricRecord]
+        """Query metrics and process their results, so that only the submission of the resulting records is left to
+        the main thread.
+        Warning: called in threads
+        """
+        results = self.query_metrics_wrapper(query_specs)
+        if not results:
+            self.log.debug("A metric collection API call did not return data.")
+            return []
+
+        t0 = Timer()
+        try:
+            records = self.process_metrics_results(results)
+        except Exception as e:
+            self.log.exception(
+                "Exception '%s' raised while processing metric results. Ignoring the error and continuing execution.",
+                e,
+            )
+            return []
+
+        self.histogram(
+            'datadog.vsphere.process_metrics.time',
+            t0.total(),
+            tags=self._config.base_tags,
+            raw=True,
+            hostname=self._hostname,
+        )
+        return records
+
     def make_query_specs(self):
         # type: () -> Iterable[List[vim.PerformanceManager.QuerySpec]]
         """
@@ -522,11 +716,12 @@ class VSphereCheck(AgentCheck):
         tasks = []  # type: List[Any]
         try:
             for query_specs in self.make_query_specs():
-                tasks.append(self.thread_pool.submit(self.query_metrics_wrapper, query_specs))
+                tasks.append(self.thread_pool.submit(self.collect_metric_records, query_specs))
         except Exception as e:
             self.log.warning("Unable to schedule all metric collection tasks: %s", e)
         finally:
             self.log.debug("Queued all %d tasks, waiting for completion.", len(tasks))
+            submit_time = 0.0
             for future in as_completed(tasks):
                 future_exc = future.exception()
                 if isinstance(future_exc, vmodl.fault.InvalidArgument):
@@ -536,20 +731,19 @@ class VSphereCheck(AgentCheck):
                     self.log.warning("A metric collection API call failed with the following error: %s", future_exc)
                     continue
 
-                results = future.result()
-                if not results:
-                    self.log.debug("A metric collection API call did not return data.")
-                    continue
-
-                try:
-                    # Callback is called in the main thread
-                    self.submit_metrics_callback(results)
-                except Exception as e:
-                    self.log.exception(
-                        "Exception '%s' raised during the submit_metrics_callback. "
-                        "Ignoring the error and continuing execution.",
-                        e,
-                    )
+                # Results were already processed in the threads, only their submission is left to the main thread
+                t0 = Timer()
+                self.submit_metric_records(future.result())
+                submit_time += t0.total()
+
+            if tasks:
+                self.gauge(
+                    'datadog.vsphere.submit_metrics.time',
+                    submit_time,
+                    tags=self._config.base_tags,
+                    raw=True,
+                    hostname=self._hostname,
+                )
 
     def make_batch(
         self,
@@ -971,27 +1165,60 @@ class VSphereCheck(AgentCheck):
                 pass
 
         # Refresh the metrics metadata cache
-        if self.metrics_metadata_cache.is_expired():
+        metrics_metadata_refreshed = self.metrics_metadata_cache.is_expired()
+        if metrics_metadata_refreshed:
             with self.metrics_metadata_cache.update():
                 self.refresh_metrics_metadata_cache()
 
         # Refresh the infrastructure cache
-        if self.infrastructure_cache.is_expired():
-            with self.infrastructure_cache.update():
-                self.refresh_infrastructure_cache()
+        infrastructure_refreshed = False
+        updated_mors = None  # type: Optional[Set[vim.ManagedEntity]]
+        if self.infrastructure_refresh is not None:
+            # The restored infrastructure is used until its discovery in the background completes
+            if self.infrastructure_refresh.done():
+                infrastructure_refresh, self.infrastructure_refresh = self.infrastructure_refresh, None
+                try:
+                    infrastructure_data = infrastructure_refresh.result()
+                except Exception as e:
+                    self.log.warning("Unable to discover the infrastructure in the background, retrying now: %s", e)
+                    infrastructure_data = None
+
+                with self.infrastructure_cache.update():
+                    self.refresh_infrastructure_cache(infrastructure_data)
+                infrastructure_refreshed = True
+        elif self.infrastructure_cache.is_expired():
+            if (
+                self._config.incremental_infrastructure_refresh
+                and get_timestamp() - self.last_full_infrastructure_refresh_time
+                < self._config.full_infrastructure_refresh_interval
+            ):
+                updated_mors = self.update_infrastructure_cache()
+
+            if updated_mors is None:
+                with self.infrastructure_cache.update():
+                    self.refresh_infrastructure_cache()
+            infrastructure_refreshed = True
+
+        if self._config.persist_cache and (metrics_metadata_refreshed or infrastructure_refreshed):
+            self.save_caches()
 
+        if infrastructure_refreshed:
             # Submit host tags as soon as we have fresh data
             self.submit_external_host_tags()
 
-            # Submit property metrics after the cache is refreshed
+            # Submit property metrics after the cache is refreshed, for every resource even when only some of them
+            # changed, so that unchanged resources keep reporting them
             if self._config.collect_property_metrics:
                 for resource_type in self._config.collected_resource_types:
                     for mor in self.infrastructure_cache.get_mors(resource_type):
                         mor_props = self.infrastructure_cache.get_mor_props(mor)
                         resource_tags = mor_props.get('tags', [])
                         self.submit_property_metrics(resource_type, mor_props, resource_tags)
-                # delete property data from the cache since it won't be used until next cache refresh
-                self.infrastructure_cache.clear_properties()
+                # With incremental refreshes, the properties are shared with the infrastructure data the next changes
+                # are applied to, so they are kept to be submitted again after the next update
+                if not self._config.incremental_infrastructure_refresh:
+                    # delete property data from the cache since it won't be used until next cache refresh
+                    self.infrastructure_cache.clear_properties()
 
         # Submit the number of resources that are monitored
         for resource_type in self._config.collected_resource_types:
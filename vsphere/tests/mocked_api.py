@@ -27,6 +27,7 @@ class MockedAPI(object):
     def __init__(self, config, _=None):
         self.config = config
         self.infrastructure_data = {}
+        self.infrastructure_updates = None
         self.metrics_data = []
         self.mock_events = []
         self.server_time = dt.datetime.now()
@@ -90,6 +91,15 @@ class MockedAPI(object):
 
         return self.infrastructure_data
 
+    def start_infrastructure_updates(self):
+        self.infrastructure_updates = ({}, {}, [])
+        return dict(self.get_infrastructure())
+
+    def get_infrastructure_updates(self):
+        updates = self.infrastructure_updates
+        self.infrastructure_updates = ({}, {}, [])
+        return updates
+
     def query_metrics(self, query_specs):
         if not self.metrics_data:
             metrics_filename = 'metrics_{}.json'.format(self.config.collection_type)
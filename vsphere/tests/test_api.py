@@ -8,7 +8,7 @@ import pytest
 from mock import ANY, MagicMock, patch
 from pyVmomi import vim, vmodl
 
-from datadog_checks.vsphere.api import APIConnectionError, VSphereAPI
+from datadog_checks.vsphere.api import APIConnectionError, APIResponseError, VSphereAPI
 from datadog_checks.vsphere.config import VSphereConfig
 
 
@@ -111,6 +111,79 @@ def test_get_infrastructure(realtime_instance):
         container_view.Destroy.assert_called_once()
 
 
+def build_update_set(version, object_updates, truncated=False):
+    filter_update = vmodl.query.PropertyCollector.FilterUpdate(objectSet=object_updates)
+    return vmodl.query.PropertyCollector.UpdateSet(version=version, filterSet=[filter_update], truncated=truncated)
+
+
+def build_object_update(kind, mor, **changes):
+    change_set = [
+        vmodl.query.PropertyCollector.Change(name=name, op='remove' if val is None else 'assign', val=val)
+        for name, val in changes.items()
+    ]
+    return vmodl.query.PropertyCollector.ObjectUpdate(kind=kind, obj=mor, changeSet=change_set)
+
+
+def test_get_infrastructure_updates(realtime_instance):
+    with patch('datadog_checks.vsphere.api.connect'):
+        config = VSphereConfig(realtime_instance, {}, MagicMock())
+        api = VSphereAPI(config, MagicMock())
+
+        with pytest.raises(APIResponseError):
+            api.get_infrastructure_updates()
+
+        api._get_infrastructure_filter_spec = MagicMock()
+        collector = api._conn.content.propertyCollector.CreatePropertyCollector.return_value
+        host = vim.HostSystem(moId='host-1')
+        vm1 = vim.VirtualMachine(moId='vm-1')
+        vm2 = vim.VirtualMachine(moId='vm-2')
+        vm3 = vim.VirtualMachine(moId='vm-3')
+        collector.WaitForUpdatesEx.side_effect = [
+            # The initial update set is split in two
+            build_update_set(
+                '1',
+                [build_object_update('enter', host, name='host1'), build_object_update('enter', vm1, name='vm1')],
+                truncated=True,
+            ),
+            build_update_set('2', [build_object_update('enter', vm2, name='vm2', parent=host)]),
+            build_update_set(
+                '3',
+                [
+                    build_object_update('modify', vm1, name='renamed', parent=None),
+                    build_object_update('leave', vm2),
+                    build_object_update('enter', vm3, name='vm3'),
+                    build_object_update('modify', vm3, parent=host),
+                ],
+            ),
+            None,
+        ]
+
+        root_folder = api._conn.content.rootFolder
+        root_folder.name = 'root-folder'
+        assert api.start_infrastructure_updates() == {
+            host: {'name': 'host1'},
+            vm1: {'name': 'vm1'},
+            vm2: {'name': 'vm2', 'parent': host},
+            root_folder: {'name': 'root-folder', 'parent': None},
+        }
+        collector.CreateFilter.assert_called_once_with(api._get_infrastructure_filter_spec.return_value, False)
+
+        entered, modified, left = api.get_infrastructure_updates()
+        assert entered == {vm3: {'name': 'vm3', 'parent': host}}
+        assert modified == {vm1: {'name': 'renamed', 'parent': None}}
+        assert left == [vm2]
+
+        assert api.get_infrastructure_updates() == ({}, {}, [])
+        assert [c.args[0] for c in collector.WaitForUpdatesEx.call_args_list] == ['', '1', '2', '3']
+
+        view = api._update_view
+        api.stop_infrastructure_updates()
+        collector.Destroy.assert_called_once()
+        view.Destroy.assert_called_once()
+        with pytest.raises(APIResponseError):
+            api.get_infrastructure_updates()
+
+
 @pytest.mark.parametrize(
     'exception, expected_calls',
     [
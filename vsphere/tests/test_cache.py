@@ -1,6 +1,7 @@
 # (C) Datadog, Inc. 2019-present
 # All rights reserved
 # Licensed under Simplified BSD License (see LICENSE)
+import json
 import logging
 
 import pytest
@@ -100,3 +101,67 @@ def test_infrastructure_cache(realtime_instance):
     assert cache.get_mor_tags(vm_mor) == ['my_cat_name_1:my_tag_name_1', 'my_cat_name_2:my_tag_name_2']
     assert cache.get_mor_tags(datastore) == ['my_cat_name_2:my_tag_name_2']
     assert cache.get_mor_tags(vm2_mor) == []
+
+
+def test_apply_infrastructure_updates():
+    cache = InfrastructureCache(float('inf'))
+    vm1 = vim.VirtualMachine(moId='vm-1')
+    vm2 = vim.VirtualMachine(moId='vm-2')
+    vm3 = vim.VirtualMachine(moId='vm-3')
+    host = vim.HostSystem(moId='host-1')
+    with cache.update():
+        cache.set_infrastructure_data(
+            {
+                vm1: {'name': 'vm1', 'parent': host, 'properties': {'guest.hostName': 'foo', 'guest.ipAddress': 'bar'}},
+                vm2: {'name': 'vm2', 'parent': host},
+                host: {'name': 'host1'},
+            }
+        )
+
+    assert cache.apply_infrastructure_updates(
+        {vm3: {'name': 'vm3', 'parent': host}},
+        {vm1: {'name': 'renamed', 'parent': None, 'properties': {'guest.hostName': 'baz', 'guest.ipAddress': None}}},
+        [vm2],
+    )
+    assert cache.get_infrastructure_data() == {
+        vm1: {'name': 'renamed', 'properties': {'guest.hostName': 'baz'}},
+        vm3: {'name': 'vm3', 'parent': host},
+        host: {'name': 'host1'},
+    }
+
+    # Changes to an unknown resource mean that some were missed
+    assert not cache.apply_infrastructure_updates({}, {vm2: {'name': 'vm2'}}, [])
+    assert vm2 not in cache.get_infrastructure_data()
+
+
+def test_dump_and_load_caches():
+    metadata_cache = MetricsMetadataCache(float('inf'))
+    with metadata_cache.update():
+        metadata_cache.set_metadata(vim.VirtualMachine, {1: 'cpu.usage.avg', 2: 'mem.active.avg'})
+        metadata_cache.set_metadata(vim.HostSystem, {1: 'cpu.usage.avg'})
+
+    vm = vim.VirtualMachine(moId='vm-1')
+    host = vim.HostSystem(moId='host-1')
+    infrastructure_cache = InfrastructureCache(float('inf'))
+    with infrastructure_cache.update():
+        infrastructure_cache.set_mor_props(vm, {'tags': ['vsphere_host:host1'], 'hostname': 'vm1', 'properties': {}})
+        infrastructure_cache.set_mor_props(host, {'tags': [], 'hostname': 'host1'})
+        infrastructure_cache.set_all_tags({vim.VirtualMachine: {'vm-1': ['env:prod']}})
+
+    # The caches must survive a round trip through JSON
+    metadata_dump = json.loads(json.dumps(metadata_cache.dump()))
+    infrastructure_dump = json.loads(json.dumps(infrastructure_cache.dump()))
+
+    restored_metadata_cache = MetricsMetadataCache(1800)
+    restored_metadata_cache.load(metadata_dump, 123)
+    assert restored_metadata_cache._last_ts == 123
+    assert restored_metadata_cache.get_metadata(vim.VirtualMachine) == {1: 'cpu.usage.avg', 2: 'mem.active.avg'}
+    assert restored_metadata_cache.get_metadata(vim.HostSystem) == {1: 'cpu.usage.avg'}
+
+    restored_infrastructure_cache = InfrastructureCache(300)
+    restored_infrastructure_cache.load(infrastructure_dump, 456)
+    assert restored_infrastructure_cache._last_ts == 456
+    assert list(restored_infrastructure_cache.get_mors(vim.VirtualMachine)) == [vm]
+    assert restored_infrastructure_cache.get_mor_props(vm) == {'tags': ['vsphere_host:host1'], 'hostname': 'vm1'}
+    assert restored_infrastructure_cache.get_mor_props(host) == {'tags': [], 'hostname': 'host1'}
+    assert restored_infrastructure_cache.get_mor_tags(vm) == ['env:prod']
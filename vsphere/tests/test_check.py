@@ -11,6 +11,7 @@ import mock
 import pytest
 from mock import MagicMock
 from pyVmomi import vim, vmodl
+from six import iteritems
 
 from datadog_checks.base import to_string
 from datadog_checks.base.utils.time import get_current_datetime
@@ -737,3 +738,118 @@ def test_no_infra_cache_no_perf_values(aggregator, realtime_instance, dd_run_che
         )
 
         aggregator.assert_all_metrics_covered()
+
+
+@pytest.mark.usefixtures('mock_type', 'mock_threadpool', 'mock_api')
+def test_incremental_infrastructure_refresh(aggregator, dd_run_check, realtime_instance):
+    realtime_instance['incremental_infrastructure_refresh'] = True
+    check = VSphereCheck('vsphere', {}, [realtime_instance])
+    dd_run_check(check)
+    aggregator.assert_metric('datadog.vsphere.refresh_infrastructure_cache.time', count=1)
+
+    infrastructure_data = check.api.infrastructure_data
+    vm = next(mor for mor, props in iteritems(infrastructure_data) if props['name'] == 'VM4-4')
+    host = infrastructure_data[vm]['runtime.host']
+
+    # Only the modified VM gets its payload computed again
+    aggregator.reset()
+    check.api.infrastructure_updates = ({}, {vm: {'name': 'VM4-4-renamed'}}, [])
+    check.infrastructure_cache._last_ts = 0
+    dd_run_check(check)
+    aggregator.assert_metric('datadog.vsphere.refresh_infrastructure_cache.time', count=0)
+    aggregator.assert_metric('datadog.vsphere.update_infrastructure_cache.changes', value=1, count=1)
+    assert check.infrastructure_cache.get_mor_props(vm)['hostname'] == 'VM4-4-renamed'
+
+    # Other resources may affect the payload of any resource
+    aggregator.reset()
+    check.api.infrastructure_updates = ({}, {host: {'name': '10.0.0.104-renamed'}}, [vm])
+    check.infrastructure_cache._last_ts = 0
+    dd_run_check(check)
+    aggregator.assert_metric('datadog.vsphere.refresh_infrastructure_cache.time', count=0)
+    aggregator.assert_metric('datadog.vsphere.update_infrastructure_cache.changes', value=2, count=1)
+    assert check.infrastructure_cache.get_mor_props(vm) is None
+    assert check.infrastructure_cache.get_mor_props(host)['hostname'] == '10.0.0.104-renamed'
+
+    # Changes to unknown resources trigger a full refresh
+    aggregator.reset()
+    check.api.infrastructure_updates = ({}, {vm: {'name': 'VM4-4'}}, [])
+    check.infrastructure_cache._last_ts = 0
+    dd_run_check(check)
+    aggregator.assert_metric('datadog.vsphere.refresh_infrastructure_cache.time', count=1)
+    aggregator.assert_metric('datadog.vsphere.update_infrastructure_cache.changes', count=0)
+
+
+@pytest.mark.usefixtures('mock_type', 'mock_threadpool', 'mock_api')
+def test_incremental_infrastructure_refresh_property_metrics(aggregator, dd_run_check, realtime_instance):
+    realtime_instance['incremental_infrastructure_refresh'] = True
+    realtime_instance['collect_property_metrics'] = True
+    check = VSphereCheck('vsphere', {}, [realtime_instance])
+    dd_run_check(check)
+
+    # A full refresh picks up the properties of every resource
+    aggregator.reset()
+    infrastructure_data = check.api.infrastructure_data
+    for _, props in iteritems(infrastructure_data):
+        props['properties'] = {'summary.config.numCpu': 2}
+    check.infrastructure_cache._last_ts = 0
+    check.last_full_infrastructure_refresh_time = 0
+    dd_run_check(check)
+    aggregator.assert_metric('datadog.vsphere.refresh_infrastructure_cache.time', count=1)
+    hostnames = {metric.hostname for metric in aggregator.metrics('vsphere.vm.summary.config.numCpu')}
+    assert 'VM4-4' in hostnames
+    assert len(hostnames) > 1
+
+    # The VMs that did not change still get their property metrics after an incremental update
+    aggregator.reset()
+    vm = next(mor for mor, props in iteritems(infrastructure_data) if props['name'] == 'VM4-4')
+    check.api.infrastructure_updates = ({}, {vm: {'name': 'VM4-4-renamed'}}, [])
+    check.infrastructure_cache._last_ts = 0
+    dd_run_check(check)
+    aggregator.assert_metric('datadog.vsphere.refresh_infrastructure_cache.time', count=0)
+    aggregator.assert_metric('datadog.vsphere.update_infrastructure_cache.changes', value=1, count=1)
+    for hostname in (hostnames - {'VM4-4'}) | {'VM4-4-renamed'}:
+        aggregator.assert_metric('vsphere.vm.summary.config.numCpu', value=2, hostname=hostname, count=1)
+
+
+@pytest.mark.usefixtures('mock_type', 'mock_threadpool', 'mock_api')
+def test_metric_results_processed_in_threads(aggregator, dd_run_check, realtime_instance):
+    check = VSphereCheck('vsphere', {}, [realtime_instance])
+    dd_run_check(check)
+    aggregator.reset()
+
+    # Everything but the submission happens in the threads making the queries
+    records = []
+    for query_specs in check.make_query_specs():
+        records.extend(check.collect_metric_records(query_specs))
+    assert records
+    aggregator.assert_metric('datadog.vsphere.query_metrics.time')
+    aggregator.assert_metric('datadog.vsphere.process_metrics.time')
+    aggregator.assert_all_metrics_covered()
+
+    check.submit_metric_records(records)
+    for metric_name, value, hostname, tags in records:
+        aggregator.assert_metric(metric_name, value, hostname=hostname, tags=tags)
+
+
+@pytest.mark.usefixtures('mock_type', 'mock_threadpool', 'mock_api', 'datadog_agent')
+def test_persist_cache(aggregator, dd_run_check, realtime_instance):
+    realtime_instance['persist_cache'] = True
+    check = VSphereCheck('vsphere', {}, [realtime_instance])
+    dd_run_check(check)
+    saved_infrastructure = check.infrastructure_cache.dump()
+    saved_metadata = check.metrics_metadata_cache.dump()
+    assert saved_infrastructure['mors']
+
+    # After a restart, the saved caches are restored and the infrastructure is discovered again in the background
+    aggregator.reset()
+    check = VSphereCheck('vsphere', {}, [realtime_instance])
+    with mock.patch.object(check.infrastructure_cache, 'load', wraps=check.infrastructure_cache.load) as load:
+        dd_run_check(check)
+
+    load.assert_called_once_with(saved_infrastructure, mock.ANY)
+    assert check.metrics_metadata_cache.dump() == saved_metadata
+    assert check.infrastructure_refresh is None
+    assert check.infrastructure_cache.dump() == saved_infrastructure
+    aggregator.assert_metric('datadog.vsphere.refresh_infrastructure_cache.time', count=1)
+    aggregator.assert_metric('datadog.vsphere.refresh_metrics_metadata_cache.time', count=0)
+    aggregator.assert_metric('vsphere.cpu.usage.avg', hostname='VM4-4')
@@ -2977,6 +2977,8 @@ def test_property_metrics_metric_filters(
     aggregator.assert_metric('datadog.vsphere.refresh_infrastructure_cache.time')
     aggregator.assert_metric('datadog.vsphere.refresh_metrics_metadata_cache.time')
     aggregator.assert_metric('datadog.vsphere.query_metrics.time')
+    aggregator.assert_metric('datadog.vsphere.process_metrics.time')
+    aggregator.assert_metric('datadog.vsphere.submit_metrics.time')
     aggregator.assert_metric('vsphere.cpu.totalmhz.avg')
     aggregator.assert_metric('vsphere.datastore.busResets.sum')
     aggregator.assert_all_metrics_covered()
@@ -3042,6 +3044,8 @@ def test_property_metrics_expired_cache(
         aggregator.assert_metric('vsphere.host.count')
         aggregator.assert_metric('datadog.vsphere.collect_events.time')
         aggregator.assert_metric('datadog.vsphere.query_metrics.time')
+        aggregator.assert_metric('datadog.vsphere.process_metrics.time')
+        aggregator.assert_metric('datadog.vsphere.submit_metrics.time')
         aggregator.assert_metric('vsphere.cpu.costop.sum')
         aggregator.assert_all_metrics_covered()
 
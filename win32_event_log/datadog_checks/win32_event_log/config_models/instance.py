@@ -66,6 +66,7 @@ class InstanceConfig(BaseModel):
     message_filters: Optional[tuple[str, ...]] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     password: Optional[str] = None
     path: Optional[str] = None
     payload_size: Optional[int] = None
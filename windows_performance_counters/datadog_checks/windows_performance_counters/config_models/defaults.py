@@ -28,5 +28,9 @@ def instance_min_collection_interval():
     return 15
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_use_legacy_check_version():
     return False
@@ -95,6 +95,7 @@ class InstanceConfig(BaseModel):
     metrics: MappingProxyType[str, Metrics]
     min_collection_interval: Optional[float] = None
     namespace: Optional[str] = Field(None, pattern='\\w*')
+    normalization_cache_size: Optional[int] = None
     password: Optional[str] = None
     server: Optional[str] = None
     server_tag: Optional[str] = None
@@ -24,5 +24,9 @@ def instance_min_collection_interval():
     return 15
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_windows_service_startup_type_tag():
     return False
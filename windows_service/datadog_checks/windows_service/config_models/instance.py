@@ -40,6 +40,7 @@ class InstanceConfig(BaseModel):
     empty_default_hostname: Optional[bool] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     service: Optional[str] = None
     services: tuple[Union[str, MappingProxyType[str, Any]], ...]
     tags: Optional[tuple[str, ...]] = None
@@ -28,5 +28,9 @@ def instance_namespace():
     return 'root\\cimv2'
 
 
+def instance_normalization_cache_size():
+    return 0
+
+
 def instance_provider():
     return 64
@@ -44,6 +44,7 @@ class InstanceConfig(BaseModel):
     metrics: tuple[tuple[str, ...], ...]
     min_collection_interval: Optional[float] = None
     namespace: Optional[str] = None
+    normalization_cache_size: Optional[int] = None
     password: Optional[str] = None
     provider: Optional[int] = None
     service: Optional[str] = None
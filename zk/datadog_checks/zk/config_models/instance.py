@@ -40,6 +40,7 @@ class InstanceConfig(BaseModel):
     host: str
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    normalization_cache_size: Optional[int] = None
     port: Optional[int] = None
     report_instance_mode: Optional[bool] = None
     service: Optional[str] = None